@@ -1,5 +1,7 @@
 from .basic_transactions import *
 from .advanced_transactions import *
+from .balance_aggregation import aggregate_balances, BalanceAggregate
+from .balance_ledger import BalanceLedger
 
 __all__ = [
     "DynamicProgrammingSimplifier",
@@ -9,5 +11,11 @@ __all__ = [
     "DebtCycleSimplifier",
 	"AdvancedDebtCycleSimplifier",
     "GreedySimplifier",
+    "VectorizedGreedySimplifier",
+    "BranchAndBoundSimplifier",
 	"AdvancedGreedySimplifier",
+	"simplify_over_dates",
+    "aggregate_balances",
+    "BalanceAggregate",
+    "BalanceLedger",
 ]
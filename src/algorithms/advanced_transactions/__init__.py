@@ -2,10 +2,12 @@ from .min_cost_max_flow import AdvancedMinCostMaxFlowSimplifier
 from .cycle_detector import AdvancedDebtCycleSimplifier
 from .greedy import AdvancedGreedySimplifier
 from .dynamic_programming import AdvancedDynamicProgrammingSimplifier
+from .date_sweep import simplify_over_dates
 
 __all__ = [
     'AdvancedMinCostMaxFlowSimplifier',
     'AdvancedDebtCycleSimplifier',
     'AdvancedGreedySimplifier',
     'AdvancedDynamicProgrammingSimplifier',
+    'simplify_over_dates',
 ] 
\ No newline at end of file
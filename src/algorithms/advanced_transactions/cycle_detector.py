@@ -4,9 +4,9 @@ from typing import Any
 from src.data_structures import LinkedList, HashTable, Array
 from src.core_type import AdvancedTransaction, BasicTransaction
 from src.algorithms.basic_transactions.cycle_detector import DebtCycleSimplifier
+from src.algorithms.balance_ledger import BalanceLedger
+from src.algorithms.advanced_transactions.debt_index import DebtIndex
 from src.utils.financial_calculator import FinancialCalculator, InterestType,PenaltyType
-from src.utils.money_utils import round_money
-from src.utils.constants import EPSILON
 
 class AdvancedDebtCycleSimplifier:
     """
@@ -18,10 +18,22 @@ class AdvancedDebtCycleSimplifier:
     """
 
     def __init__(self,
-                 advanced_transactions: LinkedList[AdvancedTransaction],
-                 current_date: date):
+                 advanced_transactions: LinkedList[AdvancedTransaction] | BalanceLedger,
+                 current_date: date,
+                 use_batch: bool = False,
+                 transaction_metrics: Array[dict] | None = None):
+        if isinstance(advanced_transactions, BalanceLedger):
+            # Sổ cái dùng chung đã có sẵn chi tiết nợ tại đúng ngày này, không tính lại
+            advanced_transactions.require_date(current_date)
+            if transaction_metrics is None:
+                transaction_metrics = advanced_transactions.transaction_metrics
+            advanced_transactions = advanced_transactions.transactions
         self.advanced_transactions = advanced_transactions
         self.current_date = current_date
+        # True: tính lãi/phạt/ưu tiên cho toàn bộ giao dịch trong một lượt vector hóa (NumPy)
+        self.use_batch = use_batch
+        # Chi tiết nợ tính sẵn theo thứ tự giao dịch (ví dụ từ simplify_over_dates); None = tự tính
+        self._transaction_metrics = transaction_metrics
         self.financial_metrics: HashTable[str, float] = HashTable()
         self.detailed_report: str = ""
         self._calculator = FinancialCalculator()
@@ -30,9 +42,15 @@ class AdvancedDebtCycleSimplifier:
         if len(self.advanced_transactions) == 0:
             return LinkedList[AdvancedTransaction]()
 
-        self.financial_metrics = self._calculate_financial_metrics()
+        # Chi tiết nợ và điểm ưu tiên của từng giao dịch chỉ tính một lần, dùng chung cho hai bước
+        transaction_metrics = self._transaction_metrics
+        if transaction_metrics is None:
+            transaction_metrics = FinancialCalculator.evaluate_transactions(
+                self.advanced_transactions, self.current_date, self.use_batch
+            )
+        self.financial_metrics = self._calculate_financial_metrics(transaction_metrics)
 
-        conversion_data = self._convert_to_basic_transactions_with_priority()
+        conversion_data = self._convert_to_basic_transactions_with_priority(transaction_metrics)
         basic_transactions = conversion_data["transactions"]
 
         if len(basic_transactions) == 0:
@@ -42,39 +60,22 @@ class AdvancedDebtCycleSimplifier:
 
         simplified_advanced = self._convert_back_to_advanced_transactions(
             simplified_basic,
-            conversion_data["person_to_advanced_map"]
+            conversion_data["debt_index"]
         )
 
         return simplified_advanced
 
-    def _calculate_financial_metrics(self) -> HashTable[str, float]:
+    def _calculate_financial_metrics(self, transaction_metrics: Array[dict]) -> HashTable[str, float]:
         metrics: HashTable[str, float] = HashTable()
         total_original, total_current, total_interest, total_penalty = 0.0, 0.0, 0.0, 0.0
         overdue_count = high_priority_count = 0
 
         node = self.advanced_transactions.head
+        index = 0
         while node:
             tx: AdvancedTransaction = node.data
-            breakdown = self._calculator.calculate_total_debt(
-                amount=tx.amount,
-                interest_rate=tx.interest_rate,
-                penalty_rate=tx.penalty_rate,
-                borrow_date=tx.borrow_date,
-                due_date=tx.due_date,
-                current_date=self.current_date,
-                interest_type=tx.interest_type,
-                penalty_type=tx.penalty_type
-            )
-            priority = self._calculator.calculate_priority_score(
-                principal=tx.amount,
-                interest_rate=tx.interest_rate,
-                penalty_rate=tx.penalty_rate,
-                borrow_date=tx.borrow_date,
-                due_date=tx.due_date,
-                current_date=self.current_date,
-                interest_type=tx.interest_type,
-                penalty_type=tx.penalty_type
-            )
+            breakdown = transaction_metrics[index]
+            priority = breakdown["priority"]
 
             total_original += tx.amount
             total_current += breakdown["total"]
@@ -87,6 +88,7 @@ class AdvancedDebtCycleSimplifier:
                 high_priority_count += 1
 
             node = node.next
+            index += 1
 
         count = len(self.advanced_transactions)
         metrics["original_debt_total"] = total_original
@@ -99,35 +101,19 @@ class AdvancedDebtCycleSimplifier:
 
         return metrics
 
-    def _convert_to_basic_transactions_with_priority(self) -> HashTable[str, any]:
+    def _convert_to_basic_transactions_with_priority(self, transaction_metrics: Array[dict]) -> HashTable[str, any]:
         basic_transactions: LinkedList[BasicTransaction] = LinkedList()
-        person_to_advanced_map: HashTable[str, Array[AdvancedTransaction]] = HashTable()
+        # Chỉ mục theo cặp: mỗi cặp giữ một bản tổng hợp và giao dịch gốc đầu tiên làm mẫu
+        debt_index = DebtIndex(self.current_date)
         priority_scores: HashTable[str, float] = HashTable()
 
         node = self.advanced_transactions.head
+        index = 0
         while node:
             tx: AdvancedTransaction = node.data
 
-            breakdown = self._calculator.calculate_total_debt(
-                amount=tx.amount,
-                interest_rate=tx.interest_rate,
-                penalty_rate=tx.penalty_rate,
-                borrow_date=tx.borrow_date,
-                due_date=tx.due_date,
-                current_date=self.current_date,
-                interest_type=tx.interest_type,
-                penalty_type=tx.penalty_type
-            )
-            priority = self._calculator.calculate_priority_score(
-                principal=tx.amount,
-                interest_rate=tx.interest_rate,
-                penalty_rate=tx.penalty_rate,
-                borrow_date=tx.borrow_date,
-                due_date=tx.due_date,
-                current_date=self.current_date,
-                interest_type=tx.interest_type,
-                penalty_type=tx.penalty_type
-            )
+            breakdown = transaction_metrics[index]
+            priority = breakdown["priority"]
 
             basic_tx = BasicTransaction(
                 debtor=tx.debtor,
@@ -136,19 +122,15 @@ class AdvancedDebtCycleSimplifier:
             )
             basic_transactions.append(basic_tx)
 
-            key = f"{tx.debtor}->{tx.creditor}"
-            if not person_to_advanced_map.contains_key(key):
-                person_to_advanced_map.put(key, Array[AdvancedTransaction]())
-            array_of_tx = person_to_advanced_map.get(key)
-            if array_of_tx is not None:
-                array_of_tx.append(value=tx)
-            priority_scores[key] = priority
+            debt_index.add(tx, breakdown)
+            priority_scores[f"{tx.debtor}->{tx.creditor}"] = priority
 
             node = node.next
+            index += 1
 
         return {
             "transactions": basic_transactions,
-            "person_to_advanced_map": person_to_advanced_map,
+            "debt_index": debt_index,
             "priority_scores": priority_scores,
             "financial_metrics": self.financial_metrics
         }
@@ -156,34 +138,30 @@ class AdvancedDebtCycleSimplifier:
     def _convert_back_to_advanced_transactions(
         self,
         basic_transactions: LinkedList[BasicTransaction],
-        person_map: HashTable[str, Array[AdvancedTransaction]]
+        debt_index: DebtIndex
     ) -> LinkedList[AdvancedTransaction]:
         result: LinkedList[AdvancedTransaction] = LinkedList()
 
         node = basic_transactions.head
         while node:
             basic_tx: BasicTransaction = node.data
-            key = f"{basic_tx.debtor}->{basic_tx.creditor}"
-            
-            original_advanced_tx_list_for_pair = person_map.get(key)
+            pair_summary = debt_index.pair(basic_tx.debtor, basic_tx.creditor)
 
             final_borrow_date = self.current_date
             final_due_date = self.current_date
             final_interest_type = InterestType.SIMPLE 
             final_penalty_type = PenaltyType.FIXED   
 
-            if original_advanced_tx_list_for_pair is not None and len(original_advanced_tx_list_for_pair):
-                template: AdvancedTransaction = original_advanced_tx_list_for_pair.get(0)
+            if pair_summary is not None:
+                template: AdvancedTransaction = pair_summary.first_transaction
                 final_interest_type = template.interest_type
                 final_penalty_type = template.penalty_type
 
-            final_amount_for_advanced = round_money(basic_tx.amount)
-
-            if final_amount_for_advanced > EPSILON: 
+            if basic_tx.amount_cents > 0: 
                 new_advanced = AdvancedTransaction(
                     debtor=basic_tx.debtor,
                     creditor=basic_tx.creditor,
-                    amount=final_amount_for_advanced,
+                    amount=basic_tx.amount,
                     borrow_date=final_borrow_date, 
                     due_date=final_due_date,       
                     interest_rate=0.0,             
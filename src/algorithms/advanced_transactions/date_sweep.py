@@ -0,0 +1,179 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+import inspect
+from typing import Any, Iterable
+
+from src.core_type import AdvancedTransaction
+from src.data_structures import LinkedList, HashTable, Array, Tuple
+from src.utils.sorting import merge_sort
+from src.utils.money_utils import Cents, to_cents
+from src.utils.financial_calculator import FinancialCalculator, BatchMetrics, np
+
+# Nếu khoảng ngày cần chiếu dài hơn số ngày đánh giá nhân hệ số này thì tính trực tiếp từng ngày,
+# vì chiếu theo từng ngày liên tiếp sẽ tốn nhiều công hơn là có ích
+_PROJECTION_SPAN_FACTOR = 4
+
+
+def simplify_over_dates(simplifier_cls: type,
+                        transactions: Iterable[AdvancedTransaction],
+                        dates: Iterable[date],
+                        use_batch: bool = False,
+                        max_workers: int | None = None,
+                        **simplifier_kwargs: Any) -> Array[Tuple]:
+    """
+    Chạy một bộ đơn giản hóa nâng cao cho nhiều ngày đánh giá.
+
+    Danh sách giao dịch chỉ được duyệt và chuẩn hóa một lần. Chi tiết nợ của mọi ngày được tính chung:
+    - Các ngày gần nhau: mỗi giao dịch được chiếu một lần qua FinancialCalculator.project_debt
+      (lãi dồn theo công thức truy hồi), mỗi ngày chỉ còn là phép tra cứu.
+    - use_batch=True (có NumPy): dựng các cột một lần rồi tính vector hóa cho từng ngày.
+    Tên người được intern một lần cho mọi ngày; số dư theo người của ngày sau được cập nhật từ ngày
+    trước bằng chênh lệch tổng nợ của những giao dịch thay đổi. Bộ đơn giản hóa nhận chi tiết nợ qua
+    tham số transaction_metrics và, nếu hỗ trợ, số dư qua tham số balances nên không cộng dồn lại.
+
+    Args:
+        simplifier_cls: Một trong AdvancedGreedySimplifier, AdvancedDynamicProgrammingSimplifier,
+                        AdvancedDebtCycleSimplifier, AdvancedMinCostMaxFlowSimplifier
+        transactions: Iterable các AdvancedTransaction (phần tử None bị bỏ qua)
+        dates: Các ngày đánh giá (trùng lặp được gộp, kết quả trả về theo thứ tự tăng dần)
+        use_batch: True để tính chi tiết nợ bằng API vector hóa
+        max_workers: Số tiến trình chạy song song các ngày; None hoặc 1 = chạy tuần tự
+        **simplifier_kwargs: Tham số bổ sung cho hàm khởi tạo của bộ đơn giản hóa
+
+    Returns:
+        Array[Tuple]: Mỗi phần tử là Tuple (ngày, kết quả simplify() của ngày đó)
+    """
+    tx_list = LinkedList[AdvancedTransaction]()
+    for tx in transactions:
+        if tx is not None:
+            tx_list.append(tx)
+
+    sorted_dates = _unique_sorted_dates(dates)
+    metrics_by_date = _sweep_metrics(tx_list, sorted_dates, use_batch)
+    # AdvancedDebtCycleSimplifier làm việc trên từng cạnh nợ nên không nhận số dư tính sẵn
+    if 'balances' in inspect.signature(simplifier_cls).parameters:
+        balances_by_date = _sweep_balances(tx_list, metrics_by_date)
+    else:
+        balances_by_date = [None] * len(sorted_dates)
+
+    tasks = [
+        (simplifier_cls, tx_list, sorted_dates[i], metrics_by_date[i], balances_by_date[i], simplifier_kwargs)
+        for i in range(len(sorted_dates))
+    ]
+    if max_workers is not None and max_workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            outputs = list(executor.map(_run_simplifier, tasks))
+    else:
+        outputs = [_run_simplifier(task) for task in tasks]
+
+    results = Array[Tuple]()
+    for i in range(len(sorted_dates)):
+        results.append(Tuple([sorted_dates[i], outputs[i]]))
+    return results
+
+
+def _unique_sorted_dates(dates: Iterable[date]) -> list[date]:
+    """Sắp xếp tăng dần và loại bỏ các ngày trùng lặp."""
+    ordered = merge_sort(list(dates), lambda a, b: a <= b)
+    unique: list[date] = []
+    for day in ordered:
+        if not unique or unique[-1] != day:
+            unique.append(day)
+    return unique
+
+
+def _sweep_metrics(tx_list: LinkedList[AdvancedTransaction],
+                   sorted_dates: list[date],
+                   use_batch: bool) -> list[Array[dict] | BatchMetrics]:
+    """Tính chi tiết nợ của mọi giao dịch cho từng ngày đánh giá, dùng chung công tính toán."""
+    if not sorted_dates:
+        return []
+
+    if use_batch and np is not None:
+        columns = FinancialCalculator.build_columns(tx_list)
+        return [FinancialCalculator.evaluate_columns(columns, day) for day in sorted_dates]
+
+    metrics_by_date = [Array[dict]() for _ in sorted_dates]
+    first_date, last_date = sorted_dates[0], sorted_dates[-1]
+    span = last_date.toordinal() - first_date.toordinal() + 1
+
+    if span > _PROJECTION_SPAN_FACTOR * len(sorted_dates):
+        # Các ngày quá thưa: tính trực tiếp cho từng ngày (vẫn chỉ duyệt danh sách một lần)
+        for tx in tx_list:
+            for i, day in enumerate(sorted_dates):
+                metrics_by_date[i].append(FinancialCalculator.calculate_debt_metrics(
+                    tx.amount, tx.interest_rate, tx.penalty_rate,
+                    tx.borrow_date, tx.due_date, day,
+                    tx.interest_type, tx.penalty_type
+                ))
+        return metrics_by_date
+
+    offsets = [day.toordinal() - first_date.toordinal() for day in sorted_dates]
+    for tx in tx_list:
+        series = tx.project_debt(first_date, last_date)
+        principal = tx.amount
+        for i, day in enumerate(sorted_dates):
+            _, interest, penalty, total = series[offsets[i]]
+            metrics_by_date[i].append({
+                'principal': principal,
+                'interest': interest,
+                'penalty': penalty,
+                'total': total,
+                'priority': FinancialCalculator.priority_from_total(
+                    total, tx.interest_rate, tx.penalty_rate,
+                    tx.due_date, day, tx.penalty_type
+                )
+            })
+    return metrics_by_date
+
+
+def _sweep_balances(tx_list: LinkedList[AdvancedTransaction],
+                    metrics_by_date: list[Array[dict] | BatchMetrics]) -> list[HashTable[str, Cents]]:
+    """
+    Tính số dư theo người (xu) cho từng ngày đánh giá.
+
+    Tên người được intern một lần thành mã số; ngày đầu cộng dồn toàn bộ, các ngày sau chỉ cộng
+    chênh lệch của những giao dịch có tổng nợ (theo xu) thay đổi so với ngày trước.
+    """
+    name_ids: dict[str, int] = {}
+    names: list[str] = []
+    debtor_ids: list[int] = []
+    creditor_ids: list[int] = []
+    for tx in tx_list:
+        for name, ids in ((tx.debtor, debtor_ids), (tx.creditor, creditor_ids)):
+            name_id = name_ids.get(name)
+            if name_id is None:
+                name_id = len(names)
+                name_ids[name] = name_id
+                names.append(name)
+            ids.append(name_id)
+
+    balances = [0] * len(names)
+    previous_cents = [0] * len(debtor_ids)
+    balances_by_date: list[HashTable[str, Cents]] = []
+    for metrics in metrics_by_date:
+        totals = FinancialCalculator.metric_values(metrics, 'total')
+        for index in range(len(previous_cents)):
+            cents = to_cents(totals[index])
+            delta = cents - previous_cents[index]
+            if delta != 0:
+                previous_cents[index] = cents
+                balances[debtor_ids[index]] -= delta
+                balances[creditor_ids[index]] += delta
+        day_balances = HashTable[str, Cents]()
+        for name_id, name in enumerate(names):
+            day_balances.put(name, balances[name_id])
+        balances_by_date.append(day_balances)
+    return balances_by_date
+
+
+def _run_simplifier(task: tuple) -> Any:
+    """Khởi tạo và chạy bộ đơn giản hóa cho một ngày (hàm cấp mô-đun để dùng được với tiến trình con)."""
+    simplifier_cls, tx_list, day, metrics, balances, simplifier_kwargs = task
+    if balances is not None:
+        simplifier_kwargs = dict(simplifier_kwargs, balances=balances)
+    simplifier = simplifier_cls(tx_list, day, transaction_metrics=metrics, **simplifier_kwargs)
+    # AdvancedDebtCycleSimplifier dùng simplify_advanced(), các bộ còn lại dùng simplify()
+    run = getattr(simplifier, 'simplify_advanced', None) or simplifier.simplify
+    return run()
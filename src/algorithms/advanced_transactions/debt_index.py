@@ -0,0 +1,170 @@
+# Chỉ mục chi tiết nợ của giao dịch nâng cao: bản ghi gọn theo giao dịch, tổng hợp theo người và theo cặp
+from __future__ import annotations
+from datetime import date
+from typing import Any
+
+from src.data_structures import HashTable, Array, Tuple
+from src.utils.money_utils import Cents, to_cents
+
+
+def days_overdue_at(transaction: Any, current_date: date) -> float:
+    """Số ngày quá hạn của một giao dịch tại current_date (0 nếu chưa quá hạn)."""
+    if callable(getattr(transaction, 'days_overdue', None)):
+        return float(transaction.days_overdue(current_date))
+    due_date = getattr(transaction, 'due_date', None)
+    if due_date and current_date > due_date:
+        return float((current_date - due_date).days)
+    return 0.0
+
+
+class DebtRecord:
+    """Chi tiết nợ của một giao dịch gốc tại ngày đánh giá (một đối tượng cho cả hai phía)."""
+
+    __slots__ = ("debtor", "creditor", "principal", "interest", "penalty", "total",
+                 "priority", "borrow_date", "due_date", "days_overdue")
+
+    def __init__(self, transaction: Any, debt_breakdown: dict, days_overdue: float):
+        self.debtor: str = transaction.debtor
+        self.creditor: str = transaction.creditor
+        self.principal: float = debt_breakdown["principal"]
+        self.interest: float = debt_breakdown["interest"]
+        self.penalty: float = debt_breakdown["penalty"]
+        self.total: float = debt_breakdown["total"]
+        self.priority: float = debt_breakdown["priority"]
+        self.borrow_date: date = transaction.borrow_date
+        self.due_date: date = transaction.due_date
+        self.days_overdue: float = days_overdue
+
+
+class PersonDebtSummary:
+    """Tổng hợp cộng dồn của mọi khoản nợ/cho vay liên quan tới một người."""
+
+    __slots__ = ("priority_sum", "count", "earliest_borrow_date", "overdue_days_sum", "max_overdue_days")
+
+    def __init__(self):
+        self.priority_sum: float = 0.0
+        self.count: int = 0
+        self.earliest_borrow_date: date | None = None
+        self.overdue_days_sum: float = 0.0
+        self.max_overdue_days: float = 0.0
+
+    def add(self, record: DebtRecord) -> None:
+        self.priority_sum += record.priority
+        self.count += 1
+        if self.earliest_borrow_date is None or record.borrow_date < self.earliest_borrow_date:
+            self.earliest_borrow_date = record.borrow_date
+        self.overdue_days_sum += record.days_overdue
+        if record.days_overdue > self.max_overdue_days:
+            self.max_overdue_days = record.days_overdue
+
+    @property
+    def avg_priority(self) -> float:
+        return self.priority_sum / self.count if self.count > 0 else 0.0
+
+
+class PairDebtSummary:
+    """Tổng hợp mọi giao dịch gốc của một cặp (người nợ, người cho vay)."""
+
+    __slots__ = ("count", "principal_cents", "interest_cents", "penalty_cents", "total_cents",
+                 "priority_sum", "earliest_borrow_date", "max_overdue_days", "first_transaction")
+
+    def __init__(self, first_transaction: Any):
+        self.count: int = 0
+        self.principal_cents: Cents = 0
+        self.interest_cents: Cents = 0
+        self.penalty_cents: Cents = 0
+        self.total_cents: Cents = 0
+        self.priority_sum: float = 0.0
+        self.earliest_borrow_date: date | None = None
+        self.max_overdue_days: float = 0.0
+        # Giao dịch gốc đầu tiên của cặp, dùng làm mẫu (loại lãi, loại phí phạt) khi tạo báo cáo
+        self.first_transaction: Any = first_transaction
+
+    def add(self, record: DebtRecord) -> None:
+        self.count += 1
+        self.principal_cents += to_cents(record.principal)
+        self.interest_cents += to_cents(record.interest)
+        self.penalty_cents += to_cents(record.penalty)
+        self.total_cents += to_cents(record.total)
+        self.priority_sum += record.priority
+        if self.earliest_borrow_date is None or record.borrow_date < self.earliest_borrow_date:
+            self.earliest_borrow_date = record.borrow_date
+        if record.days_overdue > self.max_overdue_days:
+            self.max_overdue_days = record.days_overdue
+
+    @property
+    def avg_priority(self) -> float:
+        return self.priority_sum / self.count if self.count > 0 else 0.0
+
+
+class DebtIndex:
+    """
+    Chỉ mục chi tiết nợ được xây dựng một lần khi nạp giao dịch nâng cao.
+
+    Mỗi giao dịch có đúng một DebtRecord (thuộc tính cố định, không phải một bảng băm cho mỗi dòng),
+    mỗi người có một PersonDebtSummary và mỗi cặp (người nợ, người cho vay) có một PairDebtSummary được
+    cập nhật ngay khi nạp. Nhờ đó điểm ưu tiên của một người hay ngày vay sớm nhất của một cặp được tra cứu
+    trong O(1) thay vì duyệt lại mọi khoản nợ (người cho vay trung tâm có thể có hàng nghìn khoản).
+
+    PHƯƠNG THỨC:
+    - add(transaction, debt_breakdown): Nạp một giao dịch với chi tiết nợ đã tính - O(1) trung bình
+    - person(name): Tổng hợp của một người hoặc None - O(1) trung bình
+    - pair(debtor, creditor): Tổng hợp của một cặp hoặc None - O(1) trung bình
+    - avg_priority(name): Điểm ưu tiên trung bình của một người - O(1) trung bình
+    - avg_overdue_days(): Số ngày quá hạn trung bình trên mọi giao dịch - O(1)
+    """
+
+    def __init__(self, current_date: date):
+        self.current_date: date = current_date
+        self.records: Array[DebtRecord] = Array()
+        self.people: HashTable[str, PersonDebtSummary] = HashTable()
+        self.pairs: HashTable[Tuple, PairDebtSummary] = HashTable()
+        self.pair_keys: Array[Tuple] = Array()  # Các cặp theo thứ tự xuất hiện lần đầu
+        self.overdue_days_sum: float = 0.0
+
+    def add(self, transaction: Any, debt_breakdown: dict) -> DebtRecord:
+        record = DebtRecord(transaction, debt_breakdown, days_overdue_at(transaction, self.current_date))
+        self.records.append(record)
+        self.overdue_days_sum += record.days_overdue
+        self._summary_for(record.debtor).add(record)
+        self._summary_for(record.creditor).add(record)
+
+        pair_key = Tuple([record.debtor, record.creditor])
+        pair_summary = self.pairs.get(pair_key)
+        if pair_summary is None:
+            pair_summary = PairDebtSummary(transaction)
+            self.pairs.put(pair_key, pair_summary)
+            self.pair_keys.append(pair_key)
+        pair_summary.add(record)
+        return record
+
+    def _summary_for(self, name: str) -> PersonDebtSummary:
+        summary = self.people.get(name)
+        if summary is None:
+            summary = PersonDebtSummary()
+            self.people.put(name, summary)
+        return summary
+
+    def person(self, name: str) -> PersonDebtSummary | None:
+        return self.people.get(name)
+
+    def pair(self, debtor: str, creditor: str) -> PairDebtSummary | None:
+        return self.pairs.get(Tuple([debtor, creditor]))
+
+    def avg_priority(self, name: str) -> float:
+        summary = self.people.get(name)
+        return summary.avg_priority if summary is not None else 0.0
+
+    def avg_overdue_days(self) -> float:
+        count = len(self.records)
+        return self.overdue_days_sum / count if count > 0 else 0.0
+
+    def total_cents(self) -> Cents:
+        """Tổng nợ thực tế (theo xu) của mọi giao dịch gốc."""
+        total = 0
+        for pair_key in self.pair_keys:
+            total += self.pairs.get(pair_key).total_cents
+        return total
+
+    def __len__(self) -> int:
+        return len(self.records)
@@ -1,21 +1,49 @@
 from __future__ import annotations
 from datetime import date
-from typing import Any 
 
 from src.core_type import BasicTransaction, AdvancedTransaction
-from src.data_structures import LinkedList, HashTable, PriorityQueue, Tuple, Array
+from src.data_structures import LinkedList, HashTable, PriorityQueue, Tuple, Array, LRUCache
 from src.utils.sorting import merge_sort_linked_list
 from src.utils.constants import EPSILON
-from src.utils.money_utils import round_money
+from src.utils.money_utils import Cents, to_cents, from_cents
 from src.utils.financial_calculator import FinancialCalculator 
+from src.algorithms.balance_ledger import BalanceLedger
+from src.algorithms.advanced_transactions.debt_index import DebtIndex
+from src.database.dp_memo import PersistentDPMemo
+from src.algorithms.basic_transactions.dynamic_programming import (
+    canonical_balance_key, reconstruct_transfers, dp_memo_entry_size, DPValueTuple,
+    transfers_to_ranks, transfers_from_ranks
+)
 
 # Định nghĩa kiểu dữ liệu cho giá trị bảng DP với thông tin tài chính nâng cao
-# AdvancedDPValueTuple: (tổng_chi_phí_tài_chính, tổng_số_giao_dịch, danh_sách_giao_dịch, điểm_ưu_tiên_tổng_đã_xử_lý)
-AdvancedDPValueTuple = Tuple
+# AdvancedDPValueTuple: giống DPValueTuple - (tổng_chi_phí, tổng_số_giao_dịch, giao_dịch_của_bước_này dạng hạng,
+# khóa_trạng_thái_kế_tiếp). Mỗi bước ở đây là đúng một giao dịch.
+# Điểm ưu tiên phụ thuộc vào tên người nên không lưu, mà được tính lại trên danh sách giao dịch đã dựng lại.
+AdvancedDPValueTuple = DPValueTuple
 
-# Khóa bảng DP: Tuple chứa số dư thực tế của mọi người theo thứ tự cố định
-# Giá trị bảng DP: AdvancedDPValueTuple như định nghĩa ở trên
-AdvancedDPTable = HashTable[Tuple, AdvancedDPValueTuple]
+# Khóa bảng DP: khóa chuẩn (bội số dư thực tế khác 0 đã sắp xếp, dạng bytes) - xem canonical_balance_key
+AdvancedDPTable = LRUCache[bytes, AdvancedDPValueTuple]
+
+
+class _SearchFrame:
+    """Một trạng thái đang được mở rộng trên ngăn xếp tìm kiếm của bộ giải DP nâng cao."""
+
+    __slots__ = ("balances", "state_key", "moves", "next_move", "pending",
+                 "best_cost", "best_count", "best_step", "best_successor")
+
+    def __init__(self, balances: HashTable[str, Cents], state_key: bytes, moves: Array[Tuple]):
+        self.balances = balances
+        self.state_key = state_key
+        # Các nước đi (người_nợ, người_cho_vay, hạng_người_nợ, hạng_người_cho_vay) sẽ thử, và vị trí tiếp theo
+        self.moves = moves
+        self.next_move = 0
+        # Bước đang chờ kết quả của trạng thái con: Tuple(hạng_người_trả, hạng_người_nhận, số_tiền)
+        self.pending: Tuple | None = None
+        # Lời giải tốt nhất: chỉ giữ bước đầu tiên và con trỏ tới trạng thái kế tiếp
+        self.best_cost: float = float("inf")
+        self.best_count: float = float("inf")
+        self.best_step: Tuple | None = None
+        self.best_successor: bytes | None = None
 
 
 class AdvancedDynamicProgrammingSimplifier:
@@ -30,16 +58,17 @@ class AdvancedDynamicProgrammingSimplifier:
     Phương pháp tiếp cận:
     1.  Tính toán số dư thực tế cho mỗi người từ các giao dịch nâng cao ban đầu,
         bao gồm cả lãi và phí phạt tính đến ngày đánh giá hiện tại.
-    2.  Sử dụng một hàm đệ quy Quy hoạch động (DP) với kỹ thuật ghi nhớ (memoization) để
-        khám phá các trạng thái thanh toán có thể.
-    3.  Mỗi trạng thái DP được đại diện bởi một Tuple các số dư hiện tại của tất cả những người tham gia.
+    2.  Sử dụng Quy hoạch động (DP) với kỹ thuật ghi nhớ (memoization), duyệt theo chiều sâu bằng
+        ngăn xếp tường minh, để khám phá các trạng thái thanh toán có thể. Bảng ghi nhớ có thể giới hạn
+        theo số mục hoặc dung lượng (loại bỏ theo LRU).
+    3.  Mỗi trạng thái DP được đại diện bởi khóa chuẩn: bội số dư khác 0 đã sắp xếp.
     4.  Tại mỗi trạng thái, thuật toán thử tất cả các cặp (người nợ, người cho vay) có thể để thực hiện
         một giao dịch thanh toán. Số tiền thanh toán là giá trị nhỏ hơn giữa nợ của người nợ
         và tín dụng của người cho vay.
     5.  Chi phí của một bước được định nghĩa là số tiền thực tế được chuyển.
-    6.  Kết quả (chi phí, số lượng giao dịch, danh sách giao dịch, số liệu ưu tiên) cho mỗi trạng thái
+    6.  Kết quả (chi phí, số lượng giao dịch, danh sách giao dịch) cho mỗi trạng thái
         đã giải quyết được lưu trữ để tránh tính toán lại.
-    7.  Trường hợp cơ sở của đệ quy là khi tất cả các số dư đều bằng không.
+    7.  Trường hợp cơ sở là khi tất cả các số dư đều bằng không.
     8.  Thuật toán trả về một Tuple chứa danh sách các giao dịch BasicTransaction đã được tối ưu hóa
         và một HashTable chứa các số liệu thống kê về quá trình tối ưu.
 
@@ -60,23 +89,59 @@ class AdvancedDynamicProgrammingSimplifier:
 
     def __init__(
         self,
-        transactions: LinkedList[AdvancedTransaction],
-        current_date: date
+        transactions: LinkedList[AdvancedTransaction] | BalanceLedger,
+        current_date: date,
+        use_batch: bool = False,
+        transaction_metrics: Array[dict] | None = None,
+        memo_max_entries: int | None = None,
+        memo_max_bytes: int | None = None,
+        persistent_memo: PersistentDPMemo | None = None,
+        balances: HashTable[str, Cents] | None = None
     ):
         """
         Khởi tạo bộ đơn giản hóa nợ nâng cao.
 
         Args:
-            transactions (LinkedList[AdvancedTransaction]): Danh sách các giao dịch nâng cao ban đầu.
+            transactions (LinkedList[AdvancedTransaction] | BalanceLedger): Danh sách các giao dịch nâng cao
+                                 ban đầu, hoặc BalanceLedger đã tính sẵn tại current_date.
             current_date (date): Ngày hiện tại được sử dụng để tính toán lãi suất, phí phạt,
                                  và các yếu tố tài chính khác.
+            use_batch (bool): True để tính lãi, phí phạt và điểm ưu tiên của mọi giao dịch
+                              trong một lượt vector hóa (FinancialCalculator.calculate_batch).
+            transaction_metrics (Array[dict] | None): Chi tiết nợ đã tính sẵn cho các giao dịch
+                              khác None, theo thứ tự (ví dụ từ simplify_over_dates).
+            memo_max_entries (int | None): Số mục tối đa của bảng ghi nhớ (None = không giới hạn).
+            memo_max_bytes (int | None): Dung lượng ước lượng tối đa của bảng ghi nhớ theo byte
+                              (None = không giới hạn); vượt giới hạn thì loại bỏ mục cũ nhất theo LRU.
+            persistent_memo (PersistentDPMemo | None): Bảng ghi nhớ trên đĩa dùng chung giữa các lần chạy
+                              và tiến trình, khóa theo bội số dư thực tế.
+            balances (HashTable[str, Cents] | None): Số dư thực tế theo xu đã tổng hợp sẵn, khớp với
+                              transaction_metrics (ví dụ BalanceAggregate.balances); None = tự cộng dồn.
         """
+        if isinstance(transactions, BalanceLedger):
+            # Sổ cái dùng chung đã có sẵn chi tiết nợ tại đúng ngày này, không tính lại
+            transactions.require_date(current_date)
+            if transaction_metrics is None:
+                transaction_metrics = transactions.transaction_metrics
+            transactions = transactions.transactions
         self.initial_transactions: LinkedList[AdvancedTransaction] = transactions
         self.current_date: date = current_date
-        self.people_real_balances: HashTable[str, float] = HashTable()
-        self.people_debt_details: HashTable[str, LinkedList[HashTable[str, Any]]] = HashTable()
+        self.use_batch: bool = use_batch
+        self.persistent_memo: PersistentDPMemo | None = persistent_memo
+        # Chi tiết nợ + điểm ưu tiên của từng giao dịch (bỏ qua phần tử None), tính một lần duy nhất
+        if transaction_metrics is None:
+            transaction_metrics = FinancialCalculator.evaluate_transactions(
+                (tx for tx in transactions if tx is not None), current_date, use_batch
+            )
+        self.transaction_metrics: Array[dict] = transaction_metrics
+        self.people_real_balances: HashTable[str, Cents] = HashTable()  # Số dư thực tế theo xu
+        self._precomputed_balances: HashTable[str, Cents] | None = balances
+        # Bản ghi nợ gọn theo giao dịch và tổng hợp theo người (điểm ưu tiên, ngày vay sớm nhất, quá hạn)
+        self.debt_index: DebtIndex = DebtIndex(current_date)
         self.all_people_nodes: LinkedList[str] = LinkedList()
-        self.advanced_dp_table: AdvancedDPTable = HashTable()
+        self.advanced_dp_table: AdvancedDPTable = LRUCache(
+            memo_max_entries, memo_max_bytes, size_of=dp_memo_entry_size
+        )
         self.total_priority_score: float = 0.0
         
         self._initialize_advanced_balances()
@@ -94,7 +159,15 @@ class AdvancedDynamicProgrammingSimplifier:
             self.all_people_nodes = LinkedList()
             return
 
+        precomputed = self._precomputed_balances
+        if precomputed is not None:
+            for person in precomputed:
+                self.people_real_balances.put(
+                    person, self.people_real_balances.get(person, 0) + precomputed.get(person)
+                )
+
         current_tx_node = self.initial_transactions.head
+        metric_index = 0
         while current_tx_node:
             advanced_tx = current_tx_node.data
             if advanced_tx is None:
@@ -105,58 +178,29 @@ class AdvancedDynamicProgrammingSimplifier:
             unique_names_table.put(advanced_tx.debtor, True)
             unique_names_table.put(advanced_tx.creditor, True)
 
-            # Tính toán nợ thực tế (bao gồm gốc, lãi, phạt) cho giao dịch hiện tại
-            debt_breakdown = FinancialCalculator.calculate_total_debt(
-                amount=advanced_tx.amount,
-                interest_rate=advanced_tx.interest_rate,
-                penalty_rate=advanced_tx.penalty_rate,
-                borrow_date=advanced_tx.borrow_date,
-                due_date=advanced_tx.due_date,
-                current_date=self.current_date,
-                interest_type=advanced_tx.interest_type,
-                penalty_type=advanced_tx.penalty_type,
-            )
-            real_debt_amount = debt_breakdown["total"]
-
-            # Tính điểm ưu tiên cho giao dịch
-            priority_score = FinancialCalculator.calculate_priority_score(
-                principal=advanced_tx.amount,
-                interest_rate=advanced_tx.interest_rate,
-                penalty_rate=advanced_tx.penalty_rate,
-                borrow_date=advanced_tx.borrow_date,
-                due_date=advanced_tx.due_date,
-                current_date=self.current_date,
-                interest_type=advanced_tx.interest_type,
-                penalty_type=advanced_tx.penalty_type,
-            )
+            # Nợ thực tế (gốc, lãi, phạt) và điểm ưu tiên đã được tính sẵn cho giao dịch hiện tại
+            debt_breakdown = self.transaction_metrics[metric_index]
+            metric_index += 1
+            priority_score = debt_breakdown["priority"]
             self.total_priority_score += priority_score
 
-            # Cập nhật số dư thực tế cho người nợ và người cho vay
-            current_debtor_balance = self.people_real_balances.get(advanced_tx.debtor, 0.0)
-            self.people_real_balances.put(
-                advanced_tx.debtor, round_money(current_debtor_balance - real_debt_amount)
-            )
+            if precomputed is None:
+                # Chuyển nợ thực tế sang xu tại biên; mọi phép tính số dư sau đó là số nguyên
+                real_debt_amount = to_cents(debt_breakdown["total"])
 
-            current_creditor_balance = self.people_real_balances.get(advanced_tx.creditor, 0.0)
-            self.people_real_balances.put(
-                advanced_tx.creditor, round_money(current_creditor_balance + real_debt_amount)
-            )
+                # Cập nhật số dư thực tế cho người nợ và người cho vay
+                current_debtor_balance = self.people_real_balances.get(advanced_tx.debtor, 0)
+                self.people_real_balances.put(
+                    advanced_tx.debtor, current_debtor_balance - real_debt_amount
+                )
 
-            # Lưu trữ chi tiết nợ cho mục đích phân tích (nếu cần thiết)
-            self._store_debt_details(
-                person_name=advanced_tx.debtor,
-                debt_breakdown=debt_breakdown,
-                priority_score=priority_score,
-                transaction=advanced_tx,
-                is_creditor=False,
-            )
-            self._store_debt_details(
-                person_name=advanced_tx.creditor,
-                debt_breakdown=debt_breakdown,
-                priority_score=priority_score,
-                transaction=advanced_tx,
-                is_creditor=True,
-            )
+                current_creditor_balance = self.people_real_balances.get(advanced_tx.creditor, 0)
+                self.people_real_balances.put(
+                    advanced_tx.creditor, current_creditor_balance + real_debt_amount
+                )
+
+            # Ghi chi tiết nợ và cập nhật tổng hợp của cả hai phía
+            self.debt_index.add(advanced_tx, debt_breakdown)
             current_tx_node = current_tx_node.next
 
         # Tạo danh sách tên người tham gia duy nhất và sắp xếp theo thứ tự bảng chữ cái
@@ -170,62 +214,6 @@ class AdvancedDynamicProgrammingSimplifier:
              self.all_people_nodes = LinkedList()
 
 
-    def _store_debt_details(
-        self,
-        person_name: str,
-        debt_breakdown: HashTable[str, float],
-        priority_score: float,
-        transaction: AdvancedTransaction,
-        is_creditor: bool = False
-    ) -> None:
-        """Lưu trữ thông tin chi tiết về một khoản nợ/cho vay cụ thể liên quan đến một người."""
-        detail_entry: HashTable[str, Any] = HashTable()
-        detail_entry.put("principal", debt_breakdown["principal"])
-        detail_entry.put("interest", debt_breakdown["interest"])
-        detail_entry.put("penalty", debt_breakdown["penalty"])
-        detail_entry.put("total", debt_breakdown["total"])
-        detail_entry.put("priority_score", priority_score)
-        detail_entry.put("is_creditor", 1.0 if is_creditor else 0.0) # Sử dụng float cho nhất quán
-        
-        # Lưu trữ thông tin từ giao dịch gốc để tham khảo
-        detail_entry.put("original_debtor", transaction.debtor)
-        detail_entry.put("original_creditor", transaction.creditor)
-        detail_entry.put("original_borrow_date", transaction.borrow_date)
-        detail_entry.put("original_due_date", transaction.due_date)
-
-        days_overdue_val = 0.0
-        if hasattr(transaction, 'days_overdue') and callable(getattr(transaction, 'days_overdue')):
-             days_overdue_val = float(transaction.days_overdue(self.current_date))
-        elif hasattr(transaction, 'due_date') and hasattr(transaction, 'borrow_date'): # Dự phòng
-            if transaction.due_date and self.current_date > transaction.due_date:
-                days_overdue_val = float((self.current_date - transaction.due_date).days)
-        detail_entry.put("days_overdue", days_overdue_val)
-
-        if not self.people_debt_details.contains_key(person_name):
-            self.people_debt_details.put(person_name, LinkedList[HashTable[str, Any]]())
-        
-        person_details_list = self.people_debt_details.get(person_name)
-        if person_details_list is not None:
-            person_details_list.append(detail_entry)
-
-
-    def _get_balances_tuple_key(self, current_balances: HashTable[str, float]) -> Tuple:
-        """
-        Tạo một khóa Tuple duy nhất từ trạng thái số dư hiện tại.
-        Thứ tự của các số dư trong Tuple được xác định bởi `self.all_people_nodes` (đã được sắp xếp),
-        đảm bảo tính nhất quán của khóa cho bảng DP.
-        """
-        py_balances_list = Array[Any]()
-        if not self.all_people_nodes.is_empty():
-            current_name_node = self.all_people_nodes.head
-            while current_name_node:
-                name = current_name_node.data
-                if name is not None:
-                    py_balances_list.append(value=round_money(current_balances.get(name, 0.0)))
-                current_name_node = current_name_node.next
-        return Tuple(py_balances_list)
-
-
     def _deep_copy_balances_map(self, source_balances: HashTable[str, float]) -> HashTable[str, float]:
         """
         Tạo một bản sao sâu của HashTable chứa số dư.
@@ -273,14 +261,14 @@ class AdvancedDynamicProgrammingSimplifier:
 
         # Đưa người nợ/cho vay vào hàng đợi
         for person_name in balances_after_settlement: # Giả sử HashTable lặp qua các khóa
-            balance = balances_after_settlement.get(person_name, 0.0)
+            balance = balances_after_settlement.get(person_name, 0)
             avg_priority = self._calculate_person_avg_priority(person_name)
             
             item_tuple_for_pq = Tuple([person_name, balance, avg_priority])
 
-            if balance < -EPSILON: # Người nợ
+            if balance < 0: # Người nợ
                 priority_debtors_pq.enqueue(item_tuple_for_pq)
-            elif balance > EPSILON: # Người cho vay
+            elif balance > 0: # Người cho vay
                 priority_creditors_pq.enqueue(item_tuple_for_pq)
         
         # Xử lý thanh toán
@@ -291,23 +279,23 @@ class AdvancedDynamicProgrammingSimplifier:
             creditor_item_tuple = priority_creditors_pq.dequeue()
             c_name, c_balance, c_priority = creditor_item_tuple[0], creditor_item_tuple[1], creditor_item_tuple[2]
             
-            amount_to_settle = round_money(min(abs(d_balance), c_balance))
-            if amount_to_settle > EPSILON:
-                simplified_tx_list.append(BasicTransaction(debtor=d_name, creditor=c_name, amount=amount_to_settle))
+            amount_to_settle = min(-d_balance, c_balance)
+            if amount_to_settle > 0:
+                simplified_tx_list.append(BasicTransaction.from_cents(debtor=d_name, creditor=c_name, amount_cents=amount_to_settle))
                 financial_cost += amount_to_settle
                 num_tx_this_step += 1
                 # Tính toán điểm ưu tiên được xử lý bởi giao dịch này (ước lượng)
                 total_priority_handled_this_step += amount_to_settle * (d_priority + c_priority) / 2.0 
 
                 # Cập nhật số dư và đưa lại vào hàng đợi nếu cần
-                new_d_balance = round_money(d_balance + amount_to_settle)
-                new_c_balance = round_money(c_balance - amount_to_settle)
+                new_d_balance = d_balance + amount_to_settle
+                new_c_balance = c_balance - amount_to_settle
                 balances_after_settlement.put(d_name, new_d_balance)
                 balances_after_settlement.put(c_name, new_c_balance)
 
-                if new_d_balance < -EPSILON:
+                if new_d_balance < 0:
                     priority_debtors_pq.enqueue(Tuple([d_name, new_d_balance, d_priority]))
-                if new_c_balance > EPSILON:
+                if new_c_balance > 0:
                     priority_creditors_pq.enqueue(Tuple([c_name, new_c_balance, c_priority]))
         
         return Tuple([simplified_tx_list, # Các giao dịch thực hiện trong bước này
@@ -316,185 +304,176 @@ class AdvancedDynamicProgrammingSimplifier:
 
 
     def _calculate_person_avg_priority(self, person_name: str) -> float:
-        """Tính điểm ưu tiên trung bình cho một người dựa trên các khoản nợ/cho vay liên quan đến họ."""
-        if not self.people_debt_details.contains_key(person_name):
-            return 0.0
-        
-        details_list = self.people_debt_details.get(person_name) # LinkedList các HashTable chi tiết
-        if not details_list or details_list.is_empty():
-            return 0.0
-
-        total_priority_sum = 0.0
-        count = 0
-        current_detail_node = details_list.head
-        while current_detail_node:
-            entry_ht = current_detail_node.data # Đây là một HashTable chứa "priority_score"
-            if entry_ht is not None:
-                 priority_val = entry_ht.get("priority_score")
-                 if priority_val is not None:
-                    total_priority_sum += float(priority_val) 
-                 count += 1
-            current_detail_node = current_detail_node.next
-            
-        return (total_priority_sum / count) if count > 0 else 0.0
+        """Điểm ưu tiên trung bình của một người, lấy từ tổng hợp cộng dồn khi nạp - O(1)."""
+        return self.debt_index.avg_priority(person_name)
 
 
-    def _solve_advanced_dp_recursive(self, current_balances_map: HashTable[str, float]) -> AdvancedDPValueTuple:
+    def _open_state(self, balances: HashTable[str, Cents]) -> Tuple:
         """
-        Hàm đệ quy chính của thuật toán Quy hoạch động nâng cao.
-        Tìm giải pháp tối ưu (chi phí thấp nhất, sau đó là số lượng giao dịch ít nhất)
-        cho trạng thái số dư hiện tại.
+        Chuẩn bị một trạng thái cho bộ giải.
+
+        Trả về:
+            Tuple: (kết_quả, None) nếu trạng thái đã có lời giải (trong bảng ghi nhớ hoặc mọi số dư bằng 0),
+                   ngược lại (None, _SearchFrame) để mở rộng trên ngăn xếp.
+                   kết_quả là Tuple(tổng_chi_phí, tổng_số_giao_dịch, khóa_trạng_thái)
         """
-        key_tuple = self._get_balances_tuple_key(current_balances_map)
+        canonical_state = canonical_balance_key(balances, self.all_people_nodes)
+        state_key = canonical_state[0]
+        ordered_names = canonical_state[1]
 
-        # Kiểm tra bảng ghi nhớ xem trạng thái này đã được giải quyết chưa
-        memoized_result = self.advanced_dp_table.get(key_tuple)
+        # Kiểm tra bảng ghi nhớ xem trạng thái này (hoặc một hoán vị của nó) đã được giải quyết chưa
+        memoized_result = self.advanced_dp_table.get(state_key)
         if memoized_result is not None:
-            return memoized_result
-
-        # Trường hợp cơ sở: kiểm tra xem tất cả số dư có bằng không không
-        all_zero = True
-        if not self.all_people_nodes.is_empty():
-            current_name_node_check = self.all_people_nodes.head
-            while current_name_node_check:
-                name = current_name_node_check.data
-                if name is not None and abs(current_balances_map.get(name, 0.0)) > EPSILON:
-                    all_zero = False
-                    break
-                current_name_node_check = current_name_node_check.next
-        elif not current_balances_map.is_empty(): # Fallback, không nên xảy ra nếu khởi tạo đúng
-            all_zero = False 
-            for name_key in current_balances_map:
-                if abs(current_balances_map.get(name_key, 0.0)) > EPSILON:
-                    break
-            else: # Vòng lặp hoàn thành không break, nghĩa là tất cả bằng 0 (hoặc map rỗng)
-                 all_zero = current_balances_map.is_empty()
-
-        if all_zero:
-            # Nếu tất cả số dư bằng không, không cần làm gì thêm
-            # Trả về: (tổng_chi_phí, số_GD, danh_sách_GD, tổng_ưu_tiên_xử_lý)
-            result = Tuple([0.0, 0, LinkedList[BasicTransaction](), 0.0])
-            self.advanced_dp_table.put(key_tuple, result)
-            return result
-
-        # Xác định danh sách người nợ và người cho vay từ trạng thái hiện tại
-        debtors = Array[Any]()
-        creditors = Array[Any]()
-        if not self.all_people_nodes.is_empty():
-            current_name_node_iter = self.all_people_nodes.head
-            while current_name_node_iter:
-                name = current_name_node_iter.data
-                if name is not None:
-                    bal = current_balances_map.get(name, 0.0)
-                    if bal < -EPSILON: # Người nợ có số dư âm
-                        debtors.append(value=name)
-                    elif bal > EPSILON: # Người cho vay có số dư dương
-                        creditors.append(value=name)
-                current_name_node_iter = current_name_node_iter.next
-
-        # Khởi tạo các biến để theo dõi giải pháp tốt nhất cho trạng thái hiện tại
-        best_current_cost = float("inf")
-        best_current_count = float("inf")
-        best_tx_list = LinkedList[BasicTransaction]()
-        best_priority_handled = 0.0 # Số liệu ưu tiên tốt nhất
-
-        # Thử tất cả các cặp (người_nợ, người_cho_vay) có thể có để thực hiện một giao dịch
+            return Tuple([Tuple([memoized_result[0], memoized_result[1], state_key]), None])
+
+        # Trường hợp cơ sở: mọi số dư bằng 0 (khóa chuẩn rỗng)
+        if not ordered_names:
+            self.advanced_dp_table.put(state_key, Tuple([0, 0, LinkedList[Tuple](), None]))
+            return Tuple([Tuple([0, 0, state_key]), None])
+
+        # Thử mọi cặp (người_nợ, người_cho_vay) theo thứ tự tên; hạng là vị trí trong thứ tự chuẩn
+        rank_of: HashTable[str, int] = HashTable()
+        for rank, name in enumerate(ordered_names):
+            rank_of.put(name, rank)
+        debtors = Array[str]()
+        creditors = Array[str]()
+        for name in self.all_people_nodes:
+            balance = balances.get(name, 0)
+            if balance < 0:
+                debtors.append(name)
+            elif balance > 0:
+                creditors.append(name)
+        moves = Array[Tuple]()
         for debtor_name in debtors:
             for creditor_name in creditors:
-                # Tạo bản sao sâu của số dư để thao tác trong nhánh đệ quy này
-                new_balances_for_recursion = self._deep_copy_balances_map(current_balances_map)
+                moves.append(Tuple([debtor_name, creditor_name, rank_of.get(debtor_name), rank_of.get(creditor_name)]))
+        return Tuple([None, _SearchFrame(balances, state_key, moves)])
+
+    def _combine_child_result(self, frame: _SearchFrame, child_result: Tuple) -> None:
+        """Ghép bước đang chờ của frame với lời giải trạng thái con và cập nhật lời giải tốt nhất."""
+        path_total_cost = frame.pending[2] + child_result[0]
+        path_total_count = 1 + child_result[1]
+
+        # Tiêu chí: tổng chi phí thấp hơn, hoặc chi phí bằng nhau nhưng số giao dịch ít hơn.
+        if path_total_cost < frame.best_cost or \
+           (path_total_cost == frame.best_cost and path_total_count < frame.best_count):
+            frame.best_cost = path_total_cost
+            frame.best_count = path_total_count
+            frame.best_step = frame.pending
+            frame.best_successor = child_result[2]
+        frame.pending = None
+
+    def _solve_advanced_dp(self, initial_balances_map: HashTable[str, Cents]) -> Tuple:
+        """
+        Bộ giải chính của thuật toán Quy hoạch động nâng cao, duyệt theo chiều sâu bằng ngăn xếp tường minh.
+        Tìm giải pháp tối ưu (chi phí thấp nhất, sau đó là số lượng giao dịch ít nhất)
+        cho trạng thái số dư ban đầu.
 
-                debtor_current_balance = new_balances_for_recursion.get(debtor_name, 0.0)
-                creditor_current_balance = new_balances_for_recursion.get(creditor_name, 0.0)
+        Mỗi khung trên ngăn xếp thử lần lượt từng cặp (người_nợ, người_cho_vay); trạng thái con chưa có
+        lời giải được đẩy lên ngăn xếp, kết quả của nó được ghép vào khung cha khi lấy ra. Độ sâu không
+        phụ thuộc vào giới hạn đệ quy của Python. Mỗi mục ghi nhớ chỉ giữ bước đầu tiên của lời giải tốt
+        nhất và con trỏ tới trạng thái kế tiếp; danh sách giao dịch được dựng lại bằng reconstruct_transfers.
 
-                # Số tiền thực tế có thể chuyển là giá trị nhỏ hơn giữa nợ và tín dụng
-                amount_transferred_monetary = round_money(min(abs(debtor_current_balance), creditor_current_balance))
-                
-                # Bỏ qua nếu số tiền chuyển quá nhỏ
-                if amount_transferred_monetary <= EPSILON or amount_transferred_monetary < 0.01:
-                    continue
+        Trả về:
+            Tuple: (tổng_chi_phí, tổng_số_GD, khóa_trạng_thái_ban_đầu)
+        """
+        opened = self._open_state(initial_balances_map)
+        if opened[1] is None:
+            return opened[0]
+
+        stack = LinkedList[_SearchFrame]()
+        stack.prepend(opened[1])
+        child_result: Tuple | None = None
+        while True:
+            frame = stack.head.data
+            if child_result is not None:
+                self._combine_child_result(frame, child_result)
+                child_result = None
+
+            if frame.next_move < len(frame.moves):
+                move = frame.moves[frame.next_move]
+                frame.next_move += 1
+                debtor_name = move[0]
+                creditor_name = move[1]
 
                 # Thực hiện giao dịch thử nghiệm trên bản sao số dư
-                new_balances_for_recursion.put(debtor_name, round_money(debtor_current_balance + amount_transferred_monetary))
-                new_balances_for_recursion.put(creditor_name, round_money(creditor_current_balance - amount_transferred_monetary))
-
-                # Định nghĩa chi phí của bước này là số tiền được chuyển
-                # Đây là cách tiếp cận đã được xác minh là hoạt động tốt và đơn giản.
-                cost_of_this_step = amount_transferred_monetary
-
-                # Tính một số liệu ưu tiên cho bước này (có thể được cải thiện/tùy chỉnh)
-                priority_metric_this_step = (self._calculate_person_avg_priority(debtor_name) +
-                                            self._calculate_person_avg_priority(creditor_name)) / 2.0
-
-                current_step_tx = BasicTransaction(debtor=debtor_name, creditor=creditor_name,
-                                                amount=amount_transferred_monetary)
-                
-                # Gọi đệ quy cho trạng thái số dư mới sau giao dịch thử nghiệm
-                recursive_result_tuple = self._solve_advanced_dp_recursive(new_balances_for_recursion)
-
-                # Trích xuất kết quả từ lời gọi đệ quy
-                rec_cost, rec_count, rec_tx_list, rec_priority_handled = \
-                    recursive_result_tuple[0], recursive_result_tuple[1], recursive_result_tuple[2], recursive_result_tuple[3]
-
-                # Tính tổng chi phí, tổng số giao dịch, và tổng ưu tiên cho đường đi hiện tại
-                path_total_cost = cost_of_this_step + rec_cost
-                path_total_count = 1 + rec_count
-                path_total_priority_handled = priority_metric_this_step + rec_priority_handled
-
-                # Xây dựng danh sách giao dịch cho đường đi này
-                path_tx_list = LinkedList[BasicTransaction]()
-                path_tx_list.append(current_step_tx)
-                if rec_tx_list and not rec_tx_list.is_empty():
-                    rec_tx_node = rec_tx_list.head
-                    while rec_tx_node:
-                        if rec_tx_node.data: # Đảm bảo dữ liệu không None
-                            path_tx_list.append(rec_tx_node.data)
-                        rec_tx_node = rec_tx_node.next
-                
-                # So sánh và cập nhật giải pháp tốt nhất nếu đường đi này tốt hơn
-                # Tiêu chí: tổng chi phí thấp hơn, hoặc chi phí bằng nhau nhưng số giao dịch ít hơn.
-                if path_total_cost < best_current_cost or \
-                   (abs(path_total_cost - best_current_cost) < EPSILON and path_total_count < best_current_count):
-                    best_current_cost = path_total_cost
-                    best_current_count = path_total_count
-                    best_tx_list = path_tx_list
-                    best_priority_handled = path_total_priority_handled
-
-        # Lưu kết quả tốt nhất tìm được cho trạng thái này vào bảng DP
-        final_best_result_for_state = Tuple([best_current_cost, best_current_count, best_tx_list, best_priority_handled])
-        self.advanced_dp_table.put(key_tuple, final_best_result_for_state)
-        return final_best_result_for_state
+                new_balances = self._deep_copy_balances_map(frame.balances)
+                debtor_current_balance = new_balances.get(debtor_name, 0)
+                creditor_current_balance = new_balances.get(creditor_name, 0)
+                # Số tiền thực tế có thể chuyển (theo xu) là giá trị nhỏ hơn giữa nợ và tín dụng;
+                # chi phí của bước này chính là số tiền được chuyển
+                amount_transferred_monetary = min(-debtor_current_balance, creditor_current_balance)
+                new_balances.put(debtor_name, debtor_current_balance + amount_transferred_monetary)
+                new_balances.put(creditor_name, creditor_current_balance - amount_transferred_monetary)
+                frame.pending = Tuple([move[2], move[3], amount_transferred_monetary])
+
+                opened = self._open_state(new_balances)
+                if opened[1] is None:
+                    child_result = opened[0]
+                else:
+                    stack.prepend(opened[1])
+                continue
+
+            # Đã thử mọi cặp: lưu bước đầu tiên của lời giải tốt nhất và con trỏ tới trạng thái kế tiếp
+            best_step = LinkedList[Tuple]()
+            if frame.best_step is not None:
+                best_step.append(frame.best_step)
+            self.advanced_dp_table.put(frame.state_key, Tuple([
+                frame.best_cost, frame.best_count, best_step, frame.best_successor
+            ]))
+            stack.remove_first()
+            child_result = Tuple([frame.best_cost, frame.best_count, frame.state_key])
+            if stack.is_empty():
+                return child_result
+
+    def _solve_persistent(self) -> Tuple:
+        """
+        Giải từ số dư thực tế ban đầu, tra cứu/lưu bảng ghi nhớ trên đĩa nếu có.
+
+        Trả về:
+            Tuple: (tổng_chi_phí, tổng_số_GD, danh_sách_GD)
+        """
+        canonical_state = canonical_balance_key(self.people_real_balances, self.all_people_nodes)
+        if self.persistent_memo is not None:
+            stored = self.persistent_memo.get("advanced_dp", canonical_state[0])
+            if stored is not None:
+                return Tuple([stored[0], stored[1], transfers_from_ranks(stored[2], canonical_state[1])])
+
+        solved = self._solve_advanced_dp(self.people_real_balances)
+        simplified_tx_list = reconstruct_transfers(
+            self.advanced_dp_table, self.people_real_balances, self.all_people_nodes, self._solve_advanced_dp
+        )
+        if self.persistent_memo is not None:
+            self.persistent_memo.put(
+                "advanced_dp", canonical_state[0], solved[0], solved[1],
+                transfers_to_ranks(simplified_tx_list, canonical_state[1])
+            )
+        return Tuple([solved[0], solved[1], simplified_tx_list])
+
+    def memo_stats(self) -> HashTable[str, int]:
+        """Thống kê bảng ghi nhớ: hits, misses, evictions, entries, bytes."""
+        return self.advanced_dp_table.stats()
+
+    def _calculate_priority_handled(self, tx_list: LinkedList[BasicTransaction]) -> float:
+        """Tổng số liệu ưu tiên của một chuỗi giao dịch, giống cách cộng dồn trong lúc tìm kiếm."""
+        priority_handled = 0.0
+        for tx in tx_list:
+            priority_handled += (self._calculate_person_avg_priority(tx.debtor) +
+                                 self._calculate_person_avg_priority(tx.creditor)) / 2.0
+        return priority_handled
 
 
     def _estimate_borrow_date(self, debtor_simpl_tx: str, creditor_simpl_tx: str) -> date:
         """
         Ước tính ngày vay sớm nhất cho một giao dịch đơn giản hóa tiềm năng giữa hai người.
         Hàm này được sử dụng nếu `cost_of_this_step` trong DP sử dụng một heuristic phức tạp
-        cần ngày vay. Với `cost_of_this_step = amount_transferred_monetary`, hàm này ít quan trọng hơn.
+        cần ngày vay. Tra cứu O(1) trong chỉ mục theo cặp; không có giao dịch gốc trực tiếp giữa
+        hai người thì trả về ngày hiện tại.
         """
-        earliest_borrow_date = self.current_date # Giá trị mặc định
-
-        # Tìm kiếm trong chi tiết nợ đã lưu trữ
-        # Cố gắng tìm một giao dịch gốc mà debtor_simpl_tx nợ creditor_simpl_tx
-        if self.people_debt_details.contains_key(debtor_simpl_tx):
-            debt_details_list = self.people_debt_details.get(debtor_simpl_tx)
-            if debt_details_list and not debt_details_list.is_empty():
-                detail_node = debt_details_list.head
-                while detail_node:
-                    entry_ht = detail_node.data # HashTable chi tiết
-                    if entry_ht:
-                        original_debtor = entry_ht.get("original_debtor")
-                        original_creditor = entry_ht.get("original_creditor")
-                        original_b_date = entry_ht.get("original_borrow_date") # Phải là đối tượng date
-
-                        if (original_debtor == debtor_simpl_tx and
-                            original_creditor == creditor_simpl_tx and
-                            isinstance(original_b_date, date)): # Đảm bảo original_b_date là kiểu date
-                            if original_b_date < earliest_borrow_date:
-                                earliest_borrow_date = original_b_date
-                    detail_node = detail_node.next
-        
-        return earliest_borrow_date
+        pair_summary = self.debt_index.pair(debtor_simpl_tx, creditor_simpl_tx)
+        if pair_summary is None or pair_summary.earliest_borrow_date > self.current_date:
+            return self.current_date
+        return pair_summary.earliest_borrow_date
 
 
     def simplify(self) -> Tuple:
@@ -517,15 +496,13 @@ class AdvancedDynamicProgrammingSimplifier:
             empty_stats.put("total_interest_saved", 0.0) # Tổng lãi (và phạt) tiết kiệm được
             return Tuple([LinkedList[BasicTransaction](), empty_stats])
 
-        # Gọi hàm giải DP đệ quy với trạng thái số dư thực tế ban đầu
-        final_res_tuple = self._solve_advanced_dp_recursive(self.people_real_balances)
-        
-        # Giải nén kết quả từ DP
-        # final_res_tuple: (tổng_chi_phí_tiền_tệ, tổng_số_GD_đơn_giản, ds_GD_đơn_giản, tổng_ưu_tiên_xử_lý)
-        total_monetary_cost_simplified = final_res_tuple[0]
+        # Giải DP từ trạng thái số dư thực tế ban đầu, rồi dựng lại danh sách giao dịch một lần
+        # bằng cách đi theo các con trỏ trạng thái kế tiếp trong bảng ghi nhớ
+        final_res_tuple = self._solve_persistent()
+        total_monetary_cost_simplified = from_cents(final_res_tuple[0])
         total_simplified_tx_count = final_res_tuple[1]
         simplified_tx_list = final_res_tuple[2]
-        total_priority_metric_handled = final_res_tuple[3]
+        total_priority_metric_handled = self._calculate_priority_handled(simplified_tx_list)
 
         # Chuẩn bị HashTable thống kê
         stats = HashTable[str, float]()
@@ -555,57 +532,9 @@ class AdvancedDynamicProgrammingSimplifier:
 
     def _calculate_original_total_cost(self) -> float:
         """Tính tổng giá trị nợ thực tế của tất cả các giao dịch ban đầu."""
-        total = 0.0
-        if self.initial_transactions.is_empty():
-            return 0.0
-            
-        current_tx_node = self.initial_transactions.head
-        while current_tx_node:
-            adv_tx = current_tx_node.data
-            if adv_tx is None:
-                current_tx_node = current_tx_node.next
-                continue
-
-            debt_breakdown = FinancialCalculator.calculate_total_debt(
-                amount=adv_tx.amount,
-                interest_rate=adv_tx.interest_rate,
-                penalty_rate=adv_tx.penalty_rate,
-                borrow_date=adv_tx.borrow_date,
-                due_date=adv_tx.due_date,
-                current_date=self.current_date,
-                interest_type=adv_tx.interest_type,
-                penalty_type=adv_tx.penalty_type,
-            )
-            total += debt_breakdown["total"]
-            current_tx_node = current_tx_node.next
-        return round_money(total)
+        # Cộng theo cặp trong chỉ mục (đã quy về xu khi nạp) thay vì duyệt lại từng giao dịch
+        return from_cents(self.debt_index.total_cents())
 
     def _calculate_avg_overdue_days(self) -> float:
-        """Tính số ngày quá hạn trung bình của các giao dịch ban đầu."""
-        total_overdue_days_sum = 0.0
-        num_transactions_counted = 0
-        if self.initial_transactions.is_empty():
-            return 0.0
-            
-        current_tx_node = self.initial_transactions.head
-        while current_tx_node:
-            adv_tx = current_tx_node.data
-            if adv_tx is None:
-                current_tx_node = current_tx_node.next
-                continue
-
-            overdue_days_for_this_tx = 0.0
-            if hasattr(adv_tx, 'days_overdue') and callable(getattr(adv_tx, 'days_overdue')):
-                 overdue_days_for_this_tx = float(adv_tx.days_overdue(self.current_date))
-            elif hasattr(adv_tx, 'due_date') and hasattr(adv_tx, 'borrow_date'): # Fallback
-                if adv_tx.due_date and self.current_date > adv_tx.due_date: # Kiểm tra due_date không None
-                    overdue_days_for_this_tx = float((self.current_date - adv_tx.due_date).days)
-            
-            # Chỉ cộng dồn nếu thực sự quá hạn (ngày > 0)
-            if overdue_days_for_this_tx > 0:
-                total_overdue_days_sum += overdue_days_for_this_tx
-            num_transactions_counted += 1 # Tất cả giao dịch đều được tính vào mẫu số
-            current_tx_node = current_tx_node.next
-            
-        return (total_overdue_days_sum / num_transactions_counted) if num_transactions_counted > 0 else 0.0
-
+        """Tính số ngày quá hạn trung bình của các giao dịch ban đầu (đã cộng dồn khi nạp)."""
+        return self.debt_index.avg_overdue_days()
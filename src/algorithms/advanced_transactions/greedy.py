@@ -3,10 +3,12 @@ from datetime import date
 from typing import Any
 
 from src.core_type import BasicTransaction, AdvancedTransaction
-from src.data_structures import LinkedList, HashTable, Tuple
+from src.data_structures import LinkedList, HashTable, Tuple, Array
 from src.utils.sorting import merge_sort_linked_list
-from src.utils.constants import EPSILON
-from src.utils.money_utils import round_money
+from src.utils.money_utils import Cents, to_cents
+from src.utils.financial_calculator import FinancialCalculator
+from src.algorithms.balance_ledger import BalanceLedger
+from src.algorithms.basic_transactions.exact_matching import settle_exact_matches
 
 class AdvancedGreedySimplifier:
     """
@@ -14,42 +16,78 @@ class AdvancedGreedySimplifier:
     """
 
     def __init__(self, 
-                 transactions: LinkedList[AdvancedTransaction],
-                 current_date: date):
+                 transactions: LinkedList[AdvancedTransaction] | BalanceLedger,
+                 current_date: date,
+                 use_batch: bool = False,
+                 transaction_metrics: Array[dict] | None = None,
+                 exact_match: bool = False,
+                 balances: HashTable[str, Cents] | None = None):
+        if isinstance(transactions, BalanceLedger):
+            # Sổ cái dùng chung đã có sẵn chi tiết nợ tại đúng ngày này, không tính lại
+            transactions.require_date(current_date)
+            if transaction_metrics is None:
+                transaction_metrics = transactions.transaction_metrics
+            transactions = transactions.transactions
         self.initial_transactions = transactions
         self.current_date = current_date
-        self.people_balances = HashTable[str, float]()
+        # True: tính lãi/phạt/ưu tiên cho toàn bộ giao dịch trong một lượt vector hóa (NumPy)
+        self.use_batch = use_batch
+        # Chi tiết nợ tính sẵn theo thứ tự giao dịch (ví dụ từ simplify_over_dates); None = tự tính
+        self._transaction_metrics = transaction_metrics
+        # True: ghép trước các cặp/bộ ba có tổng bằng 0 rồi mới chạy vòng lặp tham lam
+        self.exact_match = exact_match
+        # Số dư đã tổng hợp sẵn (ví dụ BalanceAggregate.balances); None = tự cộng dồn từ chi tiết nợ
+        self._precomputed_balances = balances
+        self.people_balances = HashTable[str, Cents]()
         self.transaction_details = LinkedList[Tuple]()
         self._calculate_balances()
 
     def _calculate_balances(self) -> None:
+        metrics = self._transaction_metrics
+        if metrics is None:
+            metrics = FinancialCalculator.evaluate_transactions(
+                self.initial_transactions, self.current_date, self.use_batch
+            )
+        # Đọc theo cột: với kết quả vector hóa không phải dựng một dict cho mỗi giao dịch
+        principals = FinancialCalculator.metric_values(metrics, 'principal')
+        interests = FinancialCalculator.metric_values(metrics, 'interest')
+        penalties = FinancialCalculator.metric_values(metrics, 'penalty')
+        totals = FinancialCalculator.metric_values(metrics, 'total')
+        priorities = FinancialCalculator.metric_values(metrics, 'priority')
+        precomputed = self._precomputed_balances
+        if precomputed is not None:
+            for person in precomputed:
+                self._update_balance(person, precomputed.get(person))
         current = self.initial_transactions.head
+        index = 0
         while current:
             tx: AdvancedTransaction = current.data
-            breakdown = tx.get_debt_breakdown(self.current_date)
-            actual_debt = breakdown['total']
+            actual_debt = totals[index]
 
             detail = Tuple([
                 tx.debtor, 
                 tx.creditor,
-                breakdown['principal'],
-                breakdown['interest'],
-                breakdown['penalty'],
+                principals[index],
+                interests[index],
+                penalties[index],
                 actual_debt,
-                tx.get_priority_score(self.current_date),
+                priorities[index],
                 tx.is_overdue(self.current_date)
             ])
             self.transaction_details.append(detail)
 
-            self._update_balance(tx.debtor, -actual_debt)
-            self._update_balance(tx.creditor, actual_debt)
+            if precomputed is None:
+                # Chuyển tổng nợ sang xu tại biên, sau đó mọi phép tính số dư đều là số nguyên
+                actual_debt_cents = to_cents(actual_debt)
+                self._update_balance(tx.debtor, -actual_debt_cents)
+                self._update_balance(tx.creditor, actual_debt_cents)
 
             current = current.next
+            index += 1
 
-    def _update_balance(self, person: str, amount: float) -> None:
-        current_balance = self.people_balances.get(person, 0.0)
-        new_balance = round_money(current_balance + amount)
-        self.people_balances.put(person, new_balance)
+    def _update_balance(self, person: str, amount_cents: Cents) -> None:
+        current_balance = self.people_balances.get(person, 0)
+        self.people_balances.put(person, current_balance + amount_cents)
 
     def simplify(self) -> LinkedList[BasicTransaction]:
         if self.initial_transactions.is_empty():
@@ -60,15 +98,22 @@ class AdvancedGreedySimplifier:
 
         for person in self.people_balances.keys():
             balance = self.people_balances.get(person)
-            if balance < -EPSILON:
+            if balance < 0:
                 debtors.append(Tuple([person, balance]))
-            elif balance > EPSILON:
+            elif balance > 0:
                 creditors.append(Tuple([person, balance]))
 
-        debtors = merge_sort_linked_list(debtors, lambda t1, t2: t1[1] < t2[1])
-        creditors = merge_sort_linked_list(creditors, lambda t1, t2: t1[1] > t2[1])
+        # Số dư bằng nhau thì sắp theo tên để kết quả xác định (khớp với nhân vector hóa)
+        debtors = merge_sort_linked_list(
+            debtors, lambda t1, t2: t1[1] < t2[1] or (t1[1] == t2[1] and t1[0] < t2[0])
+        )
+        creditors = merge_sort_linked_list(
+            creditors, lambda t1, t2: t1[1] > t2[1] or (t1[1] == t2[1] and t1[0] < t2[0])
+        )
 
         simplified_txs = LinkedList[BasicTransaction]()
+        if self.exact_match:
+            simplified_txs, debtors, creditors = settle_exact_matches(debtors, creditors)
         debtor_node, creditor_node = debtors.head, creditors.head
 
         while debtor_node and creditor_node:
@@ -76,18 +121,18 @@ class AdvancedGreedySimplifier:
             creditor_name, creditor_balance = creditor_node.data
             settle_amount = min(-debtor_balance, creditor_balance)
 
-            if settle_amount > EPSILON:
+            if settle_amount > 0:
                 simplified_txs.append(
-                    BasicTransaction(debtor=debtor_name, creditor=creditor_name, amount=settle_amount)
+                    BasicTransaction.from_cents(debtor=debtor_name, creditor=creditor_name, amount_cents=settle_amount)
                 )
                 debtor_balance += settle_amount
                 creditor_balance -= settle_amount
                 debtor_node.data = Tuple([debtor_name, debtor_balance])
                 creditor_node.data = Tuple([creditor_name, creditor_balance])
 
-            if abs(debtor_balance) < EPSILON:
+            if debtor_balance == 0:
                 debtor_node = debtor_node.next
-            if abs(creditor_balance) < EPSILON:
+            if creditor_balance == 0:
                 creditor_node = creditor_node.next
 
         return simplified_txs
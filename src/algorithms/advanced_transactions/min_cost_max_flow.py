@@ -3,12 +3,13 @@
 from __future__ import annotations
 from datetime import date
 from typing import Any
-from src.data_structures import Array, LinkedList, HashTable, Graph, GraphEdge, Tuple
+from src.data_structures import LinkedList, HashTable, Graph, GraphEdge, Tuple, Array
 from src.core_type import BasicTransaction, AdvancedTransaction
-from src.utils.sorting import merge_sort_linked_list, merge_sort_array
-from src.utils.constants import EPSILON
-from src.utils.money_utils import round_money
+from src.utils.sorting import merge_sort_linked_list
+from src.utils.money_utils import Cents, round_money, to_cents
 from src.utils.financial_calculator import FinancialCalculator, InterestType, PenaltyType
+from src.algorithms.balance_ledger import BalanceLedger
+from src.algorithms.advanced_transactions.debt_index import DebtIndex
 
 class AdvancedMinCostMaxFlowSimplifier:
     """
@@ -34,28 +35,46 @@ class AdvancedMinCostMaxFlowSimplifier:
     _INFINITY = float('inf')
     
     def __init__(self, 
-                 transactions: LinkedList[AdvancedTransaction],
+                 transactions: LinkedList[AdvancedTransaction] | BalanceLedger,
                  current_date: date,
                  interest_type: InterestType = InterestType.COMPOUND_DAILY,
-                 penalty_type: PenaltyType = PenaltyType.FIXED):
+                 penalty_type: PenaltyType = PenaltyType.FIXED,
+                 use_batch: bool = False,
+                 transaction_metrics: Array[dict] | None = None,
+                 balances: HashTable[str, Cents] | None = None):
         """
         Khởi tạo bộ đơn giản hóa Min-Cost Max-Flow nâng cao.
         
         Tham số:
-            transactions: Danh sách giao dịch nâng cao cần đơn giản hóa
+            transactions: Danh sách giao dịch nâng cao cần đơn giản hóa, hoặc BalanceLedger đã tính sẵn tại current_date
             current_date: Ngày hiện tại để tính toán lãi và phí phạt
             interest_type: Loại lãi suất (đơn, kép theo ngày/tháng/năm)
             penalty_type: Loại phí phạt (cố định, theo ngày, theo phần trăm)
+            use_batch: True để tính nợ và điểm ưu tiên của mọi giao dịch trong một lượt
+                       vector hóa (FinancialCalculator.calculate_batch)
+            transaction_metrics: Chi tiết nợ đã tính sẵn theo thứ tự giao dịch
+                                 (ví dụ từ simplify_over_dates); None = tự tính
+            balances: Số dư theo xu đã tổng hợp sẵn, khớp với transaction_metrics
+                      (ví dụ BalanceAggregate.balances); None = tự cộng dồn
         """
+        if isinstance(transactions, BalanceLedger):
+            # Sổ cái dùng chung đã có sẵn chi tiết nợ tại đúng ngày này, không tính lại
+            transactions.require_date(current_date)
+            if transaction_metrics is None:
+                transaction_metrics = transactions.transaction_metrics
+            transactions = transactions.transactions
         self.initial_transactions = transactions
         self.current_date = current_date
         self.interest_type = interest_type
         self.penalty_type = penalty_type
+        self.use_batch = use_batch
+        self._transaction_metrics = transaction_metrics
+        self._precomputed_balances = balances
         
         # Cấu trúc dữ liệu chính
-        self.people_balances: HashTable[str, float] = HashTable()
-        self.people_priorities: HashTable[str, float] = HashTable()  # Điểm ưu tiên của từng người
-        self.transaction_details: HashTable[str, HashTable[str, float]] = HashTable()  # Chi tiết nợ giữa các cặp
+        self.people_balances: HashTable[str, Cents] = HashTable()  # Số dư theo xu
+        # Tổng hợp theo người (tổng điểm ưu tiên) và theo cặp người nợ -> người cho vay, tra cứu O(1)
+        self.debt_index: DebtIndex = DebtIndex(current_date)
         self.all_people: LinkedList[str] = LinkedList()
         self.flow_graph: Graph[str, None] | None = None
         
@@ -74,59 +93,45 @@ class AdvancedMinCostMaxFlowSimplifier:
         """
         people_set: HashTable[str, bool] = HashTable()
         
+        # Tổng nợ thực tế (gốc + lãi + phí phạt) và điểm ưu tiên của mọi giao dịch
+        metrics = self._transaction_metrics
+        if metrics is None:
+            metrics = FinancialCalculator.evaluate_transactions(
+                self.initial_transactions, self.current_date, self.use_batch
+            )
+
+        precomputed = self._precomputed_balances
+        if precomputed is not None:
+            for person in precomputed:
+                self.people_balances.put(person, self.people_balances.get(person, 0) + precomputed.get(person))
+
         # Khởi tạo bảng chi tiết giao dịch giữa các cặp
         current = self.initial_transactions.head
+        index = 0
         while current:
             tx = current.data
+            debt_breakdown = metrics[index]
             
-            # Tính tổng nợ thực tế bao gồm lãi và phí phạt
-            debt_breakdown = FinancialCalculator.calculate_total_debt(
-                amount=tx.amount,
-                interest_rate=tx.interest_rate,
-                penalty_rate=tx.penalty_rate,
-                borrow_date=tx.borrow_date,
-                due_date=tx.due_date,
-                current_date=self.current_date,
-                interest_type=tx.interest_type,
-                penalty_type=tx.penalty_type
-            )
-            
-            total_debt = debt_breakdown['total']
-            
-            # Tính điểm ưu tiên cho giao dịch này
-            priority_score = FinancialCalculator.calculate_priority_score(
-                principal=tx.amount,
-                interest_rate=tx.interest_rate,
-                penalty_rate=tx.penalty_rate,
-                borrow_date=tx.borrow_date,
-                due_date=tx.due_date,
-                current_date=self.current_date,
-                interest_type=tx.interest_type,
-                penalty_type=tx.penalty_type
-            )
-            
-            # Cập nhật số dư cho từng người
-            debtor_balance = self.people_balances.get(tx.debtor, 0.0)
-            creditor_balance = self.people_balances.get(tx.creditor, 0.0)
-            
-            self.people_balances.put(tx.debtor, debtor_balance - total_debt)
-            self.people_balances.put(tx.creditor, creditor_balance + total_debt)
-            
-            # Cập nhật điểm ưu tiên tích lũy cho từng người
-            debtor_priority = self.people_priorities.get(tx.debtor, 0.0)
-            creditor_priority = self.people_priorities.get(tx.creditor, 0.0)
-            
-            self.people_priorities.put(tx.debtor, debtor_priority + priority_score)
-            self.people_priorities.put(tx.creditor, creditor_priority + priority_score)
+            if precomputed is None:
+                # Chuyển tổng nợ sang xu tại biên; từ đây số dư và luồng đều là số nguyên
+                total_debt = to_cents(debt_breakdown['total'])
+                
+                # Cập nhật số dư cho từng người
+                debtor_balance = self.people_balances.get(tx.debtor, 0)
+                creditor_balance = self.people_balances.get(tx.creditor, 0)
+                
+                self.people_balances.put(tx.debtor, debtor_balance - total_debt)
+                self.people_balances.put(tx.creditor, creditor_balance + total_debt)
             
-            # Lưu chi tiết nợ giữa cặp người này
-            self._update_transaction_details(tx.debtor, tx.creditor, total_debt, priority_score)
+            # Cộng dồn điểm ưu tiên theo người và chi tiết nợ theo cặp người
+            self.debt_index.add(tx, debt_breakdown)
             
             # Thêm vào tập hợp người tham gia
             people_set.put(tx.debtor, True)
             people_set.put(tx.creditor, True)
             
             current = current.next
+            index += 1
         
         # Chuyển đổi tập hợp thành danh sách và sắp xếp
         people_keys = people_set.keys()
@@ -136,34 +141,6 @@ class AdvancedMinCostMaxFlowSimplifier:
                 comparator=lambda a, b: a < b
             )
 
-    def _update_transaction_details(self, debtor: str, creditor: str, 
-                                  total_debt: float, priority_score: float) -> None:
-        """
-        Cập nhật chi tiết giao dịch giữa hai người.
-        
-        Tham số:
-            debtor: Người nợ
-            creditor: Người cho vay
-            total_debt: Tổng số nợ thực tế
-            priority_score: Điểm ưu tiên của giao dịch
-        """
-        # Tạo key duy nhất cho cặp người
-        pair_key = f"{debtor}->{creditor}"
-        
-        # Lấy chi tiết hiện tại hoặc tạo mới
-        current_details = self.transaction_details.get(pair_key, HashTable())
-        
-        # Cập nhật tổng nợ và điểm ưu tiên
-        existing_debt = current_details.get('total_debt', 0.0)
-        existing_priority = current_details.get('priority_score', 0.0)
-        
-        current_details.put('total_debt', existing_debt + total_debt)
-        current_details.put('priority_score', existing_priority + priority_score)
-        current_details.put('avg_priority', 
-                           (existing_priority + priority_score) / 2 if existing_priority > 0 else priority_score)
-        
-        self.transaction_details.put(pair_key, current_details)
-    
     def _build_flow_network(self) -> None:
         """
         Xây dựng mạng luồng nâng cao với trọng số dựa trên điểm ưu tiên.
@@ -188,21 +165,21 @@ class AdvancedMinCostMaxFlowSimplifier:
             g.add_vertex(current.data)
             current = current.next
         
-        # Tính tổng nợ và tổng cho vay
-        total_debt = 0.0
-        total_credit = 0.0
+        # Tính tổng nợ và tổng cho vay (theo xu)
+        total_debt = 0
+        total_credit = 0
         
         current = self.all_people.head
         while current:
             person = current.data
-            balance = self.people_balances.get(person, 0.0)
+            balance = self.people_balances.get(person, 0)
             
-            if balance < -EPSILON:  # Người nợ
-                debt_amount = abs(balance)
+            if balance < 0:  # Người nợ
+                debt_amount = -balance
                 total_debt += debt_amount
                 self._add_edge_with_reverse(self._S_NODE, person, debt_amount, 0)
                 
-            elif balance > EPSILON:  # Người cho vay
+            elif balance > 0:  # Người cho vay
                 total_credit += balance
                 self._add_edge_with_reverse(person, self._T_NODE, balance, 0)
             
@@ -214,17 +191,17 @@ class AdvancedMinCostMaxFlowSimplifier:
         p1_node = self.all_people.head
         while p1_node:
             p1 = p1_node.data
-            p1_balance = self.people_balances.get(p1, 0.0)
+            p1_balance = self.people_balances.get(p1, 0)
             
-            if p1_balance < -EPSILON:  # p1 là người nợ
+            if p1_balance < 0:  # p1 là người nợ
                 p2_node = self.all_people.head
                 while p2_node:
                     p2 = p2_node.data
-                    p2_balance = self.people_balances.get(p2, 0.0)
+                    p2_balance = self.people_balances.get(p2, 0)
                     
-                    if p1 != p2 and p2_balance > EPSILON:  # p2 là người cho vay
+                    if p1 != p2 and p2_balance > 0:  # p2 là người cho vay
                         # Tính capacity và cost cho cạnh này
-                        capacity = min(abs(p1_balance), p2_balance, max_flow_per_edge)
+                        capacity = min(-p1_balance, p2_balance, max_flow_per_edge)
                         
                         # Tính cost dựa trên điểm ưu tiên
                         cost = self._calculate_edge_cost(p1, p2)
@@ -245,32 +222,36 @@ class AdvancedMinCostMaxFlowSimplifier:
         Trả về:
             float: Cost cho cạnh (càng thấp càng được ưu tiên)
         """
-        pair_key = f"{debtor}->{creditor}"
-        transaction_detail = self.transaction_details.get(pair_key)
+        pair_summary = self.debt_index.pair(debtor, creditor)
         
-        if transaction_detail:
+        if pair_summary is not None:
             # Nếu có giao dịch trực tiếp, ưu tiên cao (cost thấp)
-            priority_score = transaction_detail.get('avg_priority', 1.0)
+            priority_score = pair_summary.avg_priority
             # Cost ngược với priority: priority cao -> cost thấp
             base_cost = max(0.1, 1.0 / max(priority_score, 1.0))
         else:
             # Nếu không có giao dịch trực tiếp, cost cao hơn
-            debtor_priority = self.people_priorities.get(debtor, 1.0)
-            creditor_priority = self.people_priorities.get(creditor, 1.0)
+            debtor_priority = self._person_priority(debtor)
+            creditor_priority = self._person_priority(creditor)
             avg_priority = (debtor_priority + creditor_priority) / 2
             base_cost = max(1.0, 10.0 / max(avg_priority, 1.0))
         
         return round_money(base_cost)
     
+    def _person_priority(self, person: str) -> float:
+        """Tổng điểm ưu tiên của mọi giao dịch liên quan tới một người (1.0 nếu không có)."""
+        summary = self.debt_index.person(person)
+        return summary.priority_sum if summary is not None else 1.0
+    
     def _add_edge_with_reverse(self, from_node: str, to_node: str, 
-                              capacity: float, cost: float) -> None:
+                              capacity: Cents, cost: float) -> None:
         """
         Thêm cạnh thuận và cạnh ngược cho mạng luồng.
         
         Tham số:
             from_node: Đỉnh nguồn
             to_node: Đỉnh đích
-            capacity: Khả năng thông qua
+            capacity: Khả năng thông qua (theo xu)
             cost: Chi phí cho mỗi đơn vị luồng
         """
         if not self.flow_graph:
@@ -289,8 +270,11 @@ class AdvancedMinCostMaxFlowSimplifier:
             if forward_edge and reverse_edge:
                 forward_edge.reverse_edge = reverse_edge
                 reverse_edge.reverse_edge = forward_edge
+                # Luồng tính theo xu (số nguyên)
+                forward_edge.flow = 0
+                reverse_edge.flow = 0
     
-    def _find_shortest_path_spfa(self) -> Tuple[LinkedList[GraphEdge[str, None]], float] | None:
+    def _find_shortest_path_spfa(self) -> Tuple[LinkedList[GraphEdge[str, None]], Cents] | None:
         """
         Tìm đường đi ngắn nhất từ Source đến Sink bằng thuật toán SPFA.
         
@@ -334,7 +318,7 @@ class AdvancedMinCostMaxFlowSimplifier:
                 v = edge.destination
                 
                 residual_cap = (edge.capacity or 0) - edge.flow
-                if residual_cap > EPSILON:
+                if residual_cap > 0:
                     u_dist = distances.get(u, self._INFINITY)
                     v_dist = distances.get(v, self._INFINITY)
                     edge_cost = edge.cost or 0
@@ -414,17 +398,19 @@ class AdvancedMinCostMaxFlowSimplifier:
     
     def _extract_transactions(self) -> LinkedList[BasicTransaction]:
         """
-        Trích xuất các giao dịch từ đồ thị luồng với tổng tiền khớp tuyệt đối.
+        Trích xuất các giao dịch từ đồ thị luồng.
+        
+        Luồng là số nguyên xu nên tổng các giao dịch khớp tuyệt đối với tổng nợ,
+        không cần bước làm tròn hay phân bổ sai số.
         
         Trả về:
             LinkedList[BasicTransaction]: Danh sách giao dịch được trích xuất
         """
-        raw_transactions: HashTable[Tuple[str, str], float] = HashTable()
+        # Tổng luồng giữa mỗi cặp (người nợ, người cho vay), giữ thứ tự xuất hiện
+        pair_flows: HashTable[Tuple, Cents] = HashTable()
+        pair_order = LinkedList[Tuple]()
         person_node = self.all_people.head
-        total_flow = 0.0
 
-        # Bước 1: Tính tổng luồng thực tế giữa các cặp người
-        # (Giữ nguyên logic này)
         while person_node:
             debtor = person_node.data
             person_vertex = self.flow_graph.get_vertex(debtor)
@@ -433,98 +419,25 @@ class AdvancedMinCostMaxFlowSimplifier:
                 while edge_node:
                     edge = edge_node.data
                     creditor = edge.destination
-                    if edge.flow > EPSILON and creditor != self._S_NODE and creditor != self._T_NODE:
+                    if edge.flow > 0 and creditor != self._S_NODE and creditor != self._T_NODE:
                         key = Tuple([debtor, creditor])
-                        existing = raw_transactions.get(key, 0.0)
-                        raw_transactions.put(key, existing + edge.flow)
-                        total_flow += edge.flow
+                        existing = pair_flows.get(key)
+                        if existing is None:
+                            pair_order.append(key)
+                            existing = 0
+                        pair_flows.put(key, existing + edge.flow)
                     edge_node = edge_node.next
             person_node = person_node.next
 
-        # Bước 2: Làm tròn từng giao dịch, theo dõi sai số
-        rounded_transactions = LinkedList[BasicTransaction]()
-        rounded_total = 0.0
-        
-        # Khởi tạo temp_list là Array của bạn
-        # temp_list sẽ chứa các tuple: (name_from, name_to, original_amount, rounded_amount)
-        temp_list: Array[Tuple[str, str, float, float]] = Array() # Type hint rõ ràng hơn
-
-        for key in raw_transactions: # Giả sử raw_transactions.keys() hoạt động hoặc bạn có cách lặp khác
-            # Nếu raw_transactions là HashTable tự định nghĩa, bạn có thể cần:
-            # for key_node in raw_transactions.keys():
-            #    key = key_node.data # Hoặc cách bạn lấy key
-            #    amount = raw_transactions.get(key)
-            # Hoặc nếu HashTable của bạn hỗ trợ __iter__ trả về key:
-            amount = raw_transactions.get(key)
-            if amount is None: continue # Bỏ qua nếu không lấy được amount
-
-            rounded = round_money(amount)
-            rounded_total += rounded
-            # temp_list.append(value=(key[0], key[1], amount, rounded)) # Giả sử key là Tuple[str,str]
-            # Để an toàn hơn với key từ HashTable, nếu key là đối tượng Tuple của bạn:
-            name_from = key[0]  # Truy cập phần tử đầu tiên của Tuple key
-            name_to = key[1]
-            temp_list.append(value=(name_from, name_to, amount, rounded))
-
-
-        # Bước 3: Tính sai số cần phân bổ
-        delta = round_money(total_flow) - rounded_total
-
-        # SỬA ĐỔI Ở ĐÂY: Sử dụng merge_sort_array của bạn
-        # Mã gốc gây lỗi:
-        # temp_list.sort(key=lambda x: x[2] - x[3], reverse=(delta > 0))
-
-        # Mã sửa đổi:
-        # Tạo hàm so sánh dựa trên logic của key và reverse
-        def sort_key_for_delta_distribution(item_tuple: Tuple[str, str, float, float]) -> float:
-            # item_tuple là (name_from, name_to, original_amount, rounded_amount)
-            return item_tuple[2] - item_tuple[3] # original_amount - rounded_amount
-
-        # Hàm so sánh cho merge_sort_array
-        # comparator(a, b) trả về True nếu a nên đứng trước b (ví dụ: a < b cho tăng dần)
-        if delta > 0: # reverse=True => Sắp xếp giảm dần theo key
-            # Nếu delta > 0, muốn ưu tiên những cái có (original - rounded) LỚN NHẤT
-            # => sắp xếp giảm dần theo (original - rounded)
-            # => comparator(a,b) là True nếu (key(a) > key(b))
-            delta_comparator = lambda item_a, item_b: sort_key_for_delta_distribution(item_a) > sort_key_for_delta_distribution(item_b)
-        else: # reverse=False (hoặc delta <= 0) => Sắp xếp tăng dần theo key
-            # Nếu delta <= 0, muốn ưu tiên những cái có (original - rounded) NHỎ NHẤT (có thể âm)
-            # => sắp xếp tăng dần theo (original - rounded)
-            # => comparator(a,b) là True nếu (key(a) < key(b))
-            delta_comparator = lambda item_a, item_b: sort_key_for_delta_distribution(item_a) < sort_key_for_delta_distribution(item_b)
-        
-        if len(temp_list) > 0 : # Chỉ sắp xếp nếu có phần tử
-            temp_list = merge_sort_array(temp_list, comparator=delta_comparator)
-        # Lưu ý: merge_sort_array của bạn trả về một Array MỚI đã sắp xếp.
-        # Bạn cần gán lại nó cho temp_list.
-
-        # Phân phối sai số (mỗi bước = 0.01)
-        i = 0
-        # Kiểm tra len(temp_list) > 0 trước khi truy cập để tránh lỗi nếu rỗng
-        while abs(delta) >= 0.009 and len(temp_list) > 0:
-            # Giả sử Array có phương thức get(index) và set_at_index(index, value)
-            current_item_tuple = temp_list.get(i)
-            name_from, name_to, amt, rounded_amt = current_item_tuple[0], current_item_tuple[1], current_item_tuple[2], current_item_tuple[3]
-            
-            corrected_amt = rounded_amt + (0.01 if delta > 0 else -0.01)
-            
-            # Cập nhật lại phần tử trong temp_list
-            temp_list.set(i, (name_from, name_to, amt, corrected_amt))
-
-            delta -= (0.01 if delta > 0 else -0.01)
-            i = (i + 1) % len(temp_list)
-
-        # Bước 4: Tạo LinkedList kết quả cuối cùng
-        # Lặp qua Array bằng chỉ số nếu nó không hỗ trợ __iter__ trực tiếp
-        for idx in range(len(temp_list)):
-            item_data = temp_list.get(idx) # Giả sử có phương thức get(index)
-            name_from, name_to, _, final_amt = item_data[0], item_data[1], item_data[2], item_data[3]
-            
-            if final_amt > EPSILON:
-                rounded_transactions.append(BasicTransaction(
-                    debtor=name_from,
-                    creditor=name_to,
-                    amount=round_money(final_amt)
-                ))
+        transactions = LinkedList[BasicTransaction]()
+        key_node = pair_order.head
+        while key_node:
+            key = key_node.data
+            transactions.append(BasicTransaction.from_cents(
+                debtor=key[0],
+                creditor=key[1],
+                amount_cents=pair_flows.get(key)
+            ))
+            key_node = key_node.next
 
-        return rounded_transactions
\ No newline at end of file
+        return transactions
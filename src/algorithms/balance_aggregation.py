@@ -0,0 +1,156 @@
+# Tổng hợp số dư song song theo mô hình map-reduce
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor, Future
+from datetime import date
+from typing import Any, Iterable
+
+from src.data_structures import HashTable, Array, LinkedList
+from src.utils.financial_calculator import FinancialCalculator
+from src.utils.money_utils import Cents, to_cents
+
+# Số giao dịch trong mỗi phân đoạn gửi cho một tiến trình
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+class BalanceAggregate:
+    """
+    Kết quả của aggregate_balances.
+
+    Cách dùng với các bộ đơn giản hóa:
+    - Giao dịch cơ bản: add_balances(balances, transaction_count) của GreedySimplifier,
+      VectorizedGreedySimplifier, DynamicProgrammingSimplifier, MinCostMaxFlowSimplifier và
+      BranchAndBoundSimplifier.
+    - Giao dịch nâng cao: tham số transaction_metrics và balances của AdvancedGreedySimplifier,
+      AdvancedDynamicProgrammingSimplifier và AdvancedMinCostMaxFlowSimplifier.
+    - DebtCycleSimplifier / AdvancedDebtCycleSimplifier tìm chu trình trên từng cạnh nợ nên không dùng
+      được số dư ròng (số dư theo người đã xóa mất các cạnh).
+
+    Thuộc tính:
+        balances: Số dư ròng theo xu của từng người
+        transaction_count: Số giao dịch đã tổng hợp
+        priority_totals: Tổng điểm ưu tiên theo người (chỉ với giao dịch nâng cao)
+        transaction_metrics: Chi tiết nợ từng giao dịch theo thứ tự đầu vào (khi with_metrics=True),
+                             truyền được thẳng vào tham số transaction_metrics của các bộ đơn giản hóa nâng cao
+    """
+
+    def __init__(self):
+        self.balances: HashTable[str, Cents] = HashTable()
+        self.transaction_count: int = 0
+        self.priority_totals: HashTable[str, float] = HashTable()
+        self.transaction_metrics: Array[dict] | None = None
+
+
+def aggregate_balances(transactions: Iterable[Any],
+                       current_date: date | None = None,
+                       max_workers: int | None = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       with_metrics: bool = False) -> BalanceAggregate:
+    """
+    Tính số dư ròng của mọi người bằng map-reduce trên các phân đoạn của luồng giao dịch.
+
+    - Map: mỗi tiến trình nhận một phân đoạn (các bộ giá trị thuần, không phải đối tượng) và trả về
+      bảng số dư cục bộ; với giao dịch nâng cao (current_date khác None) lãi, phí phạt và điểm ưu tiên
+      cũng được tính trong tiến trình con.
+    - Reduce: các bảng cục bộ được cộng dồn theo đúng thứ tự phân đoạn.
+
+    Luồng đầu vào chỉ được duyệt một lần; số phân đoạn đang chờ được giới hạn nên bộ nhớ không phụ thuộc
+    vào tổng số giao dịch (trừ khi with_metrics=True).
+
+    Args:
+        transactions: Iterable các BasicTransaction, hoặc AdvancedTransaction khi có current_date
+        current_date: None = cộng số tiền gốc; ngày cụ thể = cộng tổng nợ thực tế tại ngày đó
+        max_workers: Số tiến trình; None hoặc 1 = chạy tuần tự trong tiến trình hiện tại
+        chunk_size: Số giao dịch mỗi phân đoạn
+        with_metrics: Giữ lại chi tiết nợ của từng giao dịch (chỉ với giao dịch nâng cao)
+
+    Returns:
+        BalanceAggregate: Số dư, số giao dịch, tổng điểm ưu tiên và (tùy chọn) chi tiết nợ
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size phải lớn hơn 0.")
+
+    aggregate = BalanceAggregate()
+    if with_metrics and current_date is not None:
+        aggregate.transaction_metrics = Array[dict]()
+
+    chunks = _iter_row_chunks(transactions, current_date, chunk_size)
+    keep_metrics = aggregate.transaction_metrics is not None
+
+    if max_workers is None or max_workers <= 1:
+        for rows in chunks:
+            _reduce_partial(aggregate, _map_chunk(rows, current_date, keep_metrics))
+        return aggregate
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # Hàng đợi các phân đoạn đang xử lý, giữ thứ tự gửi để chi tiết nợ khớp thứ tự đầu vào
+        pending = LinkedList[Future]()
+        for rows in chunks:
+            pending.append(executor.submit(_map_chunk, rows, current_date, keep_metrics))
+            if len(pending) >= 2 * max_workers:
+                _reduce_partial(aggregate, pending.remove_first().result())
+        while not pending.is_empty():
+            _reduce_partial(aggregate, pending.remove_first().result())
+    return aggregate
+
+
+def _iter_row_chunks(transactions: Iterable[Any], current_date: date | None, chunk_size: int):
+    """Chia luồng giao dịch thành các danh sách bộ giá trị thuần (rẻ khi chuyển sang tiến trình con)."""
+    rows: list[tuple] = []
+    for tx in transactions:
+        if tx is None:
+            continue
+        if current_date is None:
+            rows.append((tx.debtor, tx.creditor, tx.amount_cents))
+        else:
+            rows.append((tx.debtor, tx.creditor, tx.amount, tx.interest_rate, tx.penalty_rate,
+                         tx.borrow_date, tx.due_date, tx.interest_type, tx.penalty_type))
+        if len(rows) >= chunk_size:
+            yield rows
+            rows = []
+    if rows:
+        yield rows
+
+
+def _map_chunk(rows: list[tuple], current_date: date | None, keep_metrics: bool) -> tuple:
+    """
+    Bước map: tính bảng số dư cục bộ của một phân đoạn.
+    Dùng dict thuần vì kết quả phải được pickle để gửi về tiến trình chính.
+    """
+    balances: dict[str, int] = {}
+    priorities: dict[str, float] = {}
+    metrics: list[dict] = []
+
+    if current_date is None:
+        for debtor, creditor, amount_cents in rows:
+            balances[debtor] = balances.get(debtor, 0) - amount_cents
+            balances[creditor] = balances.get(creditor, 0) + amount_cents
+        return balances, priorities, metrics, len(rows)
+
+    for (debtor, creditor, amount, interest_rate, penalty_rate,
+         borrow_date, due_date, interest_type, penalty_type) in rows:
+        tx_metrics = FinancialCalculator.calculate_debt_metrics(
+            amount, interest_rate, penalty_rate, borrow_date, due_date,
+            current_date, interest_type, penalty_type
+        )
+        total_cents = to_cents(tx_metrics['total'])
+        balances[debtor] = balances.get(debtor, 0) - total_cents
+        balances[creditor] = balances.get(creditor, 0) + total_cents
+        priority = tx_metrics['priority']
+        priorities[debtor] = priorities.get(debtor, 0.0) + priority
+        priorities[creditor] = priorities.get(creditor, 0.0) + priority
+        if keep_metrics:
+            metrics.append(tx_metrics)
+    return balances, priorities, metrics, len(rows)
+
+
+def _reduce_partial(aggregate: BalanceAggregate, partial: tuple) -> None:
+    """Bước reduce: cộng bảng cục bộ của một phân đoạn vào kết quả chung."""
+    balances, priorities, metrics, count = partial
+    for person, amount in balances.items():
+        aggregate.balances.put(person, aggregate.balances.get(person, 0) + amount)
+    for person, priority in priorities.items():
+        aggregate.priority_totals.put(person, aggregate.priority_totals.get(person, 0.0) + priority)
+    if aggregate.transaction_metrics is not None:
+        for tx_metrics in metrics:
+            aggregate.transaction_metrics.append(tx_metrics)
+    aggregate.transaction_count += count
@@ -0,0 +1,131 @@
+# Sổ cái số dư dùng chung cho mọi thuật toán đơn giản hóa
+from __future__ import annotations
+from datetime import date
+from typing import Any, Iterable
+
+from src.core_type import BasicTransaction
+from src.data_structures import LinkedList, HashTable, Array, Tuple
+from src.utils.financial_calculator import FinancialCalculator, BatchMetrics
+from src.utils.sorting import merge_sort_linked_list
+from src.utils.money_utils import Cents, to_cents
+
+
+class BalanceLedger:
+    """
+    Sổ cái số dư được tính một lần từ danh sách giao dịch và dùng chung cho nhiều bộ đơn giản hóa.
+
+    Mỗi bộ đơn giản hóa nhận BalanceLedger thay cho danh sách giao dịch thô, nhờ đó khi so sánh nhiều
+    thuật toán trên cùng dữ liệu thì vòng cộng dồn số dư (và với giao dịch nâng cao là toàn bộ phần
+    tính lãi, phí phạt, điểm ưu tiên) chỉ chạy một lần.
+
+    Thuộc tính:
+        balances: Số dư ròng theo xu của từng người
+        sorted_people: Tên người tham gia theo thứ tự từ điển (chỉ đọc)
+        pair_totals: Tổng tiền theo xu của mỗi cặp (người nợ, người cho vay), khóa là Tuple
+        pair_keys: Các cặp theo thứ tự xuất hiện lần đầu
+        transaction_count: Số giao dịch gốc
+        total_volume: Tổng tiền của mọi giao dịch (xu)
+        total_outstanding: Tổng số dư dương, tức tổng tiền tối thiểu phải chuyển (xu)
+        current_date: Ngày đánh giá (None với giao dịch cơ bản)
+        transactions: Danh sách giao dịch nâng cao gốc (chỉ khi có current_date)
+        transaction_metrics: Chi tiết nợ của từng giao dịch nâng cao theo thứ tự (chỉ khi có current_date)
+        priority_totals: Tổng điểm ưu tiên theo người (chỉ khi có current_date)
+    """
+
+    def __init__(self,
+                 transactions: Iterable[Any] = (),
+                 current_date: date | None = None,
+                 use_batch: bool = False):
+        """
+        Tham số:
+            transactions: Các BasicTransaction, hoặc AdvancedTransaction khi có current_date
+            current_date: None = dùng số tiền gốc; ngày cụ thể = dùng tổng nợ thực tế tại ngày đó
+            use_batch: Tính chi tiết nợ giao dịch nâng cao bằng API vector hóa
+        """
+        self.current_date = current_date
+        self.balances: HashTable[str, Cents] = HashTable()
+        self.pair_totals: HashTable[Tuple, Cents] = HashTable()
+        self.pair_keys: LinkedList[Tuple] = LinkedList()
+        self.transaction_count: int = 0
+        self.total_volume: Cents = 0
+        self.total_outstanding: Cents = 0
+        self.transactions: LinkedList[Any] | None = None
+        self.transaction_metrics: Array[dict] | BatchMetrics | None = None
+        self.priority_totals: HashTable[str, float] = HashTable()
+
+        if current_date is None:
+            for tx in transactions:
+                self._record(tx.debtor, tx.creditor, tx.amount_cents)
+        else:
+            self.transactions = LinkedList[Any]()
+            for tx in transactions:
+                if tx is not None:
+                    self.transactions.append(tx)
+            self.transaction_metrics = FinancialCalculator.evaluate_transactions(
+                self.transactions, current_date, use_batch
+            )
+            # Chỉ đọc hai trường cần thiết; với kết quả dạng cột không phải dựng dict cho từng giao dịch
+            totals = FinancialCalculator.metric_values(self.transaction_metrics, 'total')
+            priorities = FinancialCalculator.metric_values(self.transaction_metrics, 'priority')
+            index = 0
+            for tx in self.transactions:
+                priority = priorities[index]
+                self._record(tx.debtor, tx.creditor, to_cents(totals[index]))
+                index += 1
+                self.priority_totals.put(tx.debtor, self.priority_totals.get(tx.debtor, 0.0) + priority)
+                self.priority_totals.put(tx.creditor, self.priority_totals.get(tx.creditor, 0.0) + priority)
+
+        for person in self.balances:
+            balance = self.balances.get(person)
+            if balance > 0:
+                self.total_outstanding += balance
+
+        people = self.balances.keys()
+        self.sorted_people: LinkedList[str] = (
+            merge_sort_linked_list(people, comparator=lambda a, b: a < b) if people else LinkedList[str]()
+        )
+
+    def _record(self, debtor: str, creditor: str, amount_cents: Cents) -> None:
+        """Cộng một giao dịch vào số dư, tổng theo cặp và các tổng chung."""
+        self.balances.put(debtor, self.balances.get(debtor, 0) - amount_cents)
+        self.balances.put(creditor, self.balances.get(creditor, 0) + amount_cents)
+
+        pair = Tuple([debtor, creditor])
+        pair_total = self.pair_totals.get(pair)
+        if pair_total is None:
+            self.pair_keys.append(pair)
+            pair_total = 0
+        self.pair_totals.put(pair, pair_total + amount_cents)
+
+        self.transaction_count += 1
+        self.total_volume += amount_cents
+
+    @property
+    def is_advanced(self) -> bool:
+        """True nếu sổ cái được tạo từ giao dịch nâng cao tại một ngày đánh giá."""
+        return self.current_date is not None
+
+    @property
+    def people_count(self) -> int:
+        return len(self.sorted_people)
+
+    def pair_transactions(self) -> LinkedList[BasicTransaction]:
+        """
+        Trả về mỗi cặp (người nợ, người cho vay) dưới dạng một BasicTransaction gộp, theo thứ tự xuất hiện.
+        Luôn tạo đối tượng mới nên bộ đơn giản hóa có thể sửa số tiền mà không ảnh hưởng tới sổ cái.
+        """
+        result = LinkedList[BasicTransaction]()
+        for pair in self.pair_keys:
+            amount_cents = self.pair_totals.get(pair)
+            if amount_cents > 0:
+                result.append(BasicTransaction.from_cents(pair[0], pair[1], amount_cents))
+        return result
+
+    def require_date(self, current_date: date) -> None:
+        """Kiểm tra sổ cái nâng cao được tính đúng tại ngày mà bộ đơn giản hóa yêu cầu."""
+        if self.current_date is None:
+            raise ValueError("BalanceLedger này được tạo từ giao dịch cơ bản, không có chi tiết nợ nâng cao.")
+        if self.current_date != current_date:
+            raise ValueError(
+                f"BalanceLedger được tính tại ngày {self.current_date}, khác với ngày yêu cầu {current_date}."
+            )
@@ -2,10 +2,14 @@ from .min_cost_max_flow import MinCostMaxFlowSimplifier
 from .cycle_detector import DebtCycleSimplifier
 from .greedy import GreedySimplifier
 from .dynamic_programming import DynamicProgrammingSimplifier
+from .vectorized_greedy import VectorizedGreedySimplifier
+from .branch_and_bound import BranchAndBoundSimplifier
 
 __all__ = [
     'MinCostMaxFlowSimplifier',
     'DebtCycleSimplifier',
     'GreedySimplifier',
     'DynamicProgrammingSimplifier',
+    'VectorizedGreedySimplifier',
+    'BranchAndBoundSimplifier',
 ] 
\ No newline at end of file
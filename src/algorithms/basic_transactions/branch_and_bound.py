@@ -0,0 +1,284 @@
+# Tìm kiếm nhánh cận (anytime) số giao dịch tối thiểu với giới hạn thời gian
+from __future__ import annotations
+import time
+from array import array
+from typing import Iterable
+
+from src.core_type import BasicTransaction
+from src.data_structures import LinkedList, HashTable, Tuple
+from src.utils.money_utils import Cents
+from src.algorithms.balance_ledger import BalanceLedger
+from src.algorithms.basic_transactions.greedy import GreedySimplifier
+from src.algorithms.basic_transactions.exact_solver import (
+    min_transfer_count, estimated_solve_seconds, DEFAULT_MAX_PEOPLE
+)
+from src.algorithms.basic_transactions.dynamic_programming import canonical_balance_key
+
+# Thời gian tìm kiếm mặc định (giây) khi simplify() không nhận deadline
+DEFAULT_TIME_BUDGET = 1.0
+# Số trạng thái tối đa trong bảng ghi nhớ dùng để cắt tỉa
+DEFAULT_MEMO_ENTRIES = 200_000
+# Số nút được duyệt giữa hai lần đọc đồng hồ
+_CLOCK_CHECK_INTERVAL = 64
+
+
+def zero_sum_group_bound(sorted_amounts: list[Cents]) -> int:
+    """
+    Cận trên của số nhóm rời nhau có tổng bằng 0 (amounts đã sắp xếp tăng dần, khác 0).
+
+    - Mỗi nhóm cần ít nhất một người nợ và một người cho vay: g <= min(số âm, số dương)
+    - Nhóm 2 người chỉ có thể là cặp khớp chính xác (a, -a), các nhóm còn lại có ít nhất 3 người.
+      Với m = số cặp khớp chính xác rời nhau nhiều nhất: g <= m + (n - 2m) // 3
+
+    Độ phức tạp: O(n) bằng hai con trỏ trên dãy đã sắp xếp
+    """
+    n = len(sorted_amounts)
+    negatives = 0
+    while negatives < n and sorted_amounts[negatives] < 0:
+        negatives += 1
+
+    exact_pairs = 0
+    left, right = 0, n - 1
+    while left < negatives <= right:
+        debt = -sorted_amounts[left]
+        credit = sorted_amounts[right]
+        if debt == credit:
+            exact_pairs += 1
+            left += 1
+            right -= 1
+        elif debt > credit:
+            left += 1
+        else:
+            right -= 1
+    return min(negatives, n - negatives, exact_pairs + (n - 2 * exact_pairs) // 3)
+
+
+class BranchAndBoundSimplifier:
+    """
+    Tìm kiếm nhánh cận số giao dịch tối thiểu, trả về lời giải tốt nhất trong giới hạn thời gian.
+
+    Dùng cho nhóm 25-60 người: thuật toán tham lam không tối ưu, còn bộ giải chính xác (2^n trạng thái)
+    quá chậm. Bộ tìm kiếm luôn có một lời giải hợp lệ (bắt đầu từ lời giải tham lam) và cải thiện dần
+    cho tới khi chứng minh được tối ưu hoặc hết thời gian, nên thời gian phản hồi được đảm bảo.
+
+    - Cận dưới: n - (cận trên số nhóm tổng bằng 0); với nhóm nhỏ dùng đúng giá trị của bộ giải chính xác
+      nếu thời gian còn lại đủ cho nó (bộ giải 2^n không dừng giữa chừng được)
+    - Lời giải ban đầu: GreedySimplifier với ghép khớp chính xác
+    - Nhánh: người có số dư khác 0 đầu tiên (theo thứ tự chuẩn) chuyển toàn bộ số dư cho một người trái dấu;
+      nếu có người khớp chính xác thì chỉ thử người đó (luôn tồn tại lời giải tối ưu chứa cặp này)
+    - Cắt tỉa ghi nhớ: trạng thái (bội số dư còn lại) đã gặp ở độ sâu nhỏ hơn hoặc bằng thì bỏ qua
+
+    Sau simplify():
+        best_transfer_count: Số giao dịch của lời giải trả về
+        lower_bound: Cận dưới đã chứng minh của số giao dịch tối thiểu
+        optimality_gap: best_transfer_count - lower_bound (0 nghĩa là tối ưu)
+        timed_out: True nếu tìm kiếm dừng do hết thời gian
+        nodes_explored: Số nút đã duyệt
+    """
+
+    def __init__(self,
+                 transactions: Iterable[BasicTransaction] | BalanceLedger = (),
+                 time_budget: float = DEFAULT_TIME_BUDGET,
+                 memo_max_entries: int | None = DEFAULT_MEMO_ENTRIES,
+                 max_exact_people: int = DEFAULT_MAX_PEOPLE):
+        """
+        Tham số:
+            transactions: Iterable các giao dịch cơ bản (chỉ duyệt một lần) hoặc một BalanceLedger
+            time_budget: Thời gian tìm kiếm tối đa (giây) khi simplify() không nhận deadline
+            memo_max_entries: Số trạng thái tối đa trong bảng ghi nhớ cắt tỉa (None = không giới hạn)
+            max_exact_people: Nhóm có tối đa chừng này người số dư khác 0 thì cận dưới được tính chính xác
+                              bằng bộ giải QHĐ bitmask, nếu ước lượng thời gian của nó không vượt deadline
+        """
+        if time_budget < 0:
+            raise ValueError("time_budget không được âm.")
+        self.time_budget: float = time_budget
+        self.memo_max_entries: int | None = memo_max_entries
+        self.max_exact_people: int = max_exact_people
+        self.people_balances = HashTable[str, Cents]()
+        self.transaction_count: int = 0
+
+        self.best_transfer_count: int = 0
+        self.lower_bound: int = 0
+        self.optimality_gap: int = 0
+        self.timed_out: bool = False
+        self.nodes_explored: int = 0
+
+        if isinstance(transactions, BalanceLedger):
+            self.add_balances(transactions.balances, transactions.transaction_count)
+        else:
+            self.add_many(transactions)
+
+    def add(self, tx: BasicTransaction) -> None:
+        """Nạp thêm một giao dịch vào số dư hiện tại."""
+        self.add_many((tx,))
+
+    def add_many(self, transactions: Iterable[BasicTransaction]) -> None:
+        """Nạp thêm một loạt giao dịch theo kiểu luồng, chỉ giữ lại số dư của từng người."""
+        balances = self.people_balances
+        for tx in transactions:
+            balances.put(tx.debtor, balances.get(tx.debtor, 0) - tx.amount_cents)
+            balances.put(tx.creditor, balances.get(tx.creditor, 0) + tx.amount_cents)
+            self.transaction_count += 1
+
+    def add_balances(self, balances: HashTable[str, Cents], transaction_count: int) -> None:
+        """Cộng dồn một bảng số dư đã tổng hợp sẵn thay vì duyệt lại từng giao dịch."""
+        people_balances = self.people_balances
+        for person in balances:
+            people_balances.put(person, people_balances.get(person, 0) + balances.get(person))
+        self.transaction_count += transaction_count
+
+    @property
+    def is_optimal(self) -> bool:
+        """True nếu lời giải của lần simplify() gần nhất đã được chứng minh là tối ưu."""
+        return self.optimality_gap == 0
+
+    def _initial_lower_bound(self, amounts: list[Cents], deadline: float) -> int:
+        if (len(amounts) <= self.max_exact_people
+                and time.monotonic() + estimated_solve_seconds(len(amounts)) <= deadline):
+            return min_transfer_count(self.people_balances, self.max_exact_people)[0]
+        return len(amounts) - zero_sum_group_bound(amounts)
+
+    def _greedy_incumbent(self) -> LinkedList[BasicTransaction]:
+        greedy = GreedySimplifier(exact_match=True)
+        greedy.add_balances(self.people_balances, self.transaction_count)
+        return greedy.simplify()
+
+    def simplify(self, deadline: float | None = None) -> LinkedList[BasicTransaction]:
+        """
+        Tìm lời giải có ít giao dịch nhất trước deadline.
+
+        Tham số:
+            deadline: Thời điểm dừng theo time.monotonic(); None = bây giờ + time_budget
+
+        Trả về:
+            LinkedList[BasicTransaction]: Lời giải tốt nhất tìm được (luôn thanh toán hết số dư)
+        """
+        if deadline is None:
+            deadline = time.monotonic() + self.time_budget
+        self.timed_out = False
+        self.nodes_explored = 0
+        if self.transaction_count == 0:
+            self.best_transfer_count = self.lower_bound = self.optimality_gap = 0
+            return LinkedList[BasicTransaction]()
+
+        canonical_state = canonical_balance_key(self.people_balances, sorted(self.people_balances.keys()))
+        names: list[str] = canonical_state[1]
+        amounts: list[Cents] = [self.people_balances.get(name) for name in names]
+
+        best_transfers = self._greedy_incumbent()
+        self.best_transfer_count = len(best_transfers)
+        self.lower_bound = self._initial_lower_bound(amounts, deadline)
+
+        if self.best_transfer_count > self.lower_bound:
+            best_moves = self._search(amounts, deadline)
+            if best_moves is not None:
+                best_transfers = self._moves_to_transfers(best_moves, names)
+                self.best_transfer_count = len(best_transfers)
+            if not self.timed_out:
+                # Đã duyệt hết cây tìm kiếm: lời giải hiện tại là tối ưu
+                self.lower_bound = self.best_transfer_count
+
+        self.optimality_gap = self.best_transfer_count - self.lower_bound
+        return best_transfers
+
+    def _search(self, amounts: list[Cents], deadline: float) -> LinkedList[Tuple] | None:
+        """
+        Duyệt theo chiều sâu bằng ngăn xếp tường minh.
+
+        Mỗi khung: [chỉ số người i, danh sách ứng viên j, vị trí ứng viên kế tiếp, j đang áp dụng, số dư của i
+        trước bước]. Bất biến: mọi người trước i đã có số dư bằng 0.
+
+        Trả về:
+            LinkedList[Tuple] | None: Các bước (i, j, số_dư_của_i) của lời giải tốt hơn lời giải ban đầu,
+                                      None nếu không tìm được
+        """
+        balances = list(amounts)
+        n = len(balances)
+        # Bảng ghi nhớ là dict của Python: HashTable/LRUCache nhân đôi bảng bằng vòng lặp Python, mỗi lần
+        # mất hàng trăm mili giây với vài chục nghìn mục, phá vỡ giới hạn thời gian. Khi đầy thì xóa
+        # toàn bộ (chỉ làm giảm cắt tỉa, không ảnh hưởng tính đúng).
+        memo: dict[bytes, int] = {}
+        best_count = self.best_transfer_count
+        best_moves: LinkedList[Tuple] | None = None
+        frames: list[list] = []
+
+        def open_frame(start: int, depth: int) -> list | None:
+            nonlocal best_count, best_moves
+            i = start
+            while i < n and balances[i] == 0:
+                i += 1
+            if i == n:
+                # Mọi số dư bằng 0: có lời giải tốt hơn (cận đã loại các nhánh không tốt hơn)
+                if depth < best_count:
+                    best_count = depth
+                    best_moves = LinkedList[Tuple]()
+                    for frame in frames:
+                        best_moves.append(Tuple([frame[0], frame[3], frame[4]]))
+                return None
+
+            remaining = sorted(balance for balance in balances[i:] if balance != 0)
+            key = array('q', remaining).tobytes()
+            seen_depth = memo.get(key)
+            if seen_depth is not None and seen_depth <= depth:
+                return None
+            if self.memo_max_entries is not None and len(memo) >= self.memo_max_entries:
+                memo.clear()
+            memo[key] = depth
+            if depth + len(remaining) - zero_sum_group_bound(remaining) >= best_count:
+                return None
+
+            balance = balances[i]
+            candidates = []
+            tried = set()
+            for j in range(i + 1, n):
+                other = balances[j]
+                if other == -balance:
+                    candidates = [j]
+                    break
+                if other != 0 and (other > 0) != (balance > 0) and other not in tried:
+                    tried.add(other)
+                    candidates.append(j)
+            # Ứng viên triệt tiêu gần hết số dư được thử trước
+            candidates.sort(key=lambda j: abs(balance + balances[j]))
+            return [i, candidates, 0, -1, balance]
+
+        root = open_frame(0, 0)
+        if root is not None:
+            frames.append(root)
+        while frames:
+            self.nodes_explored += 1
+            if self.nodes_explored % _CLOCK_CHECK_INTERVAL == 0 and time.monotonic() >= deadline:
+                self.timed_out = True
+                break
+
+            frame = frames[-1]
+            i = frame[0]
+            if frame[3] >= 0:
+                # Hoàn tác bước trước của khung này
+                balances[frame[3]] -= frame[4]
+                balances[i] = frame[4]
+                frame[3] = -1
+            if frame[2] >= len(frame[1]) or len(frames) >= best_count:
+                frames.pop()
+                continue
+
+            j = frame[1][frame[2]]
+            frame[2] += 1
+            frame[3] = j
+            balances[j] += frame[4]
+            balances[i] = 0
+            child = open_frame(i + 1, len(frames))
+            if child is not None:
+                frames.append(child)
+        return best_moves
+
+    @staticmethod
+    def _moves_to_transfers(moves: LinkedList[Tuple], names: list[str]) -> LinkedList[BasicTransaction]:
+        """Mỗi bước (i, j, số_dư_của_i): i thanh toán toàn bộ số dư với j."""
+        transfers = LinkedList[BasicTransaction]()
+        for i, j, balance in moves:
+            if balance < 0:
+                transfers.append(BasicTransaction.from_cents(names[i], names[j], -balance))
+            else:
+                transfers.append(BasicTransaction.from_cents(names[j], names[i], balance))
+        return transfers
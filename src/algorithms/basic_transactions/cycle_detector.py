@@ -2,10 +2,10 @@
 from __future__ import annotations
 
 from src.core_type import BasicTransaction
-from src.data_structures import LinkedList, Graph, HashTable, Array, Tuple
+from src.data_structures import LinkedList, Graph, GraphEdge, HashTable, Array, Tuple
 from src.utils.sorting import merge_sort_array
-from src.utils.constants import EPSILON
-from src.utils.money_utils import round_money
+from src.utils.money_utils import Cents
+from src.algorithms.balance_ledger import BalanceLedger
 
 class DebtCycleSimplifier:
     """
@@ -16,27 +16,48 @@ class DebtCycleSimplifier:
     
     Thuật toán hoạt động theo 2 giai đoạn:
     1. Phase 1: Loại bỏ chu trình
-       - Xây dựng đồ thị có hướng từ các giao dịch nợ
-       - Tìm tất cả chu trình có lợi (có thể loại bỏ giao dịch)
-       - Sắp xếp chu trình theo độ ưu tiên (số giao dịch loại bỏ, số tiền)
-       - Áp dụng chu trình tốt nhất và lặp lại cho đến khi hết
+       - Xây dựng đồ thị có hướng từ các giao dịch nợ một lần duy nhất
+       - Tách đồ thị thành các thành phần liên thông mạnh (Tarjan lặp); chu trình chỉ nằm trong các thành phần này
+       - Trong mỗi thành phần: tìm chu trình có lợi, sắp xếp theo độ ưu tiên (số giao dịch loại bỏ, số tiền)
+         và lần lượt hủy mọi chu trình còn hợp lệ (mọi cạnh vẫn dương) từ cùng một lần liệt kê;
+         cạnh về 0 bị xóa ngay trên đồ thị
+       - Chỉ thành phần vừa bị thay đổi được tách lại và tìm tiếp, cho đến khi đồ thị không còn chu trình
     
     2. Phase 2: Net Settlement tối ưu
        - Tính số dư ròng cho từng người
        - Sử dụng thuật toán matching tham lam để tối thiểu hóa giao dịch
     
-    Độ phức tạp thời gian: O((V+E) * C) với V = số người, E = số giao dịch, C = số chu trình
+    Chế độ "scc" bỏ qua cả hai giai đoạn trên: mỗi thành phần liên thông mạnh không tầm thường được gộp thành
+    số dư ròng và thanh toán lại dọc một cây khung các quan hệ nợ bên trong nó, còn cạnh giữa các thành phần
+    giữ nguyên. Kết quả không phụ thuộc thứ tự chọn chu trình và mọi cạnh đều là cặp người đã có nợ với nhau.
+    Độ phức tạp của chế độ này: O(V + E).
+
+    Độ phức tạp thời gian: O(V + E + tổng (V_s + E_s) qua R lần liệt kê), với V_s, E_s là kích thước
+    thành phần liên thông mạnh được liệt kê; R <= E vì mỗi lần liệt kê hủy ít nhất một chu trình và xóa ít nhất
+    một cạnh, trên thực tế R nhỏ hơn nhiều vì một lần liệt kê hủy được nhiều chu trình
     Độ phức tạp không gian: O(V + E)
     """
     
-    def __init__(self, transactions: LinkedList[BasicTransaction]):
+    def __init__(self, transactions: LinkedList[BasicTransaction] | BalanceLedger, mode: str = "cycle"):
         """
         Khởi tạo bộ đơn giản hóa nợ với danh sách giao dịch ban đầu.
         
         Tham số:
-            transactions: Danh sách liên kết các giao dịch cơ bản cần đơn giản hóa
+            transactions: Danh sách liên kết các giao dịch cơ bản cần đơn giản hóa, hoặc một BalanceLedger
+                          (khi đó mỗi cặp người nợ - người cho vay là một cạnh với tổng tiền đã gộp)
+            mode: "cycle" - loại bỏ từng chu trình rồi net settlement toàn cục (mặc định);
+                  "scc" - gộp số dư trong từng thành phần liên thông mạnh và thanh toán lại chỉ bằng các
+                  quan hệ nợ có sẵn trong thành phần, giữ nguyên các cạnh giữa các thành phần
+
+        Raises:
+            ValueError: Nếu mode không phải "cycle" hoặc "scc"
         """
+        if mode not in ("cycle", "scc"):
+            raise ValueError(f"mode phải là 'cycle' hoặc 'scc' (nhận '{mode}').")
+        if isinstance(transactions, BalanceLedger):
+            transactions = transactions.pair_transactions()
         self.initial_transactions: LinkedList[BasicTransaction] = transactions
+        self.mode: str = mode
         self.simplified_transactions: LinkedList[BasicTransaction] = LinkedList()
 
     def _build_graph_from_list(self, tx_array: Array[BasicTransaction]) -> Graph[str, BasicTransaction]:
@@ -56,8 +77,8 @@ class DebtCycleSimplifier:
         """
         debt_graph = Graph[str, BasicTransaction](is_directed=True)
         for tx in tx_array:
-            # Chỉ thêm giao dịch có số tiền lớn hơn ngưỡng epsilon
-            if tx.amount > EPSILON:
+            # Chỉ thêm giao dịch có số tiền dương
+            if tx.amount_cents > 0:
                 debt_graph.add_vertex(tx.debtor)    # Thêm đỉnh người nợ
                 debt_graph.add_vertex(tx.creditor)  # Thêm đỉnh người cho vay
                 # Thêm cạnh có hướng từ người nợ đến người cho vay
@@ -76,41 +97,44 @@ class DebtCycleSimplifier:
             cycle_edges: Danh sách các cạnh tạo thành chu trình
             
         Trả về:
-            Tuple: (số_giao_dịch_được_loại_bỏ, số_tiền_nhỏ_nhất) hoặc (-1, 0.0) nếu không hợp lệ
+            Tuple: (số_giao_dịch_được_loại_bỏ, số_tiền_nhỏ_nhất_theo_xu) hoặc (-1, 0) nếu không hợp lệ
         """
         # Kiểm tra điều kiện chu trình tối thiểu (ít nhất 2 cạnh)
         if len(cycle_edges) < 2:
-            return Tuple([-1, 0.0])
+            return Tuple([-1, 0])
         
-        min_amount = float('inf')
+        min_amount: Cents | None = None
         cycle_transactions = []
         
         # Thu thập thông tin chu trình
         for edge_node in cycle_edges:
             tx = edge_node.data
             # Kiểm tra tính hợp lệ của giao dịch
-            if tx is None or tx.amount <= EPSILON:
-                return Tuple([-1, 0.0])
-            min_amount = min(min_amount, tx.amount)
+            if tx is None or tx.amount_cents <= 0:
+                return Tuple([-1, 0])
+            if min_amount is None or tx.amount_cents < min_amount:
+                min_amount = tx.amount_cents
             cycle_transactions.append(tx)
         
         # Kiểm tra tính hợp lệ của số tiền nhỏ nhất
-        if min_amount == float('inf') or min_amount <= EPSILON:
-            return Tuple([-1, 0.0])
+        if min_amount is None:
+            return Tuple([-1, 0])
         
         # Đếm số giao dịch sẽ được loại bỏ hoàn toàn
         transactions_eliminated = 0
         for tx in cycle_transactions:
-            # Giao dịch được loại bỏ nếu số tiền bằng với số tiền nhỏ nhất
-            if abs(tx.amount - min_amount) < EPSILON:
+            # Giao dịch được loại bỏ nếu số tiền bằng đúng số tiền nhỏ nhất
+            if tx.amount_cents == min_amount:
                 transactions_eliminated += 1
         
         # Trả về tuple để so sánh: ưu tiên số giao dịch loại bỏ, sau đó đến số tiền
         return Tuple([transactions_eliminated, min_amount])
 
-    def _find_all_profitable_cycles(self, debt_graph: Graph) -> LinkedList[Tuple]:
+    def _find_all_profitable_cycles(self, debt_graph: Graph,
+                                    component: Array[str] | None = None) -> LinkedList[Tuple]:
         """
-        Tìm tất cả chu trình có lợi trong đồ thị nợ và sắp xếp theo độ ưu tiên.
+        Tìm tất cả chu trình có lợi trong đồ thị nợ (hoặc trong một thành phần liên thông mạnh) và sắp xếp
+        theo độ ưu tiên.
         
         Chu trình có lợi: chu trình có thể loại bỏ ít nhất 1 giao dịch hoàn toàn
         
@@ -122,12 +146,16 @@ class DebtCycleSimplifier:
         
         Tham số:
             debt_graph: Đồ thị nợ có hướng cần tìm chu trình
+            component: Các đỉnh của thành phần liên thông mạnh cần tìm; None để tìm trên toàn đồ thị
             
         Trả về:
             LinkedList[Tuple]: Danh sách chu trình có lợi đã sắp xếp
                              Mỗi phần tử: (score_tuple, cycle_edges, min_amount)
         """
-        found_cycles_edges = debt_graph.find_cycles_with_edges()
+        if component is None:
+            found_cycles_edges = debt_graph.find_cycles_with_edges()
+        else:
+            found_cycles_edges = self._find_cycles_in_component(debt_graph, component)
         profitable_cycles = LinkedList[Tuple]()
         
         if found_cycles_edges.is_empty():
@@ -193,35 +221,203 @@ class DebtCycleSimplifier:
         
         return sorted_cycles
 
-    def _apply_cycle_elimination(self, cycle_edges: LinkedList, min_amount: float) -> Array[BasicTransaction]:
+    def _strongly_connected_components(self, debt_graph: Graph[str, BasicTransaction],
+                                       vertices: LinkedList[str] | Array[str]) -> LinkedList[Array[str]]:
         """
-        Áp dụng việc loại bỏ chu trình và trả về danh sách giao dịch được cập nhật.
-        
-        Quy trình loại bỏ chu trình:
-        1. Giảm số tiền của tất cả giao dịch trong chu trình đi min_amount
-        2. Loại bỏ các giao dịch có số tiền <= EPSILON (giao dịch đã được thanh toán)
-        3. Trả về danh sách giao dịch còn lại
-        
+        Tìm các thành phần liên thông mạnh có từ 2 đỉnh trở lên của đồ thị con cảm sinh bởi vertices.
+
+        Dùng thuật toán Tarjan dạng lặp (ngăn xếp khung tường minh thay cho đệ quy) nên không bị giới hạn
+        độ sâu đệ quy với chuỗi nợ dài. Mọi chu trình đều nằm trọn trong một thành phần như vậy.
+
         Tham số:
-            cycle_edges: Danh sách các cạnh trong chu trình cần loại bỏ
-            min_amount: Số tiền nhỏ nhất trong chu trình (số tiền được loại bỏ)
-            
+            debt_graph: Đồ thị nợ hiện tại
+            vertices: Các đỉnh được xét (cạnh đi ra ngoài tập này bị bỏ qua)
+
         Trả về:
-            Array[BasicTransaction]: Danh sách giao dịch sau khi áp dụng loại bỏ chu trình
+            LinkedList[Array[str]]: Các thành phần liên thông mạnh không tầm thường
+
+        Độ phức tạp: O(V + E) của đồ thị con
         """
-        # Cập nhật số tiền cho các giao dịch trong chu trình
-        for edge_node in cycle_edges:
-            tx = edge_node.data
-            tx.amount -= min_amount
-        
-        # Thu thập tất cả giao dịch còn lại có số tiền > 0
-        updated_tx_array = Array[BasicTransaction]()
-        for tx_node in self.initial_transactions:
-            tx = tx_node.data
-            if tx.amount > EPSILON:
-                updated_tx_array.append(tx)
-        
-        return updated_tx_array
+        # Cấp sẵn dung lượng bảng băm theo kích thước đồ thị con để tránh rehash liên tục
+        capacity = max(HashTable.DEFAULT_CAPACITY, 2 * len(vertices))
+        in_scope = HashTable[str, bool](capacity)
+        for vertex in vertices:
+            in_scope.put(vertex, True)
+
+        index_of = HashTable[str, int](capacity)
+        lowlink = HashTable[str, int](capacity)
+        on_stack = HashTable[str, bool](capacity)
+        component_stack = Array[str]()
+        components = LinkedList[Array[str]]()
+        next_index = 0
+
+        for root in in_scope.keys():
+            if index_of.contains_key(root):
+                continue
+            # Mỗi khung: (đỉnh, iterator các cạnh đi ra chưa duyệt)
+            call_stack = Array[Tuple]()
+            index_of.put(root, next_index)
+            lowlink.put(root, next_index)
+            next_index += 1
+            component_stack.append(root)
+            on_stack.put(root, True)
+            call_stack.append(Tuple([root, iter(debt_graph.get_vertex(root).edges)]))
+
+            while len(call_stack) > 0:
+                frame = call_stack[len(call_stack) - 1]
+                vertex, edges = frame[0], frame[1]
+                descended = False
+                for edge in edges:
+                    target = edge.destination
+                    if not in_scope.contains_key(target):
+                        continue
+                    if not index_of.contains_key(target):
+                        index_of.put(target, next_index)
+                        lowlink.put(target, next_index)
+                        next_index += 1
+                        component_stack.append(target)
+                        on_stack.put(target, True)
+                        call_stack.append(Tuple([target, iter(debt_graph.get_vertex(target).edges)]))
+                        descended = True
+                        break
+                    if on_stack.contains_key(target) and index_of.get(target) < lowlink.get(vertex):
+                        lowlink.put(vertex, index_of.get(target))
+                if descended:
+                    continue
+
+                # Đã duyệt hết cạnh của vertex: cập nhật lowlink của cha và tách thành phần nếu vertex là gốc
+                call_stack.pop()
+                if len(call_stack) > 0:
+                    parent = call_stack[len(call_stack) - 1][0]
+                    if lowlink.get(vertex) < lowlink.get(parent):
+                        lowlink.put(parent, lowlink.get(vertex))
+                if lowlink.get(vertex) == index_of.get(vertex):
+                    component = Array[str]()
+                    while True:
+                        member = component_stack.pop()
+                        on_stack.remove(member)
+                        component.append(member)
+                        if member == vertex:
+                            break
+                    if len(component) > 1:
+                        components.append(component)
+        return components
+
+    def _find_cycles_in_component(self, debt_graph: Graph[str, BasicTransaction],
+                                  component: Array[str]) -> LinkedList[LinkedList[GraphEdge]]:
+        """
+        Tìm các chu trình (qua back edge của DFS) chỉ trong một thành phần liên thông mạnh.
+
+        Giống Graph.find_cycles_with_edges nhưng dạng lặp và bỏ qua mọi cạnh rời khỏi thành phần,
+        nên chi phí chỉ phụ thuộc kích thước thành phần chứ không phải toàn bộ đồ thị.
+
+        Tham số:
+            debt_graph: Đồ thị nợ hiện tại
+            component: Các đỉnh của thành phần liên thông mạnh
+
+        Trả về:
+            LinkedList[LinkedList[GraphEdge]]: Danh sách chu trình, mỗi chu trình là danh sách cạnh
+        """
+        capacity = max(HashTable.DEFAULT_CAPACITY, 2 * len(component))
+        in_component = HashTable[str, bool](capacity)
+        for vertex in component:
+            in_component.put(vertex, True)
+
+        cycles = LinkedList[LinkedList[GraphEdge]]()
+        visited = HashTable[str, bool](capacity)
+        # Đỉnh đang nằm trên nhánh DFS -> vị trí cạnh đi ra đầu tiên của nó trong path_edges
+        path_position = HashTable[str, int](capacity)
+        path_edges = Array[GraphEdge]()
+
+        for root in component:
+            if visited.contains_key(root):
+                continue
+            visited.put(root, True)
+            path_position.put(root, 0)
+            call_stack = Array[Tuple]()
+            call_stack.append(Tuple([root, iter(debt_graph.get_vertex(root).edges)]))
+
+            while len(call_stack) > 0:
+                frame = call_stack[len(call_stack) - 1]
+                vertex, edges = frame[0], frame[1]
+                descended = False
+                for edge in edges:
+                    target = edge.destination
+                    if not in_component.contains_key(target):
+                        continue
+                    if not visited.contains_key(target):
+                        visited.put(target, True)
+                        path_edges.append(edge)
+                        path_position.put(target, len(path_edges))
+                        call_stack.append(Tuple([target, iter(debt_graph.get_vertex(target).edges)]))
+                        descended = True
+                        break
+                    if path_position.contains_key(target):
+                        # Back edge: chu trình gồm các cạnh trên nhánh từ target tới vertex cộng với cạnh này
+                        cycle_edges = LinkedList[GraphEdge]()
+                        for position in range(path_position.get(target), len(path_edges)):
+                            cycle_edges.append(path_edges[position])
+                        cycle_edges.append(edge)
+                        cycles.append(cycle_edges)
+                if descended:
+                    continue
+
+                call_stack.pop()
+                path_position.remove(vertex)
+                if len(call_stack) > 0:
+                    path_edges.pop()
+        return cycles
+
+    def _collect_parallel_transactions(self, debt_graph: Graph[str, BasicTransaction],
+                                       tx_array: Array[BasicTransaction]) -> HashTable[Tuple, LinkedList[BasicTransaction]]:
+        """
+        Gom các giao dịch trùng cặp (người nợ, người cho vay) chưa có cạnh trong đồ thị.
+
+        Đồ thị chỉ giữ một cạnh cho mỗi cặp; khi cạnh đó về 0, giao dịch kế tiếp của cặp được đưa vào thay.
+        """
+        pending = HashTable[Tuple, LinkedList[BasicTransaction]]()
+        for tx in tx_array:
+            if tx.amount_cents > 0 and debt_graph.get_edge_data(tx.debtor, tx.creditor) is not tx:
+                pair_key = Tuple([tx.debtor, tx.creditor])
+                queue = pending.get(pair_key)
+                if queue is None:
+                    queue = LinkedList[BasicTransaction]()
+                    pending.put(pair_key, queue)
+                queue.append(tx)
+        return pending
+
+    @staticmethod
+    def _remaining_cycle_amount(cycle_edges: LinkedList) -> Cents:
+        """
+        Số tiền nhỏ nhất hiện tại trên các cạnh của chu trình, hoặc 0 nếu có cạnh đã về 0
+        (cạnh đó đã bị xóa khỏi đồ thị nên chu trình không còn tồn tại).
+        """
+        min_amount: Cents = 0
+        for edge in cycle_edges:
+            amount = edge.data.amount_cents
+            if amount <= 0:
+                return 0
+            if min_amount == 0 or amount < min_amount:
+                min_amount = amount
+        return min_amount
+
+    def _cancel_cycle(self, debt_graph: Graph[str, BasicTransaction], cycle_edges: LinkedList,
+                      min_amount: Cents, pending: HashTable[Tuple, LinkedList[BasicTransaction]]) -> None:
+        """
+        Trừ min_amount khỏi mọi cạnh của chu trình và xóa ngay các cạnh về 0 khỏi đồ thị.
+
+        Độ phức tạp: O(tổng bậc ra của các đỉnh trong chu trình)
+        """
+        for edge in cycle_edges:
+            tx = edge.data
+            tx.amount_cents -= min_amount
+            if tx.amount_cents > 0:
+                continue
+            debt_graph.get_vertex(edge.source).edges.remove_by_value(edge)
+            queue = pending.get(Tuple([tx.debtor, tx.creditor]))
+            if queue is not None and not queue.is_empty():
+                next_tx = queue.remove_first()
+                debt_graph.add_edge(next_tx.debtor, next_tx.creditor, next_tx)
 
     def _optimal_net_settlement(self, tx_array: Array[BasicTransaction]) -> LinkedList[BasicTransaction]:
         """
@@ -239,15 +435,15 @@ class DebtCycleSimplifier:
         Trả về:
             LinkedList[BasicTransaction]: Danh sách giao dịch tối ưu sau net settlement
         """
-        # Tính số dư ròng
-        net_balances: HashTable[str, float] = HashTable()
+        # Tính số dư ròng (theo xu)
+        net_balances: HashTable[str, Cents] = HashTable()
         
         for tx_item in tx_array:
-            current_debtor_balance = net_balances.get(tx_item.debtor, 0.0)
-            current_creditor_balance = net_balances.get(tx_item.creditor, 0.0)
+            current_debtor_balance = net_balances.get(tx_item.debtor, 0)
+            current_creditor_balance = net_balances.get(tx_item.creditor, 0)
             
-            net_balances.put(tx_item.debtor, current_debtor_balance - tx_item.amount)
-            net_balances.put(tx_item.creditor, current_creditor_balance + tx_item.amount)
+            net_balances.put(tx_item.debtor, current_debtor_balance - tx_item.amount_cents)
+            net_balances.put(tx_item.creditor, current_creditor_balance + tx_item.amount_cents)
         
         # Phân loại người nợ và người cho vay
         debtors_list = Array[str]()
@@ -259,9 +455,9 @@ class DebtCycleSimplifier:
             while current_key_node:
                 person = current_key_node.data
                 balance = net_balances.get(person)
-                if balance < -EPSILON:  # Người nợ
+                if balance < 0:  # Người nợ
                     debtors_list.append(person)
-                elif balance > EPSILON:  # Người cho vay
+                elif balance > 0:  # Người cho vay
                     creditors_list.append(person)
                 current_key_node = current_key_node.next
         
@@ -277,21 +473,21 @@ class DebtCycleSimplifier:
             debtor_amount = abs(net_balances.get(debtor))
             
             for j in range(len(creditors_list)):
-                if debtor_amount <= EPSILON:
+                if debtor_amount <= 0:
                     break
                     
                 creditor = creditors_list.get(j)
                 creditor_amount = net_balances.get(creditor)
                 
-                if creditor_amount <= EPSILON:
+                if creditor_amount <= 0:
                     continue
                 
                 transfer_amount = min(debtor_amount, creditor_amount)
-                if transfer_amount > EPSILON:
-                    result.append(BasicTransaction(
+                if transfer_amount > 0:
+                    result.append(BasicTransaction.from_cents(
                         debtor=debtor,
                         creditor=creditor,
-                        amount=round_money(transfer_amount)
+                        amount_cents=transfer_amount
                     ))
                     
                     debtor_amount -= transfer_amount
@@ -299,6 +495,83 @@ class DebtCycleSimplifier:
         
         return result
 
+    def _settle_components(self, tx_array: Array[BasicTransaction]) -> LinkedList[BasicTransaction]:
+        """
+        Đơn giản hóa bằng cách gộp từng thành phần liên thông mạnh (chế độ "scc").
+
+        Quy trình:
+        1. Tách đồ thị nợ thành các thành phần liên thông mạnh (Tarjan lặp) - O(V + E)
+        2. Giao dịch giữa hai thành phần khác nhau được giữ nguyên (không thuộc chu trình nào)
+        3. Giao dịch bên trong một thành phần được gộp thành số dư ròng của thành phần đó
+        4. Mỗi thành phần được thanh toán lại dọc một cây khung BFS trên các quan hệ nợ bên trong nó
+           (bỏ qua chiều): xử lý đỉnh theo thứ tự BFS ngược, mỗi đỉnh thanh toán toàn bộ số dư với đỉnh cha
+           rồi chuyển phần chênh lệch lên cha. Thành phần k người cần tối đa k - 1 giao dịch, và mỗi giao
+           dịch nối hai người vốn đã có nợ với nhau (có thể theo chiều ngược lại)
+
+        Tham số:
+            tx_array: Mảng các giao dịch cần đơn giản hóa
+
+        Trả về:
+            LinkedList[BasicTransaction]: Giao dịch giữa các thành phần và giao dịch thanh toán trong thành phần
+        """
+        debt_graph = self._build_graph_from_list(tx_array)
+        components = self._strongly_connected_components(debt_graph, debt_graph.get_all_vertices())
+
+        capacity = max(HashTable.DEFAULT_CAPACITY, 2 * debt_graph.get_num_vertices())
+        component_of = HashTable[str, int](capacity)
+        component_id = 0
+        for component in components:
+            for member in component:
+                component_of.put(member, component_id)
+            component_id += 1
+
+        result = LinkedList[BasicTransaction]()
+        # Số dư ròng bên trong thành phần và danh sách kề vô hướng của các quan hệ nợ nội bộ
+        internal_balances = HashTable[str, Cents](capacity)
+        relationships = HashTable[str, LinkedList[str]](capacity)
+        for tx in tx_array:
+            if tx.amount_cents <= 0:
+                continue
+            debtor_component = component_of.get(tx.debtor)
+            if debtor_component is None or debtor_component != component_of.get(tx.creditor):
+                result.append(BasicTransaction.from_cents(tx.debtor, tx.creditor, tx.amount_cents))
+                continue
+            internal_balances.put(tx.debtor, internal_balances.get(tx.debtor, 0) - tx.amount_cents)
+            internal_balances.put(tx.creditor, internal_balances.get(tx.creditor, 0) + tx.amount_cents)
+            for person, other in ((tx.debtor, tx.creditor), (tx.creditor, tx.debtor)):
+                neighbours = relationships.get(person)
+                if neighbours is None:
+                    neighbours = LinkedList[str]()
+                    relationships.put(person, neighbours)
+                neighbours.append(other)
+
+        parent_of = HashTable[str, str](capacity)
+        for component in components:
+            # Cây khung BFS từ đỉnh đầu tiên của thành phần
+            root = component[0]
+            order = Array[str]()
+            order.append(root)
+            parent_of.put(root, root)
+            head = 0
+            while head < len(order):
+                person = order[head]
+                head += 1
+                for other in relationships.get(person):
+                    if not parent_of.contains_key(other):
+                        parent_of.put(other, person)
+                        order.append(other)
+
+            for position in range(len(order) - 1, 0, -1):
+                person = order[position]
+                parent = parent_of.get(person)
+                balance = internal_balances.get(person, 0)
+                if balance < 0:
+                    result.append(BasicTransaction.from_cents(person, parent, -balance))
+                elif balance > 0:
+                    result.append(BasicTransaction.from_cents(parent, person, balance))
+                internal_balances.put(parent, internal_balances.get(parent, 0) + balance)
+        return result
+
     def simplify(self) -> LinkedList[BasicTransaction]:
         """
         Thực hiện đơn giản hóa nợ hoàn chỉnh bằng thuật toán loại bỏ chu trình cải tiến.
@@ -306,16 +579,21 @@ class DebtCycleSimplifier:
         Thuật toán hoạt động theo 2 giai đoạn chính:
         
         Giai đoạn 1 - Loại bỏ chu trình có lợi:
-        1. Chuyển đổi danh sách giao dịch thành mảng để xử lý hiệu quả
-        2. Lặp cho đến khi không còn chu trình có lợi:
-           a. Xây dựng đồ thị nợ từ giao dịch hiện tại
-           b. Tìm tất cả chu trình có lợi và sắp xếp theo độ ưu tiên
-           c. Áp dụng chu trình tốt nhất (loại bỏ nhiều giao dịch nhất)
-           d. Cập nhật danh sách giao dịch và tiếp tục
+        1. Xây dựng đồ thị nợ một lần từ các giao dịch
+        2. Đưa mọi thành phần liên thông mạnh không tầm thường vào hàng đợi công việc
+        3. Với mỗi thành phần lấy ra khỏi hàng đợi:
+           a. Tìm các chu trình có lợi trong thành phần và sắp xếp theo độ ưu tiên
+           b. Hủy lần lượt theo độ ưu tiên mọi chu trình còn hợp lệ (kiểm tra lại amount_cents > 0 vì chu trình
+              trước có thể đã làm cạnh về 0), xóa các cạnh về 0 ngay trên đồ thị
+           c. Tách lại riêng thành phần này và đưa các thành phần con không tầm thường vào hàng đợi
+        4. Kết thúc khi hàng đợi rỗng, tức đồ thị không còn chu trình (không cần giới hạn số vòng lặp
+           vì mỗi lần liệt kê xóa ít nhất một cạnh)
         
         Giai đoạn 2 - Net settlement tối ưu:
         1. Tính số dư ròng cho tất cả người tham gia
         2. Sử dụng thuật toán matching tham lam để tạo giao dịch tối thiểu
+
+        Với mode="scc", thay cả hai giai đoạn bằng _settle_components (không sửa đổi giao dịch đầu vào).
         
         Trả về:
             LinkedList[BasicTransaction]: Danh sách giao dịch đã được đơn giản hóa tối ưu
@@ -328,39 +606,38 @@ class DebtCycleSimplifier:
         for tx_node_data in self.initial_transactions:
             current_tx_array.append(tx_node_data)
 
-        iteration_count = 0
-        max_iterations = min(len(current_tx_array) * 2, 50)  # Giới hạn số vòng lặp
+        if self.mode == "scc":
+            self.simplified_transactions = self._settle_components(current_tx_array)
+            return self.simplified_transactions
 
-        # Phase 1: Loại bỏ chu trình có lợi
-        while iteration_count < max_iterations and len(current_tx_array) > 1:
-            iteration_count += 1
-            
-            # Xây dựng đồ thị từ giao dịch hiện tại
-            debt_graph = self._build_graph_from_list(current_tx_array)
-            
-            # Tìm chu trình có lợi nhất
-            profitable_cycles = self._find_all_profitable_cycles(debt_graph)
-            
+        # Phase 1: Loại bỏ chu trình có lợi trên đồ thị được duy trì
+        debt_graph = self._build_graph_from_list(current_tx_array)
+        pending = self._collect_parallel_transactions(debt_graph, current_tx_array)
+        worklist = self._strongly_connected_components(debt_graph, debt_graph.get_all_vertices())
+
+        while not worklist.is_empty():
+            component = worklist.remove_first()
+            profitable_cycles = self._find_all_profitable_cycles(debt_graph, component)
             if profitable_cycles.is_empty():
-                break  # Không còn chu trình có lợi
-            
-            # Áp dụng chu trình tốt nhất
-            best_cycle_info = profitable_cycles.head.data
-            _, cycle_edges, min_amount = best_cycle_info[0], best_cycle_info[1], best_cycle_info[2]
-            
-            # Áp dụng loại bỏ chu trình
-            for edge_node in cycle_edges:
-                tx = edge_node.data
-                tx.amount -= min_amount
-            
-            # Cập nhật danh sách giao dịch
-            updated_tx_array = Array[BasicTransaction]()
-            for tx_in_array in current_tx_array:
-                if tx_in_array.amount > EPSILON:
-                    updated_tx_array.append(tx_in_array)
-            
-            current_tx_array = updated_tx_array
+                continue
+
+            # Áp dụng lần lượt mọi chu trình của lần liệt kê này theo độ ưu tiên, bỏ qua chu trình
+            # có cạnh đã bị các chu trình trước thanh toán hết
+            for cycle_info in profitable_cycles:
+                min_amount = self._remaining_cycle_amount(cycle_info[1])
+                if min_amount > 0:
+                    self._cancel_cycle(debt_graph, cycle_info[1], min_amount, pending)
+
+            # Chỉ thành phần vừa thay đổi cần tách lại; các thành phần khác giữ nguyên
+            for sub_component in self._strongly_connected_components(debt_graph, component):
+                worklist.append(sub_component)
+
+        # Cập nhật danh sách giao dịch
+        remaining_tx_array = Array[BasicTransaction]()
+        for tx_in_array in current_tx_array:
+            if tx_in_array.amount_cents > 0:
+                remaining_tx_array.append(tx_in_array)
 
         # Phase 2: Net settlement tối ưu cho giao dịch còn lại
-        self.simplified_transactions = self._optimal_net_settlement(current_tx_array)
-        return self.simplified_transactions
\ No newline at end of file
+        self.simplified_transactions = self._optimal_net_settlement(remaining_tx_array)
+        return self.simplified_transactions
@@ -1,20 +1,121 @@
 # Thuật toán Đơn giản hóa Nợ sử dụng Quy hoạch động
 from __future__ import annotations
+import sys
+from array import array
+from typing import Callable, Iterable
 
 from src.core_type import BasicTransaction
-from src.data_structures import LinkedList, HashTable, PriorityQueue, Tuple, Array
+from src.data_structures import LinkedList, HashTable, PriorityQueue, Tuple, LRUCache
 from src.utils.sorting import merge_sort_linked_list
-from src.utils.constants import EPSILON
-from src.utils.money_utils import round_money
+from src.utils.money_utils import Cents
+from src.algorithms.balance_ledger import BalanceLedger
+from src.algorithms.basic_transactions.exact_solver import solve_min_transfers, DEFAULT_MAX_PEOPLE
+from src.algorithms.basic_transactions.meet_in_the_middle import (
+    solve_by_decomposition, DEFAULT_MAX_MITM_PEOPLE, DEFAULT_MAX_HALF_ENTRIES
+)
+from src.database.dp_memo import PersistentDPMemo
 
 # Định nghĩa kiểu dữ liệu cho giá trị bảng DP
 # DPValueTuple: Đại diện cho giá trị lưu trong bảng DP cho một trạng thái
-# Cấu trúc: (tổng_chi_phí_tài_chính, tổng_số_giao_dịch_đơn_giản, danh_sách_giao_dịch_đơn_giản)
+# Cấu trúc: (tổng_chi_phí_tài_chính, tổng_số_giao_dịch, giao_dịch_của_bước_này, khóa_trạng_thái_kế_tiếp)
+# - giao_dịch_của_bước_này: LinkedList[Tuple(hạng_người_trả, hạng_người_nhận, số_tiền)], trong đó hạng là
+#   vị trí của người trong thứ tự chuẩn của trạng thái
+# - khóa_trạng_thái_kế_tiếp: con trỏ tới mục của trạng thái sau bước này (None với trạng thái cuối).
+# Danh sách giao dịch đầy đủ chỉ được dựng lại một lần ở cuối bằng cách đi theo các con trỏ này.
 DPValueTuple = Tuple
 
-# Khóa bảng DP: Tuple chứa số dư của mọi người theo thứ tự cố định
-# Giá trị bảng DP: DPValueTuple như định nghĩa ở trên
-DPTable = HashTable[Tuple, DPValueTuple]
+# Khóa bảng DP: dạng chuẩn của trạng thái - bội số dư khác 0 (theo xu) đã sắp xếp, đóng gói thành bytes.
+# Hai trạng thái chỉ khác nhau ở việc ai giữ số dư nào dùng chung một mục.
+DPTable = LRUCache[bytes, DPValueTuple]
+
+# Kích thước ước lượng (byte) của mỗi giao dịch dạng hạng trong một mục ghi nhớ
+_RANK_TRANSFER_BYTES = 200
+
+
+def dp_memo_entry_size(key: bytes, value: Tuple) -> int:
+    """Ước lượng bộ nhớ của một mục trong bảng ghi nhớ DP, dùng cho giới hạn memo_max_bytes."""
+    return sys.getsizeof(key) + sys.getsizeof(value) + _RANK_TRANSFER_BYTES * len(value[2])
+
+
+def canonical_balance_key(balances: HashTable[str, Cents], people: Iterable[str]) -> Tuple:
+    """
+    Tạo khóa chuẩn cho một trạng thái số dư.
+
+    Người có số dư khác 0 được sắp xếp theo (số dư, tên); khóa chỉ gồm dãy số dư đã sắp xếp,
+    đóng gói thành bytes (8 byte mỗi số dư). Thứ tự tên đi kèm dùng để ánh xạ hạng -> người
+    khi dựng lại giao dịch từ một mục của bảng ghi nhớ.
+
+    Trả về:
+        Tuple: (khóa bytes, list tên theo thứ tự chuẩn)
+    """
+    entries = []
+    for name in people:
+        balance = balances.get(name, 0)
+        if balance != 0:
+            entries.append((balance, name))
+    entries.sort()
+    key = array('q', [balance for balance, _ in entries]).tobytes()
+    return Tuple([key, [name for _, name in entries]])
+
+
+def transfers_to_ranks(transactions: LinkedList[BasicTransaction], ordered_names: list[str]) -> LinkedList[Tuple]:
+    """Chuyển giao dịch theo tên sang dạng (hạng người trả, hạng người nhận, số tiền) của trạng thái."""
+    rank_of: HashTable[str, int] = HashTable()
+    for rank, name in enumerate(ordered_names):
+        rank_of.put(name, rank)
+    rank_transfers = LinkedList[Tuple]()
+    for tx in transactions:
+        rank_transfers.append(Tuple([rank_of.get(tx.debtor), rank_of.get(tx.creditor), tx.amount_cents]))
+    return rank_transfers
+
+
+def transfers_from_ranks(rank_transfers: LinkedList[Tuple], ordered_names: list[str]) -> LinkedList[BasicTransaction]:
+    """Dựng lại giao dịch theo tên từ dạng hạng, dùng thứ tự chuẩn của trạng thái hiện tại."""
+    transactions = LinkedList[BasicTransaction]()
+    for debtor_rank, creditor_rank, amount_cents in rank_transfers:
+        transactions.append(BasicTransaction.from_cents(
+            debtor=ordered_names[debtor_rank],
+            creditor=ordered_names[creditor_rank],
+            amount_cents=amount_cents
+        ))
+    return transactions
+
+
+def reconstruct_transfers(memo: LRUCache[bytes, DPValueTuple],
+                          balances: HashTable[str, Cents],
+                          people: Iterable[str],
+                          solve_state: Callable[[HashTable[str, Cents]], object]) -> LinkedList[BasicTransaction]:
+    """
+    Dựng lại danh sách giao dịch đầy đủ từ bảng ghi nhớ bằng cách đi theo con trỏ trạng thái kế tiếp.
+
+    Tại mỗi trạng thái, giao dịch của bước được ánh xạ từ hạng về người theo thứ tự chuẩn của trạng thái,
+    rồi áp dụng vào số dư để sang trạng thái kế tiếp. Nếu một mục đã bị loại khỏi bảng ghi nhớ (LRU),
+    solve_state được gọi để giải lại từ trạng thái đó (bộ giải xác định nên chuỗi không đổi).
+
+    Tham số:
+        memo: Bảng ghi nhớ với các mục DPValueTuple
+        balances: Số dư ban đầu (không bị thay đổi)
+        people: Danh sách người tham gia dùng để tạo khóa chuẩn
+        solve_state: Hàm giải và ghi nhớ một trạng thái số dư
+
+    Trả về:
+        LinkedList[BasicTransaction]: Các giao dịch theo thứ tự từ trạng thái ban đầu tới trạng thái cuối
+    """
+    transactions = LinkedList[BasicTransaction]()
+    current_balances = balances.copy()
+    while True:
+        canonical_state = canonical_balance_key(current_balances, people)
+        entry = memo.peek(canonical_state[0])
+        if entry is None:
+            solve_state(current_balances)
+            entry = memo.peek(canonical_state[0])
+        for tx in transfers_from_ranks(entry[2], canonical_state[1]):
+            transactions.append(tx)
+            current_balances.put(tx.debtor, current_balances.get(tx.debtor, 0) + tx.amount_cents)
+            current_balances.put(tx.creditor, current_balances.get(tx.creditor, 0) - tx.amount_cents)
+        if entry[3] is None:
+            return transactions
+
 
 class DynamicProgrammingSimplifier:
     """
@@ -26,7 +127,7 @@ class DynamicProgrammingSimplifier:
     
     Phương pháp tiếp cận:
     1. Tính toán số dư ròng cho mỗi người từ các giao dịch đầu vào
-    2. Sử dụng DP đệ quy với ghi nhớ để khám phá tất cả khả năng thanh toán
+    2. Sử dụng DP với ghi nhớ (ngăn xếp tường minh, bảng ghi nhớ LRU có giới hạn) để khám phá các khả năng thanh toán
     3. Áp dụng chiến lược tham lam ở mỗi bước để giảm không gian tìm kiếm
     4. Lưu trữ kết quả trung gian để tránh tính toán lặp lại
     5. Trả về chuỗi giao dịch tối ưu
@@ -45,24 +146,63 @@ class DynamicProgrammingSimplifier:
     - Phù hợp hơn với mạng lưới nợ từ nhỏ đến trung bình
     """
 
-    def __init__(self, transactions: LinkedList[BasicTransaction]):
+    def __init__(self,
+                 transactions: Iterable[BasicTransaction] | BalanceLedger = (),
+                 exact: bool = False,
+                 max_exact_people: int = DEFAULT_MAX_PEOPLE,
+                 exact_max_workers: int | None = None,
+                 decompose_max_people: int = DEFAULT_MAX_MITM_PEOPLE,
+                 max_half_entries: int = DEFAULT_MAX_HALF_ENTRIES,
+                 memo_max_entries: int | None = None,
+                 memo_max_bytes: int | None = None,
+                 persistent_memo: PersistentDPMemo | None = None):
         """
         Khởi tạo bộ đơn giản hóa nợ dựa trên DP với các giao dịch đầu vào.
         
         Tham số:
-            transactions: Danh sách liên kết các giao dịch cơ bản cần được đơn giản hóa
+            transactions: Danh sách liên kết hoặc bất kỳ iterable/generator nào của các giao dịch cơ bản
+                          cần được đơn giản hóa. Giao dịch chỉ được duyệt một lần, không được giữ lại.
+                          Cũng có thể truyền một BalanceLedger đã tính sẵn.
+            exact: True để dùng bộ giải chính xác (QHĐ bitmask trên tổng tập con) cho số giao dịch
+                   tối thiểu chứng minh được. Chỉ nhóm tới max_exact_people người được đảm bảo tối ưu; nhóm
+                   lớn hơn nhưng không quá decompose_max_people (mặc định 23-40 người) được tách bằng
+                   heuristic, kết quả hợp lệ nhưng có thể nhiều hơn số giao dịch tối thiểu
+            max_exact_people: Số người có số dư khác 0 tối đa cho bộ giải chính xác; lớn hơn thì dùng bước tách
+                              (decompose_max_people) hoặc quay về thuật toán DP ghi nhớ thông thường
+            exact_max_workers: Số tiến trình cho bộ giải chính xác (chia 2^n tập con theo các bit cao);
+                               None hoặc 1 = tuần tự
+            decompose_max_people: Với exact=True, nhóm lớn hơn max_exact_people nhưng không quá giá trị này được
+                                  tách thành các nhóm con tổng bằng 0 (meet-in-the-middle) rồi giải từng nhóm
+            max_half_entries: Giới hạn bộ nhớ của bước tách: số mục tối đa của mỗi bảng tổng nửa tập
+            memo_max_entries: Số mục tối đa của bảng ghi nhớ (None = không giới hạn)
+            memo_max_bytes: Dung lượng ước lượng tối đa của bảng ghi nhớ theo byte (None = không giới hạn);
+                            khi vượt giới hạn, mục ít dùng gần đây nhất bị loại bỏ (LRU)
+            persistent_memo: Bảng ghi nhớ trên đĩa dùng chung giữa các lần chạy/tiến trình; nhóm có cùng
+                             bội số dư với một lần chạy trước được trả lời ngay từ bảng này
         """
-        self.initial_transactions: LinkedList[BasicTransaction] = transactions
-        # Bảng băm lưu trữ số dư hiện tại cho mỗi người: tên_người -> số_dư
-        self.people_balances: HashTable[str, float] = HashTable()
+        self.persistent_memo: PersistentDPMemo | None = persistent_memo
+        self.exact: bool = exact
+        self.max_exact_people: int = max_exact_people
+        self.exact_max_workers: int | None = exact_max_workers
+        self.decompose_max_people: int = decompose_max_people
+        self.max_half_entries: int = max_half_entries
+        # True nếu lần simplify() gần nhất dùng bộ giải chính xác (kết quả tối ưu được đảm bảo)
+        self.used_exact_solver: bool = False
+        # True nếu lần simplify() gần nhất tách nhóm bằng meet-in-the-middle trước khi giải
+        self.used_decomposition: bool = False
+        # Bảng băm lưu trữ số dư hiện tại cho mỗi người: tên_người -> số_dư (theo xu)
+        self.people_balances: HashTable[str, Cents] = HashTable()
         # Danh sách liên kết lưu trữ tên tất cả người tham gia, được sắp xếp để đảm bảo tính nhất quán
         self.all_people_nodes: LinkedList[str] = LinkedList()
-        # Bảng DP ghi nhớ cho các trạng thái con đã được giải quyết
-        self.dp_table: DPTable = HashTable()
+        # Bảng DP ghi nhớ cho các trạng thái con đã được giải quyết (giới hạn tùy chọn, loại bỏ theo LRU)
+        self.dp_table: DPTable = LRUCache(memo_max_entries, memo_max_bytes, size_of=dp_memo_entry_size)
+        # Số giao dịch đã nạp và cờ cho biết danh sách người tham gia cần sắp xếp lại
+        self.transaction_count: int = 0
+        self._people_stale: bool = False
 
-        self._initialize_people_and_balances()
+        self._initialize_people_and_balances(transactions)
 
-    def _initialize_people_and_balances(self) -> None:
+    def _initialize_people_and_balances(self, transactions: Iterable[BasicTransaction] | BalanceLedger) -> None:
         """
         Khởi tạo danh sách người tham gia duy nhất và tính toán số dư ban đầu
         từ các giao dịch đầu vào. Tên người tham gia được sắp xếp để đảm bảo thứ tự xác định.
@@ -71,62 +211,62 @@ class DynamicProgrammingSimplifier:
         - Người nợ: số dư giảm theo số tiền giao dịch
         - Người cho vay: số dư tăng theo số tiền giao dịch
         """
-        unique_names_table: HashTable[str, bool] = HashTable()
+        if isinstance(transactions, BalanceLedger):
+            # Số dư và danh sách người đã sắp xếp lấy thẳng từ sổ cái dùng chung
+            self.add_balances(transactions.balances, transactions.transaction_count)
+            self.all_people_nodes = transactions.sorted_people
+            self._people_stale = False
+            return
+        self.add_many(transactions)
+        self._sort_people()
 
-        # Xử lý từng giao dịch để trích xuất người tham gia và tính toán số dư
-        current_tx_node = self.initial_transactions.head
-        while current_tx_node:
-            tx = current_tx_node.data
-            
-            # Theo dõi tên người tham gia duy nhất
-            unique_names_table.put(tx.debtor, True)
-            unique_names_table.put(tx.creditor, True)
-            
+    def add(self, tx: BasicTransaction) -> None:
+        """Nạp thêm một giao dịch vào số dư hiện tại."""
+        self.add_many((tx,))
+
+    def add_many(self, transactions: Iterable[BasicTransaction]) -> None:
+        """
+        Nạp thêm một loạt giao dịch theo kiểu luồng, chỉ giữ lại số dư của từng người (bộ nhớ O(số người)).
+        Danh sách người tham gia được sắp xếp lại khi gọi simplify().
+        """
+        balances = self.people_balances
+        for tx in transactions:
             # Cập nhật số dư: người nợ nợ tiền (âm), người cho vay nhận tiền (dương)
-            current_debtor_balance = self.people_balances.get(tx.debtor, 0.0)
-            self.people_balances.put(tx.debtor, current_debtor_balance - tx.amount)
-            
-            current_creditor_balance = self.people_balances.get(tx.creditor, 0.0)
-            self.people_balances.put(tx.creditor, current_creditor_balance + tx.amount)
-            
-            current_tx_node = current_tx_node.next
-        
-        # Trích xuất và sắp xếp tên người tham gia để tạo khóa DP nhất quán
-        names_ll = unique_names_table.keys()
+            balances.put(tx.debtor, balances.get(tx.debtor, 0) - tx.amount_cents)
+            balances.put(tx.creditor, balances.get(tx.creditor, 0) + tx.amount_cents)
+            self.transaction_count += 1
+            self._people_stale = True
+
+    def add_balances(self, balances: HashTable[str, Cents], transaction_count: int) -> None:
+        """
+        Cộng dồn một bảng số dư đã tổng hợp sẵn (ví dụ BalanceAggregate.balances từ aggregate_balances)
+        thay vì duyệt lại từng giao dịch.
+
+        Tham số:
+            balances: Số dư ròng theo xu của từng người
+            transaction_count: Số giao dịch gốc đã được tổng hợp vào bảng số dư
+        """
+        people_balances = self.people_balances
+        for person in balances:
+            people_balances.put(person, people_balances.get(person, 0) + balances.get(person))
+        self.transaction_count += transaction_count
+        self._people_stale = True
+
+    def _sort_people(self) -> None:
+        """Sắp xếp tên người tham gia theo thứ tự bảng chữ cái để tạo khóa DP nhất quán."""
+        self._people_stale = False
+        # Mỗi người xuất hiện trong giao dịch đều có một mục trong bảng số dư (kể cả khi bằng 0)
+        names_ll = self.people_balances.keys()
         if names_ll is None or names_ll.is_empty():
             self.all_people_nodes = LinkedList[str]()
             return
 
-        # Sắp xếp tên theo thứ tự bảng chữ cái để đảm bảo biểu diễn trạng thái DP xác định
         self.all_people_nodes = merge_sort_linked_list(
             names_ll, 
             comparator=lambda a, b: a < b
         )
 
-    def _get_balances_tuple_key(self, current_balances: HashTable[str, float]) -> Tuple:
-        """
-        Chuyển đổi trạng thái số dư hiện tại thành khóa Tuple xác định cho bảng DP.
-        
-        Thứ tự Tuple được đảm bảo bởi self.all_people_nodes (đã được sắp xếp trước).
-        Điều này đảm bảo biểu diễn trạng thái nhất quán qua các lần gọi đệ quy.
-        
-        Tham số:
-            current_balances: Bảng băm ánh xạ tên người với số dư của họ
-            
-        Trả về:
-            Tuple: Các giá trị số dư được sắp xếp thứ tự phù hợp làm khóa bảng DP
-        """
-        # Sử dụng Array thay vì list Python built-in
-        balance_values = Array[float]()
-        current_name_node = self.all_people_nodes.head
-        while current_name_node:
-            name = current_name_node.data
-            balance_values.append(current_balances.get(name, 0.0))
-            current_name_node = current_name_node.next
-        
-        return Tuple(balance_values)
-
-    def _deep_copy_balances_map(self, source_balances: HashTable[str, float]) -> HashTable[str, float]:
+    def _deep_copy_balances_map(self, source_balances: HashTable[str, Cents]) -> HashTable[str, Cents]:
         """
         Tạo bản sao sâu của bảng băm số dư để tránh thay đổi trạng thái.
         
@@ -137,9 +277,9 @@ class DynamicProgrammingSimplifier:
             source_balances: Ánh xạ số dư gốc cần sao chép
             
         Trả về:
-            HashTable[str, float]: Bản sao sâu của số dư nguồn
+            HashTable[str, Cents]: Bản sao sâu của số dư nguồn
         """
-        copied_balances = HashTable[str, float]()
+        copied_balances = HashTable[str, Cents]()
         if source_balances and not source_balances.is_empty():
             keys_ll = source_balances.keys()
             if keys_ll:
@@ -150,7 +290,7 @@ class DynamicProgrammingSimplifier:
                     current_key_node = current_key_node.next
         return copied_balances
 
-    def _find_greedy_settlements(self, current_balances_map: HashTable[str, float]) -> Tuple:
+    def _find_greedy_settlements(self, current_balances_map: HashTable[str, Cents]) -> Tuple:
         """
         Áp dụng chiến lược thanh toán tham lam cho trạng thái số dư hiện tại.
         
@@ -169,13 +309,13 @@ class DynamicProgrammingSimplifier:
         Trả về:
             Tuple chứa:
                 1. LinkedList[BasicTransaction]: các giao dịch được tạo trong bước này
-                2. Tuple[float, int]: (chi_phí_tài_chính_bước_này, số_giao_dịch_bước_này)
-                3. HashTable[str, float]: trạng thái số dư cập nhật sau thanh toán
+                2. Tuple[Cents, int]: (chi_phí_tài_chính_bước_này, số_giao_dịch_bước_này)
+                3. HashTable[str, Cents]: trạng thái số dư cập nhật sau thanh toán
         """
         # Khởi tạo các cấu trúc dữ liệu
         temp_simplified_tx_list = LinkedList[BasicTransaction]()
-        balances_after_settlement = HashTable[str, float]()
-        financial_cost = 0.0
+        balances_after_settlement = HashTable[str, Cents]()
+        financial_cost = 0
         num_tx_this_step = 0
         
         # Tạo bản sao cô lập để ngăn thay đổi trạng thái
@@ -199,13 +339,13 @@ class DynamicProgrammingSimplifier:
             current_person_node = people_names_ll.head
             while current_person_node:
                 person_name = current_person_node.data
-                balance = balances_after_settlement.get(person_name, 0.0)
+                balance = balances_after_settlement.get(person_name, 0)
                 
-                if balance < -EPSILON:  # Người nợ: nợ tiền
+                if balance < 0:  # Người nợ: nợ tiền
                     debtors_pq.enqueue(Tuple([person_name, balance]), balance)
-                elif balance > EPSILON:  # Người cho vay: được nợ tiền
+                elif balance > 0:  # Người cho vay: được nợ tiền
                     creditors_pq.enqueue(Tuple([person_name, balance]), balance)
-                # Bỏ qua những người tham gia có số dư gần bằng không (đã thanh toán)
+                # Bỏ qua những người tham gia có số dư bằng không (đã thanh toán)
                 current_person_node = current_person_node.next
         
         # Vòng lặp thanh toán tham lam: ghép các khoản nợ lớn nhất với tín dụng lớn nhất
@@ -220,31 +360,31 @@ class DynamicProgrammingSimplifier:
             creditor_balance_positive = creditor_info_tuple[1]
             
             # Tính toán số tiền thanh toán tối ưu (bị giới hạn bởi số tiền nhỏ hơn của nợ/tín dụng)
-            amount_to_settle = round_money(min(abs(debtor_balance_negative), creditor_balance_positive))
+            amount_to_settle = min(-debtor_balance_negative, creditor_balance_positive)
             
-            # Chỉ tạo giao dịch nếu số tiền có ý nghĩa
-            if amount_to_settle > EPSILON:
-                new_transaction = BasicTransaction(
+            # Chỉ tạo giao dịch nếu số tiền dương
+            if amount_to_settle > 0:
+                new_transaction = BasicTransaction.from_cents(
                     debtor=debtor_name,
                     creditor=creditor_name,
-                    amount=amount_to_settle
+                    amount_cents=amount_to_settle
                 )
                 temp_simplified_tx_list.append(new_transaction)
                 financial_cost += amount_to_settle
                 num_tx_this_step += 1
 
                 # Cập nhật số dư sau thanh toán
-                updated_debtor_balance = round_money(debtor_balance_negative + amount_to_settle)
-                updated_creditor_balance = round_money(creditor_balance_positive - amount_to_settle)
+                updated_debtor_balance = debtor_balance_negative + amount_to_settle
+                updated_creditor_balance = creditor_balance_positive - amount_to_settle
 
                 balances_after_settlement.put(debtor_name, updated_debtor_balance)
                 balances_after_settlement.put(creditor_name, updated_creditor_balance)
 
-                # Đưa lại vào hàng đợi những người tham gia nếu họ vẫn có số dư đáng kể
-                if updated_debtor_balance < -EPSILON:
+                # Đưa lại vào hàng đợi những người tham gia nếu họ vẫn còn số dư
+                if updated_debtor_balance < 0:
                     debtors_pq.enqueue(Tuple([debtor_name, updated_debtor_balance]), updated_debtor_balance)
                 
-                if updated_creditor_balance > EPSILON:
+                if updated_creditor_balance > 0:
                     creditors_pq.enqueue(Tuple([creditor_name, updated_creditor_balance]), updated_creditor_balance)
 
         return Tuple([
@@ -253,112 +393,82 @@ class DynamicProgrammingSimplifier:
             balances_after_settlement
         ])
 
-    def _solve_dp_recursive(self, current_balances_map: HashTable[str, float]) -> DPValueTuple:
+    def _solve_dp(self, initial_balances_map: HashTable[str, Cents]) -> Tuple:
         """
-        Hàm DP đệ quy cốt lõi với ghi nhớ để đơn giản hóa nợ tối ưu.
+        Bộ giải DP cốt lõi với ghi nhớ, dùng ngăn xếp tường minh thay cho đệ quy.
         
-        Hàm này triển khai trái tim của thuật toán DP:
-        1. Kiểm tra bảng ghi nhớ cho các kết quả đã tính toán trước đó
-        2. Xử lý trường hợp cơ sở: tất cả số dư gần bằng không (không còn nợ)
-        3. Áp dụng thanh toán tham lam cho trạng thái hiện tại
-        4. Giải đệ quy bài toán con kết quả
-        5. Kết hợp bước hiện tại với giải pháp đệ quy
-        6. Lưu trữ kết quả để sử dụng trong tương lai
+        1. Đi xuôi: từ trạng thái ban đầu, áp dụng bước thanh toán tham lam liên tiếp và đẩy mỗi
+           trạng thái đã đi qua vào ngăn xếp, cho tới khi gặp trạng thái đã ghi nhớ hoặc trường hợp
+           cơ sở (mọi số dư bằng 0)
+        2. Đi ngược: lấy từng trạng thái khỏi ngăn xếp, cộng chi phí và số giao dịch của bước với
+           lời giải phía sau, rồi lưu (chi phí, số giao dịch, giao dịch của bước, khóa kế tiếp)
+           vào bảng ghi nhớ. Danh sách giao dịch của phần phía sau không bị sao chép.
         
-        Thuật toán đảm bảo tính tối ưu bằng cách khám phá tất cả các chuỗi
-        thanh toán có thể và chọn ra chuỗi có chi phí/giao dịch tối thiểu.
+        Độ sâu không bị giới hạn bởi ngăn xếp lời gọi của Python nên không có RecursionError.
         
         Tham số:
-            current_balances_map: Trạng thái số dư hiện tại cho tất cả người tham gia
+            initial_balances_map: Trạng thái số dư ban đầu cho tất cả người tham gia
             
         Trả về:
-            DPValueTuple: (tổng_chi_phí, tổng_giao_dịch, danh_sách_giao_dịch) cho giải pháp tối ưu
+            Tuple: (tổng_chi_phí, tổng_giao_dịch) của giải pháp; danh sách giao dịch được dựng lại
+                   bằng reconstruct_transfers
         """
+        # Ngăn xếp các bước đã đi qua: (khóa, thứ_tự_tên, giao_dịch_bước, chi_phí_bước, số_giao_dịch_bước)
+        pending_steps = LinkedList[Tuple]()
+        current_balances_map = initial_balances_map
 
-        # Bước 1: Tạo khóa bảng DP từ trạng thái hiện tại
-        current_balances_key_tuple = self._get_balances_tuple_key(current_balances_map)
-        
-        # Bước 2: Kiểm tra bảng ghi nhớ (tránh tính toán lặp lại)
-        if self.dp_table.contains_key(current_balances_key_tuple):
-            return self.dp_table.get(current_balances_key_tuple)
-        
-        # Bước 3: Trường hợp cơ sở - tất cả số dư gần bằng không (bài toán được giải quyết)
-        all_balances_zero = True
-        map_keys_ll = current_balances_map.keys()
-        if map_keys_ll:
-            current_key_node = map_keys_ll.head
-            while current_key_node:
-                person_name = current_key_node.data
-                if abs(current_balances_map.get(person_name, 0.0)) > EPSILON:
-                    all_balances_zero = False
-                    break
-                current_key_node = current_key_node.next
-            
-        if all_balances_zero:
-            # Không còn nợ - tìm thấy giải pháp tối ưu
-            base_result = Tuple([0.0, 0, LinkedList[BasicTransaction]()])
-            self.dp_table.put(current_balances_key_tuple, base_result)
-            return base_result
-        
-        # Bước 4: Trường hợp đệ quy - áp dụng bước tham lam và giải bài toán con
-        settlements_info_tuple = self._find_greedy_settlements(current_balances_map)
-        
-        # Xử lý lỗi cho các trường hợp biên
-        if not settlements_info_tuple: 
-            error_result = Tuple([float('inf'), float('inf'), LinkedList[BasicTransaction]()])
-            self.dp_table.put(current_balances_key_tuple, error_result)
-            return error_result
-
-        # Trích xuất kết quả từ bước thanh toán tham lam
-        tx_list_this_step = settlements_info_tuple[0]
-        cost_and_count_this_step_tuple = settlements_info_tuple[1]
-        next_balances_map = settlements_info_tuple[2]
-
-        cost_this_step = cost_and_count_this_step_tuple[0]
-        tx_count_this_step = cost_and_count_this_step_tuple[1]
-        
-        # Gọi đệ quy để giải quyết bài toán con còn lại
-        recursive_result_tuple = self._solve_dp_recursive(next_balances_map)
-        
-        # Xử lý lỗi cho lời gọi đệ quy
-        if not recursive_result_tuple:
-             error_result = Tuple([float('inf'), float('inf'), LinkedList[BasicTransaction]()])
-             self.dp_table.put(current_balances_key_tuple, error_result)
-             return error_result
-
-        # Trích xuất các thành phần giải pháp đệ quy
-        cost_from_recursion = recursive_result_tuple[0]
-        tx_count_from_recursion = recursive_result_tuple[1]
-        tx_list_from_recursion = recursive_result_tuple[2]
-        
-        # Bước 5: Kết hợp bước hiện tại với giải pháp đệ quy
-        total_accumulated_cost = cost_this_step + cost_from_recursion
-        total_tx_count = tx_count_this_step + tx_count_from_recursion
-        
-        # Hợp nhất danh sách giao dịch: bước hiện tại + giải pháp đệ quy
-        final_combined_tx_list = LinkedList[BasicTransaction]()
-        
-        # Thêm giao dịch từ bước tham lam hiện tại
-        if tx_list_this_step and not tx_list_this_step.is_empty():
-            current_node = tx_list_this_step.head
-            while current_node:
-                final_combined_tx_list.append(current_node.data)
-                current_node = current_node.next
-                
-        # Thêm giao dịch từ giải pháp đệ quy
-        if tx_list_from_recursion and not tx_list_from_recursion.is_empty():
-            current_node = tx_list_from_recursion.head
-            while current_node:
-                final_combined_tx_list.append(current_node.data)
-                current_node = current_node.next
-        
-        # Tạo kết quả cuối cùng cho trạng thái hiện tại
-        current_state_result = Tuple([total_accumulated_cost, total_tx_count, final_combined_tx_list])
-        
-        # Bước 6: Lưu trữ kết quả trong bảng DP trước khi trả về
-        self.dp_table.put(current_balances_key_tuple, current_state_result)
-        
-        return current_state_result
+        while True:
+            # Tạo khóa chuẩn của trạng thái hiện tại
+            canonical_state = canonical_balance_key(current_balances_map, self.all_people_nodes)
+            current_balances_key = canonical_state[0]
+            ordered_names = canonical_state[1]
+
+            # Kiểm tra bảng ghi nhớ
+            memoized_result = self.dp_table.get(current_balances_key)
+            if memoized_result is not None:
+                result = Tuple([memoized_result[0], memoized_result[1]])
+                break
+
+            # Trường hợp cơ sở: mọi số dư bằng không (khóa chuẩn rỗng)
+            if not ordered_names:
+                self.dp_table.put(current_balances_key, Tuple([0, 0, LinkedList[Tuple](), None]))
+                result = Tuple([0, 0])
+                break
+
+            settlements_info_tuple = self._find_greedy_settlements(current_balances_map)
+            # Xử lý lỗi cho các trường hợp biên
+            if not settlements_info_tuple:
+                self.dp_table.put(
+                    current_balances_key, Tuple([float('inf'), float('inf'), LinkedList[Tuple](), None])
+                )
+                result = Tuple([float('inf'), float('inf')])
+                break
+
+            cost_and_count_this_step_tuple = settlements_info_tuple[1]
+            pending_steps.prepend(Tuple([
+                current_balances_key,
+                ordered_names,
+                settlements_info_tuple[0],
+                cost_and_count_this_step_tuple[0],
+                cost_and_count_this_step_tuple[1]
+            ]))
+            current_balances_map = settlements_info_tuple[2]
+
+        successor_key = current_balances_key
+        while not pending_steps.is_empty():
+            step = pending_steps.remove_first()
+            result = Tuple([step[3] + result[0], step[4] + result[1]])
+            # Mục ghi nhớ chỉ giữ giao dịch của bước này (dạng hạng) và con trỏ tới trạng thái kế tiếp
+            self.dp_table.put(step[0], Tuple([
+                result[0], result[1], transfers_to_ranks(step[2], step[1]), successor_key
+            ]))
+            successor_key = step[0]
+
+        return result
+
+    def memo_stats(self) -> HashTable[str, int]:
+        """Thống kê bảng ghi nhớ: hits, misses, evictions, entries, bytes."""
+        return self.dp_table.stats()
 
     def simplify(self) -> LinkedList[BasicTransaction]:
         """
@@ -377,17 +487,55 @@ class DynamicProgrammingSimplifier:
             LinkedList[BasicTransaction]: Danh sách giao dịch được đơn giản hóa tối ưu
         """
         # Xử lý trường hợp biên: không có giao dịch đầu vào
-        if self.initial_transactions.is_empty():
+        if self.transaction_count == 0:
             return LinkedList[BasicTransaction]()
+        if self._people_stale:
+            self._sort_people()
 
-        # Giải bài toán DP bắt đầu từ trạng thái số dư ban đầu
-        final_result_tuple = self._solve_dp_recursive(self.people_balances)
+        canonical_state = canonical_balance_key(self.people_balances, self.all_people_nodes)
+        people_count = len(canonical_state[1])
+        self.used_exact_solver = self.exact and people_count <= self.max_exact_people
+        self.used_decomposition = (
+            self.exact and not self.used_exact_solver and people_count <= self.decompose_max_people
+        )
+        if self.used_exact_solver:
+            algorithm = "dp_exact"
+        elif self.used_decomposition:
+            # Kết quả tách phụ thuộc vào các tham số này (không phải lời giải tối ưu duy nhất) nên chúng
+            # là một phần của khóa, tránh trả lời lần chạy có tham số khác bằng lời giải cũ
+            algorithm = f"dp_mitm:{self.max_exact_people}:{self.max_half_entries}"
+        else:
+            algorithm = "dp"
 
-        # Trích xuất danh sách giao dịch từ giải pháp tối ưu
-        if not final_result_tuple:
-            return LinkedList[BasicTransaction]()
-            
-        # final_result_tuple: (tổng_chi_phí, tổng_số_giao_dịch, danh_sách_giao_dịch_đơn_giản)
-        simplified_transactions_list = final_result_tuple[2]
-        
-        return simplified_transactions_list
\ No newline at end of file
+        # Lời giải của một nhóm có cùng bội số dư đã được lưu trên đĩa từ lần chạy trước
+        if self.persistent_memo is not None:
+            stored = self.persistent_memo.get(algorithm, canonical_state[0])
+            if stored is not None:
+                return transfers_from_ranks(stored[2], canonical_state[1])
+
+        if self.used_exact_solver:
+            simplified_txs = solve_min_transfers(
+                self.people_balances, self.all_people_nodes, self.max_exact_people, self.exact_max_workers
+            )
+            total_cost = sum(tx.amount_cents for tx in simplified_txs)
+        elif self.used_decomposition:
+            # Các nhóm con tổng bằng 0 là các bài toán con độc lập, mỗi nhóm được giải riêng
+            simplified_txs = solve_by_decomposition(
+                self.people_balances, self.all_people_nodes, self.max_exact_people,
+                self.decompose_max_people, self.max_half_entries
+            )
+            total_cost = sum(tx.amount_cents for tx in simplified_txs)
+        else:
+            # Giải bài toán DP bắt đầu từ trạng thái số dư ban đầu
+            total_cost = self._solve_dp(self.people_balances)[0]
+            # Dựng lại danh sách giao dịch một lần bằng cách đi theo các con trỏ trạng thái kế tiếp
+            simplified_txs = reconstruct_transfers(
+                self.dp_table, self.people_balances, self.all_people_nodes, self._solve_dp
+            )
+
+        if self.persistent_memo is not None and total_cost != float('inf'):
+            self.persistent_memo.put(
+                algorithm, canonical_state[0], total_cost, len(simplified_txs),
+                transfers_to_ranks(simplified_txs, canonical_state[1])
+            )
+        return simplified_txs
\ No newline at end of file
@@ -0,0 +1,114 @@
+# Bước tiền xử lý ghép cặp khớp chính xác cho thuật toán Tham lam
+from __future__ import annotations
+
+from src.core_type import BasicTransaction
+from src.data_structures import LinkedList, HashTable, Tuple
+from src.utils.money_utils import Cents
+
+# Chỉ tìm bộ ba khi (số người nợ còn lại) x (số người cho vay còn lại) không vượt quá ngưỡng này,
+# để bước tiền xử lý luôn rẻ hơn nhiều so với Quy hoạch động
+_TRIPLE_SEARCH_LIMIT = 250_000
+
+
+def settle_exact_matches(debtors: LinkedList[Tuple],
+                         creditors: LinkedList[Tuple],
+                         match_triples: bool = True) -> Tuple:
+    """
+    Tách các nhóm có tổng bằng 0 nhỏ nhất trước khi chạy vòng lặp tham lam hai con trỏ.
+
+    1. Cặp: người nợ đúng bằng số tiền một người cho vay được nhận -> 1 giao dịch cho 2 người.
+       Các số dư được đánh chỉ mục theo số tiền (xu) trong HashTable nên bước này là O(k).
+    2. Bộ ba (tùy chọn): một người nợ = tổng của hai người cho vay, hoặc ngược lại
+       -> 2 giao dịch cho 3 người.
+
+    Tách một cặp khớp chính xác không bao giờ làm tăng số giao dịch tối thiểu, nên kết quả
+    luôn tốt bằng hoặc tốt hơn tham lam thuần túy. Thứ tự đầu vào được giữ nguyên nên kết quả xác định.
+
+    Tham số:
+        debtors: Danh sách (tên, số_dư_âm) đã sắp xếp
+        creditors: Danh sách (tên, số_dư_dương) đã sắp xếp
+        match_triples: Có tìm thêm các bộ ba có tổng bằng 0 hay không
+
+    Trả về:
+        Tuple: (các giao dịch đã ghép, người nợ còn lại, người cho vay còn lại) - hai danh sách
+               còn lại giữ định dạng và thứ tự như đầu vào
+    """
+    # Làm việc với số tiền dương cho cả hai phía
+    debt_items = [Tuple([entry[0], -entry[1]]) for entry in debtors]
+    credit_items = [Tuple([entry[0], entry[1]]) for entry in creditors]
+    debt_used = [False] * len(debt_items)
+    credit_used = [False] * len(credit_items)
+    settlements = LinkedList[BasicTransaction]()
+
+    # Bước 1: ghép cặp khớp chính xác
+    credit_index = _index_by_amount(credit_items, credit_used)
+    for i, (debtor_name, amount) in enumerate(debt_items):
+        bucket = credit_index.get(amount)
+        if bucket is not None and not bucket.is_empty():
+            j = bucket.remove_first()
+            debt_used[i] = credit_used[j] = True
+            settlements.append(BasicTransaction.from_cents(debtor_name, credit_items[j][0], amount))
+
+    # Bước 2: bộ ba (một người nợ trả cho hai người cho vay, rồi hai người nợ trả cho một người cho vay)
+    if match_triples:
+        remaining = (len(debt_used) - sum(debt_used)) * (len(credit_used) - sum(credit_used))
+        if 0 < remaining <= _TRIPLE_SEARCH_LIMIT:
+            _match_triples(debt_items, debt_used, credit_items, credit_used, settlements, single_is_debtor=True)
+            _match_triples(credit_items, credit_used, debt_items, debt_used, settlements, single_is_debtor=False)
+
+    remaining_debtors = LinkedList[Tuple]()
+    for i, (name, amount) in enumerate(debt_items):
+        if not debt_used[i]:
+            remaining_debtors.append(Tuple([name, -amount]))
+    remaining_creditors = LinkedList[Tuple]()
+    for j, item in enumerate(credit_items):
+        if not credit_used[j]:
+            remaining_creditors.append(item)
+    return Tuple([settlements, remaining_debtors, remaining_creditors])
+
+
+def _index_by_amount(items: list[Tuple], used: list[bool]) -> HashTable[Cents, LinkedList[int]]:
+    """Đánh chỉ mục các phần tử chưa dùng theo số tiền: số_tiền -> danh sách chỉ số (theo thứ tự)."""
+    index: HashTable[Cents, LinkedList[int]] = HashTable()
+    for position, item in enumerate(items):
+        if used[position]:
+            continue
+        bucket = index.get(item[1])
+        if bucket is None:
+            bucket = LinkedList[int]()
+            index.put(item[1], bucket)
+        bucket.append(position)
+    return index
+
+
+def _match_triples(singles: list[Tuple], singles_used: list[bool],
+                   others: list[Tuple], others_used: list[bool],
+                   settlements: LinkedList[BasicTransaction],
+                   single_is_debtor: bool) -> None:
+    """Ghép mỗi phần tử của `singles` với hai phần tử của `others` có tổng đúng bằng nó."""
+    other_index = _index_by_amount(others, others_used)
+    for i, (single_name, total) in enumerate(singles):
+        if singles_used[i]:
+            continue
+        for j, (first_name, first_amount) in enumerate(others):
+            if others_used[j] or first_amount >= total:
+                continue
+            k = _first_unused(other_index.get(total - first_amount), others_used, exclude=j)
+            if k is None:
+                continue
+            singles_used[i] = others_used[j] = others_used[k] = True
+            for other_name, amount in ((first_name, first_amount), (others[k][0], others[k][1])):
+                if single_is_debtor:
+                    settlements.append(BasicTransaction.from_cents(single_name, other_name, amount))
+                else:
+                    settlements.append(BasicTransaction.from_cents(other_name, single_name, amount))
+            break
+
+
+def _first_unused(bucket: LinkedList[int] | None, used: list[bool], exclude: int) -> int | None:
+    if bucket is None:
+        return None
+    for position in bucket:
+        if position != exclude and not used[position]:
+            return position
+    return None
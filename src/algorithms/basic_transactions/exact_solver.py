@@ -0,0 +1,369 @@
+# Bộ giải chính xác số giao dịch tối thiểu bằng Quy hoạch động bitmask trên tổng tập con
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Iterable
+
+from src.core_type import BasicTransaction
+from src.data_structures import LinkedList, HashTable, Array, Tuple
+from src.utils.money_utils import Cents
+
+try:
+    import numpy as np
+except ImportError:  # NumPy là phụ thuộc tùy chọn, chỉ dùng để tăng tốc các bước O(2^n)
+    np = None
+
+# Số người có số dư khác 0 tối đa mà bộ giải chính xác chấp nhận (2^n trạng thái).
+# Không có NumPy thì vòng lặp Python thuần chậm hơn nhiều nên giới hạn thấp hơn.
+DEFAULT_MAX_PEOPLE = 22 if np is not None else 16
+# Số phân đoạn (theo các bit cao của mask) cho mỗi tiến trình ở chế độ song song, để cân bằng tải
+_SHARDS_PER_WORKER = 2
+# Thời gian (giây) cho mỗi bước (mask, người) của max_zero_sum_groups khi chạy tuần tự: khoảng gấp đôi
+# giá trị đo được (~4e-9 với NumPy, ~7e-8 với Python thuần) để ước lượng luôn nghiêng về phía chậm
+_SECONDS_PER_STEP = 1e-8 if np is not None else 2e-7
+
+
+def estimated_solve_seconds(people_count: int) -> float:
+    """Ước lượng thời gian (giây) bộ giải chính xác tuần tự cần cho `people_count` người có số dư khác 0."""
+    return (1 << people_count) * people_count * _SECONDS_PER_STEP
+
+
+def subset_sums(amounts: list[Cents]) -> Any:
+    """
+    Tính tổng số dư của mọi tập con: sums[mask] = tổng amounts[i] với bit i của mask bật.
+    Trả về mảng NumPy int64 nếu có NumPy, ngược lại là list.
+    """
+    if np is not None:
+        sums = np.zeros(1, dtype=np.int64)
+        for amount in amounts:
+            # Nửa sau (bit mới bật) = nửa trước + amount
+            sums = np.concatenate((sums, sums + amount))
+        return sums
+
+    sums = [0] * (1 << len(amounts))
+    for mask in range(1, len(sums)):
+        low_bit = mask & -mask
+        sums[mask] = sums[mask ^ low_bit] + amounts[low_bit.bit_length() - 1]
+    return sums
+
+
+def max_zero_sum_groups(amounts: list[Cents], sums: Any = None) -> Any:
+    """
+    dp[mask] = số nhóm rời nhau có tổng bằng 0 nhiều nhất khi thêm lần lượt từng phần tử của mask.
+
+    Công thức: dp[mask] = max_i dp[mask \\ {i}] + (sums[mask] == 0).
+    Số giao dịch tối thiểu để thanh toán cả tập là n - dp[tập đầy đủ].
+
+    Độ phức tạp thời gian: O(2^n * n); không gian: O(2^n)
+    """
+    if sums is None:
+        sums = subset_sums(amounts)
+    n = len(amounts)
+
+    if np is not None:
+        zero = (sums == 0).astype(np.int8)
+        dp = np.zeros(1 << n, dtype=np.int8)
+        # Duyệt theo số bit bật: mọi mask \ {i} thuộc lớp trước nên đã có giá trị cuối cùng.
+        # Các mask ở lớp sau vẫn bằng 0 nên lấy max trên mọi bit (kể cả bit chưa bật) vẫn đúng.
+        popcount = np.zeros(1, dtype=np.int8)
+        for _ in range(n):
+            popcount = np.concatenate((popcount, popcount + 1))
+        order = np.argsort(popcount, kind='stable')
+        bounds = np.cumsum(np.bincount(popcount, minlength=n + 1))
+        for size in range(1, n + 1):
+            masks = order[bounds[size - 1]:bounds[size]]
+            best = np.zeros(len(masks), dtype=np.int8)
+            for i in range(n):
+                np.maximum(best, dp[masks ^ (1 << i)], out=best)
+            dp[masks] = best + zero[masks]
+        return dp
+
+    dp = [0] * (1 << n)
+    for mask in range(1, 1 << n):
+        best = 0
+        remaining = mask
+        while remaining:
+            low_bit = remaining & -remaining
+            value = dp[mask ^ low_bit]
+            if value > best:
+                best = value
+            remaining ^= low_bit
+        dp[mask] = best + (1 if sums[mask] == 0 else 0)
+    return dp
+
+
+def subset_popcounts(bits: int) -> Any:
+    """popcount[mask] = số bit bật của mask, với mọi mask trên `bits` bit (mảng NumPy int8 hoặc list)."""
+    if np is not None:
+        popcount = np.zeros(1, dtype=np.int8)
+        for _ in range(bits):
+            popcount = np.concatenate((popcount, popcount + 1))
+        return popcount
+    popcount = [0]
+    for _ in range(bits):
+        popcount += [count + 1 for count in popcount]
+    return popcount
+
+
+def _popcount_layers(bits: int) -> Tuple:
+    """Các mask trên `bits` bit xếp theo số bit bật: Tuple(order, bounds) như trong max_zero_sum_groups."""
+    popcount = subset_popcounts(bits)
+    order = np.argsort(popcount, kind='stable')
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(popcount, minlength=bits + 1))))
+    return Tuple([order, bounds])
+
+
+def _fill_shard_sums(sums_name: str, zero_name: str, amounts: list[Cents], low_bits: int, shards: list[int]) -> int:
+    """
+    Tiến trình con: tính tổng tập con và cờ tổng bằng 0 cho các phân đoạn được giao.
+    Phân đoạn h gồm các mask có bit cao (từ bit low_bits trở lên) bằng h: sums = tổng phần cao + tổng phần thấp.
+
+    Trả về số mask có tổng bằng 0 trong các phân đoạn (bảng đếm cục bộ để gộp ở tiến trình chính).
+    """
+    n = len(amounts)
+    sums_shm = shared_memory.SharedMemory(name=sums_name)
+    zero_shm = shared_memory.SharedMemory(name=zero_name)
+    try:
+        sums = np.ndarray(1 << n, dtype=np.int64, buffer=sums_shm.buf)
+        zero = np.ndarray(1 << n, dtype=np.int8, buffer=zero_shm.buf)
+        low_sums = subset_sums(amounts[:low_bits])
+        block = 1 << low_bits
+        zero_count = 0
+        for shard in shards:
+            high_sum = sum(amounts[low_bits + i] for i in range(n - low_bits) if shard >> i & 1)
+            start = shard * block
+            sums[start:start + block] = low_sums + high_sum
+            is_zero = sums[start:start + block] == 0
+            zero[start:start + block] = is_zero
+            zero_count += int(np.count_nonzero(is_zero))
+        del sums, zero
+        return zero_count
+    finally:
+        sums_shm.close()
+        zero_shm.close()
+
+
+def _fill_shard_dp(dp_name: str, zero_name: str, n: int, low_bits: int, shards: list[int]) -> None:
+    """
+    Tiến trình con: tính dp cho các phân đoạn được giao.
+
+    Bỏ một bit thấp cho mask cùng phân đoạn (đã tính ở lớp số bit thấp trước); bỏ một bit cao cho mask thuộc
+    phân đoạn có ít bit cao hơn, đã xong ở lượt trước. Các phân đoạn cùng số bit cao không phụ thuộc nhau.
+    """
+    dp_shm = shared_memory.SharedMemory(name=dp_name)
+    zero_shm = shared_memory.SharedMemory(name=zero_name)
+    try:
+        dp = np.ndarray(1 << n, dtype=np.int8, buffer=dp_shm.buf)
+        zero = np.ndarray(1 << n, dtype=np.int8, buffer=zero_shm.buf)
+        layers = _popcount_layers(low_bits)
+        order, bounds = layers[0], layers[1]
+        for shard in shards:
+            base = shard << low_bits
+            for size in range(low_bits + 1):
+                masks = order[bounds[size]:bounds[size + 1]] + base
+                if base == 0 and size == 0:
+                    continue  # Tập rỗng: dp = 0
+                best = np.zeros(len(masks), dtype=np.int8)
+                for i in range(n):
+                    np.maximum(best, dp[masks ^ (1 << i)], out=best)
+                dp[masks] = best + zero[masks]
+        del dp, zero
+    finally:
+        dp_shm.close()
+        zero_shm.close()
+
+
+def parallel_zero_sum_tables(amounts: list[Cents], max_workers: int) -> Tuple:
+    """
+    Chế độ song song của subset_sums + max_zero_sum_groups trên ProcessPoolExecutor (cần NumPy).
+
+    Không gian 2^n mask được chia thành các phân đoạn theo các bit cao; các bảng tổng, cờ tổng bằng 0 và dp
+    nằm trong bộ nhớ dùng chung (multiprocessing.shared_memory) nên tiến trình con ghi thẳng vào đó:
+    1. Tổng tập con và cờ tổng bằng 0: mọi phân đoạn độc lập
+    2. dp: các phân đoạn được xử lý theo lượt, mỗi lượt là các phân đoạn có cùng số bit cao bật
+
+    Trả về:
+        Tuple: (sums, dp, số_mask_tổng_bằng_0) - sums/dp là mảng NumPy thường, cùng giá trị với bản tuần tự
+    """
+    if np is None:
+        raise ValueError("Chế độ song song của bộ giải chính xác cần NumPy.")
+    n = len(amounts)
+    high_bits = 0
+    while (1 << high_bits) < max_workers * _SHARDS_PER_WORKER and high_bits < n:
+        high_bits += 1
+    low_bits = n - high_bits
+    size = 1 << n
+
+    sums_shm = shared_memory.SharedMemory(create=True, size=8 * size)
+    zero_shm = shared_memory.SharedMemory(create=True, size=size)
+    dp_shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        dp_view = np.ndarray(size, dtype=np.int8, buffer=dp_shm.buf)
+        dp_view[:] = 0
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            shard_groups = [list(range(worker, 1 << high_bits, max_workers)) for worker in range(max_workers)]
+            zero_count = sum(executor.map(
+                _fill_shard_sums,
+                [sums_shm.name] * max_workers, [zero_shm.name] * max_workers,
+                [amounts] * max_workers, [low_bits] * max_workers, shard_groups
+            ))
+
+            for high_count in range(high_bits + 1):
+                layer = [shard for shard in range(1 << high_bits) if bin(shard).count("1") == high_count]
+                groups = [layer[worker::max_workers] for worker in range(min(max_workers, len(layer)))]
+                list(executor.map(
+                    _fill_shard_dp,
+                    [dp_shm.name] * len(groups), [zero_shm.name] * len(groups),
+                    [n] * len(groups), [low_bits] * len(groups), groups
+                ))
+
+        sums = np.ndarray(size, dtype=np.int64, buffer=sums_shm.buf).copy()
+        dp = dp_view.copy()
+        del dp_view
+        return Tuple([sums, dp, zero_count])
+    finally:
+        for shm in (sums_shm, zero_shm, dp_shm):
+            shm.close()
+            shm.unlink()
+
+
+def _zero_sum_tables(amounts: list[Cents], max_workers: int | None) -> Tuple:
+    """(sums, dp): song song khi max_workers > 1 và có NumPy, ngược lại tuần tự."""
+    if max_workers is not None and max_workers > 1 and np is not None:
+        tables = parallel_zero_sum_tables(amounts, max_workers)
+        return Tuple([tables[0], tables[1]])
+    sums = subset_sums(amounts)
+    return Tuple([sums, max_zero_sum_groups(amounts, sums)])
+
+
+def zero_sum_partition(amounts: list[Cents], sums: Any = None, dp: Any = None) -> LinkedList[Array[int]]:
+    """
+    Truy vết bảng dp để tìm phân hoạch thành nhiều nhóm tổng bằng 0 nhất.
+
+    Trả về:
+        LinkedList[Array[int]]: Các nhóm chỉ số, mỗi nhóm có tổng bằng 0
+    """
+    n = len(amounts)
+    if sums is None:
+        sums = subset_sums(amounts)
+    if dp is None:
+        dp = max_zero_sum_groups(amounts, sums)
+
+    # Gỡ dần từng phần tử từ tập đầy đủ; thứ tự gỡ ngược lại là thứ tự thêm vào
+    removal_order = Array[int]()
+    mask = (1 << n) - 1
+    while mask:
+        target = int(dp[mask]) - (1 if sums[mask] == 0 else 0)
+        for i in range(n):
+            bit = 1 << i
+            if mask & bit and int(dp[mask ^ bit]) == target:
+                removal_order.append(i)
+                mask ^= bit
+                break
+
+    # Thêm lại theo thứ tự ngược; mỗi khi tổng tích lũy về 0 là đóng một nhóm
+    groups = LinkedList[Array[int]]()
+    current_group = Array[int]()
+    running = 0
+    for position in range(len(removal_order) - 1, -1, -1):
+        index = removal_order[position]
+        current_group.append(index)
+        running += amounts[index]
+        if running == 0:
+            groups.append(current_group)
+            current_group = Array[int]()
+    return groups
+
+
+def _settle_group(names: list[str], amounts: list[Cents], group: Array[int]) -> LinkedList[BasicTransaction]:
+    """
+    Thanh toán một nhóm tổng bằng 0 bằng hai con trỏ (nợ lớn nhất trước, bằng nhau theo tên).
+    Nhóm k người luôn cần tối đa k - 1 giao dịch.
+    """
+    debtors = [[amounts[i], names[i]] for i in group if amounts[i] < 0]
+    creditors = [[amounts[i], names[i]] for i in group if amounts[i] > 0]
+    debtors.sort(key=lambda entry: (entry[0], entry[1]))
+    creditors.sort(key=lambda entry: (-entry[0], entry[1]))
+
+    settlements = LinkedList[BasicTransaction]()
+    i = j = 0
+    while i < len(debtors) and j < len(creditors):
+        amount = min(-debtors[i][0], creditors[j][0])
+        settlements.append(BasicTransaction.from_cents(debtors[i][1], creditors[j][1], amount))
+        debtors[i][0] += amount
+        creditors[j][0] -= amount
+        if debtors[i][0] == 0:
+            i += 1
+        if creditors[j][0] == 0:
+            j += 1
+    return settlements
+
+
+def solve_min_transfers(balances: HashTable[str, Cents],
+                        people: Iterable[str] | None = None,
+                        max_people: int = DEFAULT_MAX_PEOPLE,
+                        max_workers: int | None = None) -> LinkedList[BasicTransaction]:
+    """
+    Tìm số giao dịch ít nhất có thể để thanh toán toàn bộ số dư (tối ưu chứng minh được).
+
+    Với n người có số dư khác 0, số giao dịch tối thiểu là n - (số nhóm rời nhau tổng bằng 0 nhiều nhất).
+    Nhóm tối đa được tìm bằng QHĐ bitmask trên tổng tập con theo xu (số nguyên, không sai số làm tròn),
+    sau đó mỗi nhóm được thanh toán riêng với k - 1 giao dịch.
+
+    Tham số:
+        balances: Số dư ròng theo xu của từng người
+        people: Thứ tự người tham gia (mặc định: tên theo thứ tự từ điển), quyết định kết quả khi có
+                nhiều lời giải tối ưu
+        max_people: Số người có số dư khác 0 tối đa; vượt quá sẽ báo lỗi
+        max_workers: Số tiến trình cho chế độ song song (parallel_zero_sum_tables); None hoặc 1 = tuần tự
+
+    Trả về:
+        LinkedList[BasicTransaction]: Danh sách giao dịch tối thiểu
+
+    Raises:
+        ValueError: Nếu số người có số dư khác 0 vượt quá max_people
+    """
+    if people is None:
+        people = sorted(balances.keys())
+    names: list[str] = []
+    amounts: list[Cents] = []
+    for name in people:
+        amount = balances.get(name, 0)
+        if amount != 0:
+            names.append(name)
+            amounts.append(amount)
+
+    if len(amounts) > max_people:
+        raise ValueError(
+            f"Bộ giải chính xác chỉ hỗ trợ tối đa {max_people} người có số dư khác 0 (nhận {len(amounts)})."
+        )
+
+    settlements = LinkedList[BasicTransaction]()
+    if not amounts:
+        return settlements
+    tables = _zero_sum_tables(amounts, max_workers)
+    for group in zero_sum_partition(amounts, tables[0], tables[1]):
+        for tx in _settle_group(names, amounts, group):
+            settlements.append(tx)
+    return settlements
+
+
+def min_transfer_count(balances: HashTable[str, Cents],
+                       max_people: int = DEFAULT_MAX_PEOPLE,
+                       max_workers: int | None = None) -> Tuple:
+    """
+    Chỉ tính số giao dịch tối thiểu, không dựng danh sách giao dịch.
+
+    Trả về:
+        Tuple: (số giao dịch tối thiểu, số nhóm tổng bằng 0)
+    """
+    amounts = [balances.get(name) for name in balances if balances.get(name) != 0]
+    if len(amounts) > max_people:
+        raise ValueError(
+            f"Bộ giải chính xác chỉ hỗ trợ tối đa {max_people} người có số dư khác 0 (nhận {len(amounts)})."
+        )
+    if not amounts:
+        return Tuple([0, 0])
+    dp = _zero_sum_tables(amounts, max_workers)[1]
+    groups = int(dp[(1 << len(amounts)) - 1])
+    return Tuple([len(amounts) - groups, groups])
@@ -1,11 +1,13 @@
 # Thuật toán Tham lam cho Đơn giản hóa Nợ
 from __future__ import annotations
+from typing import Iterable
 
 from src.core_type import BasicTransaction
 from src.data_structures import LinkedList, HashTable, Tuple
 from src.utils.sorting import merge_sort_linked_list
-from src.utils.constants import EPSILON
-from src.utils.money_utils import round_money
+from src.utils.money_utils import Cents
+from src.algorithms.balance_ledger import BalanceLedger
+from .exact_matching import settle_exact_matches
 
 class GreedySimplifier:
     """
@@ -24,18 +26,23 @@ class GreedySimplifier:
     Độ phức tạp không gian: O(k)
     """
     
-    def __init__(self, transactions: LinkedList[BasicTransaction]):
+    def __init__(self, transactions: Iterable[BasicTransaction] | BalanceLedger = (), exact_match: bool = False):
         """
         Khởi tạo bộ đơn giản hóa nợ với danh sách giao dịch ban đầu.
         
         Tham số:
-            transactions: Danh sách liên kết các giao dịch cơ bản cần đơn giản hóa
+            transactions: Danh sách liên kết hoặc bất kỳ iterable/generator nào của các giao dịch cơ bản.
+                          Giao dịch chỉ được duyệt một lần để cộng dồn số dư, không được giữ lại.
+                          Cũng có thể truyền một BalanceLedger đã tính sẵn.
+            exact_match: True để ghép trước các cặp/bộ ba có tổng bằng 0 (settle_exact_matches)
+                         rồi mới chạy vòng lặp tham lam trên phần còn lại
         """
-        self.initial_transactions = transactions  # Lưu trữ giao dịch gốc để tham chiếu
-        self.people_balances = HashTable[str, float]()  # Bảng băm lưu số dư của từng người
-        self._calculate_balances()  # Tính toán số dư ban đầu
+        self.exact_match = exact_match
+        self.people_balances = HashTable[str, Cents]()  # Bảng băm lưu số dư (theo xu) của từng người
+        self.transaction_count: int = 0  # Số giao dịch đã được nạp
+        self._calculate_balances(transactions)  # Tính toán số dư ban đầu
 
-    def _calculate_balances(self) -> None:
+    def _calculate_balances(self, transactions: Iterable[BasicTransaction] | BalanceLedger) -> None:
         """
         Tính toán số dư ròng cho mỗi người từ tất cả giao dịch.
         
@@ -43,20 +50,45 @@ class GreedySimplifier:
         - Người nợ (debtor): số dư giảm theo số tiền nợ (-amount)
         - Người cho vay (creditor): số dư tăng theo số tiền cho vay (+amount)
         
-        Sử dụng duyệt tuần tự qua LinkedList với độ phức tạp O(n).
+        Duyệt tuần tự một lần qua các giao dịch với độ phức tạp O(n), bộ nhớ O(k).
+        Số dư là số nguyên xu nên phép cộng/trừ chính xác, không cần làm tròn.
         """
-        current = self.initial_transactions.head
-        while current:
-            tx = current.data
+        if isinstance(transactions, BalanceLedger):
+            # Số dư đã được tính sẵn trong sổ cái dùng chung, không duyệt lại giao dịch
+            self.add_balances(transactions.balances, transactions.transaction_count)
+        else:
+            self.add_many(transactions)
+
+    def add(self, tx: BasicTransaction) -> None:
+        """Nạp thêm một giao dịch vào số dư hiện tại."""
+        self.add_many((tx,))
+
+    def add_many(self, transactions: Iterable[BasicTransaction]) -> None:
+        """
+        Nạp thêm một loạt giao dịch theo kiểu luồng (ví dụ từng khối đọc từ cơ sở dữ liệu hoặc tệp).
+        Chỉ trạng thái theo từng người được giữ lại nên bộ nhớ là O(số người).
+        """
+        balances = self.people_balances
+        for tx in transactions:
             # Cập nhật số dư cho người nợ (trừ đi số tiền nợ)
-            current_debtor_balance = self.people_balances.get(tx.debtor, 0.0)
-            self.people_balances.put(tx.debtor, round_money(current_debtor_balance - tx.amount))
-            
+            balances.put(tx.debtor, balances.get(tx.debtor, 0) - tx.amount_cents)
             # Cập nhật số dư cho người cho vay (cộng thêm số tiền cho vay)
-            current_creditor_balance = self.people_balances.get(tx.creditor, 0.0)
-            self.people_balances.put(tx.creditor, round_money(current_creditor_balance + tx.amount))
-            
-            current = current.next
+            balances.put(tx.creditor, balances.get(tx.creditor, 0) + tx.amount_cents)
+            self.transaction_count += 1
+
+    def add_balances(self, balances: HashTable[str, Cents], transaction_count: int) -> None:
+        """
+        Cộng dồn một bảng số dư đã tổng hợp sẵn (ví dụ BalanceAggregate.balances từ aggregate_balances)
+        thay vì duyệt lại từng giao dịch.
+
+        Tham số:
+            balances: Số dư ròng theo xu của từng người
+            transaction_count: Số giao dịch gốc đã được tổng hợp vào bảng số dư
+        """
+        people_balances = self.people_balances
+        for person in balances:
+            people_balances.put(person, people_balances.get(person, 0) + balances.get(person))
+        self.transaction_count += transaction_count
 
     def simplify(self) -> LinkedList[BasicTransaction]:
         """
@@ -73,7 +105,7 @@ class GreedySimplifier:
             LinkedList[BasicTransaction]: Danh sách giao dịch đã được đơn giản hóa
         """
         # Điều kiện dừng: nếu không có giao dịch nào thì trả về danh sách rỗng
-        if self.initial_transactions.is_empty():
+        if self.transaction_count == 0:
             return LinkedList()
 
         # Bước 1: Phân loại người tham gia thành 2 nhóm
@@ -84,29 +116,33 @@ class GreedySimplifier:
         for person in self.people_balances.keys():
             balance = self.people_balances.get(person)
             
-            # Người nợ: số dư âm (dưới ngưỡng -EPSILON để tránh lỗi làm tròn)
-            if balance < -EPSILON:
+            # Người nợ: số dư âm
+            if balance < 0:
                 debtors.append(Tuple([person, balance]))
-            # Người cho vay: số dư dương (trên ngưỡng EPSILON để tránh lỗi làm tròn)
-            elif balance > EPSILON:
+            # Người cho vay: số dư dương
+            elif balance > 0:
                 creditors.append(Tuple([person, balance]))
-            # Bỏ qua những người có số dư gần bằng 0 (đã cân bằng)
+            # Bỏ qua những người có số dư bằng 0 (đã cân bằng)
 
         # Bước 2: Sắp xếp để đảm bảo tính xác định và tối ưu
-        # Sắp xếp người nợ: tăng dần theo số dư (âm lớn nhất trước - nợ nhiều nhất)
+        # Sắp xếp người nợ: tăng dần theo số dư (âm lớn nhất trước - nợ nhiều nhất),
+        # số dư bằng nhau thì theo tên để kết quả không phụ thuộc thứ tự trong bảng băm
         debtors = merge_sort_linked_list(
             debtors, 
-            comparator=lambda t1, t2: t1[1] < t2[1]  # t1[1] là số dư, so sánh tăng dần
+            comparator=lambda t1, t2: t1[1] < t2[1] or (t1[1] == t2[1] and t1[0] < t2[0])
         )
         
         # Sắp xếp người cho vay: giảm dần theo số dư (dương lớn nhất trước - cho vay nhiều nhất)
         creditors = merge_sort_linked_list(
             creditors, 
-            comparator=lambda t1, t2: t1[1] > t2[1]  # t1[1] là số dư, so sánh giảm dần
+            comparator=lambda t1, t2: t1[1] > t2[1] or (t1[1] == t2[1] and t1[0] < t2[0])
         )
 
         # Bước 3: Thực hiện thuật toán tham lam ghép đôi
         simplified_txs = LinkedList[BasicTransaction]()  # Danh sách giao dịch kết quả
+        if self.exact_match:
+            # Tiền xử lý: thanh toán trước các nhóm khớp chính xác, vòng lặp chỉ xử lý phần còn lại
+            simplified_txs, debtors, creditors = settle_exact_matches(debtors, creditors)
         debtor_node = debtors.head      # Con trỏ đến người nợ hiện tại
         creditor_node = creditors.head  # Con trỏ đến người cho vay hiện tại
         
@@ -120,13 +156,13 @@ class GreedySimplifier:
             # Chọn min để đảm bảo không vượt quá khả năng của cả 2 bên
             settle_amount = min(-debtor_balance, creditor_balance)
             
-            # Chỉ tạo giao dịch nếu số tiền thanh toán đủ lớn (tránh giao dịch vô nghĩa)
-            if settle_amount > EPSILON:
+            # Chỉ tạo giao dịch nếu số tiền thanh toán dương
+            if settle_amount > 0:
                 # Tạo giao dịch thanh toán mới
-                new_transaction = BasicTransaction(
+                new_transaction = BasicTransaction.from_cents(
                     debtor=debtor_name, 
                     creditor=creditor_name, 
-                    amount=settle_amount
+                    amount_cents=settle_amount
                 )
                 simplified_txs.append(new_transaction)
                 
@@ -139,12 +175,12 @@ class GreedySimplifier:
                 creditor_node.data = Tuple([creditor_name, creditor_balance])
             
             # Bước 4: Chuyển đến người tiếp theo nếu đã thanh toán xong
-            # Nếu người nợ đã hết nợ (số dư gần bằng 0), chuyển sang người nợ tiếp theo
-            if abs(debtor_balance) < EPSILON:
+            # Nếu người nợ đã hết nợ (số dư bằng 0), chuyển sang người nợ tiếp theo
+            if debtor_balance == 0:
                 debtor_node = debtor_node.next
                 
-            # Nếu người cho vay đã được trả hết (số dư gần bằng 0), chuyển sang người cho vay tiếp theo
-            if creditor_balance < EPSILON:
+            # Nếu người cho vay đã được trả hết (số dư bằng 0), chuyển sang người cho vay tiếp theo
+            if creditor_balance == 0:
                 creditor_node = creditor_node.next
         
         # Trả về danh sách giao dịch đã được đơn giản hóa
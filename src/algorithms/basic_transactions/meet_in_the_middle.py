@@ -0,0 +1,251 @@
+# Tìm nhóm con tổng bằng 0 bằng kỹ thuật gặp nhau ở giữa (meet-in-the-middle) để tách bài toán lớn
+from __future__ import annotations
+from typing import Iterable
+
+from src.core_type import BasicTransaction
+from src.data_structures import LinkedList, HashTable, Array, Tuple
+from src.utils.money_utils import Cents
+from src.algorithms.basic_transactions.exact_solver import (
+    np, subset_sums, subset_popcounts, zero_sum_partition, _settle_group, DEFAULT_MAX_PEOPLE
+)
+
+# Số người có số dư khác 0 tối đa cho bước tách (mỗi nửa 2^(n/2) tổng tập con)
+DEFAULT_MAX_MITM_PEOPLE = 40
+# Số mục tối đa của mỗi bảng tổng nửa tập; nửa lớn hơn được duyệt theo từng khối có kích thước này
+DEFAULT_MAX_HALF_ENTRIES = 1 << 20 if np is not None else 1 << 16
+
+
+def _cap_bits(max_half_entries: int) -> int:
+    if max_half_entries < 2:
+        raise ValueError("max_half_entries phải lớn hơn hoặc bằng 2.")
+    return max_half_entries.bit_length() - 1
+
+
+def _mask_indices(mask: int, offset: int) -> list[int]:
+    indices = []
+    bit = 0
+    while mask:
+        if mask & 1:
+            indices.append(offset + bit)
+        mask >>= 1
+        bit += 1
+    return indices
+
+
+def smallest_zero_sum_subset(amounts: list[Cents],
+                             max_half_entries: int = DEFAULT_MAX_HALF_ENTRIES) -> Array[int] | None:
+    """
+    Tìm tập con thực sự (khác rỗng, khác toàn bộ) có tổng bằng 0 và ít phần tử nhất.
+
+    Chia amounts thành nửa A và nửa B, liệt kê tổng tập con của từng nửa rồi ghép bằng bảng băm: với mỗi tổng
+    của A chỉ giữ mask ít phần tử nhất, rồi tra cứu -tổng của mỗi tập con của B. Thời gian O(2^(n/2)) thay
+    vì O(2^n). Bảng của A không vượt quá max_half_entries mục; nếu B lớn hơn giới hạn thì các bit cao của B
+    được duyệt tuần tự, mỗi lượt một khối max_half_entries tổng.
+
+    Tập con nhỏ nhất không chứa tập con tổng bằng 0 nào nhỏ hơn, nên thanh toán nó bằng k - 1 giao dịch là tối ưu.
+
+    Trả về:
+        Array[int] | None: Chỉ số các phần tử của tập con, hoặc None nếu không có tập con thực sự nào
+    """
+    n = len(amounts)
+    cap_bits = _cap_bits(max_half_entries)
+    a_bits = min(n // 2, cap_bits)
+    b_low_bits = min(n - a_bits, cap_bits)
+    b_high_bits = n - a_bits - b_low_bits
+
+    # best = (số phần tử, mask của A, mask của B)
+    if np is not None:
+        best = _search_numpy(amounts, a_bits, b_low_bits, b_high_bits)
+    else:
+        best = _search_python(amounts, a_bits, b_low_bits, b_high_bits)
+    if best is None or best[0] == n:
+        return None
+
+    subset = Array[int]()
+    for index in _mask_indices(best[1], 0) + _mask_indices(best[2], a_bits):
+        subset.append(index)
+    return subset
+
+
+def _search_numpy(amounts: list[Cents], a_bits: int, b_low_bits: int, b_high_bits: int) -> tuple | None:
+    best = None
+    sums_a = subset_sums(amounts[:a_bits])
+    popcount_a = subset_popcounts(a_bits)
+    if len(sums_a) > 1:
+        # Bảng băm của A dưới dạng mảng đã sắp xếp: mỗi tổng một mask khác rỗng ít phần tử nhất
+        order = np.lexsort((popcount_a[1:], sums_a[1:])) + 1
+        sorted_sums = sums_a[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = sorted_sums[1:] != sorted_sums[:-1]
+        keys_a = sorted_sums[first]
+        masks_a = order[first]
+        sizes_a = popcount_a[masks_a].astype(np.int64)
+
+        # Chỉ gồm phần tử của A
+        position = np.searchsorted(keys_a, 0)
+        if position < len(keys_a) and keys_a[position] == 0:
+            best = (int(sizes_a[position]), int(masks_a[position]), 0)
+    else:
+        keys_a = np.zeros(0, dtype=np.int64)
+
+    amounts_b = amounts[a_bits:]
+    sums_b_low = subset_sums(amounts_b[:b_low_bits])
+    popcount_b_low = subset_popcounts(b_low_bits).astype(np.int64)
+    low_masks = np.arange(len(sums_b_low), dtype=np.int64)
+    for high in range(1 << b_high_bits):
+        high_indices = _mask_indices(high, b_low_bits)
+        sums_b = sums_b_low + sum(amounts_b[i] for i in high_indices)
+        sizes_b = popcount_b_low + len(high_indices)
+        nonempty = np.ones(len(sums_b), dtype=bool)
+        if high == 0:
+            nonempty[0] = False
+
+        # Chỉ gồm phần tử của B
+        candidates = np.flatnonzero(nonempty & (sums_b == 0))
+        if len(candidates):
+            pick = candidates[np.argmin(sizes_b[candidates])]
+            if best is None or sizes_b[pick] < best[0]:
+                best = (int(sizes_b[pick]), 0, (high << b_low_bits) | int(low_masks[pick]))
+
+        # Ghép A và B: tổng của A bằng -tổng của B
+        if len(keys_a):
+            position = np.searchsorted(keys_a, -sums_b)
+            position[position == len(keys_a)] = 0
+            matched = np.flatnonzero(nonempty & (keys_a[position] == -sums_b))
+            if len(matched):
+                totals = sizes_a[position[matched]] + sizes_b[matched]
+                pick = int(np.argmin(totals))
+                if best is None or totals[pick] < best[0]:
+                    b_index = matched[pick]
+                    best = (int(totals[pick]), int(masks_a[position[b_index]]),
+                            (high << b_low_bits) | int(low_masks[b_index]))
+    return best
+
+
+def _search_python(amounts: list[Cents], a_bits: int, b_low_bits: int, b_high_bits: int) -> tuple | None:
+    best = None
+    sums_a = subset_sums(amounts[:a_bits])
+    popcount_a = subset_popcounts(a_bits)
+    # Bảng băm tổng -> mask khác rỗng ít phần tử nhất của A
+    table_a: dict[int, int] = {}
+    for mask in range(1, len(sums_a)):
+        current = table_a.get(sums_a[mask])
+        if current is None or popcount_a[mask] < popcount_a[current]:
+            table_a[sums_a[mask]] = mask
+    if 0 in table_a:
+        best = (popcount_a[table_a[0]], table_a[0], 0)
+
+    amounts_b = amounts[a_bits:]
+    sums_b_low = subset_sums(amounts_b[:b_low_bits])
+    popcount_b_low = subset_popcounts(b_low_bits)
+    for high in range(1 << b_high_bits):
+        high_indices = _mask_indices(high, b_low_bits)
+        high_sum = sum(amounts_b[i] for i in high_indices)
+        for low in range(len(sums_b_low)):
+            if high == 0 and low == 0:
+                continue
+            sum_b = sums_b_low[low] + high_sum
+            size_b = popcount_b_low[low] + len(high_indices)
+            mask_b = (high << b_low_bits) | low
+            if sum_b == 0 and (best is None or size_b < best[0]):
+                best = (size_b, 0, mask_b)
+            mask_a = table_a.get(-sum_b)
+            if mask_a is not None and (best is None or popcount_a[mask_a] + size_b < best[0]):
+                best = (popcount_a[mask_a] + size_b, mask_a, mask_b)
+    return best
+
+
+def decompose_zero_sum(amounts: list[Cents],
+                       max_exact_people: int = DEFAULT_MAX_PEOPLE,
+                       max_half_entries: int = DEFAULT_MAX_HALF_ENTRIES) -> Tuple:
+    """
+    Tách dần các tập con tổng bằng 0 nhỏ nhất cho tới khi phần còn lại vừa với bộ giải chính xác
+    hoặc không còn tập con thực sự nào (phần còn lại khi đó cần đúng k - 1 giao dịch).
+
+    Chọn tham lam tập con nhỏ nhất ở mỗi bước không đảm bảo số nhóm lớn nhất, nên kết quả phụ thuộc vào
+    max_exact_people (điểm dừng) và có thể kém hơn phân hoạch tối ưu.
+
+    Trả về:
+        Tuple: (LinkedList[Array[int]] các nhóm đã tách, Array[int] chỉ số phần còn lại)
+    """
+    remaining = Array[int]()
+    for index in range(len(amounts)):
+        if amounts[index] != 0:
+            remaining.append(index)
+    groups = LinkedList[Array[int]]()
+
+    while len(remaining) > max_exact_people:
+        subset = smallest_zero_sum_subset([amounts[i] for i in remaining], max_half_entries)
+        if subset is None:
+            break
+        chosen = HashTable[int, bool]()
+        group = Array[int]()
+        for position in subset:
+            chosen.put(position, True)
+            group.append(remaining[position])
+        groups.append(group)
+
+        rest = Array[int]()
+        for position in range(len(remaining)):
+            if not chosen.contains_key(position):
+                rest.append(remaining[position])
+        remaining = rest
+    return Tuple([groups, remaining])
+
+
+def solve_by_decomposition(balances: HashTable[str, Cents],
+                           people: Iterable[str] | None = None,
+                           max_exact_people: int = DEFAULT_MAX_PEOPLE,
+                           max_people: int = DEFAULT_MAX_MITM_PEOPLE,
+                           max_half_entries: int = DEFAULT_MAX_HALF_ENTRIES) -> LinkedList[BasicTransaction]:
+    """
+    Thanh toán nhóm quá lớn cho bộ giải chính xác bằng cách tách thành các bài toán con độc lập.
+
+    - Mỗi tập con nhỏ nhất tìm bởi smallest_zero_sum_subset được thanh toán riêng (k - 1 giao dịch, tối ưu)
+    - Phần còn lại: bộ giải chính xác nếu đủ nhỏ, ngược lại không còn tập con tổng bằng 0 nên một chuỗi
+      k - 1 giao dịch là tối ưu
+
+    Từng nhóm được thanh toán tối ưu nhưng cách tách là heuristic (xem decompose_zero_sum): tổng số giao dịch
+    không được đảm bảo là tối thiểu.
+
+    Raises:
+        ValueError: Nếu số người có số dư khác 0 vượt quá max_people
+    """
+    if people is None:
+        people = sorted(balances.keys())
+    names: list[str] = []
+    amounts: list[Cents] = []
+    for name in people:
+        amount = balances.get(name, 0)
+        if amount != 0:
+            names.append(name)
+            amounts.append(amount)
+    if len(amounts) > max_people:
+        raise ValueError(
+            f"Bước tách chỉ hỗ trợ tối đa {max_people} người có số dư khác 0 (nhận {len(amounts)})."
+        )
+
+    decomposition = decompose_zero_sum(amounts, max_exact_people, max_half_entries)
+    settlements = LinkedList[BasicTransaction]()
+    for group in decomposition[0]:
+        for tx in _settle_group(names, amounts, group):
+            settlements.append(tx)
+
+    remaining = decomposition[1]
+    if len(remaining) == 0:
+        return settlements
+    if len(remaining) <= max_exact_people:
+        remaining_amounts = [amounts[i] for i in remaining]
+        remaining_groups = LinkedList[Array[int]]()
+        for local_group in zero_sum_partition(remaining_amounts):
+            group = Array[int]()
+            for position in local_group:
+                group.append(remaining[position])
+            remaining_groups.append(group)
+    else:
+        remaining_groups = LinkedList[Array[int]]()
+        remaining_groups.append(remaining)
+    for group in remaining_groups:
+        for tx in _settle_group(names, amounts, group):
+            settlements.append(tx)
+    return settlements
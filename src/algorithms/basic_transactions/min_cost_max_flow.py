@@ -1,10 +1,11 @@
 # Thuật toán Min-Cost Max-Flow cho Đơn giản hóa Nợ
 from __future__ import annotations
+from typing import Iterable
 from src.data_structures import LinkedList, HashTable, Graph, GraphEdge, Tuple
 from src.core_type import BasicTransaction
 from src.utils.sorting import merge_sort_linked_list
-from src.utils.constants import EPSILON
-from src.utils.money_utils import round_money
+from src.utils.money_utils import Cents
+from src.algorithms.balance_ledger import BalanceLedger
 
 class MinCostMaxFlowSimplifier:
     """
@@ -29,20 +30,23 @@ class MinCostMaxFlowSimplifier:
     _T_NODE = "_SINK_"      # Đỉnh đích (sink) - thu thập luồng cuối cùng
     _INFINITY = float('inf') # Giá trị vô cực cho khởi tạo khoảng cách
     
-    def __init__(self, transactions: LinkedList[BasicTransaction]):
+    def __init__(self, transactions: Iterable[BasicTransaction] | BalanceLedger = ()):
         """
         Khởi tạo bộ đơn giản hóa Min-Cost Max-Flow với danh sách giao dịch ban đầu.
         
         Tham số:
-            transactions: Danh sách liên kết các giao dịch cơ bản cần đơn giản hóa
+            transactions: Danh sách liên kết hoặc bất kỳ iterable/generator nào của các giao dịch cơ bản.
+                          Giao dịch chỉ được duyệt một lần để cộng dồn số dư, không được giữ lại.
+                          Cũng có thể truyền một BalanceLedger đã tính sẵn.
         """
-        self.initial_transactions = transactions              # Lưu trữ giao dịch gốc để tham chiếu
-        self.people_balances: HashTable[str, float] = HashTable()  # Bảng băm lưu số dư của từng người
+        self.people_balances: HashTable[str, Cents] = HashTable()  # Bảng băm lưu số dư (theo xu) của từng người
         self.all_people: LinkedList[str] = LinkedList()      # Danh sách tất cả người tham gia
         self.flow_graph: Graph[str, None] | None = None      # Mạng luồng cho thuật toán
-        self._calculate_balances()                            # Tính toán số dư ban đầu
+        self.transaction_count: int = 0                       # Số giao dịch đã được nạp
+        self._people_stale: bool = False                      # Danh sách người cần sắp xếp lại
+        self._calculate_balances(transactions)                # Tính toán số dư ban đầu
     
-    def _calculate_balances(self) -> None:
+    def _calculate_balances(self, transactions: Iterable[BasicTransaction] | BalanceLedger) -> None:
         """
         Tính toán số dư ròng cho mỗi người từ tất cả giao dịch và xây dựng danh sách người tham gia.
         
@@ -50,31 +54,53 @@ class MinCostMaxFlowSimplifier:
         - Người nợ (debtor): số dư giảm theo số tiền nợ (-amount)
         - Người cho vay (creditor): số dư tăng theo số tiền cho vay (+amount)
         
-        Sử dụng HashTable để theo dõi người duy nhất và LinkedList để lưu danh sách.
         Cuối cùng sắp xếp danh sách người để đảm bảo tính nhất quán.
         """
-        people_set: HashTable[str, bool] = HashTable()  # Set tạm để lưu người duy nhất
-        
-        # Duyệt qua tất cả giao dịch để tính số dư và thu thập danh sách người
-        current = self.initial_transactions.head
-        while current:
-            tx = current.data
-            
-            # Cập nhật số dư cho người nợ (trừ đi số tiền nợ)
-            debtor_balance = self.people_balances.get(tx.debtor, 0.0)
-            creditor_balance = self.people_balances.get(tx.creditor, 0.0)
-            
-            self.people_balances.put(tx.debtor, debtor_balance - tx.amount)
-            self.people_balances.put(tx.creditor, creditor_balance + tx.amount)
-            
-            # Thêm vào tập hợp người tham gia (tự động loại bỏ trùng lặp)
-            people_set.put(tx.debtor, True)
-            people_set.put(tx.creditor, True)
-            
-            current = current.next
-        
-        # Chuyển đổi tập hợp thành danh sách và sắp xếp để đảm bảo tính xác định
-        people_keys = people_set.keys()
+        if isinstance(transactions, BalanceLedger):
+            # Số dư và danh sách người đã sắp xếp lấy thẳng từ sổ cái dùng chung
+            self.add_balances(transactions.balances, transactions.transaction_count)
+            self.all_people = transactions.sorted_people
+            self._people_stale = False
+            return
+        self.add_many(transactions)
+        self._sort_people()
+
+    def add(self, tx: BasicTransaction) -> None:
+        """Nạp thêm một giao dịch vào số dư hiện tại."""
+        self.add_many((tx,))
+
+    def add_many(self, transactions: Iterable[BasicTransaction]) -> None:
+        """
+        Nạp thêm một loạt giao dịch theo kiểu luồng, chỉ giữ lại số dư của từng người (bộ nhớ O(số người)).
+        Danh sách người tham gia được sắp xếp lại khi gọi simplify().
+        """
+        balances = self.people_balances
+        for tx in transactions:
+            # Cập nhật số dư cho người nợ (trừ) và người cho vay (cộng)
+            balances.put(tx.debtor, balances.get(tx.debtor, 0) - tx.amount_cents)
+            balances.put(tx.creditor, balances.get(tx.creditor, 0) + tx.amount_cents)
+            self.transaction_count += 1
+            self._people_stale = True
+
+    def add_balances(self, balances: HashTable[str, Cents], transaction_count: int) -> None:
+        """
+        Cộng dồn một bảng số dư đã tổng hợp sẵn (ví dụ BalanceAggregate.balances từ aggregate_balances)
+        thay vì duyệt lại từng giao dịch.
+
+        Tham số:
+            balances: Số dư ròng theo xu của từng người
+            transaction_count: Số giao dịch gốc đã được tổng hợp vào bảng số dư
+        """
+        people_balances = self.people_balances
+        for person in balances:
+            people_balances.put(person, people_balances.get(person, 0) + balances.get(person))
+        self.transaction_count += transaction_count
+        self._people_stale = True
+
+    def _sort_people(self) -> None:
+        """Sắp xếp danh sách người tham gia (các khóa của bảng số dư) theo thứ tự từ điển."""
+        self._people_stale = False
+        people_keys = self.people_balances.keys()
         if people_keys:
             self.all_people = merge_sort_linked_list(
                 people_keys, 
@@ -92,6 +118,7 @@ class MinCostMaxFlowSimplifier:
         3. Mỗi người nợ kết nối với mỗi người cho vay (capacity = min flow, cost = 1)
         
         Việc thiết lập cost = 1 cho cạnh giữa người giúp tối thiểu hóa số giao dịch.
+        Mọi capacity và luồng đều là số nguyên xu nên các phép so sánh là chính xác.
         """
         self.flow_graph = Graph[str, None](is_directed=True)  # Tạo đồ thị có hướng
         g = self.flow_graph
@@ -107,20 +134,20 @@ class MinCostMaxFlowSimplifier:
             current = current.next
         
         # Bước 3: Tính tổng nợ và tổng cho vay để kiểm tra cân bằng và thiết lập capacity
-        total_debt = 0.0      # Tổng số tiền nợ (giá trị dương)
-        total_credit = 0.0    # Tổng số tiền cho vay (giá trị dương)
+        total_debt = 0      # Tổng số tiền nợ (giá trị dương, theo xu)
+        total_credit = 0    # Tổng số tiền cho vay (giá trị dương, theo xu)
         
         current = self.all_people.head
         while current:
             person = current.data
-            balance = self.people_balances.get(person, 0.0)
+            balance = self.people_balances.get(person, 0)
             
-            if balance < -EPSILON:  # Người nợ (số dư âm)
-                total_debt += abs(balance)
+            if balance < 0:  # Người nợ (số dư âm)
+                total_debt += -balance
                 # Tạo cạnh từ Source đến người nợ với capacity = số tiền nợ
-                self._add_edge_with_reverse(self._S_NODE, person, abs(balance), 0)
+                self._add_edge_with_reverse(self._S_NODE, person, -balance, 0)
                 
-            elif balance > EPSILON:  # Người cho vay (số dư dương)
+            elif balance > 0:  # Người cho vay (số dư dương)
                 total_credit += balance
                 # Tạo cạnh từ người cho vay đến Sink với capacity = số tiền cho vay
                 self._add_edge_with_reverse(person, self._T_NODE, balance, 0)
@@ -135,23 +162,23 @@ class MinCostMaxFlowSimplifier:
         p1_node = self.all_people.head
         while p1_node:
             p1 = p1_node.data
-            p1_balance = self.people_balances.get(p1, 0.0)
+            p1_balance = self.people_balances.get(p1, 0)
             
             p2_node = self.all_people.head
             while p2_node:
                 p2 = p2_node.data
-                p2_balance = self.people_balances.get(p2, 0.0)
+                p2_balance = self.people_balances.get(p2, 0)
                 
                 # Chỉ tạo cạnh từ người nợ đến người cho vay (không tự giao dịch)
-                if p1 != p2 and p1_balance < -EPSILON and p2_balance > EPSILON:
+                if p1 != p2 and p1_balance < 0 and p2_balance > 0:
                     # Capacity = min(khả năng trả nợ, khả năng nhận tiền, max_flow)
-                    capacity = min(abs(p1_balance), p2_balance, max_flow_per_edge)
+                    capacity = min(-p1_balance, p2_balance, max_flow_per_edge)
                     self._add_edge_with_reverse(p1, p2, capacity, 1)  # cost = 1 để tối thiểu hóa số giao dịch
                 
                 p2_node = p2_node.next
             p1_node = p1_node.next
     
-    def _add_edge_with_reverse(self, from_node: str, to_node: str, capacity: float, cost: float) -> None:
+    def _add_edge_with_reverse(self, from_node: str, to_node: str, capacity: Cents, cost: float) -> None:
         """
         Thêm cạnh thuận và cạnh ngược cho mạng luồng (theo yêu cầu của thuật toán flow).
         
@@ -180,8 +207,11 @@ class MinCostMaxFlowSimplifier:
             if forward_edge and reverse_edge:
                 forward_edge.reverse_edge = reverse_edge
                 reverse_edge.reverse_edge = forward_edge
+                # Luồng tính theo xu (số nguyên)
+                forward_edge.flow = 0
+                reverse_edge.flow = 0
     
-    def _find_shortest_path_spfa(self) -> Tuple[LinkedList[GraphEdge[str, None]], float] | None:
+    def _find_shortest_path_spfa(self) -> Tuple[LinkedList[GraphEdge[str, None]], Cents] | None:
         """
         Tìm đường đi ngắn nhất từ Source đến Sink bằng thuật toán SPFA.
         SPFA (Shortest Path Faster Algorithm) là cải tiến của Bellman-Ford.
@@ -189,7 +219,7 @@ class MinCostMaxFlowSimplifier:
         Trả về:
             Tuple chứa:
             - LinkedList[GraphEdge]: Danh sách các cạnh tạo thành đường đi ngắn nhất
-            - float: Khả năng luồng tối thiểu trên đường đi (bottleneck capacity)
+            - Cents: Khả năng luồng tối thiểu trên đường đi (bottleneck capacity)
             Hoặc None nếu không tìm thấy đường đi
             
         Thuật toán SPFA:
@@ -241,7 +271,7 @@ class MinCostMaxFlowSimplifier:
                 
                 # Kiểm tra residual capacity (khả năng còn lại của cạnh)
                 residual_cap = (edge.capacity or 0) - edge.flow
-                if residual_cap > EPSILON:  # Chỉ xét cạnh còn khả năng thông qua
+                if residual_cap > 0:  # Chỉ xét cạnh còn khả năng thông qua
                     u_dist = distances.get(u, self._INFINITY)
                     v_dist = distances.get(v, self._INFINITY)
                     edge_cost = edge.cost or 0
@@ -295,8 +325,10 @@ class MinCostMaxFlowSimplifier:
             LinkedList[BasicTransaction]: Danh sách giao dịch đã được đơn giản hóa
         """
         # Điều kiện dừng: nếu không có giao dịch nào thì trả về danh sách rỗng
-        if self.initial_transactions.is_empty():
+        if self.transaction_count == 0:
             return LinkedList()
+        if self._people_stale:
+            self._sort_people()
         
         # Bước 1: Xây dựng mạng luồng
         self._build_flow_network()
@@ -362,15 +394,15 @@ class MinCostMaxFlowSimplifier:
                     edge = edge_node.data
                     
                     # Chỉ lấy các cạnh có luồng dương và không kết nối với source/sink
-                    if (edge.flow > EPSILON and 
+                    if (edge.flow > 0 and 
                         edge.destination != self._S_NODE and 
                         edge.destination != self._T_NODE):
                         
                         # Tạo giao dịch từ luồng trên cạnh
-                        transactions.append(BasicTransaction(
+                        transactions.append(BasicTransaction.from_cents(
                             debtor=person,                      # Người gửi luồng = người nợ
                             creditor=edge.destination,          # Người nhận luồng = người cho vay
-                            amount=round_money(edge.flow)       # Số tiền = lượng luồng đã làm tròn
+                            amount_cents=edge.flow              # Số tiền = lượng luồng (xu)
                         ))
                     
                     edge_node = edge_node.next
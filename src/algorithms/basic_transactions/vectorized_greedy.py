@@ -0,0 +1,234 @@
+# Nhân NumPy vector hóa cho thuật toán Tham lam (dùng cho nhóm rất lớn)
+from __future__ import annotations
+from datetime import date
+from typing import Any, Iterable
+
+from src.core_type import BasicTransaction
+from src.data_structures import LinkedList, HashTable, Tuple
+from src.utils.financial_calculator import FinancialCalculator
+from src.utils.money_utils import Cents
+from src.algorithms.balance_ledger import BalanceLedger
+
+try:
+    import numpy as np
+except ImportError:  # NumPy là phụ thuộc tùy chọn, chỉ cần cho nhân vector hóa
+    np = None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("VectorizedGreedySimplifier cần NumPy (pip install numpy).")
+
+
+def net_balances(debtor_ids: Any, creditor_ids: Any, amount_cents: Any, people_count: int) -> Any:
+    """
+    Tính số dư ròng (theo xu, int64) của từng người từ các cột giao dịch đã intern.
+
+    Args:
+        debtor_ids / creditor_ids: Mảng mã số người nợ / người cho vay
+        amount_cents: Mảng số tiền theo xu
+        people_count: Tổng số người (độ dài mảng kết quả)
+    """
+    _require_numpy()
+    amounts = np.asarray(amount_cents, dtype=np.int64)
+    balances = np.zeros(people_count, dtype=np.int64)
+    np.add.at(balances, np.asarray(debtor_ids, dtype=np.intp), -amounts)
+    np.add.at(balances, np.asarray(creditor_ids, dtype=np.intp), amounts)
+    return balances
+
+
+def greedy_settlement_arrays(balances: Any, name_rank: Any) -> Tuple:
+    """
+    Ghép người nợ nhiều nhất với người cho vay nhiều nhất, giống hệt GreedySimplifier.simplify().
+
+    Thứ tự: người nợ tăng dần theo số dư, người cho vay giảm dần theo số dư, bằng nhau thì theo
+    thứ hạng tên (name_rank). Vòng lặp hai con trỏ được thay bằng phép hợp các tổng tích lũy:
+    mỗi khoản thanh toán là một đoạn giữa hai mốc liên tiếp của cumsum(nợ) ∪ cumsum(cho vay).
+
+    Returns:
+        Tuple: (mảng mã người trả, mảng mã người nhận, mảng số tiền theo xu)
+    """
+    _require_numpy()
+    balances = np.asarray(balances, dtype=np.int64)
+    name_rank = np.asarray(name_rank)
+
+    debtor_ids = np.nonzero(balances < 0)[0]
+    creditor_ids = np.nonzero(balances > 0)[0]
+    if len(debtor_ids) == 0 or len(creditor_ids) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return Tuple([empty, empty, empty])
+
+    # np.lexsort: khóa cuối là khóa chính
+    debtor_ids = debtor_ids[np.lexsort((name_rank[debtor_ids], balances[debtor_ids]))]
+    creditor_ids = creditor_ids[np.lexsort((name_rank[creditor_ids], -balances[creditor_ids]))]
+
+    debt_cumsum = np.cumsum(-balances[debtor_ids])
+    credit_cumsum = np.cumsum(balances[creditor_ids])
+    settled_total = min(debt_cumsum[-1], credit_cumsum[-1])
+
+    ends = np.union1d(debt_cumsum, credit_cumsum)
+    ends = ends[ends <= settled_total]
+    starts = np.concatenate((np.zeros(1, dtype=np.int64), ends[:-1]))
+
+    payers = debtor_ids[np.searchsorted(debt_cumsum, starts, side='right')]
+    payees = creditor_ids[np.searchsorted(credit_cumsum, starts, side='right')]
+    return Tuple([payers, payees, ends - starts])
+
+
+class VectorizedGreedySimplifier:
+    """
+    Phiên bản vector hóa (NumPy) của GreedySimplifier cho các nhóm rất lớn.
+
+    - Tên người được intern thành mã số nguyên, giao dịch được lưu dạng cột
+    - Cộng dồn số dư bằng np.add.at, sắp xếp bằng np.lexsort
+    - Sinh khoản thanh toán bằng phép hợp tổng tích lũy thay cho vòng lặp hai con trỏ
+
+    Kết quả trùng khớp hoàn toàn với GreedySimplifier (và AdvancedGreedySimplifier khi dùng from_store
+    với current_date). Cần NumPy.
+
+    Độ phức tạp thời gian: O(n + k log k) với n = số giao dịch, k = số người (phần lớn chạy trong NumPy)
+    Độ phức tạp không gian: O(n + k)
+    """
+
+    def __init__(self, transactions: Iterable[BasicTransaction] | BalanceLedger = ()):
+        """
+        Khởi tạo từ danh sách liên kết hoặc bất kỳ iterable nào của các giao dịch cơ bản.
+
+        Tham số:
+            transactions: Các giao dịch cơ bản cần đơn giản hóa, hoặc BalanceLedger đã tính sẵn
+        """
+        _require_numpy()
+        if isinstance(transactions, BalanceLedger):
+            self._set_ledger(transactions)
+            return
+        name_ids: dict[str, int] = {}
+        names: list[str] = []
+        debtor_ids: list[int] = []
+        creditor_ids: list[int] = []
+        amounts: list[int] = []
+        for tx in transactions:
+            for name, ids in ((tx.debtor, debtor_ids), (tx.creditor, creditor_ids)):
+                name_id = name_ids.get(name)
+                if name_id is None:
+                    name_id = len(names)
+                    name_ids[name] = name_id
+                    names.append(name)
+                ids.append(name_id)
+            amounts.append(tx.amount_cents)
+        self._set_columns(debtor_ids, creditor_ids, amounts, names)
+
+    @classmethod
+    def from_arrays(cls,
+                    debtor_ids: Any,
+                    creditor_ids: Any,
+                    amount_cents: Any,
+                    names: list[str]) -> VectorizedGreedySimplifier:
+        """Khởi tạo trực tiếp từ các cột đã intern (names[i] là tên của mã số i)."""
+        _require_numpy()
+        simplifier = cls.__new__(cls)
+        simplifier._set_columns(debtor_ids, creditor_ids, amount_cents, names)
+        return simplifier
+
+    @classmethod
+    def from_store(cls, store: Any, current_date: date | None = None) -> VectorizedGreedySimplifier:
+        """
+        Khởi tạo từ TransactionStore mà không tạo đối tượng giao dịch.
+
+        Tham số:
+            store: TransactionStore
+            current_date: None để dùng số tiền gốc; nếu có, dùng tổng nợ (gốc + lãi + phạt) tại ngày này,
+                          tương đương AdvancedGreedySimplifier(..., use_batch=True)
+        """
+        _require_numpy()
+        if current_date is None:
+            amounts = np.frombuffer(store.amount_cents, dtype=np.int64)
+        else:
+            columns = store.to_columns()
+            totals = FinancialCalculator.calculate_batch(
+                columns['principal'], columns['interest_rate'], columns['penalty_rate'],
+                columns['borrow_ordinal'], columns['due_ordinal'], current_date,
+                columns['interest_code'], columns['penalty_code']
+            )['total']
+            # Giống to_cents(): làm tròn x*100 về số nguyên gần nhất (làm tròn chẵn khi đúng .5)
+            amounts = np.rint(totals * 100).astype(np.int64)
+        names = [store.name_of(i) for i in range(store.people_count)]
+        return cls.from_arrays(
+            np.frombuffer(store.debtor_ids, dtype=np.int32),
+            np.frombuffer(store.creditor_ids, dtype=np.int32),
+            amounts, names
+        )
+
+    def _set_columns(self, debtor_ids: Any, creditor_ids: Any, amount_cents: Any, names: list[str]) -> None:
+        self.names: list[str] = list(names)
+        self.transaction_count: int = len(amount_cents)
+        self.people_balances = net_balances(debtor_ids, creditor_ids, amount_cents, len(self.names))
+        self._rank_names()
+
+    def _rank_names(self) -> None:
+        """Thứ hạng của mỗi tên theo thứ tự từ điển, dùng làm khóa phụ khi số dư bằng nhau."""
+        self._name_rank = np.empty(len(self.names), dtype=np.int64)
+        if self.names:
+            self._name_rank[np.argsort(np.array(self.names), kind='stable')] = np.arange(len(self.names))
+
+    def _set_ledger(self, ledger: BalanceLedger) -> None:
+        """Lấy số dư từ sổ cái; sorted_people đã theo thứ tự từ điển nên thứ hạng tên chính là chỉ số."""
+        self.names = list(ledger.sorted_people)
+        self.transaction_count = ledger.transaction_count
+        self.people_balances = np.fromiter(
+            (ledger.balances.get(name) for name in self.names), dtype=np.int64, count=len(self.names)
+        )
+        self._name_rank = np.arange(len(self.names), dtype=np.int64)
+
+    def add_balances(self, balances: HashTable[str, Cents], transaction_count: int) -> None:
+        """
+        Cộng dồn một bảng số dư đã tổng hợp sẵn (ví dụ BalanceAggregate.balances từ aggregate_balances)
+        thay vì duyệt lại từng giao dịch. Người chưa có mã số được intern thêm vào cuối.
+
+        Tham số:
+            balances: Số dư ròng theo xu của từng người
+            transaction_count: Số giao dịch gốc đã được tổng hợp vào bảng số dư
+        """
+        name_ids = {name: index for index, name in enumerate(self.names)}
+        people = balances.keys()
+        known_count = len(self.names)
+        for name in people:
+            if name not in name_ids:
+                name_ids[name] = len(self.names)
+                self.names.append(name)
+        if len(self.names) > known_count:
+            self.people_balances = np.concatenate(
+                (self.people_balances, np.zeros(len(self.names) - known_count, dtype=np.int64))
+            )
+            self._rank_names()
+        ids = np.fromiter((name_ids[name] for name in people), dtype=np.intp, count=len(people))
+        amounts = np.fromiter((balances.get(name) for name in people), dtype=np.int64, count=len(people))
+        np.add.at(self.people_balances, ids, amounts)
+        self.transaction_count += transaction_count
+
+    def settle_arrays(self) -> Tuple:
+        """
+        Trả về kết quả dạng cột, tránh tạo đối tượng cho mỗi giao dịch khi nhóm rất lớn.
+
+        Returns:
+            Tuple: (mảng mã người trả, mảng mã người nhận, mảng số tiền theo xu); tên tra qua self.names
+        """
+        return greedy_settlement_arrays(self.people_balances, self._name_rank)
+
+    def simplify(self) -> LinkedList[BasicTransaction]:
+        """
+        Thực hiện đơn giản hóa nợ và trả về kết quả giống GreedySimplifier.simplify().
+
+        Trả về:
+            LinkedList[BasicTransaction]: Danh sách giao dịch đã được đơn giản hóa
+        """
+        simplified_txs = LinkedList[BasicTransaction]()
+        if self.transaction_count == 0:
+            return simplified_txs
+
+        payers, payees, amounts = self.settle_arrays()
+        names = self.names
+        for payer, payee, amount in zip(payers.tolist(), payees.tolist(), amounts.tolist()):
+            simplified_txs.append(
+                BasicTransaction.from_cents(debtor=names[payer], creditor=names[payee], amount_cents=amount)
+            )
+        return simplified_txs
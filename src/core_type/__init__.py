@@ -1,6 +1,9 @@
 from .transaction import AdvancedTransaction, BasicTransaction
+from .transaction_store import TransactionStore, TransactionRow
 
 __all__ = [
     'AdvancedTransaction',
     'BasicTransaction',
-] 
\ No newline at end of file
+    'TransactionStore',
+    'TransactionRow',
+] 
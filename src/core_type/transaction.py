@@ -1,15 +1,31 @@
 from __future__ import annotations
 
 from datetime import date
+from types import MappingProxyType
+from typing import Mapping
 from src.data_structures.hash_table import HashTable
+from src.data_structures.array import Array
+from src.data_structures.tuple import Tuple
 from src.utils.financial_calculator import FinancialCalculator, InterestType, PenaltyType
+from src.utils.money_utils import Cents, to_cents, from_cents
 # Đây là mô-đun chứa định nghĩa lớp Transaction.
 
 class AdvancedTransaction:
     """
     Đại diện cho một giao dịch nợ nâng cao với đầy đủ thông tin tài chính.
     Sử dụng FinancialCalculator để xử lý các tính toán phức tạp.
+
+    Kết quả tính toán (gốc, lãi, phạt, tổng, ưu tiên) được ghi nhớ theo ngày đánh giá
+    và tự động bị xóa khi một trong các trường tài chính thay đổi.
     """
+
+    # Các trường ảnh hưởng đến kết quả tính toán; gán lại bất kỳ trường nào sẽ xóa bộ nhớ đệm
+    _METRIC_FIELDS = frozenset({
+        'amount_cents', 'borrow_date', 'due_date', 'interest_rate',
+        'penalty_rate', 'interest_type', 'penalty_type'
+    })
+    # Số ngày đánh giá tối đa được ghi nhớ cho mỗi giao dịch; vượt quá thì bỏ ngày được ghi nhớ sớm nhất
+    _METRICS_CACHE_SIZE = 16
     
     def __init__(self, 
                  debtor: str,
@@ -22,7 +38,8 @@ class AdvancedTransaction:
                  interest_type: InterestType = InterestType.COMPOUND_DAILY,
                  penalty_type: PenaltyType = PenaltyType.FIXED):
         
-        if amount <= 1e-9:
+        amount_cents = to_cents(amount)
+        if amount_cents <= 0:
             raise ValueError("Số tiền giao dịch phải lớn hơn 0.")
         if interest_rate < 0:
             raise ValueError("Lãi suất không thể âm.")
@@ -31,9 +48,10 @@ class AdvancedTransaction:
         if due_date < borrow_date:
             raise ValueError("Ngày đến hạn không thể trước ngày vay.")
             
+        self._metrics_cache: dict[date, dict] = {}
         self.debtor = debtor
         self.creditor = creditor
-        self.amount = amount
+        self.amount_cents: Cents = amount_cents  # Số tiền gốc lưu dạng số nguyên xu
         self.borrow_date = borrow_date
         self.due_date = due_date
         self.interest_rate = interest_rate
@@ -41,12 +59,54 @@ class AdvancedTransaction:
         self.interest_type = interest_type
         self.penalty_type = penalty_type
 
+    @property
+    def amount(self) -> float:
+        """Số tiền gốc dạng float (chỉ dùng ở biên nhập/xuất và tính lãi)."""
+        return from_cents(self.amount_cents)
+
+    @amount.setter
+    def amount(self, value: float) -> None:
+        self.amount_cents = to_cents(value)
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if name in AdvancedTransaction._METRIC_FIELDS:
+            cache = self.__dict__.get('_metrics_cache')
+            if cache:
+                cache.clear()
+
+    def get_debt_metrics(self, current_date: date) -> Mapping[str, float]:
+        """
+        Trả về chi tiết nợ và điểm ưu tiên tại một ngày, có ghi nhớ theo ngày.
+        Khi đã ghi nhớ đủ _METRICS_CACHE_SIZE ngày, ngày được ghi nhớ sớm nhất bị loại bỏ.
+
+        Returns:
+            Mapping: 'principal', 'interest', 'penalty', 'total', 'priority' - dạng chỉ đọc
+                     (MappingProxyType) để người gọi không sửa được kết quả đã ghi nhớ
+        """
+        cache = self._metrics_cache
+        metrics = cache.get(current_date)
+        if metrics is None:
+            metrics = FinancialCalculator.calculate_debt_metrics(
+                self.amount, self.interest_rate, self.penalty_rate,
+                self.borrow_date, self.due_date, current_date,
+                self.interest_type, self.penalty_type
+            )
+            if len(cache) >= AdvancedTransaction._METRICS_CACHE_SIZE:
+                # dict giữ thứ tự chèn: khóa đầu tiên là ngày được ghi nhớ sớm nhất
+                del cache[next(iter(cache))]
+            cache[current_date] = metrics
+        # Bộ nhớ đệm giữ dict thuần để giao dịch vẫn pickle được (ProcessPoolExecutor)
+        return MappingProxyType(metrics)
+
     def get_debt_breakdown(self, current_date: date) -> dict:
-        return FinancialCalculator.calculate_total_debt(
-            self.amount, self.interest_rate, self.penalty_rate,
-            self.borrow_date, self.due_date, current_date,
-            self.interest_type, self.penalty_type
-        )
+        metrics = self.get_debt_metrics(current_date)
+        return {
+            'principal': metrics['principal'],
+            'interest': metrics['interest'],
+            'penalty': metrics['penalty'],
+            'total': metrics['total']
+        }
 
     def calculate_total_debt(self, current_date: date) -> float:
         """
@@ -68,9 +128,18 @@ class AdvancedTransaction:
         Returns:
             float: Điểm ưu tiên (càng cao càng được ưu tiên)
         """
-        return FinancialCalculator.calculate_priority_score(
+        return self.get_debt_metrics(current_date)['priority']
+
+    def project_debt(self, start_date: date, end_date: date) -> Array[Tuple]:
+        """
+        Chuỗi giá trị nợ theo từng ngày từ start_date đến end_date (bao gồm hai đầu mút).
+
+        Returns:
+            Array[Tuple]: Mỗi phần tử là Tuple (ngày, lãi, phí phạt, tổng nợ)
+        """
+        return FinancialCalculator.project_debt(
             self.amount, self.interest_rate, self.penalty_rate,
-            self.borrow_date, self.due_date, current_date,
+            self.borrow_date, self.due_date, start_date, end_date,
             self.interest_type, self.penalty_type
         )
 
@@ -95,9 +164,33 @@ class BasicTransaction:
                  creditor: str,       # Tên người cho vay
                  amount: float):      # Số tiền của giao dịch
         
-        if amount <= 1e-9: # Sử dụng ngưỡng nhỏ cho số tiền dương
+        amount_cents = to_cents(amount)
+        if amount_cents <= 0: # Số tiền phải dương sau khi làm tròn đến xu
             raise ValueError("Số tiền giao dịch phải lớn hơn 0.")
             
         self.debtor = debtor
         self.creditor = creditor
-        self.amount = amount
\ No newline at end of file
+        self.amount_cents: Cents = amount_cents  # Số tiền lưu dạng số nguyên xu
+
+    @classmethod
+    def from_cents(cls, debtor: str, creditor: str, amount_cents: Cents) -> BasicTransaction:
+        """
+        Tạo giao dịch trực tiếp từ số tiền tính theo xu (không qua float).
+        Dùng bởi các thuật toán đơn giản hóa khi xuất kết quả.
+        """
+        if amount_cents <= 0:
+            raise ValueError("Số tiền giao dịch phải lớn hơn 0.")
+        tx = cls.__new__(cls)
+        tx.debtor = debtor
+        tx.creditor = creditor
+        tx.amount_cents = amount_cents
+        return tx
+
+    @property
+    def amount(self) -> float:
+        """Số tiền dạng float (chỉ dùng ở biên nhập/xuất)."""
+        return from_cents(self.amount_cents)
+
+    @amount.setter
+    def amount(self, value: float) -> None:
+        self.amount_cents = to_cents(value)
\ No newline at end of file
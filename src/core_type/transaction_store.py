@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+from array import array
+from datetime import date
+from typing import Callable, Iterable, Iterator
+
+from src.data_structures.linked_list import LinkedList
+from src.data_structures.array import Array
+from src.data_structures.tuple import Tuple
+from src.utils.financial_calculator import FinancialCalculator, InterestType, PenaltyType, np
+from src.utils.money_utils import Cents, to_cents, from_cents
+from .transaction import AdvancedTransaction
+
+# Bảng tra ngược mã số -> enum, khớp với FinancialCalculator.INTEREST_TYPE_CODES / PENALTY_TYPE_CODES
+_INTEREST_TYPES = list(InterestType)
+_PENALTY_TYPES = list(PenaltyType)
+
+
+class TransactionStore:
+    """
+    Kho giao dịch nâng cao dạng cột (struct-of-arrays), thay thế cho LinkedList[AdvancedTransaction]
+    khi số lượng giao dịch lớn.
+
+    Mỗi trường được lưu trong một array.array liền mạch thay vì một đối tượng cho mỗi dòng:
+    - debtor_ids / creditor_ids: mã số nguyên của tên đã được intern (mỗi tên chỉ lưu một lần)
+    - amount_cents: số tiền gốc theo xu (int64)
+    - borrow_ordinals / due_ordinals: ngày dạng date.toordinal() (int64, đúng kiểu của calculate_batch)
+    - interest_rates / penalty_rates: float64
+    - interest_codes / penalty_codes: mã enum (int8)
+
+    PHƯƠNG THỨC:
+    - append(...) / append_transaction(tx): Thêm một dòng - O(1) trung bình
+    - __getitem__(index): Trả về TransactionRow (view nhẹ, không sao chép) - O(1)
+    - filter(predicate): Tạo kho mới chỉ gồm các dòng thỏa điều kiện - O(n)
+    - from_linked_list / to_linked_list: Chuyển đổi qua lại với API LinkedList hiện có - O(n)
+    - to_columns(): Các cột NumPy cho FinancialCalculator.evaluate_columns (chỉ cột số tiền được tạo mới)
+    """
+
+    def __init__(self):
+        # Bảng intern tên người: tên -> mã số và mã số -> tên
+        self._name_ids: dict[str, int] = {}
+        self._names: list[str] = []
+
+        self.debtor_ids = array('i')
+        self.creditor_ids = array('i')
+        self.amount_cents = array('q')
+        self.borrow_ordinals = array('q')
+        self.due_ordinals = array('q')
+        self.interest_rates = array('d')
+        self.penalty_rates = array('d')
+        self.interest_codes = array('b')
+        self.penalty_codes = array('b')
+
+    def intern(self, name: str) -> int:
+        """Trả về mã số của một tên, cấp mã mới nếu tên chưa xuất hiện."""
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._name_ids[name] = name_id
+            self._names.append(name)
+        return name_id
+
+    def name_of(self, name_id: int) -> str:
+        """Trả về tên tương ứng với mã số đã intern."""
+        return self._names[name_id]
+
+    @property
+    def people_count(self) -> int:
+        """Số người (tên khác nhau) đã được intern."""
+        return len(self._names)
+
+    def append(self,
+               debtor: str,
+               creditor: str,
+               amount: float,
+               borrow_date: date,
+               due_date: date,
+               interest_rate: float = 0.0,
+               penalty_rate: float = 0.0,
+               interest_type: InterestType = InterestType.COMPOUND_DAILY,
+               penalty_type: PenaltyType = PenaltyType.FIXED) -> int:
+        """
+        Thêm một giao dịch, kiểm tra hợp lệ giống AdvancedTransaction.
+
+        Returns:
+            int: Chỉ số của dòng vừa thêm
+        """
+        return self.append_cents(
+            debtor, creditor, to_cents(amount), borrow_date, due_date,
+            interest_rate, penalty_rate, interest_type, penalty_type
+        )
+
+    def append_cents(self,
+                     debtor: str,
+                     creditor: str,
+                     amount_cents: Cents,
+                     borrow_date: date,
+                     due_date: date,
+                     interest_rate: float = 0.0,
+                     penalty_rate: float = 0.0,
+                     interest_type: InterestType = InterestType.COMPOUND_DAILY,
+                     penalty_type: PenaltyType = PenaltyType.FIXED) -> int:
+        """Giống append nhưng nhận số tiền theo xu (không qua float)."""
+        if amount_cents <= 0:
+            raise ValueError("Số tiền giao dịch phải lớn hơn 0.")
+        if interest_rate < 0:
+            raise ValueError("Lãi suất không thể âm.")
+        if penalty_rate < 0:
+            raise ValueError("Phí phạt không thể âm.")
+        if due_date < borrow_date:
+            raise ValueError("Ngày đến hạn không thể trước ngày vay.")
+
+        self.debtor_ids.append(self.intern(debtor))
+        self.creditor_ids.append(self.intern(creditor))
+        self.amount_cents.append(amount_cents)
+        self.borrow_ordinals.append(borrow_date.toordinal())
+        self.due_ordinals.append(due_date.toordinal())
+        self.interest_rates.append(interest_rate)
+        self.penalty_rates.append(penalty_rate)
+        self.interest_codes.append(FinancialCalculator.INTEREST_TYPE_CODES[interest_type])
+        self.penalty_codes.append(FinancialCalculator.PENALTY_TYPE_CODES[penalty_type])
+        return len(self.amount_cents) - 1
+
+    def append_transaction(self, tx: AdvancedTransaction) -> int:
+        """Thêm một AdvancedTransaction (hoặc TransactionRow) vào kho."""
+        return self.append_cents(
+            tx.debtor, tx.creditor, tx.amount_cents, tx.borrow_date, tx.due_date,
+            tx.interest_rate, tx.penalty_rate, tx.interest_type, tx.penalty_type
+        )
+
+    def _append_row_from(self, other: TransactionStore, index: int) -> None:
+        """Sao chép một dòng từ kho khác mà không cần kiểm tra lại hay tạo đối tượng trung gian."""
+        self.debtor_ids.append(self.intern(other._names[other.debtor_ids[index]]))
+        self.creditor_ids.append(self.intern(other._names[other.creditor_ids[index]]))
+        self.amount_cents.append(other.amount_cents[index])
+        self.borrow_ordinals.append(other.borrow_ordinals[index])
+        self.due_ordinals.append(other.due_ordinals[index])
+        self.interest_rates.append(other.interest_rates[index])
+        self.penalty_rates.append(other.penalty_rates[index])
+        self.interest_codes.append(other.interest_codes[index])
+        self.penalty_codes.append(other.penalty_codes[index])
+
+    def __len__(self) -> int:
+        return len(self.amount_cents)
+
+    def __getitem__(self, index: int) -> TransactionRow:
+        size = len(self.amount_cents)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Chỉ số ngoài phạm vi")
+        return TransactionRow(self, index)
+
+    def __iter__(self) -> Iterator[TransactionRow]:
+        for index in range(len(self.amount_cents)):
+            yield TransactionRow(self, index)
+
+    def filter(self, predicate: Callable[[TransactionRow], bool]) -> TransactionStore:
+        """Tạo kho mới chỉ chứa các dòng mà predicate(row) trả về True (giữ nguyên thứ tự)."""
+        result = TransactionStore()
+        for index in range(len(self.amount_cents)):
+            if predicate(TransactionRow(self, index)):
+                result._append_row_from(self, index)
+        return result
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[AdvancedTransaction]) -> TransactionStore:
+        """Tạo kho từ một iterable bất kỳ các AdvancedTransaction (phần tử None bị bỏ qua)."""
+        store = cls()
+        for tx in transactions:
+            if tx is not None:
+                store.append_transaction(tx)
+        return store
+
+    @classmethod
+    def from_linked_list(cls, transactions: LinkedList[AdvancedTransaction]) -> TransactionStore:
+        """Tạo kho từ LinkedList[AdvancedTransaction] đang được GUI và các thuật toán sử dụng."""
+        return cls.from_transactions(transactions)
+
+    def to_linked_list(self) -> LinkedList[AdvancedTransaction]:
+        """Tạo lại LinkedList[AdvancedTransaction] để dùng với các bộ đơn giản hóa hiện có."""
+        result = LinkedList[AdvancedTransaction]()
+        for row in self:
+            result.append(row.to_transaction())
+        return result
+
+    def to_columns(self) -> dict:
+        """
+        Trả về các cột NumPy theo đúng định dạng của FinancialCalculator.build_columns.
+        Riêng cột 'principal' là mảng float64 mới (số tiền được lưu theo xu, phải chia cho 100);
+        các cột còn lại được ánh xạ trực tiếp lên bộ nhớ của array.array (không sao chép),
+        nên không được append thêm vào kho trong lúc còn dùng các cột này.
+        """
+        if np is None:
+            raise ImportError("TransactionStore.to_columns cần NumPy (pip install numpy).")
+        return {
+            'principal': np.frombuffer(self.amount_cents, dtype=np.int64) / 100,
+            'interest_rate': np.frombuffer(self.interest_rates, dtype=np.float64),
+            'penalty_rate': np.frombuffer(self.penalty_rates, dtype=np.float64),
+            'borrow_ordinal': np.frombuffer(self.borrow_ordinals, dtype=np.int64),
+            'due_ordinal': np.frombuffer(self.due_ordinals, dtype=np.int64),
+            'interest_code': np.frombuffer(self.interest_codes, dtype=np.int8),
+            'penalty_code': np.frombuffer(self.penalty_codes, dtype=np.int8),
+        }
+
+
+class TransactionRow:
+    """
+    View nhẹ trỏ tới một dòng của TransactionStore, có cùng các thuộc tính đọc như AdvancedTransaction.
+    Không sao chép dữ liệu; các giá trị được đọc từ các cột khi truy cập.
+    """
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: TransactionStore, index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def debtor(self) -> str:
+        return self._store._names[self._store.debtor_ids[self._index]]
+
+    @property
+    def creditor(self) -> str:
+        return self._store._names[self._store.creditor_ids[self._index]]
+
+    @property
+    def amount_cents(self) -> Cents:
+        return self._store.amount_cents[self._index]
+
+    @property
+    def amount(self) -> float:
+        return from_cents(self._store.amount_cents[self._index])
+
+    @property
+    def borrow_date(self) -> date:
+        return date.fromordinal(self._store.borrow_ordinals[self._index])
+
+    @property
+    def due_date(self) -> date:
+        return date.fromordinal(self._store.due_ordinals[self._index])
+
+    @property
+    def interest_rate(self) -> float:
+        return self._store.interest_rates[self._index]
+
+    @property
+    def penalty_rate(self) -> float:
+        return self._store.penalty_rates[self._index]
+
+    @property
+    def interest_type(self) -> InterestType:
+        return _INTEREST_TYPES[self._store.interest_codes[self._index]]
+
+    @property
+    def penalty_type(self) -> PenaltyType:
+        return _PENALTY_TYPES[self._store.penalty_codes[self._index]]
+
+    def get_debt_metrics(self, current_date: date) -> dict:
+        """Chi tiết nợ và điểm ưu tiên tại current_date (tương thích FinancialCalculator.evaluate_transactions)."""
+        return FinancialCalculator.calculate_debt_metrics(
+            self.amount, self.interest_rate, self.penalty_rate,
+            self.borrow_date, self.due_date, current_date,
+            self.interest_type, self.penalty_type
+        )
+
+    def is_overdue(self, current_date: date) -> bool:
+        """Kiểm tra xem giao dịch có quá hạn không."""
+        return current_date.toordinal() > self._store.due_ordinals[self._index]
+
+    def days_overdue(self, current_date: date) -> int:
+        """Tính số ngày quá hạn."""
+        return max(0, current_date.toordinal() - self._store.due_ordinals[self._index])
+
+    def project_debt(self, start_date: date, end_date: date) -> Array[Tuple]:
+        """Chuỗi giá trị nợ theo từng ngày (xem FinancialCalculator.project_debt)."""
+        return FinancialCalculator.project_debt(
+            self.amount, self.interest_rate, self.penalty_rate,
+            self.borrow_date, self.due_date, start_date, end_date,
+            self.interest_type, self.penalty_type
+        )
+
+    def to_transaction(self) -> AdvancedTransaction:
+        """Tạo một AdvancedTransaction độc lập từ dòng này."""
+        return AdvancedTransaction(
+            debtor=self.debtor,
+            creditor=self.creditor,
+            amount=self.amount,
+            borrow_date=self.borrow_date,
+            due_date=self.due_date,
+            interest_rate=self.interest_rate,
+            penalty_rate=self.penalty_rate,
+            interest_type=self.interest_type,
+            penalty_type=self.penalty_type
+        )
+
+    def __repr__(self) -> str:
+        return f"TransactionRow({self.debtor} -> {self.creditor}: {self.amount})"
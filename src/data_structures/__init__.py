@@ -5,6 +5,7 @@ from .priority_queue import PriorityQueue, PriorityQueueItem
 from .graph import Graph, GraphVertex, GraphEdge
 from .array import Array
 from .tuple import Tuple
+from .lru_cache import LRUCache
 
 __all__ = [
     "LinkedList", "Node", 
@@ -12,5 +13,6 @@ __all__ = [
     "PriorityQueue", "PriorityQueueItem",
     "Graph", "GraphVertex", "GraphEdge",
     "Array",
-    "Tuple"
+    "Tuple",
+    "LRUCache"
 ] 
\ No newline at end of file
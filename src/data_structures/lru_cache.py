@@ -0,0 +1,173 @@
+import sys
+from typing import TypeVar, Generic, Callable, Iterator
+from .hash_table import HashTable
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+class LRUNode(Generic[K, V]):
+    """
+    Node của danh sách liên kết đôi trong LRUCache, lưu cặp key-value và kích thước ước lượng.
+    """
+
+    def __init__(self, key: K, value: V, size: int):
+        self.key: K = key
+        self.value: V = value
+        self.size: int = size
+        self.prev: 'LRUNode[K, V] | None' = None
+        self.next: 'LRUNode[K, V] | None' = None
+
+def default_entry_size(key: object, value: object) -> int:
+    """Kích thước ước lượng (byte) của một mục: kích thước nông của key và value."""
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+class LRUCache(Generic[K, V]):
+    """
+    LRU CACHE - BỘ NHỚ ĐỆM GIỚI HẠN, LOẠI BỎ MỤC ÍT DÙNG GẦN ĐÂY NHẤT
+
+    Kết hợp HashTable (key -> node) với danh sách liên kết đôi theo thứ tự sử dụng:
+    đầu danh sách là mục mới dùng nhất, cuối danh sách là mục bị loại bỏ trước.
+    Giới hạn theo số mục (max_entries) và/hoặc tổng kích thước ước lượng (max_bytes);
+    None nghĩa là không giới hạn. Đếm số lần trúng, trượt và số mục bị loại bỏ.
+
+    PHƯƠNG THỨC:
+    - __init__(max_entries, max_bytes, size_of): Khởi tạo bộ đệm - O(1)
+    - get(key, default): Lấy giá trị và đánh dấu vừa dùng - O(1) trung bình
+    - peek(key, default): Lấy giá trị mà không đổi thứ tự và không tính trúng/trượt - O(1) trung bình
+    - put(key, value): Thêm/cập nhật và loại bỏ mục cũ nếu vượt giới hạn - O(1) trung bình (khấu hao)
+    - remove(key): Xóa một mục - O(1) trung bình
+    - contains_key(key): Kiểm tra key, không đổi thứ tự và không tính trúng/trượt - O(1) trung bình
+    - clear(): Xóa toàn bộ mục (giữ nguyên bộ đếm) - O(1)
+    - stats(): Bảng thống kê hits/misses/evictions/entries/bytes - O(1)
+    - __len__(), __contains__(key), __iter__(): Số mục, kiểm tra key, duyệt key từ mới tới cũ
+    """
+
+    def __init__(self,
+                 max_entries: int | None = None,
+                 max_bytes: int | None = None,
+                 size_of: Callable[[K, V], int] = default_entry_size):
+        """
+        Tham số:
+            max_entries (int | None): Số mục tối đa.
+            max_bytes (int | None): Tổng kích thước ước lượng tối đa (byte).
+            size_of (Callable): Hàm ước lượng kích thước của một cặp (key, value).
+
+        Ngoại lệ:
+            ValueError: Nếu giới hạn không dương.
+        """
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries phải lớn hơn 0.")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes phải lớn hơn 0.")
+        self.max_entries: int | None = max_entries
+        self.max_bytes: int | None = max_bytes
+        self.size_of: Callable[[K, V], int] = size_of
+        self._nodes: HashTable[K, LRUNode[K, V]] = HashTable()
+        self._head: LRUNode[K, V] | None = None
+        self._tail: LRUNode[K, V] | None = None
+        self.total_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def _unlink(self, node: LRUNode[K, V]) -> None:
+        if node.prev is not None:
+            node.prev.next = node.next
+        else:
+            self._head = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        else:
+            self._tail = node.prev
+        node.prev = node.next = None
+
+    def _push_front(self, node: LRUNode[K, V]) -> None:
+        node.next = self._head
+        if self._head is not None:
+            self._head.prev = node
+        self._head = node
+        if self._tail is None:
+            self._tail = node
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        node = self._nodes.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if node is not self._head:
+            self._unlink(node)
+            self._push_front(node)
+        return node.value
+
+    def peek(self, key: K, default: V | None = None) -> V | None:
+        node = self._nodes.get(key)
+        return default if node is None else node.value
+
+    def put(self, key: K, value: V) -> None:
+        size = self.size_of(key, value)
+        node = self._nodes.get(key)
+        if node is not None:
+            self.total_bytes += size - node.size
+            node.value = value
+            node.size = size
+            if node is not self._head:
+                self._unlink(node)
+                self._push_front(node)
+        else:
+            node = LRUNode(key, value, size)
+            self._nodes.put(key, node)
+            self._push_front(node)
+            self.total_bytes += size
+        self._evict_if_needed()
+
+    def _evict_if_needed(self) -> None:
+        # Luôn giữ lại mục vừa thêm, kể cả khi riêng nó đã vượt max_bytes
+        while self._tail is not None and self._tail is not self._head and self._over_budget():
+            victim = self._tail
+            self._unlink(victim)
+            self._nodes.remove(victim.key)
+            self.total_bytes -= victim.size
+            self.evictions += 1
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self._nodes) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
+
+    def remove(self, key: K) -> V | None:
+        node = self._nodes.remove(key)
+        if node is None:
+            return None
+        self._unlink(node)
+        self.total_bytes -= node.size
+        return node.value
+
+    def contains_key(self, key: K) -> bool:
+        return self._nodes.contains_key(key)
+
+    def clear(self) -> None:
+        self._nodes = HashTable()
+        self._head = self._tail = None
+        self.total_bytes = 0
+
+    def stats(self) -> HashTable[str, int]:
+        stats = HashTable[str, int]()
+        stats.put("hits", self.hits)
+        stats.put("misses", self.misses)
+        stats.put("evictions", self.evictions)
+        stats.put("entries", len(self._nodes))
+        stats.put("bytes", self.total_bytes)
+        return stats
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, key: K) -> bool:
+        return self._nodes.contains_key(key)
+
+    def __iter__(self) -> Iterator[K]:
+        node = self._head
+        while node is not None:
+            yield node.key
+            node = node.next
@@ -0,0 +1,5 @@
+from .dp_memo import PersistentDPMemo
+
+__all__ = [
+    "PersistentDPMemo",
+]
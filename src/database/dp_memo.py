@@ -0,0 +1,120 @@
+# Bảng ghi nhớ DP lưu trên đĩa (SQLite), dùng chung giữa các lần chạy và các tiến trình
+from __future__ import annotations
+import os
+import sqlite3
+from array import array
+
+from src.data_structures import LinkedList, Tuple
+
+# File SQLite riêng đặt cạnh debt_simplifier.db (không dùng chung bảng với dữ liệu giao diện)
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), "dp_memo.db")
+# Số lời giải tối đa được giữ lại; vượt quá thì xóa các lời giải được ghi sớm nhất
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+def pack_transfers(rank_transfers: LinkedList[Tuple]) -> bytes:
+    """Đóng gói các giao dịch dạng hạng (hạng_người_trả, hạng_người_nhận, số_tiền) thành bytes."""
+    values = array('q')
+    for transfer in rank_transfers:
+        values.extend((transfer[0], transfer[1], transfer[2]))
+    return values.tobytes()
+
+
+def unpack_transfers(blob: bytes) -> LinkedList[Tuple]:
+    """Giải nén bytes từ pack_transfers về danh sách giao dịch dạng hạng."""
+    values = array('q')
+    values.frombytes(blob)
+    rank_transfers = LinkedList[Tuple]()
+    for i in range(0, len(values), 3):
+        rank_transfers.append(Tuple([values[i], values[i + 1], values[i + 2]]))
+    return rank_transfers
+
+
+class PersistentDPMemo:
+    """
+    Bảng ghi nhớ lời giải DP lưu trong SQLite, khóa là (tên thuật toán, khóa chuẩn của số dư).
+
+    Khóa chuẩn (canonical_balance_key) chỉ phụ thuộc vào bội số dư, nên cùng một nhóm chạy lại hằng đêm
+    hoặc các nhóm khác nhau có cùng bội số dư đều dùng chung một lời giải. Lời giải được lưu ở dạng hạng
+    và được ánh xạ về người của nhóm hiện tại khi đọc.
+
+    - Chế độ WAL: nhiều tiến trình đọc đồng thời, không bị chặn bởi tiến trình đang ghi
+    - Đọc không ghi gì vào file, nên giới hạn kích thước được áp dụng theo thứ tự ghi (mục cũ nhất bị xóa)
+    """
+
+    def __init__(self,
+                 path: str | None = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 timeout: float = 5.0):
+        """
+        Tham số:
+            path: Đường dẫn file SQLite (mặc định: dp_memo.db cạnh debt_simplifier.db)
+            max_entries: Số lời giải tối đa được giữ lại
+            timeout: Thời gian chờ khóa ghi (giây) khi nhiều tiến trình cùng ghi
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries phải lớn hơn 0.")
+        self.path = path or DEFAULT_DB_PATH
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(self.path, timeout=timeout)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS dp_memo (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                algorithm TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                total_cost INTEGER NOT NULL,  -- Tổng tiền chuyển (xu)
+                transfer_count INTEGER NOT NULL,
+                transfers BLOB NOT NULL,      -- pack_transfers()
+                UNIQUE (algorithm, signature)
+            )
+        ''')
+        self._conn.commit()
+
+    def get(self, algorithm: str, signature: bytes) -> Tuple | None:
+        """
+        Tra cứu lời giải đã lưu.
+
+        Trả về:
+            Tuple | None: (tổng_chi_phí, số_giao_dịch, LinkedList[Tuple] giao dịch dạng hạng), hoặc None
+        """
+        row = self._conn.execute(
+            "SELECT total_cost, transfer_count, transfers FROM dp_memo WHERE algorithm = ? AND signature = ?",
+            (algorithm, signature)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Tuple([row[0], row[1], unpack_transfers(row[2])])
+
+    def put(self, algorithm: str, signature: bytes, total_cost: int,
+            transfer_count: int, rank_transfers: LinkedList[Tuple]) -> None:
+        """Lưu (hoặc thay thế) một lời giải rồi xóa các lời giải cũ nhất nếu vượt max_entries."""
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR REPLACE INTO dp_memo (algorithm, signature, total_cost, transfer_count, transfers) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (algorithm, signature, int(total_cost), int(transfer_count), pack_transfers(rank_transfers))
+            )
+            # id tăng dần theo thứ tự ghi nên chỉ cần xóa theo khoảng, không phải đếm cả bảng
+            self._conn.execute("DELETE FROM dp_memo WHERE id <= ?", (cursor.lastrowid - self.max_entries,))
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM dp_memo")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM dp_memo").fetchone()[0]
+
+    def __enter__(self) -> PersistentDPMemo:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -3,8 +3,9 @@
 
 from .sorting import merge_sort, quick_sort, heap_sort, merge_sort_linked_list, merge_sort_array
 from .constants import EPSILON
-from .money_utils import round_money
-from .financial_calculator import InterestType, PenaltyType, FinancialCalculator
+from .money_utils import Cents, round_money, to_cents, from_cents
+from .financial_calculator import InterestType, PenaltyType, FinancialCalculator, BatchMetrics
+from .external_sort import external_merge_sort, net_transactions_by_pair
 __all__ = [
     "merge_sort", 
     "quick_sort", 
@@ -12,8 +13,14 @@ __all__ = [
     "merge_sort_linked_list",
     "merge_sort_array",
 	"EPSILON",
+	"Cents",
 	"round_money",
+	"to_cents",
+	"from_cents",
 	"InterestType",
 	"PenaltyType",
 	"FinancialCalculator",
+	"BatchMetrics",
+	"external_merge_sort",
+	"net_transactions_by_pair",
 ] 
\ No newline at end of file
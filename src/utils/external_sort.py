@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, TypeVar, List as PyList
+
+from src.data_structures.priority_queue import PriorityQueue
+from src.utils.sorting import merge_sort
+from src.utils.money_utils import Cents
+
+# Type variable cho các bản ghi được sắp xếp
+T = TypeVar('T')
+
+# Số bản ghi tối đa giữ trong bộ nhớ cho mỗi run (mặc định)
+DEFAULT_MEMORY_BUDGET = 100_000
+# Số run tối đa được trộn cùng lúc (giới hạn số file mở đồng thời)
+DEFAULT_MAX_FAN_IN = 64
+
+def external_merge_sort(records: Iterable[T],
+                        key: Callable[[T], Any] | None = None,
+                        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                        max_fan_in: int = DEFAULT_MAX_FAN_IN,
+                        temp_dir: str | None = None) -> Iterator[T]:
+    """
+    Sắp xếp ngoài (External Merge Sort) cho tập dữ liệu lớn hơn bộ nhớ.
+
+    Quy trình:
+    1. Đọc tối đa `memory_budget` bản ghi, sắp xếp trong bộ nhớ (MergeSort ổn định)
+       và ghi thành một run đã sắp xếp ra file tạm.
+    2. Trộn k-đường (k-way merge) các run bằng PriorityQueue; nếu số run vượt `max_fan_in`
+       thì trộn nhiều lượt để giới hạn số file mở đồng thời.
+    3. Trả về iterator duyệt các bản ghi theo thứ tự tăng dần của key.
+
+    Nếu toàn bộ dữ liệu nằm gọn trong một run, không có file tạm nào được tạo.
+    Thứ tự sắp xếp là ổn định (các bản ghi có cùng key giữ nguyên thứ tự đầu vào).
+
+    Tham số:
+        records: Iterable các bản ghi (phải pickle được nếu cần ghi ra đĩa)
+        key: Hàm lấy khóa sắp xếp, mặc định là chính bản ghi
+        memory_budget: Số bản ghi tối đa giữ trong bộ nhớ cho mỗi run
+        max_fan_in: Số run tối đa trộn trong một lượt
+        temp_dir: Thư mục chứa file tạm (mặc định là thư mục tạm của hệ thống)
+
+    Trả về:
+        Iterator[T]: Các bản ghi đã được sắp xếp
+
+    Độ phức tạp: O(n log n) thời gian, O(memory_budget) bộ nhớ, O(n) dung lượng đĩa
+    """
+    if memory_budget <= 0:
+        raise ValueError("memory_budget phải là số dương")
+    if max_fan_in < 2:
+        raise ValueError("max_fan_in phải lớn hơn hoặc bằng 2")
+
+    key_fn = key if key is not None else (lambda record: record)
+
+    def key_comparator(a: tuple, b: tuple) -> bool:
+        # "a <= b" để MergeSort lấy phần tử bên trái khi bằng nhau (giữ tính ổn định)
+        return not (b[0] < a[0])
+
+    run_paths: PyList[str] = []
+    # Các run đã ghi của lượt trộn hiện tại; cũng phải được dọn nếu lượt bị gián đoạn
+    next_round: PyList[str] = []
+    try:
+        buffer: PyList[tuple] = []
+        for record in records:
+            buffer.append((key_fn(record), record))
+            if len(buffer) >= memory_budget:
+                run_paths.append(_write_run(merge_sort(buffer, key_comparator), temp_dir))
+                buffer = []
+
+        if not run_paths:
+            # Toàn bộ dữ liệu vừa bộ nhớ - không cần ghi ra đĩa
+            for _, record in merge_sort(buffer, key_comparator):
+                yield record
+            return
+
+        if buffer:
+            run_paths.append(_write_run(merge_sort(buffer, key_comparator), temp_dir))
+        buffer = []
+
+        # Trộn nhiều lượt cho đến khi số run không vượt quá max_fan_in
+        while len(run_paths) > max_fan_in:
+            next_round = []
+            for start in range(0, len(run_paths), max_fan_in):
+                group = run_paths[start:start + max_fan_in]
+                next_round.append(_write_run(_merge_runs(group), temp_dir))
+                _remove_files(group)
+            run_paths, next_round = next_round, []
+
+        for _, record in _merge_runs(run_paths):
+            yield record
+    finally:
+        _remove_files(run_paths)
+        _remove_files(next_round)
+
+def _write_run(sorted_pairs: Iterable[tuple], temp_dir: str | None) -> str:
+    """Ghi một run (các cặp (key, bản ghi) đã sắp xếp) ra file tạm và trả về đường dẫn."""
+    fd, path = tempfile.mkstemp(prefix="debt_run_", suffix=".bin", dir=temp_dir)
+    with os.fdopen(fd, "wb") as run_file:
+        for pair in sorted_pairs:
+            pickle.dump(pair, run_file, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+def _read_run(run_file: BinaryIO) -> Iterator[tuple]:
+    """Đọc tuần tự các cặp (key, bản ghi) từ một file run."""
+    while True:
+        try:
+            yield pickle.load(run_file)
+        except EOFError:
+            return
+
+def _merge_runs(run_paths: PyList[str]) -> Iterator[tuple]:
+    """
+    Trộn k-đường các file run bằng PriorityQueue.
+    Mỗi phần tử trong hàng đợi là (key, chỉ_số_run, bản_ghi); chỉ số run dùng để phá hòa
+    giúp thứ tự trộn ổn định.
+    """
+    def merge_comparator(a: tuple, b: tuple) -> bool:
+        if a[0] < b[0]:
+            return True
+        if b[0] < a[0]:
+            return False
+        return a[1] < b[1]
+
+    run_files: PyList[BinaryIO] = [open(path, "rb") for path in run_paths]
+    try:
+        readers = [_read_run(run_file) for run_file in run_files]
+        heap = PriorityQueue[tuple](comparator=merge_comparator)
+        for run_index, reader in enumerate(readers):
+            first = next(reader, None)
+            if first is not None:
+                heap.enqueue((first[0], run_index, first[1]), None)
+
+        while not heap.is_empty():
+            record_key, run_index, record = heap.dequeue()
+            yield record_key, record
+            following = next(readers[run_index], None)
+            if following is not None:
+                heap.enqueue((following[0], run_index, following[1]), None)
+    finally:
+        for run_file in run_files:
+            run_file.close()
+
+def _remove_files(paths: PyList[str]) -> None:
+    """Xóa các file tạm, bỏ qua file đã bị xóa."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def net_transactions_by_pair(transactions: Iterable[Any],
+                             memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                             temp_dir: str | None = None) -> Iterator[Any]:
+    """
+    Gộp và bù trừ giao dịch theo cặp (người nợ, người cho vay) bằng External Merge Sort.
+
+    Mỗi giao dịch được chuẩn hóa về cặp không thứ tự (a, b) với a < b và số tiền có dấu
+    theo xu (dương nếu a nợ b, âm nếu b nợ a). Sau khi sắp xếp ngoài theo cặp, các giao dịch cùng
+    cặp nằm liền nhau nên chỉ cần một lượt duyệt để cộng dồn, với bộ nhớ O(memory_budget).
+
+    Đây là bước tiền xử lý tùy chọn: không bộ đơn giản hóa hay bộ nạp dữ liệu nào tự gọi hàm này.
+    Với sổ cái hàng trăm triệu dòng, người gọi tự gộp trước khi đưa vào các bộ đơn giản hóa:
+        LinkedList(net_transactions_by_pair(rows))
+
+    Tham số:
+        transactions: Iterable các giao dịch có thuộc tính debtor, creditor, amount_cents
+        memory_budget: Số bản ghi tối đa giữ trong bộ nhớ cho mỗi run
+        temp_dir: Thư mục chứa file tạm
+
+    Trả về:
+        Iterator[BasicTransaction]: Mỗi cặp người còn nợ ròng khác 0 sinh ra đúng một giao dịch
+    """
+    # Import cục bộ: src.core_type phụ thuộc vào src.utils (FinancialCalculator)
+    from src.core_type import BasicTransaction
+
+    def normalized_records() -> Iterator[tuple]:
+        for tx in transactions:
+            if tx.debtor == tx.creditor:
+                continue
+            if tx.debtor < tx.creditor:
+                yield (tx.debtor, tx.creditor, tx.amount_cents)
+            else:
+                yield (tx.creditor, tx.debtor, -tx.amount_cents)
+
+    current_pair: tuple | None = None
+    pair_total: Cents = 0
+    for first, second, signed_amount in external_merge_sort(
+            normalized_records(),
+            key=lambda record: (record[0], record[1]),
+            memory_budget=memory_budget,
+            temp_dir=temp_dir):
+        if current_pair is not None and (first, second) != current_pair:
+            settled = _pair_to_transaction(current_pair, pair_total, BasicTransaction)
+            if settled is not None:
+                yield settled
+            pair_total = 0
+        current_pair = (first, second)
+        pair_total += signed_amount
+
+    if current_pair is not None:
+        settled = _pair_to_transaction(current_pair, pair_total, BasicTransaction)
+        if settled is not None:
+            yield settled
+
+def _pair_to_transaction(pair: tuple, signed_total: Cents, transaction_cls: type) -> Any:
+    """Chuyển tổng có dấu (theo xu) của một cặp thành giao dịch theo đúng chiều, hoặc None nếu đã cân bằng."""
+    if signed_total > 0:
+        return transaction_cls.from_cents(pair[0], pair[1], signed_total)
+    if signed_total < 0:
+        return transaction_cls.from_cents(pair[1], pair[0], -signed_total)
+    return None
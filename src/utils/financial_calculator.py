@@ -1,8 +1,101 @@
 from __future__ import annotations
 from datetime import date
+from typing import Any, Iterable
 from src.utils.money_utils import round_money
+from src.data_structures.array import Array
+from src.data_structures.tuple import Tuple
+from src.data_structures.lru_cache import LRUCache
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:  # NumPy là phụ thuộc tùy chọn, chỉ cần cho API tính theo lô
+    np = None
+
+# Số thứ tự (ordinal) của ngày 1970-01-01, dùng để chuyển ordinal sang datetime64
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# long double có ít nhất 60 bit phần định trị (x86) thì x*100 được biểu diễn chính xác (53 + 7 bit)
+_EXACT_LONGDOUBLE = np is not None and np.finfo(np.longdouble).nmant >= 60
+
+def _round_money_array(values: Any) -> Any:
+    """
+    Phiên bản vector hóa của round_money, cho kết quả khớp tuyệt đối với round() của Python.
+    np.round(x, 2) làm tròn x*100 đã bị sai số nên có thể lệch một xu ở các giá trị sát .5.
+    """
+    if _EXACT_LONGDOUBLE:
+        return np.rint(values.astype(np.longdouble) * 100).astype(np.float64) / 100
+
+    # Dự phòng: chỉ làm tròn lại các phần tử sát .5 bằng round_money
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    fraction = scaled - np.floor(scaled)
+    ambiguous = np.nonzero(np.abs(fraction - 0.5) <= 1e-7 * np.maximum(1.0, np.abs(scaled)))[0]
+    for index in ambiguous.tolist():
+        rounded[index] = round_money(float(values[index]))
+    return rounded
+
+# Số cơ số (tức số lãi suất khác nhau) tối đa được giữ bảng hệ số cùng lúc
+_FACTOR_TABLE_MAX_BASES = 32
+# Bảng hệ số lãi kép base**k (k = 0, 1, 2, ...) theo từng cơ số, dùng chung cho mọi phép chiếu;
+# giới hạn bằng LRU để tiến trình chạy lâu (GUI) không phình bộ nhớ theo số lãi suất người dùng nhập
+_FACTOR_TABLES: LRUCache[float, list[float]] = LRUCache(max_entries=_FACTOR_TABLE_MAX_BASES)
+# Cứ sau chừng ấy bước nhân liên tiếp thì neo lại bằng một phép lũy thừa chính xác để tránh tích lũy sai số
+_FACTOR_ANCHOR_STEP = 365
+
+def _compounding_factors(base: float, length: int) -> list[float]:
+    """
+    Trả về bảng hệ số [base**0, base**1, ..., base**(length-1)] (có thể dài hơn), được mở rộng
+    dần bằng phép nhân liên tiếp và lưu lại cho các lần gọi sau (tối đa _FACTOR_TABLE_MAX_BASES cơ số).
+    """
+    table = _FACTOR_TABLES.get(base)
+    if table is None:
+        table = [1.0]
+        _FACTOR_TABLES.put(base, table)
+    k = len(table)
+    while k < length:
+        table.append(base ** k if k % _FACTOR_ANCHOR_STEP == 0 else table[-1] * base)
+        k += 1
+    return table
+
+class BatchMetrics:
+    """
+    Kết quả của FinancialCalculator.evaluate_columns, giữ nguyên dạng cột của calculate_batch.
+
+    Truy cập theo chỉ số (metrics[i]) hoặc duyệt tuần tự trả về dict giống evaluate_transactions,
+    nhưng dict chỉ được dựng khi có người gọi cần; các bộ đơn giản hóa chỉ cần vài trường thì
+    đọc thẳng cột qua column() hoặc values().
+    """
+    FIELDS = ('principal', 'interest', 'penalty', 'total', 'priority')
+
+    def __init__(self, columns: dict):
+        # Các mảng NumPy theo tên trường, cùng độ dài
+        self.columns = columns
+        # Bản sao list Python của từng cột, chỉ tạo khi cần truy cập từng phần tử
+        self._lists: dict[str, list] = {}
+
+    def column(self, name: str) -> Any:
+        """Trả về mảng NumPy của một trường (không sao chép)."""
+        return self.columns[name]
+
+    def values(self, name: str) -> list:
+        """Trả về các giá trị của một trường dưới dạng list số thực Python (tính một lần)."""
+        values = self._lists.get(name)
+        if values is None:
+            values = self.columns[name].tolist()
+            self._lists[name] = values
+        return values
+
+    def __len__(self) -> int:
+        return len(self.columns['total'])
+
+    def __getitem__(self, index: int) -> dict:
+        return {name: self.values(name)[index] for name in self.FIELDS}
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
 class InterestType(Enum):
     """Enum định nghĩa các loại lãi suất"""
     SIMPLE = "simple"           # Lãi suất đơn
@@ -27,6 +120,10 @@ class FinancialCalculator:
     
     Class này có thể được tái sử dụng trong nhiều thuật toán khác nhau.
     """
+
+    # Mã số nguyên của các loại lãi/phạt, dùng cho các cột dữ liệu của API tính theo lô
+    INTEREST_TYPE_CODES = {interest_type: code for code, interest_type in enumerate(InterestType)}
+    PENALTY_TYPE_CODES = {penalty_type: code for code, penalty_type in enumerate(PenaltyType)}
     
     @staticmethod
     def calculate_interest(amount, interest_rate, borrow_date, current_date, interest_type):
@@ -131,9 +228,21 @@ class FinancialCalculator:
             principal, interest_rate, penalty_rate, borrow_date, due_date, 
             current_date, interest_type, penalty_type
         )
-        
+        return FinancialCalculator.priority_from_total(
+            debt_breakdown['total'], interest_rate, penalty_rate,
+            due_date, current_date, penalty_type
+        )
+
+    @staticmethod
+    def priority_from_total(total: float,
+                             interest_rate: float,
+                             penalty_rate: float,
+                             due_date: date,
+                             current_date: date,
+                             penalty_type: PenaltyType) -> float:
+        """Tính điểm ưu tiên từ tổng nợ đã biết (không tính lại lãi và phí phạt)."""
         # Trọng số cơ bản dựa trên tổng nợ
-        base_weight = debt_breakdown['total']
+        base_weight = total
         
         # Trọng số thời gian (càng gần đến hạn hoặc đã quá hạn càng cao)
         days_to_due = (due_date - current_date).days
@@ -156,4 +265,285 @@ class FinancialCalculator:
         priority_score = base_weight * time_weight * interest_weight * penalty_weight
         
         return round_money(priority_score)
-    
\ No newline at end of file
+
+    @staticmethod
+    def calculate_debt_metrics(principal: float,
+                               interest_rate: float,
+                               penalty_rate: float,
+                               borrow_date: date,
+                               due_date: date,
+                               current_date: date,
+                               interest_type: InterestType = InterestType.COMPOUND_DAILY,
+                               penalty_type: PenaltyType = PenaltyType.FIXED) -> dict:
+        """
+        Tính chi tiết nợ và điểm ưu tiên trong một lần duy nhất
+        (calculate_priority_score riêng lẻ sẽ phải tính lại tổng nợ).
+        
+        Returns:
+            dict: 'principal', 'interest', 'penalty', 'total', 'priority'
+        """
+        metrics = FinancialCalculator.calculate_total_debt(
+            principal, interest_rate, penalty_rate, borrow_date, due_date,
+            current_date, interest_type, penalty_type
+        )
+        metrics['priority'] = FinancialCalculator.priority_from_total(
+            metrics['total'], interest_rate, penalty_rate,
+            due_date, current_date, penalty_type
+        )
+        return metrics
+
+    @staticmethod
+    def project_debt(amount: float,
+                     interest_rate: float,
+                     penalty_rate: float,
+                     borrow_date: date,
+                     due_date: date,
+                     start_date: date,
+                     end_date: date,
+                     interest_type: InterestType = InterestType.COMPOUND_DAILY,
+                     penalty_type: PenaltyType = PenaltyType.FIXED) -> Array[Tuple]:
+        """
+        Chiếu giá trị khoản nợ cho từng ngày trong khoảng [start_date, end_date] trong một lượt.
+        Kết quả khớp với calculate_total_debt gọi cho từng ngày, nhưng lãi kép được lấy từ bảng
+        hệ số tính sẵn (nhân dồn) thay vì lũy thừa lại mỗi ngày, nên chi phí là O(số ngày).
+
+        Returns:
+            Array[Tuple]: Mỗi phần tử là Tuple (ngày, lãi, phí phạt, tổng nợ)
+        """
+        series = Array[Tuple]()
+        if end_date < start_date:
+            return series
+
+        start_ordinal = start_date.toordinal()
+        day_count = end_date.toordinal() - start_ordinal + 1
+        first_day = start_ordinal - borrow_date.toordinal()
+        due_ordinal = due_date.toordinal()
+
+        factors = None
+        if interest_type == InterestType.COMPOUND_DAILY and first_day >= 0:
+            factors = _compounding_factors(1 + interest_rate / 365, first_day + day_count)
+        months = (start_date.year - borrow_date.year) * 12 + (start_date.month - borrow_date.month)
+        month_factor = (1 + interest_rate / 12) ** months
+        current_month = start_date.month
+
+        # Phí phạt không phụ thuộc số ngày quá hạn (cố định / phần trăm) chỉ cần tính một lần
+        step_penalty = FinancialCalculator.calculate_penalty(
+            amount, penalty_rate, due_date, date.fromordinal(due_ordinal + 1), penalty_type
+        ) if penalty_type != PenaltyType.DAILY else 0.0
+
+        for offset in range(day_count):
+            ordinal = start_ordinal + offset
+            current = date.fromordinal(ordinal)
+            days = first_day + offset
+
+            if interest_type == InterestType.SIMPLE:
+                interest = amount * interest_rate * (days / 365)
+            elif interest_type == InterestType.COMPOUND_DAILY:
+                factor = factors[days] if factors is not None else (1 + interest_rate / 365) ** days
+                interest = amount * (factor - 1)
+            elif interest_type == InterestType.COMPOUND_MONTHLY:
+                if current.month != current_month:
+                    # Sang tháng mới: thêm đúng một kỳ ghép lãi
+                    current_month = current.month
+                    months += 1
+                    month_factor *= 1 + interest_rate / 12
+                interest = amount * (month_factor - 1)
+            else:
+                interest = 0.0
+
+            # Bậc thang phí phạt: bằng 0 đến hết due_date, sau đó áp dụng theo loại phạt
+            overdue_days = ordinal - due_ordinal
+            if overdue_days <= 0:
+                penalty = 0.0
+            elif penalty_type == PenaltyType.DAILY:
+                penalty = round_money(penalty_rate * overdue_days)
+            else:
+                penalty = step_penalty
+
+            series.append(Tuple([current, interest, penalty, amount + interest + penalty]))
+        return series
+
+    @staticmethod
+    def calculate_batch(principal: Any,
+                        interest_rate: Any,
+                        penalty_rate: Any,
+                        borrow_ordinal: Any,
+                        due_ordinal: Any,
+                        current_date: date | int,
+                        interest_code: Any,
+                        penalty_code: Any) -> dict:
+        """
+        Tính lãi, phí phạt, tổng nợ và điểm ưu tiên cho nhiều giao dịch trong một lượt vector hóa.
+        Kết quả khớp với calculate_total_debt và calculate_priority_score cho từng phần tử.
+
+        Args:
+            principal: Mảng số tiền gốc
+            interest_rate: Mảng lãi suất
+            penalty_rate: Mảng mức phí phạt
+            borrow_ordinal: Mảng ngày vay dạng date.toordinal()
+            due_ordinal: Mảng ngày đến hạn dạng date.toordinal()
+            current_date: Ngày tính toán (date hoặc ordinal)
+            interest_code: Mảng mã loại lãi (INTEREST_TYPE_CODES)
+            penalty_code: Mảng mã loại phạt (PENALTY_TYPE_CODES)
+
+        Returns:
+            dict: Các mảng NumPy 'principal', 'interest', 'penalty', 'total', 'priority'
+
+        Raises:
+            ImportError: Nếu NumPy chưa được cài đặt
+        """
+        if np is None:
+            raise ImportError("FinancialCalculator.calculate_batch cần NumPy (pip install numpy).")
+
+        current_ordinal = current_date.toordinal() if isinstance(current_date, date) else int(current_date)
+        principal = np.asarray(principal, dtype=np.float64)
+        interest_rate = np.asarray(interest_rate, dtype=np.float64)
+        penalty_rate = np.asarray(penalty_rate, dtype=np.float64)
+        borrow_ordinal = np.asarray(borrow_ordinal, dtype=np.int64)
+        due_ordinal = np.asarray(due_ordinal, dtype=np.int64)
+        interest_code = np.asarray(interest_code, dtype=np.int8)
+        penalty_code = np.asarray(penalty_code, dtype=np.int8)
+
+        # Số ngày và số tháng lịch (theo năm*12 + tháng) kể từ ngày vay
+        days = (current_ordinal - borrow_ordinal).astype(np.float64)
+        current_month = np.datetime64(current_ordinal - _EPOCH_ORDINAL, 'D').astype('datetime64[M]').astype(np.int64)
+        borrow_month = (borrow_ordinal - _EPOCH_ORDINAL).astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+        months = (current_month - borrow_month).astype(np.float64)
+
+        codes = FinancialCalculator.INTEREST_TYPE_CODES
+        interest = np.zeros_like(principal)
+        mask = interest_code == codes[InterestType.SIMPLE]
+        interest[mask] = principal[mask] * interest_rate[mask] * (days[mask] / 365)
+        mask = interest_code == codes[InterestType.COMPOUND_MONTHLY]
+        interest[mask] = principal[mask] * ((1 + interest_rate[mask] / 12) ** months[mask] - 1)
+        mask = interest_code == codes[InterestType.COMPOUND_DAILY]
+        interest[mask] = principal[mask] * ((1 + interest_rate[mask] / 365) ** days[mask] - 1)
+        # COMPOUND_YEARLY: giữ 0.0 giống phiên bản tính từng giao dịch
+
+        codes = FinancialCalculator.PENALTY_TYPE_CODES
+        days_to_due = (due_ordinal - current_ordinal).astype(np.float64)
+        overdue = days_to_due < 0
+        penalty = np.zeros_like(principal)
+        mask = overdue & (penalty_code == codes[PenaltyType.FIXED])
+        penalty[mask] = _round_money_array(penalty_rate[mask])
+        mask = overdue & (penalty_code == codes[PenaltyType.DAILY])
+        penalty[mask] = _round_money_array(penalty_rate[mask] * -days_to_due[mask])
+        mask = overdue & (penalty_code == codes[PenaltyType.PERCENTAGE])
+        penalty[mask] = _round_money_array(principal[mask] * penalty_rate[mask])
+
+        total = principal + interest + penalty
+
+        # Trọng số điểm ưu tiên (xem calculate_priority_score)
+        time_weight = np.where(
+            days_to_due <= 0,
+            2.0 + np.minimum(np.abs(days_to_due) / 30, 5.0),
+            np.maximum(0.5, 2.0 / np.maximum(1, days_to_due / 30))
+        )
+        interest_weight = 1.0 + interest_rate * 10
+        penalty_weight = np.where(
+            (penalty_code != codes[PenaltyType.FIXED]) & (penalty_rate > 0),
+            1.0 + penalty_rate * 5,
+            1.0
+        )
+        priority = _round_money_array(total * time_weight * interest_weight * penalty_weight)
+
+        return {
+            'principal': principal,
+            'interest': interest,
+            'penalty': penalty,
+            'total': total,
+            'priority': priority
+        }
+
+    @staticmethod
+    def build_columns(transactions: Iterable[Any]) -> dict:
+        """
+        Chuyển danh sách giao dịch nâng cao thành các cột NumPy cho calculate_batch.
+
+        Args:
+            transactions: Iterable các AdvancedTransaction
+
+        Returns:
+            dict: Các cột 'principal', 'interest_rate', 'penalty_rate', 'borrow_ordinal',
+                  'due_ordinal', 'interest_code', 'penalty_code'
+        """
+        if np is None:
+            raise ImportError("FinancialCalculator.build_columns cần NumPy (pip install numpy).")
+
+        interest_codes = FinancialCalculator.INTEREST_TYPE_CODES
+        penalty_codes = FinancialCalculator.PENALTY_TYPE_CODES
+        rows = [
+            (tx.amount, tx.interest_rate, tx.penalty_rate,
+             tx.borrow_date.toordinal(), tx.due_date.toordinal(),
+             interest_codes[tx.interest_type], penalty_codes[tx.penalty_type])
+            for tx in transactions
+        ]
+        columns = list(zip(*rows)) if rows else [()] * 7
+        return {
+            'principal': np.array(columns[0], dtype=np.float64),
+            'interest_rate': np.array(columns[1], dtype=np.float64),
+            'penalty_rate': np.array(columns[2], dtype=np.float64),
+            'borrow_ordinal': np.array(columns[3], dtype=np.int64),
+            'due_ordinal': np.array(columns[4], dtype=np.int64),
+            'interest_code': np.array(columns[5], dtype=np.int8),
+            'penalty_code': np.array(columns[6], dtype=np.int8),
+        }
+
+    @staticmethod
+    def evaluate_columns(columns: dict, current_date: date) -> BatchMetrics:
+        """
+        Chạy calculate_batch trên các cột đã dựng sẵn (build_columns).
+        Cho phép dùng lại cùng một bộ cột cho nhiều ngày đánh giá.
+
+        Returns:
+            BatchMetrics: Các cột 'principal', 'interest', 'penalty', 'total', 'priority';
+                          dict của từng giao dịch chỉ được dựng khi truy cập theo chỉ số
+        """
+        return BatchMetrics(FinancialCalculator.calculate_batch(
+            columns['principal'], columns['interest_rate'], columns['penalty_rate'],
+            columns['borrow_ordinal'], columns['due_ordinal'], current_date,
+            columns['interest_code'], columns['penalty_code']
+        ))
+
+    @staticmethod
+    def metric_values(metrics: Array[dict] | BatchMetrics, name: str) -> list:
+        """
+        Trả về một trường của mọi giao dịch theo thứ tự, không dựng dict khi metrics ở dạng cột.
+
+        Args:
+            metrics: Kết quả của evaluate_transactions / evaluate_columns
+            name: Tên trường ('principal', 'interest', 'penalty', 'total', 'priority')
+        """
+        if isinstance(metrics, BatchMetrics):
+            return metrics.values(name)
+        return [tx_metrics[name] for tx_metrics in metrics]
+
+    @staticmethod
+    def evaluate_transactions(transactions: Iterable[Any],
+                              current_date: date,
+                              use_batch: bool = False) -> Array[dict] | BatchMetrics:
+        """
+        Tính chi tiết nợ và điểm ưu tiên cho từng giao dịch, theo đúng thứ tự đầu vào.
+        Đây là điểm dùng chung của các bộ đơn giản hóa nâng cao.
+
+        Args:
+            transactions: Iterable các AdvancedTransaction
+            current_date: Ngày tính toán
+            use_batch: True để dùng calculate_batch (vector hóa). Nếu NumPy chưa được cài đặt,
+                       tự động quay về cách tính từng giao dịch.
+
+        Returns:
+            Array[dict] | BatchMetrics: Mỗi phần tử gồm 'principal', 'interest', 'penalty', 'total', 'priority'
+                         (chỉ đọc - có thể là bản ghi trong bộ nhớ đệm của giao dịch); dạng cột
+                         BatchMetrics khi dùng calculate_batch
+        """
+        if use_batch and np is not None:
+            return FinancialCalculator.evaluate_columns(
+                FinancialCalculator.build_columns(transactions), current_date
+            )
+
+        results = Array[dict]()
+        for tx in transactions:
+            # Dùng bộ nhớ đệm theo ngày của từng giao dịch (AdvancedTransaction.get_debt_metrics)
+            results.append(tx.get_debt_metrics(current_date))
+        return results
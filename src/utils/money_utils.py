@@ -1,3 +1,10 @@
+# Kiểu số tiền nguyên tính theo xu (1/100 đơn vị tiền tệ).
+# Toàn bộ pipeline đơn giản hóa làm việc trên Cents; chỉ chuyển sang float ở biên nhập/xuất.
+Cents = int
+
+# Số xu trong một đơn vị tiền tệ
+CENTS_PER_UNIT = 100
+
 def round_money(amount: float) -> float:
     """
     Làm tròn một số tiền đến 2 chữ số thập phân.
@@ -8,4 +15,28 @@ def round_money(amount: float) -> float:
     Returns:
         float: Số tiền đã được làm tròn với 2 chữ số thập phân
     """
-    return round(amount, 2) 
\ No newline at end of file
+    return round(amount, 2)
+
+def to_cents(amount: float) -> Cents:
+    """
+    Chuyển số tiền dạng float sang số nguyên xu (làm tròn đến xu gần nhất).
+    
+    Args:
+        amount (float): Số tiền cần chuyển đổi
+        
+    Returns:
+        Cents: Số tiền tính theo xu
+    """
+    return int(round(amount * CENTS_PER_UNIT))
+
+def from_cents(cents: Cents) -> float:
+    """
+    Chuyển số nguyên xu về số tiền dạng float (dùng ở biên xuất dữ liệu).
+    
+    Args:
+        cents (Cents): Số tiền tính theo xu
+        
+    Returns:
+        float: Số tiền với 2 chữ số thập phân
+    """
+    return cents / CENTS_PER_UNIT
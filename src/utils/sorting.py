@@ -42,38 +42,124 @@ def _merge(left: PyList[T], right: PyList[T], comparator: Callable[[T, T], bool]
     result.extend(right[j:])
     return result
 
+# Ngưỡng kích thước đoạn con chuyển sang Insertion Sort trong Introsort
+_INSERTION_SORT_THRESHOLD = 16
+# Kích thước đoạn con từ đó chọn pivot bằng "ninther" (trung vị của 3 trung vị) thay vì median-of-three
+_NINTHER_THRESHOLD = 128
+# Độ sâu phân hoạch tối đa là _DEPTH_LIMIT_FACTOR * log2(n) trước khi chuyển sang HeapSort
+_DEPTH_LIMIT_FACTOR = 2
+
 def quick_sort(array: PyList[T], comparator: Callable[[T, T], bool] | None = None) -> None:
-    """Triển khai QuickSort (sắp xếp tại chỗ - in-place). hàm so sánh (comparator) `comparator(a,b)` trả về True nếu a < b."""
-    _quick_sort_recursive(array, 0, len(array) - 1, comparator)
-
-def _quick_sort_recursive(array: PyList[T], low: int, high: int, comparator: Callable[[T, T], bool] | None) -> None:
-    if low < high:
-        pivot_index = _partition(array, low, high, comparator)
-        _quick_sort_recursive(array, low, pivot_index - 1, comparator)
-        _quick_sort_recursive(array, pivot_index + 1, high, comparator)
-        
-def _partition(array: PyList[T], low: int, high: int, comparator: Callable[[T, T], bool] | None) -> int:
-    pivot = array[high]
-    i = low - 1 # Chỉ số của phần tử nhỏ hơn pivot
-    
-    for j in range(low, high):
-        should_swap = False
-        if comparator:
-            # array[j] <= pivot tương đương với comparator(array[j], pivot) HOẶC array[j] == pivot
-            # Nếu comparator(a,b) là a < b, thì (a <= b) là (a < b hoặc a == b)
-            should_swap = comparator(array[j], pivot) or array[j] == pivot
+    """Triển khai QuickSort dạng Introsort (sắp xếp tại chỗ - in-place). hàm so sánh (comparator) `comparator(a,b)` trả về True nếu a < b.
+
+    - Pivot chọn bằng median-of-three (hoặc ninther với đoạn lớn) nên input đã sắp xếp không còn rơi vào O(n²).
+    - Phân hoạch 3 nhánh (< pivot, == pivot, > pivot) để xử lý nhanh các dãy nhiều số dư bằng nhau.
+    - Dùng stack tường minh thay cho đệ quy, luôn xử lý đoạn nhỏ hơn trước nên stack chỉ sâu O(log n).
+    - Đoạn nhỏ hơn `_INSERTION_SORT_THRESHOLD` phần tử được sắp xếp bằng Insertion Sort.
+    - Khi độ sâu phân hoạch vượt `_DEPTH_LIMIT_FACTOR`*log2(n), đoạn đó được chuyển sang `heap_sort` để đảm bảo O(n log n).
+    """
+    n = len(array)
+    if n <= 1:
+        return
+
+    less = _resolve_less_comparator(comparator)
+    depth_limit = _DEPTH_LIMIT_FACTOR * n.bit_length()
+
+    # Mỗi phần tử stack: (low, high, độ_sâu_còn_lại)
+    stack: PyList[tuple[int, int, int]] = [(0, n - 1, depth_limit)]
+    while stack:
+        low, high, depth = stack.pop()
+
+        if high - low + 1 <= _INSERTION_SORT_THRESHOLD:
+            _insertion_sort_range(array, low, high, less)
+            continue
+
+        if depth == 0:
+            # Phân hoạch quá sâu (dữ liệu bất lợi) - dùng HeapSort cho đoạn này
+            _heap_sort_range(array, low, high, less)
+            continue
+
+        lt, gt = _partition_three_way(array, low, high, less)
+        # Đoạn [lt, gt] đã bằng pivot và nằm đúng vị trí.
+        # Đẩy đoạn lớn hơn vào trước để đoạn nhỏ hơn được xử lý trước (giới hạn kích thước stack).
+        if lt - low < high - gt:
+            stack.append((gt + 1, high, depth - 1))
+            stack.append((low, lt - 1, depth - 1))
         else:
-            try:
-                should_swap = array[j] <= pivot
-            except TypeError:
-                raise TypeError("Không thể so sánh các phần tử nếu không có hàm so sánh (comparator) hoặc __le__")
+            stack.append((low, lt - 1, depth - 1))
+            stack.append((gt + 1, high, depth - 1))
+
+def _resolve_less_comparator(comparator: Callable[[T, T], bool] | None) -> Callable[[T, T], bool]:
+    """Trả về hàm `less(a, b)`; mặc định dùng toán tử < nếu không có comparator."""
+    if comparator:
+        return comparator
+
+    def default_less(a, b):
+        try:
+            return a < b
+        except TypeError:
+            raise TypeError("Không thể so sánh các phần tử nếu không có hàm so sánh (comparator) hoặc __lt__")
+    return default_less
+
+def _median_of_three_index(array: PyList[T], i: int, j: int, k: int, less: Callable[[T, T], bool]) -> int:
+    """Trả về chỉ số của phần tử trung vị trong ba phần tử array[i], array[j], array[k]."""
+    if less(array[i], array[j]):
+        if less(array[j], array[k]):
+            return j
+        return k if less(array[i], array[k]) else i
+    if less(array[i], array[k]):
+        return i
+    return k if less(array[j], array[k]) else j
+
+def _choose_pivot_index(array: PyList[T], low: int, high: int, less: Callable[[T, T], bool]) -> int:
+    """Chọn pivot bằng median-of-three, hoặc ninther (trung vị của 3 trung vị) cho đoạn lớn."""
+    mid = low + (high - low) // 2
+    if high - low + 1 >= _NINTHER_THRESHOLD:
+        step = (high - low + 1) // 8
+        first = _median_of_three_index(array, low, low + step, low + 2 * step, less)
+        middle = _median_of_three_index(array, mid - step, mid, mid + step, less)
+        last = _median_of_three_index(array, high - 2 * step, high - step, high, less)
+        return _median_of_three_index(array, first, middle, last, less)
+    return _median_of_three_index(array, low, mid, high, less)
+
+def _partition_three_way(array: PyList[T], low: int, high: int, less: Callable[[T, T], bool]) -> tuple[int, int]:
+    """
+    Phân hoạch 3 nhánh (Dutch National Flag) trên đoạn [low, high].
+    Sau khi phân hoạch: array[low..lt-1] < pivot, array[lt..gt] == pivot, array[gt+1..high] > pivot.
 
-        if should_swap:
+    Trả về:
+        tuple[int, int]: (lt, gt) - biên của đoạn bằng pivot
+    """
+    pivot_index = _choose_pivot_index(array, low, high, less)
+    pivot = array[pivot_index]
+    lt, i, gt = low, low, high
+    while i <= gt:
+        if less(array[i], pivot):
+            array[lt], array[i] = array[i], array[lt]
+            lt += 1
             i += 1
-            array[i], array[j] = array[j], array[i] # Hoán đổi
-            
-    array[i + 1], array[high] = array[high], array[i + 1] # Đưa pivot về đúng vị trí
-    return i + 1
+        elif less(pivot, array[i]):
+            array[i], array[gt] = array[gt], array[i]
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+def _insertion_sort_range(array: PyList[T], low: int, high: int, less: Callable[[T, T], bool]) -> None:
+    """Insertion Sort ổn định trên đoạn [low, high] - nhanh với đoạn nhỏ."""
+    for i in range(low + 1, high + 1):
+        current = array[i]
+        j = i - 1
+        while j >= low and less(current, array[j]):
+            array[j + 1] = array[j]
+            j -= 1
+        array[j + 1] = current
+
+def _heap_sort_range(array: PyList[T], low: int, high: int, less: Callable[[T, T], bool]) -> None:
+    """Sắp xếp đoạn [low, high] bằng `heap_sort` (max-heap với `a lớn hơn b` khi less(b, a))."""
+    segment = array[low:high + 1]
+    heap_sort(segment, comparator=lambda a, b: less(b, a))
+    array[low:high + 1] = segment
 
 def heap_sort(array: PyList[T], comparator: Callable[[T, T], bool] | None = None) -> None:
     """Triển khai HeapSort (sắp xếp tại chỗ - in-place).
@@ -0,0 +1,94 @@
+from __future__ import annotations
+from datetime import date, timedelta
+import random
+import unittest
+
+from src.data_structures import LinkedList
+from src.core_type import AdvancedTransaction, BasicTransaction
+from src.algorithms import (
+    aggregate_balances, GreedySimplifier, MinCostMaxFlowSimplifier,
+    AdvancedGreedySimplifier, AdvancedMinCostMaxFlowSimplifier, AdvancedDynamicProgrammingSimplifier
+)
+from src.algorithms.basic_transactions.vectorized_greedy import VectorizedGreedySimplifier, np
+from src.utils.financial_calculator import InterestType, PenaltyType
+
+def _rows(transactions):
+    return [(tx.debtor, tx.creditor, tx.amount_cents) for tx in transactions]
+
+class TestAggregateBalances(unittest.TestCase):
+    """Bộ kiểm thử cho tổng hợp số dư map-reduce."""
+
+    def setUp(self):
+        rng = random.Random(21)
+        people = ["Alice", "Bob", "Charlie", "David", "Ema"]
+        self.basic = LinkedList[BasicTransaction]()
+        self.advanced = LinkedList[AdvancedTransaction]()
+        for _ in range(120):
+            debtor, creditor = rng.sample(people, 2)
+            amount = round(rng.uniform(1, 500), 2)
+            self.basic.append(BasicTransaction(debtor, creditor, amount))
+            borrow = date(2024, 1, 1) + timedelta(days=rng.randint(0, 90))
+            self.advanced.append(AdvancedTransaction(
+                debtor, creditor, amount, borrow, borrow + timedelta(days=rng.randint(0, 60)),
+                interest_rate=0.1, penalty_rate=1.5,
+                interest_type=rng.choice(list(InterestType)),
+                penalty_type=rng.choice(list(PenaltyType))
+            ))
+        self.current_date = date(2024, 6, 1)
+
+    def test_basic_balances_match_simplifiers(self):
+        for workers in (None, 2):
+            aggregate = aggregate_balances(self.basic, max_workers=workers, chunk_size=25)
+            self.assertEqual(aggregate.transaction_count, 120)
+            for simplifier_cls in (GreedySimplifier, MinCostMaxFlowSimplifier):
+                simplifier = simplifier_cls()
+                simplifier.add_balances(aggregate.balances, aggregate.transaction_count)
+                self.assertEqual(_rows(simplifier.simplify()), _rows(simplifier_cls(self.basic).simplify()))
+
+    @unittest.skipIf(np is None, "Cần NumPy cho nhân vector hóa")
+    def test_vectorized_greedy_consumes_balances(self):
+        head, tail = list(self.basic)[:40], list(self.basic)[40:]
+        aggregate = aggregate_balances(tail, chunk_size=25)
+        # Phần đầu nạp dạng giao dịch, phần sau cộng dồn số dư (có thể có người chưa được intern)
+        simplifier = VectorizedGreedySimplifier(head[:3])
+        simplifier.add_balances(aggregate_balances(head[3:]).balances, len(head) - 3)
+        simplifier.add_balances(aggregate.balances, aggregate.transaction_count)
+        self.assertEqual(simplifier.transaction_count, 120)
+        self.assertEqual(_rows(simplifier.simplify()), _rows(GreedySimplifier(self.basic).simplify()))
+
+    def test_advanced_metrics_feed_simplifiers(self):
+        aggregate = aggregate_balances(
+            self.advanced, current_date=self.current_date, max_workers=2, chunk_size=16, with_metrics=True
+        )
+        reference = AdvancedGreedySimplifier(self.advanced, self.current_date)
+        for person in reference.people_balances.keys():
+            self.assertEqual(aggregate.balances.get(person), reference.people_balances.get(person))
+        for simplifier_cls in (AdvancedGreedySimplifier, AdvancedMinCostMaxFlowSimplifier):
+            expected = simplifier_cls(self.advanced, self.current_date).simplify()
+            actual = simplifier_cls(
+                self.advanced, self.current_date, transaction_metrics=aggregate.transaction_metrics
+            ).simplify()
+            self.assertEqual(_rows(actual), _rows(expected))
+            # Số dư đã tổng hợp song song được dùng thẳng, không cộng dồn lại
+            actual = simplifier_cls(
+                self.advanced, self.current_date,
+                transaction_metrics=aggregate.transaction_metrics, balances=aggregate.balances
+            ).simplify()
+            self.assertEqual(_rows(actual), _rows(expected))
+
+    def test_advanced_dp_consumes_balances(self):
+        small = LinkedList[AdvancedTransaction]()
+        for tx in list(self.advanced)[:6]:
+            small.append(tx)
+        aggregate = aggregate_balances(small, current_date=self.current_date, with_metrics=True)
+        expected = AdvancedDynamicProgrammingSimplifier(small, self.current_date)
+        actual = AdvancedDynamicProgrammingSimplifier(
+            small, self.current_date,
+            transaction_metrics=aggregate.transaction_metrics, balances=aggregate.balances
+        )
+        for person in expected.people_real_balances.keys():
+            self.assertEqual(actual.people_real_balances.get(person), expected.people_real_balances.get(person))
+        self.assertEqual(_rows(actual.simplify()[0]), _rows(expected.simplify()[0]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+from datetime import date, timedelta
+import random
+import unittest
+
+from src.data_structures import LinkedList
+from src.core_type import AdvancedTransaction, BasicTransaction
+from src.algorithms import (
+    BalanceLedger, GreedySimplifier, DynamicProgrammingSimplifier, MinCostMaxFlowSimplifier,
+    DebtCycleSimplifier, AdvancedGreedySimplifier, AdvancedDynamicProgrammingSimplifier,
+    AdvancedMinCostMaxFlowSimplifier, AdvancedDebtCycleSimplifier
+)
+from src.utils.financial_calculator import InterestType, PenaltyType
+
+def _rows(transactions):
+    return [(tx.debtor, tx.creditor, tx.amount_cents) for tx in transactions]
+
+def _net(transactions):
+    balances = {}
+    for tx in transactions:
+        balances[tx.debtor] = balances.get(tx.debtor, 0) - tx.amount_cents
+        balances[tx.creditor] = balances.get(tx.creditor, 0) + tx.amount_cents
+    return {person: amount for person, amount in balances.items() if amount != 0}
+
+class TestBalanceLedger(unittest.TestCase):
+    """Bộ kiểm thử cho sổ cái số dư dùng chung."""
+
+    def setUp(self):
+        rng = random.Random(38)
+        people = ["Alice", "Bob", "Charlie", "David", "Ema"]
+        self.basic = LinkedList[BasicTransaction]()
+        self.advanced = LinkedList[AdvancedTransaction]()
+        for _ in range(60):
+            debtor, creditor = rng.sample(people, 2)
+            amount = round(rng.uniform(1, 500), 2)
+            self.basic.append(BasicTransaction(debtor, creditor, amount))
+            borrow = date(2024, 1, 1) + timedelta(days=rng.randint(0, 90))
+            self.advanced.append(AdvancedTransaction(
+                debtor, creditor, amount, borrow, borrow + timedelta(days=rng.randint(0, 60)),
+                interest_rate=0.1, penalty_rate=1.5,
+                interest_type=rng.choice(list(InterestType)),
+                penalty_type=rng.choice(list(PenaltyType))
+            ))
+        self.current_date = date(2024, 6, 1)
+
+    def test_totals(self):
+        ledger = BalanceLedger(self.basic)
+        self.assertEqual(ledger.transaction_count, 60)
+        self.assertEqual(ledger.total_volume, sum(tx.amount_cents for tx in self.basic))
+        self.assertEqual(ledger.total_outstanding, sum(v for v in _net(self.basic).values() if v > 0))
+        self.assertEqual(list(ledger.sorted_people), sorted(ledger.balances.keys()))
+        self.assertEqual(_net(ledger.pair_transactions()), _net(self.basic))
+
+    def test_basic_simplifiers_accept_ledger(self):
+        ledger = BalanceLedger(self.basic)
+        for simplifier_cls in (GreedySimplifier, DynamicProgrammingSimplifier, MinCostMaxFlowSimplifier):
+            self.assertEqual(
+                _rows(simplifier_cls(ledger).simplify()), _rows(simplifier_cls(self.basic).simplify())
+            )
+        # Bộ phát hiện chu trình làm việc trên các cạnh đã gộp theo cặp: chỉ cần giữ nguyên số dư ròng
+        self.assertEqual(_net(DebtCycleSimplifier(ledger).simplify()), _net(self.basic))
+        # Sổ cái không bị thay đổi sau khi dùng chung
+        self.assertEqual(_rows(GreedySimplifier(ledger).simplify()), _rows(GreedySimplifier(self.basic).simplify()))
+
+    def test_advanced_simplifiers_accept_ledger(self):
+        ledger = BalanceLedger(self.advanced, current_date=self.current_date)
+        for simplifier_cls in (AdvancedGreedySimplifier, AdvancedMinCostMaxFlowSimplifier):
+            expected = simplifier_cls(self.advanced, self.current_date).simplify()
+            actual = simplifier_cls(ledger, self.current_date).simplify()
+            self.assertEqual(_rows(actual), _rows(expected))
+
+        expected_dp = AdvancedDynamicProgrammingSimplifier(self.advanced, self.current_date)
+        actual_dp = AdvancedDynamicProgrammingSimplifier(ledger, self.current_date)
+        self.assertEqual(
+            list(actual_dp.people_real_balances.items()), list(expected_dp.people_real_balances.items())
+        )
+
+        expected_cycle = AdvancedDebtCycleSimplifier(self.advanced, self.current_date).simplify_advanced()
+        actual_cycle = AdvancedDebtCycleSimplifier(ledger, self.current_date).simplify_advanced()
+        self.assertEqual(
+            [(tx.debtor, tx.creditor, tx.amount) for tx in actual_cycle],
+            [(tx.debtor, tx.creditor, tx.amount) for tx in expected_cycle]
+        )
+
+    def test_date_mismatch_rejected(self):
+        ledger = BalanceLedger(self.advanced, current_date=self.current_date)
+        with self.assertRaises(ValueError):
+            AdvancedGreedySimplifier(ledger, date(2024, 7, 1))
+        with self.assertRaises(ValueError):
+            AdvancedGreedySimplifier(BalanceLedger(self.basic), self.current_date)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+from datetime import date, timedelta
+import unittest
+
+from src.data_structures import LinkedList
+from src.core_type import AdvancedTransaction
+from src.algorithms.advanced_transactions import (
+    AdvancedGreedySimplifier, AdvancedDebtCycleSimplifier, AdvancedMinCostMaxFlowSimplifier, simplify_over_dates
+)
+from src.algorithms.advanced_transactions.date_sweep import _sweep_metrics, _sweep_balances
+from src.utils.financial_calculator import InterestType, PenaltyType
+
+class TestSimplifyOverDates(unittest.TestCase):
+    """Bộ kiểm thử cho chế độ quét nhiều ngày đánh giá."""
+
+    def setUp(self):
+        self.transactions = LinkedList[AdvancedTransaction]()
+        self.transactions.append(AdvancedTransaction(
+            "Alice", "Bob", 1000.0, date(2024, 1, 1), date(2024, 6, 10),
+            interest_rate=0.12, penalty_rate=3.0,
+            interest_type=InterestType.COMPOUND_DAILY, penalty_type=PenaltyType.DAILY
+        ))
+        self.transactions.append(AdvancedTransaction(
+            "Bob", "Charlie", 400.0, date(2024, 2, 1), date(2024, 6, 5),
+            interest_rate=0.2, penalty_rate=0.05,
+            interest_type=InterestType.COMPOUND_MONTHLY, penalty_type=PenaltyType.PERCENTAGE
+        ))
+        self.transactions.append(AdvancedTransaction(
+            "Charlie", "Alice", 250.0, date(2024, 3, 1), date(2024, 7, 1),
+            interest_rate=0.05, penalty_rate=10.0,
+            interest_type=InterestType.SIMPLE, penalty_type=PenaltyType.FIXED
+        ))
+        self.dates = [date(2024, 6, 1) + timedelta(days=i) for i in range(20)]
+
+    @staticmethod
+    def _as_rows(transactions):
+        return [(tx.debtor, tx.creditor, tx.amount_cents) for tx in transactions]
+
+    def test_matches_individual_runs(self):
+        results = simplify_over_dates(AdvancedGreedySimplifier, self.transactions, self.dates)
+        self.assertEqual(len(results), len(self.dates))
+        for day, simplified in results:
+            expected = AdvancedGreedySimplifier(self.transactions, day).simplify()
+            self.assertEqual(self._as_rows(simplified), self._as_rows(expected))
+
+    def test_incremental_balances_match_each_date(self):
+        metrics_by_date = _sweep_metrics(self.transactions, self.dates, use_batch=False)
+        for day, balances in zip(self.dates, _sweep_balances(self.transactions, metrics_by_date)):
+            reference = AdvancedGreedySimplifier(self.transactions, day).people_balances
+            for person in reference.keys():
+                self.assertEqual(balances.get(person), reference.get(person))
+
+    def test_balance_consumers_match_individual_runs(self):
+        results = simplify_over_dates(AdvancedMinCostMaxFlowSimplifier, self.transactions, self.dates[::3])
+        for day, simplified in results:
+            expected = AdvancedMinCostMaxFlowSimplifier(self.transactions, day).simplify()
+            self.assertEqual(self._as_rows(simplified), self._as_rows(expected))
+
+    def test_dates_sorted_and_deduplicated(self):
+        dates = [date(2024, 9, 1), date(2024, 6, 1), date(2024, 9, 1)]
+        results = simplify_over_dates(AdvancedDebtCycleSimplifier, self.transactions, dates)
+        self.assertEqual([day for day, _ in results], [date(2024, 6, 1), date(2024, 9, 1)])
+        for day, simplified in results:
+            expected = AdvancedDebtCycleSimplifier(self.transactions, day).simplify_advanced()
+            self.assertEqual(
+                [(tx.debtor, tx.creditor, tx.amount) for tx in simplified],
+                [(tx.debtor, tx.creditor, tx.amount) for tx in expected]
+            )
+
+if __name__ == "__main__":
+    unittest.main()
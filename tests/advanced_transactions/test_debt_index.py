@@ -0,0 +1,73 @@
+from __future__ import annotations
+from datetime import date
+import unittest
+
+from src.data_structures import LinkedList
+from src.core_type import AdvancedTransaction
+from src.utils.financial_calculator import FinancialCalculator
+from src.utils.money_utils import to_cents
+from src.algorithms.advanced_transactions.debt_index import DebtIndex
+from src.algorithms.advanced_transactions.dynamic_programming import AdvancedDynamicProgrammingSimplifier
+
+class TestDebtIndex(unittest.TestCase):
+    """Bộ kiểm thử cho chỉ mục chi tiết nợ gọn."""
+
+    def setUp(self):
+        self.current_date = date(2024, 3, 1)
+        self.transactions = LinkedList[AdvancedTransaction]()
+        self.transactions.append(AdvancedTransaction("A", "B", 100.0, date(2024, 1, 10), date(2024, 2, 1),
+                                                     interest_rate=0.1, penalty_rate=1.0))
+        self.transactions.append(AdvancedTransaction("A", "C", 50.0, date(2024, 1, 5), date(2024, 4, 1),
+                                                     interest_rate=0.1, penalty_rate=1.0))
+        self.transactions.append(AdvancedTransaction("C", "B", 80.0, date(2024, 2, 1), date(2024, 2, 20),
+                                                     interest_rate=0.1, penalty_rate=1.0))
+        self.metrics = FinancialCalculator.evaluate_transactions(self.transactions, self.current_date)
+
+    def test_person_aggregates(self):
+        index = DebtIndex(self.current_date)
+        for i, tx in enumerate(self.transactions):
+            index.add(tx, self.metrics[i])
+
+        self.assertEqual(len(index), 3)
+        alice = index.person("A")
+        self.assertEqual(alice.count, 2)
+        self.assertEqual(alice.earliest_borrow_date, date(2024, 1, 5))
+        self.assertAlmostEqual(alice.priority_sum, self.metrics[0]["priority"] + self.metrics[1]["priority"])
+        self.assertEqual(alice.max_overdue_days, 29.0)
+
+        bob = index.person("B")
+        self.assertAlmostEqual(index.avg_priority("B"), (self.metrics[0]["priority"] + self.metrics[2]["priority"]) / 2)
+        self.assertEqual(bob.overdue_days_sum, 29.0 + 10.0)
+        self.assertEqual(index.avg_priority("Z"), 0.0)
+        self.assertAlmostEqual(index.avg_overdue_days(), (29.0 + 0.0 + 10.0) / 3)
+
+    def test_pair_aggregates(self):
+        self.transactions.append(AdvancedTransaction("A", "B", 30.0, date(2024, 1, 2), date(2024, 2, 25),
+                                                     interest_rate=0.1, penalty_rate=1.0))
+        metrics = FinancialCalculator.evaluate_transactions(self.transactions, self.current_date)
+        index = DebtIndex(self.current_date)
+        for i, tx in enumerate(self.transactions):
+            index.add(tx, metrics[i])
+
+        pair = index.pair("A", "B")
+        self.assertEqual(pair.count, 2)
+        self.assertEqual(pair.earliest_borrow_date, date(2024, 1, 2))
+        self.assertEqual(pair.principal_cents, 13000)
+        self.assertEqual(pair.max_overdue_days, 29.0)
+        self.assertIs(pair.first_transaction, self.transactions.head.data)
+        self.assertIsNone(index.pair("B", "A"))
+        self.assertEqual(index.total_cents(), sum(to_cents(m["total"]) for m in metrics))
+
+    def test_estimate_borrow_date(self):
+        simplifier = AdvancedDynamicProgrammingSimplifier(self.transactions, self.current_date)
+        self.assertEqual(simplifier._estimate_borrow_date("A", "C"), date(2024, 1, 5))
+        self.assertEqual(simplifier._estimate_borrow_date("C", "A"), self.current_date)
+
+    def test_simplifier_uses_index(self):
+        simplifier = AdvancedDynamicProgrammingSimplifier(self.transactions, self.current_date)
+        self.assertEqual(len(simplifier.debt_index), 3)
+        self.assertAlmostEqual(simplifier._calculate_person_avg_priority("C"), simplifier.debt_index.avg_priority("C"))
+        self.assertAlmostEqual(simplifier.simplify()[1].get("average_overdue_days"), 13.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,10 @@ from __future__ import annotations
 import unittest
 
 from src.data_structures import LinkedList
-from src.core_type import BasicTransaction
+from datetime import date
+from src.core_type import BasicTransaction, AdvancedTransaction
 from src.algorithms.basic_transactions.dynamic_programming import DynamicProgrammingSimplifier
+from src.algorithms.advanced_transactions.dynamic_programming import AdvancedDynamicProgrammingSimplifier
 from src.utils.constants import EPSILON
 from src.utils.money_utils import round_money
 
@@ -281,5 +283,45 @@ class TestDynamicProgrammingSimplifier(unittest.TestCase):
         while current: print(f"  {current.data.debtor} → {current.data.creditor} = ${current.data.amount:.2f}"); current = current.next
         print("✅ DP Kiểm thử 5 bên phức tạp thành công")
 
+class TestAdvancedDynamicProgrammingMemo(unittest.TestCase):
+    """Bộ kiểm thử cho bảng ghi nhớ có giới hạn của AdvancedDynamicProgrammingSimplifier."""
+
+    def setUp(self):
+        self.transactions = LinkedList[AdvancedTransaction]()
+        for debtor, creditor, amount in (("A", "B", 30), ("B", "C", 20), ("C", "D", 50),
+                                         ("D", "E", 10), ("E", "F", 40), ("F", "A", 25)):
+            self.transactions.append(AdvancedTransaction(
+                debtor, creditor, amount, date(2024, 1, 1), date(2024, 2, 1),
+                interest_rate=0.05, penalty_rate=1.0
+            ))
+        self.current_date = date(2024, 3, 1)
+
+    def test_bounded_memo_gives_same_result(self):
+        unbounded = AdvancedDynamicProgrammingSimplifier(self.transactions, self.current_date)
+        bounded = AdvancedDynamicProgrammingSimplifier(self.transactions, self.current_date, memo_max_entries=3)
+        expected_txs, expected_stats = unbounded.simplify()
+        actual_txs, actual_stats = bounded.simplify()
+
+        self.assertEqual([(tx.debtor, tx.creditor, tx.amount_cents) for tx in actual_txs],
+                         [(tx.debtor, tx.creditor, tx.amount_cents) for tx in expected_txs])
+        self.assertEqual(list(actual_stats.items()), list(expected_stats.items()))
+
+        stats = bounded.memo_stats()
+        self.assertLessEqual(stats.get("entries"), 3)
+        self.assertGreater(stats.get("evictions"), 0)
+        self.assertEqual(unbounded.memo_stats().get("evictions"), 0)
+        self.assertGreater(unbounded.memo_stats().get("hits"), 0)
+
+    def test_memo_entries_hold_single_step(self):
+        simplifier = AdvancedDynamicProgrammingSimplifier(self.transactions, self.current_date)
+        simplified, stats = simplifier.simplify()
+        for key in simplifier.advanced_dp_table:
+            entry = simplifier.advanced_dp_table.peek(key)
+            # (chi phí, số giao dịch, bước này, khóa trạng thái kế tiếp)
+            self.assertLessEqual(len(entry[2]), 1)
+            self.assertEqual(entry[3] is None, entry[1] == 0)
+        # Danh sách dựng lại theo con trỏ khớp với số giao dịch của lời giải
+        self.assertEqual(len(simplified), stats.get("total_transactions"))
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -7,7 +7,7 @@ from src.core_type import AdvancedTransaction
 from src.algorithms.advanced_transactions.greedy import AdvancedGreedySimplifier
 from src.utils.financial_calculator import InterestType, PenaltyType, FinancialCalculator
 from src.utils.constants import EPSILON
-from src.utils.money_utils import round_money
+from src.utils.money_utils import round_money, from_cents
 
 class TestAdvancedGreedySimplifier(unittest.TestCase):
     """Bộ kiểm thử cho AdvancedGreedySimplifier"""
@@ -176,8 +176,8 @@ class TestAdvancedGreedySimplifier(unittest.TestCase):
         )
 
         # Kiểm tra số dư
-        alice_balance = simplifier.people_balances.get("Alice", 0.0)
-        bob_balance = simplifier.people_balances.get("Bob", 0.0)
+        alice_balance = from_cents(simplifier.people_balances.get("Alice", 0))
+        bob_balance = from_cents(simplifier.people_balances.get("Bob", 0))
         self.assertAlmostEqual(alice_balance, -round_money(expected_debt), delta=EPSILON)
         self.assertAlmostEqual(bob_balance, round_money(expected_debt), delta=EPSILON)
         print(f"💰 Số dư Alice: ${alice_balance:.2f}, Dự kiến: ${-expected_debt:.2f}")
@@ -238,7 +238,7 @@ class TestAdvancedGreedySimplifier(unittest.TestCase):
         # Thu thập thông tin từng người
         people_info = {}
         for person in simplifier.people_balances.keys():
-            balance = simplifier.people_balances.get(person, 0.0)
+            balance = from_cents(simplifier.people_balances.get(person, 0))
 
             debt_count = 0
             credit_count = 0
@@ -405,7 +405,7 @@ class TestAdvancedGreedySimplifier(unittest.TestCase):
         )
 
         expected_total = breakdown['total']
-        actual_balance = simplifier.people_balances.get("Minh", 0.0)
+        actual_balance = from_cents(simplifier.people_balances.get("Minh", 0))
 
         print(f"💰 Tổng nợ thực tế: ${-actual_balance:.2f}")
         print(f"📈 Tổng nợ dự kiến: ${expected_total:.2f}")
@@ -0,0 +1,117 @@
+import random
+import time
+import unittest
+from unittest import mock
+
+from src.core_type import BasicTransaction
+from src.data_structures import LinkedList, HashTable
+from src.algorithms import BalanceLedger
+from src.algorithms.basic_transactions import branch_and_bound
+from src.algorithms.basic_transactions.branch_and_bound import (
+    BranchAndBoundSimplifier, zero_sum_group_bound
+)
+from src.algorithms.basic_transactions.exact_solver import (
+    min_transfer_count, estimated_solve_seconds, DEFAULT_MAX_PEOPLE
+)
+
+def _transactions_for(amounts):
+    """Mỗi người có số dư âm trả cho người cuối danh sách, người cuối trả cho người có số dư dương."""
+    transactions = LinkedList()
+    hub = f"P{len(amounts) - 1:02d}"
+    for i, amount in enumerate(amounts[:-1]):
+        name = f"P{i:02d}"
+        if amount < 0:
+            transactions.append(BasicTransaction.from_cents(name, hub, -amount))
+        elif amount > 0:
+            transactions.append(BasicTransaction.from_cents(hub, name, amount))
+    return transactions
+
+def _random_amounts(rng, n):
+    amounts = [rng.choice([100, 200, 300, 500, rng.randint(1, 40) * 50]) * rng.choice([-1, 1])
+               for _ in range(n - 1)]
+    amounts.append(-sum(amounts))
+    return amounts
+
+class TestBranchAndBound(unittest.TestCase):
+    def assertSettles(self, transactions, result):
+        expected = HashTable()
+        for tx in transactions:
+            expected.put(tx.debtor, expected.get(tx.debtor, 0) - tx.amount_cents)
+            expected.put(tx.creditor, expected.get(tx.creditor, 0) + tx.amount_cents)
+        for tx in result:
+            expected.put(tx.debtor, expected.get(tx.debtor, 0) + tx.amount_cents)
+            expected.put(tx.creditor, expected.get(tx.creditor, 0) - tx.amount_cents)
+        for person in expected:
+            self.assertEqual(expected.get(person), 0)
+
+    def test_group_bound(self):
+        self.assertEqual(zero_sum_group_bound(sorted([-5, 5, -3, 3, -7, 2, 5])), 3)
+        self.assertEqual(zero_sum_group_bound(sorted([-9, 1, 2, 6])), 1)
+        self.assertEqual(zero_sum_group_bound([]), 0)
+
+    def test_proves_optimum_on_small_groups(self):
+        rng = random.Random(44)
+        for _ in range(60):
+            amounts = _random_amounts(rng, rng.randint(2, 10))
+            transactions = _transactions_for(amounts)
+            # Cận dưới chỉ dùng công thức đóng để buộc tìm kiếm phải tự chứng minh tối ưu
+            simplifier = BranchAndBoundSimplifier(transactions, time_budget=10.0, max_exact_people=0)
+            result = simplifier.simplify()
+
+            self.assertSettles(transactions, result)
+            self.assertFalse(simplifier.timed_out)
+            self.assertTrue(simplifier.is_optimal)
+            self.assertEqual(len(result), min_transfer_count(simplifier.people_balances)[0])
+
+    def test_expired_deadline_returns_greedy_incumbent(self):
+        amounts = _random_amounts(random.Random(7), 40)
+        transactions = _transactions_for(amounts)
+        simplifier = BranchAndBoundSimplifier(transactions)
+        result = simplifier.simplify(deadline=time.monotonic() - 1)
+
+        self.assertSettles(transactions, result)
+        self.assertEqual(simplifier.best_transfer_count, len(result))
+        self.assertLessEqual(simplifier.lower_bound, len(result))
+        self.assertEqual(simplifier.optimality_gap, len(result) - simplifier.lower_bound)
+
+    def test_large_group_respects_time_budget(self):
+        amounts = _random_amounts(random.Random(60), 60)
+        transactions = _transactions_for(amounts)
+        ledger = BalanceLedger(transactions)
+        simplifier = BranchAndBoundSimplifier(ledger, time_budget=0.2)
+        start = time.monotonic()
+        result = simplifier.simplify()
+
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertSettles(transactions, result)
+        self.assertGreaterEqual(simplifier.optimality_gap, 0)
+
+    def test_exact_bound_skipped_when_budget_too_small(self):
+        # Nhóm lớn nhất còn dùng cận chính xác: ước lượng thời gian của bộ giải 2^n vượt xa ngân sách
+        self.assertGreater(estimated_solve_seconds(DEFAULT_MAX_PEOPLE), 0.05)
+        amounts = _random_amounts(random.Random(22), DEFAULT_MAX_PEOPLE)
+        transactions = _transactions_for(amounts)
+        simplifier = BranchAndBoundSimplifier(transactions, time_budget=0.05)
+        with mock.patch.object(branch_and_bound, "min_transfer_count",
+                               side_effect=AssertionError("không được tính cận chính xác")) as exact:
+            result = simplifier.simplify()
+
+        exact.assert_not_called()
+        self.assertSettles(transactions, result)
+        self.assertLessEqual(simplifier.lower_bound, len(result))
+
+    def test_exact_bound_used_when_budget_allows(self):
+        amounts = _random_amounts(random.Random(23), 8)
+        simplifier = BranchAndBoundSimplifier(_transactions_for(amounts), time_budget=10.0)
+        with mock.patch.object(branch_and_bound, "min_transfer_count", wraps=min_transfer_count) as exact:
+            simplifier.simplify()
+
+        exact.assert_called_once()
+
+    def test_empty_input(self):
+        simplifier = BranchAndBoundSimplifier()
+        self.assertTrue(simplifier.simplify().is_empty())
+        self.assertTrue(simplifier.is_optimal)
+
+if __name__ == '__main__':
+    unittest.main()
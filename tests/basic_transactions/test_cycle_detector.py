@@ -1,6 +1,6 @@
 import unittest
 from src.core_type import BasicTransaction
-from src.data_structures import LinkedList
+from src.data_structures import LinkedList, Graph
 from src.algorithms.basic_transactions.cycle_detector import DebtCycleSimplifier
 
 class TestDebtCycleSimplifier(unittest.TestCase):
@@ -158,6 +158,88 @@ class TestDebtCycleSimplifier(unittest.TestCase):
         expected_total = 200
         self.assertEqual(total_amount, expected_total)
 
+    def test_cancels_every_cycle_without_iteration_cap(self):
+        """Kiểm tra mọi chu trình đều bị loại bỏ, kể cả khi cần nhiều hơn 50 lần áp dụng."""
+        many_cycles = LinkedList[BasicTransaction]()
+        for group in range(40):
+            a, b, c = f"A{group}", f"B{group}", f"C{group}"
+            many_cycles.append(BasicTransaction(a, b, 30))
+            many_cycles.append(BasicTransaction(b, c, 20))
+            many_cycles.append(BasicTransaction(c, a, 10))
+            many_cycles.append(BasicTransaction(c, b, 5))
+        # Hai giao dịch trùng cặp: cạnh thứ hai được đưa vào đồ thị khi cạnh đầu về 0
+        many_cycles.append(BasicTransaction("A0", "B0", 7))
+
+        simplifier = DebtCycleSimplifier(many_cycles)
+        simplifier.simplify()
+
+        remaining = Graph[str, BasicTransaction](is_directed=True)
+        for tx in many_cycles:
+            if tx.amount_cents > 0:
+                remaining.add_edge(tx.debtor, tx.creditor, tx)
+        self.assertTrue(remaining.find_cycles_with_edges().is_empty())
+        self.assertTrue(simplifier._strongly_connected_components(remaining, remaining.get_all_vertices()).is_empty())
+
+    def test_strongly_connected_components(self):
+        """Kiểm tra Tarjan lặp chỉ trả về các thành phần liên thông mạnh không tầm thường."""
+        graph_tx = LinkedList[BasicTransaction]()
+        graph_tx.append(BasicTransaction("A", "B", 10))
+        graph_tx.append(BasicTransaction("B", "A", 10))
+        graph_tx.append(BasicTransaction("B", "C", 10))
+        graph_tx.append(BasicTransaction("C", "D", 10))
+        graph_tx.append(BasicTransaction("D", "E", 10))
+        graph_tx.append(BasicTransaction("E", "C", 10))
+        simplifier = DebtCycleSimplifier(graph_tx)
+        graph = simplifier._build_graph_from_list(list(graph_tx))
+
+        components = simplifier._strongly_connected_components(graph, graph.get_all_vertices())
+        self.assertEqual(sorted(sorted(component) for component in components), [["A", "B"], ["C", "D", "E"]])
+
+    def test_scc_mode_keeps_inter_component_edges(self):
+        """Kiểm tra chế độ scc gộp từng thành phần liên thông mạnh và giữ nguyên cạnh giữa các thành phần."""
+        scc_tx = LinkedList[BasicTransaction]()
+        scc_tx.append(BasicTransaction("Alice", "Bob", 100))
+        scc_tx.append(BasicTransaction("Bob", "Charlie", 60))
+        scc_tx.append(BasicTransaction("Charlie", "Alice", 30))
+        scc_tx.append(BasicTransaction("Charlie", "David", 25))  # Cạnh giữa hai thành phần
+        scc_tx.append(BasicTransaction("David", "Ema", 40))
+        scc_tx.append(BasicTransaction("Ema", "David", 40))      # Chu trình triệt tiêu hoàn toàn
+
+        result = DebtCycleSimplifier(scc_tx, mode="scc").simplify()
+
+        edges = [(tx.debtor, tx.creditor, tx.amount_cents) for tx in result]
+        self.assertIn(("Charlie", "David", 2500), edges)
+        # Thành phần {Alice, Bob, Charlie} có số dư nội bộ (-70, +40, +30): thanh toán bằng đúng 2 giao dịch
+        internal = [edge for edge in edges if edge != ("Charlie", "David", 2500)]
+        self.assertEqual(len(internal), 2)
+        balances = {"Alice": 0, "Bob": 0, "Charlie": 0}
+        for debtor, creditor, amount_cents in internal:
+            balances[debtor] -= amount_cents
+            balances[creditor] += amount_cents
+        self.assertEqual(balances, {"Alice": -7000, "Bob": 4000, "Charlie": 3000})
+        # Giao dịch đầu vào không bị sửa đổi
+        self.assertEqual(scc_tx.head.data.amount_cents, 10000)
+
+    def test_scc_mode_uses_existing_relationships(self):
+        """Kiểm tra chế độ scc bảo toàn số dư và chỉ tạo giao dịch giữa những người đã có nợ với nhau."""
+        result = DebtCycleSimplifier(self.transactions, mode="scc").simplify()
+
+        relationships = set()
+        expected = {}
+        for tx in self.transactions:
+            relationships.add(frozenset((tx.debtor, tx.creditor)))
+            expected[tx.debtor] = expected.get(tx.debtor, 0) - tx.amount_cents
+            expected[tx.creditor] = expected.get(tx.creditor, 0) + tx.amount_cents
+        actual = {}
+        for tx in result:
+            self.assertIn(frozenset((tx.debtor, tx.creditor)), relationships)
+            actual[tx.debtor] = actual.get(tx.debtor, 0) - tx.amount_cents
+            actual[tx.creditor] = actual.get(tx.creditor, 0) + tx.amount_cents
+        self.assertEqual({k: v for k, v in actual.items() if v}, {k: v for k, v in expected.items() if v})
+
+        with self.assertRaises(ValueError):
+            DebtCycleSimplifier(self.transactions, mode="fast")
+
 if __name__ == '__main__':
     # Chạy tất cả test cases với output verbose
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -1,7 +1,10 @@
 import unittest
 from src.core_type import BasicTransaction
 from src.data_structures import LinkedList
-from src.algorithms.basic_transactions.dynamic_programming import DynamicProgrammingSimplifier
+from src.data_structures import HashTable
+from src.algorithms.basic_transactions.dynamic_programming import (
+    DynamicProgrammingSimplifier, canonical_balance_key, transfers_to_ranks, transfers_from_ranks
+)
 
 class TestDynamicProgrammingSimplifier(unittest.TestCase):
     def setUp(self):
@@ -169,6 +172,47 @@ class TestDynamicProgrammingSimplifier(unittest.TestCase):
         self.assertEqual(tx.creditor, "Bob")
         self.assertEqual(tx.amount, 200)
 
+    def test_exact_solver_minimal(self):
+        """Bộ giải chính xác tìm được lời giải 3 giao dịch mà bước tham lam bỏ lỡ."""
+        transactions = LinkedList[BasicTransaction]()
+        transactions.append(BasicTransaction("A", "C", 40))
+        transactions.append(BasicTransaction("A", "E", 10))
+        transactions.append(BasicTransaction("B", "D", 30))
+        greedy_result = DynamicProgrammingSimplifier(transactions).simplify()
+        simplifier = DynamicProgrammingSimplifier(transactions, exact=True)
+        result = simplifier.simplify()
+        self.assertTrue(simplifier.used_exact_solver)
+        self.assertEqual(len(result), 3)
+        self.assertLessEqual(len(result), len(greedy_result))
+
+        # Vượt quá giới hạn số người thì quay về DP thông thường
+        fallback = DynamicProgrammingSimplifier(transactions, exact=True, max_exact_people=2)
+        self.assertEqual(len(fallback.simplify()), len(greedy_result))
+        self.assertFalse(fallback.used_exact_solver)
+
+    def test_canonical_memo_key(self):
+        """Các trạng thái chỉ khác nhau ở việc ai giữ số dư nào có cùng khóa ghi nhớ."""
+        first = HashTable()
+        second = HashTable()
+        for name, amount in (("A", -300), ("B", 100), ("C", 200), ("D", 0)):
+            first.put(name, amount)
+        for name, amount in (("A", 200), ("B", -300), ("C", 100), ("D", 0)):
+            second.put(name, amount)
+        people = ["A", "B", "C", "D"]
+        first_key, first_names = canonical_balance_key(first, people)
+        second_key, second_names = canonical_balance_key(second, people)
+        self.assertEqual(first_key, second_key)
+        self.assertEqual(first_names, ["A", "B", "C"])
+        self.assertEqual(second_names, ["B", "C", "A"])
+
+        # Lời giải của trạng thái thứ nhất ánh xạ đúng sang người của trạng thái thứ hai
+        solution = LinkedList[BasicTransaction]()
+        solution.append(BasicTransaction("A", "B", 1))
+        solution.append(BasicTransaction("A", "C", 2))
+        mapped = transfers_from_ranks(transfers_to_ranks(solution, first_names), second_names)
+        self.assertEqual([(tx.debtor, tx.creditor, tx.amount_cents) for tx in mapped],
+                         [("B", "C", 100), ("B", "A", 200)])
+
 if __name__ == '__main__':
     # Chạy tất cả test cases với output verbose
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,83 @@
+import random
+import unittest
+
+from src.data_structures import HashTable
+from src.algorithms.basic_transactions.exact_solver import (
+    solve_min_transfers, min_transfer_count, zero_sum_partition, parallel_zero_sum_tables,
+    subset_sums, max_zero_sum_groups, np
+)
+
+def _brute_force_min_transfers(amounts):
+    """Đối chiếu: thử mọi cách tách nhóm tổng bằng 0 chứa phần tử đầu tiên còn lại."""
+    if not amounts:
+        return 0
+    first, rest = amounts[0], amounts[1:]
+    best = None
+    for mask in range(1 << len(rest)):
+        chosen = [rest[i] for i in range(len(rest)) if mask >> i & 1]
+        if first + sum(chosen) != 0:
+            continue
+        others = [rest[i] for i in range(len(rest)) if not mask >> i & 1]
+        candidate = len(chosen) + _brute_force_min_transfers(others)
+        if best is None or candidate < best:
+            best = candidate
+    return best
+
+def _balances(amounts):
+    balances = HashTable()
+    for i, amount in enumerate(amounts):
+        balances.put(f"P{i:02d}", amount)
+    return balances
+
+class TestExactSolver(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(39)
+        for _ in range(150):
+            amounts = [rng.choice([1, 2, 3, 5, rng.randint(1, 20)]) * rng.choice([-1, 1])
+                       for _ in range(rng.randint(0, 7))]
+            amounts.append(-sum(amounts))
+            balances = _balances(amounts)
+            result = solve_min_transfers(balances)
+
+            net = {}
+            for tx in result:
+                net[tx.debtor] = net.get(tx.debtor, 0) - tx.amount_cents
+                net[tx.creditor] = net.get(tx.creditor, 0) + tx.amount_cents
+            for i, amount in enumerate(amounts):
+                self.assertEqual(net.get(f"P{i:02d}", 0), amount)
+
+            expected = _brute_force_min_transfers([amount for amount in amounts if amount != 0])
+            self.assertEqual(len(result), expected)
+            self.assertEqual(min_transfer_count(balances)[0], expected)
+
+    def test_partition_groups_sum_to_zero(self):
+        amounts = [-500, 200, 300, -700, 700, -100, 100]
+        groups = list(zero_sum_partition(amounts))
+        self.assertEqual(len(groups), 3)
+        for group in groups:
+            self.assertEqual(sum(amounts[i] for i in group), 0)
+
+    def test_rejects_large_groups(self):
+        with self.assertRaises(ValueError):
+            solve_min_transfers(_balances([1, 2, 3, -6]), max_people=3)
+
+    @unittest.skipIf(np is None, "Chế độ song song cần NumPy")
+    def test_parallel_tables_match_sequential(self):
+        rng = random.Random(47)
+        for n in (1, 4, 11):
+            amounts = [rng.randint(-30, 30) or 1 for _ in range(n - 1)]
+            amounts.append(-sum(amounts) or 1)
+            tables = parallel_zero_sum_tables(amounts, 3)
+            sums = subset_sums(amounts)
+            self.assertTrue(np.array_equal(tables[0], sums))
+            self.assertTrue(np.array_equal(tables[1], max_zero_sum_groups(amounts, sums)))
+            self.assertEqual(tables[2], int(np.count_nonzero(sums == 0)))
+
+        balances = _balances([-500, 200, 300, -700, 700, -100, 100, -40, 25, 15])
+        parallel = solve_min_transfers(balances, max_workers=2)
+        self.assertEqual([(tx.debtor, tx.creditor, tx.amount_cents) for tx in parallel],
+                         [(tx.debtor, tx.creditor, tx.amount_cents) for tx in solve_min_transfers(balances)])
+        self.assertEqual(min_transfer_count(balances, max_workers=2)[0], len(parallel))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import weakref
 from src.core_type import BasicTransaction
 from src.data_structures import LinkedList
 from src.algorithms.basic_transactions.greedy import GreedySimplifier
@@ -200,6 +201,53 @@ class TestGreedySimplifier(unittest.TestCase):
         self.assertEqual(amounts.get("Alice->Charlie", 0), 100)
         self.assertEqual(amounts.get("David->Fred", 0), 50)
 
+    def test_streaming_input(self):
+        """Bộ đơn giản hóa nhận generator và add_many cho kết quả giống LinkedList."""
+        from src.algorithms.basic_transactions.dynamic_programming import DynamicProgrammingSimplifier
+        from src.algorithms.basic_transactions.min_cost_max_flow import MinCostMaxFlowSimplifier
+
+        def rows(result):
+            return [(tx.debtor, tx.creditor, tx.amount_cents) for tx in result]
+
+        all_txs = list(self.transactions)
+        for simplifier_cls in (GreedySimplifier, DynamicProgrammingSimplifier, MinCostMaxFlowSimplifier):
+            expected = rows(simplifier_cls(self.transactions).simplify())
+            from_generator = simplifier_cls(tx for tx in all_txs)
+            self.assertEqual(from_generator.transaction_count, len(all_txs))
+            self.assertEqual(rows(from_generator.simplify()), expected)
+
+            # Danh sách đầu vào không bị bộ đơn giản hóa giữ lại sau khi cộng dồn số dư
+            source = LinkedList[BasicTransaction]()
+            for tx in all_txs:
+                source.append(tx)
+            source_ref = weakref.ref(source)
+            retained = simplifier_cls(source)
+            del source
+            self.assertIsNone(source_ref())
+            self.assertEqual(rows(retained.simplify()), expected)
+
+            chunked = simplifier_cls()
+            self.assertEqual(rows(chunked.simplify()), [])
+            chunked.add_many(all_txs[:4])
+            chunked.add_many(iter(all_txs[4:-1]))
+            chunked.add(all_txs[-1])
+            self.assertEqual(rows(chunked.simplify()), expected)
+
+    def test_exact_match_prepass(self):
+        """Tiền xử lý ghép cặp khớp chính xác tránh việc tách nhỏ khoản thanh toán."""
+        transactions = LinkedList[BasicTransaction]()
+        # Số dư: A -50, B -30, C +40, D +30, E +10
+        transactions.append(BasicTransaction("A", "C", 40))
+        transactions.append(BasicTransaction("A", "E", 10))
+        transactions.append(BasicTransaction("B", "D", 30))
+        plain = GreedySimplifier(transactions).simplify()
+        matched = GreedySimplifier(transactions, exact_match=True).simplify()
+        self.assertEqual(len(plain), 4)
+        self.assertEqual(
+            sorted((tx.debtor, tx.creditor, tx.amount_cents) for tx in matched),
+            [("A", "C", 4000), ("A", "E", 1000), ("B", "D", 3000)]
+        )
+
 if __name__ == '__main__':
     # Chạy tất cả test cases với output verbose
     unittest.main(verbosity=2)
@@ -0,0 +1,99 @@
+import itertools
+import random
+import unittest
+
+from src.core_type import BasicTransaction
+from src.data_structures import LinkedList, HashTable
+from src.algorithms.basic_transactions.dynamic_programming import DynamicProgrammingSimplifier
+from src.algorithms.basic_transactions.exact_solver import min_transfer_count
+from src.algorithms.basic_transactions.meet_in_the_middle import (
+    smallest_zero_sum_subset, solve_by_decomposition
+)
+
+def _smallest_by_brute_force(amounts):
+    for size in range(1, len(amounts)):
+        for combo in itertools.combinations(range(len(amounts)), size):
+            if sum(amounts[i] for i in combo) == 0:
+                return size
+    return None
+
+def _balances(amounts):
+    balances = HashTable()
+    for i, amount in enumerate(amounts):
+        balances.put(f"P{i:02d}", amount)
+    return balances
+
+class TestMeetInTheMiddle(unittest.TestCase):
+    def assertSettles(self, amounts, result):
+        net = {}
+        for tx in result:
+            net[tx.debtor] = net.get(tx.debtor, 0) - tx.amount_cents
+            net[tx.creditor] = net.get(tx.creditor, 0) + tx.amount_cents
+        for i, amount in enumerate(amounts):
+            self.assertEqual(net.get(f"P{i:02d}", 0), amount)
+
+    def test_finds_smallest_subset(self):
+        rng = random.Random(48)
+        for _ in range(200):
+            amounts = [rng.choice([-3, -2, -1, 1, 2, 3, rng.randint(1, 20)]) for _ in range(rng.randint(2, 10))]
+            amounts[-1] -= sum(amounts)
+            amounts = [amount for amount in amounts if amount != 0] or [4, -4]
+            expected = _smallest_by_brute_force(amounts)
+            # Giới hạn 4 mục buộc nửa sau được duyệt theo nhiều khối
+            for max_half_entries in (4, 1 << 16):
+                subset = smallest_zero_sum_subset(amounts, max_half_entries)
+                if expected is None:
+                    self.assertIsNone(subset)
+                else:
+                    self.assertEqual(len(subset), expected)
+                    self.assertEqual(sum(amounts[i] for i in subset), 0)
+
+    def test_decomposition_matches_exact_on_separable_groups(self):
+        rng = random.Random(8)
+        for _ in range(20):
+            amounts = []
+            # Tối đa 4 nhóm x 4 người để vẫn nằm trong giới hạn của bộ giải chính xác
+            for _ in range(rng.randint(2, 4)):
+                group = [rng.randint(-900, 900) or 7 for _ in range(rng.randint(1, 2))]
+                group.append(-sum(group) or 3)
+                if sum(group) != 0:
+                    group.append(-sum(group))
+                amounts.extend(group)
+            rng.shuffle(amounts)
+            balances = _balances(amounts)
+            result = solve_by_decomposition(balances, max_exact_people=4)
+            self.assertSettles(amounts, result)
+            self.assertEqual(len(result), min_transfer_count(balances)[0])
+
+    def test_decomposition_can_be_suboptimal(self):
+        # Tách tham lam tập con nhỏ nhất là heuristic: kết quả phụ thuộc điểm dừng max_exact_people
+        amounts = [-4, -10, -10, 3, -4, 1, 9, 6, 4, 7, -4, 2]
+        balances = _balances(amounts)
+        self.assertEqual(min_transfer_count(balances)[0], 8)
+        for max_exact_people, expected in ((3, 9), (12, 8)):
+            result = solve_by_decomposition(balances, max_exact_people=max_exact_people)
+            self.assertSettles(amounts, result)
+            self.assertEqual(len(result), expected)
+
+    def test_dp_simplifier_decomposes_large_groups(self):
+        rng = random.Random(30)
+        amounts = []
+        for _ in range(10):
+            a, b = rng.randint(1, 10_000), rng.randint(1, 10_000)
+            amounts.extend([a, b, -(a + b)])
+        transactions = LinkedList[BasicTransaction]()
+        for i, amount in enumerate(amounts):
+            if amount < 0:
+                transactions.append(BasicTransaction.from_cents(f"P{i:02d}", "HUB", -amount))
+            else:
+                transactions.append(BasicTransaction.from_cents("HUB", f"P{i:02d}", amount))
+
+        simplifier = DynamicProgrammingSimplifier(transactions, exact=True, max_exact_people=12)
+        result = simplifier.simplify()
+        self.assertTrue(simplifier.used_decomposition)
+        self.assertFalse(simplifier.used_exact_solver)
+        self.assertSettles(amounts, result)
+        self.assertEqual(len(result), 20)
+
+if __name__ == '__main__':
+    unittest.main()
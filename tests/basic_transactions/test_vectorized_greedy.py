@@ -0,0 +1,68 @@
+import random
+import unittest
+from datetime import date
+
+from src.core_type import BasicTransaction, TransactionStore
+from src.data_structures import LinkedList
+from src.algorithms.basic_transactions.greedy import GreedySimplifier
+from src.algorithms.basic_transactions.vectorized_greedy import VectorizedGreedySimplifier, np
+from src.algorithms.advanced_transactions.greedy import AdvancedGreedySimplifier
+from src.core_type import AdvancedTransaction
+from src.algorithms.balance_ledger import BalanceLedger
+from src.utils.financial_calculator import InterestType, PenaltyType
+
+def _rows(transactions):
+    return [(tx.debtor, tx.creditor, tx.amount_cents) for tx in transactions]
+
+@unittest.skipUnless(np is not None, "Cần NumPy cho nhân vector hóa")
+class TestVectorizedGreedySimplifier(unittest.TestCase):
+    def test_matches_greedy_on_random_groups(self):
+        rng = random.Random(11)
+        for _ in range(100):
+            transactions = LinkedList[BasicTransaction]()
+            people = rng.randint(2, 10)
+            for _ in range(rng.randint(0, 40)):
+                debtor, creditor = rng.sample(range(people), 2)
+                # Nhiều số tiền trùng nhau để kiểm tra thứ tự khi số dư bằng nhau
+                amount = rng.choice([1, 2, 5, 10, rng.randint(1, 100)])
+                transactions.append(BasicTransaction(f"P{debtor}", f"P{creditor}", amount))
+            self.assertEqual(
+                _rows(VectorizedGreedySimplifier(transactions).simplify()),
+                _rows(GreedySimplifier(transactions).simplify())
+            )
+            self.assertEqual(
+                _rows(VectorizedGreedySimplifier(BalanceLedger(transactions)).simplify()),
+                _rows(GreedySimplifier(transactions).simplify())
+            )
+
+    def test_from_store_matches_advanced_greedy(self):
+        transactions = LinkedList[AdvancedTransaction]()
+        transactions.append(AdvancedTransaction(
+            "Alice", "Bob", 100.0, date(2024, 1, 1), date(2024, 3, 1),
+            interest_rate=0.1, penalty_rate=2.0,
+            interest_type=InterestType.COMPOUND_DAILY, penalty_type=PenaltyType.DAILY
+        ))
+        transactions.append(AdvancedTransaction("Bob", "Charlie", 60.0, date(2024, 2, 1), date(2024, 5, 1)))
+        transactions.append(AdvancedTransaction("Charlie", "Alice", 30.0, date(2024, 2, 15), date(2024, 4, 1)))
+        current = date(2024, 6, 1)
+        store = TransactionStore.from_linked_list(transactions)
+        self.assertEqual(
+            _rows(VectorizedGreedySimplifier.from_store(store, current).simplify()),
+            _rows(AdvancedGreedySimplifier(transactions, current, use_batch=True).simplify())
+        )
+        self.assertEqual(
+            _rows(VectorizedGreedySimplifier.from_store(store).simplify()),
+            _rows(GreedySimplifier(BasicTransaction(tx.debtor, tx.creditor, tx.amount)
+                                   for tx in transactions).simplify())
+        )
+
+    def test_settle_arrays_balances_out(self):
+        simplifier = VectorizedGreedySimplifier.from_arrays(
+            np.array([0, 1, 2]), np.array([1, 2, 0]), np.array([500, 300, 100]), ["A", "B", "C"]
+        )
+        payers, payees, amounts = simplifier.settle_arrays()
+        self.assertEqual((payers.tolist(), payees.tolist(), amounts.tolist()), ([0, 0], [1, 2], [200, 200]))
+        self.assertEqual(len(VectorizedGreedySimplifier().simplify()), 0)
+
+if __name__ == '__main__':
+    unittest.main()
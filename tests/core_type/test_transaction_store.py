@@ -0,0 +1,63 @@
+from __future__ import annotations
+from datetime import date
+import unittest
+
+from src.data_structures import LinkedList
+from src.core_type import AdvancedTransaction, TransactionStore
+from src.utils.financial_calculator import FinancialCalculator, InterestType, PenaltyType, np
+
+class TestTransactionStore(unittest.TestCase):
+    """Bộ kiểm thử cho kho giao dịch dạng cột TransactionStore"""
+
+    def setUp(self):
+        self.transactions = LinkedList[AdvancedTransaction]()
+        self.transactions.append(AdvancedTransaction(
+            "Alice", "Bob", 100.25, date(2024, 1, 1), date(2024, 2, 1),
+            interest_rate=0.1, penalty_rate=2.0,
+            interest_type=InterestType.SIMPLE, penalty_type=PenaltyType.DAILY
+        ))
+        self.transactions.append(AdvancedTransaction(
+            "Bob", "Charlie", 50.0, date(2024, 1, 15), date(2024, 3, 1),
+            interest_rate=0.05, penalty_rate=0.1,
+            interest_type=InterestType.COMPOUND_MONTHLY, penalty_type=PenaltyType.PERCENTAGE
+        ))
+        self.transactions.append(AdvancedTransaction(
+            "Alice", "Charlie", 75.5, date(2024, 2, 1), date(2024, 4, 1)
+        ))
+        self.store = TransactionStore.from_linked_list(self.transactions)
+
+    def test_round_trip_and_interning(self):
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.store.people_count, 3)
+        self.assertEqual(self.store.debtor_ids[0], self.store.debtor_ids[2])
+        for original, restored in zip(self.transactions, self.store.to_linked_list()):
+            for field in ("debtor", "creditor", "amount_cents", "borrow_date", "due_date",
+                          "interest_rate", "penalty_rate", "interest_type", "penalty_type"):
+                self.assertEqual(getattr(original, field), getattr(restored, field))
+
+    def test_row_view_and_filter(self):
+        row = self.store[-1]
+        self.assertEqual((row.debtor, row.creditor, row.amount), ("Alice", "Charlie", 75.5))
+        with self.assertRaises(IndexError):
+            self.store[3]
+        alice_rows = self.store.filter(lambda r: r.debtor == "Alice")
+        self.assertEqual([r.amount_cents for r in alice_rows], [10025, 7550])
+        with self.assertRaises(ValueError):
+            self.store.append("A", "B", 0.0, date(2024, 1, 1), date(2024, 1, 2))
+
+    def test_metrics_match_transactions(self):
+        current = date(2024, 5, 1)
+        expected = FinancialCalculator.evaluate_transactions(self.transactions, current)
+        actual = FinancialCalculator.evaluate_transactions(self.store, current)
+        self.assertEqual(list(expected), list(actual))
+        if np is not None:
+            columns = self.store.to_columns()
+            # Các cột ngày đã đúng kiểu int64 nên được dùng trực tiếp, không sao chép
+            self.assertEqual(columns['due_ordinal'].dtype, np.int64)
+            self.assertFalse(columns['due_ordinal'].flags.owndata)
+            batch = FinancialCalculator.evaluate_columns(columns, current)
+            for exp, got in zip(expected, batch):
+                self.assertAlmostEqual(exp['total'], got['total'], places=8)
+
+if __name__ == "__main__":
+    unittest.main()
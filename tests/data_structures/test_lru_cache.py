@@ -0,0 +1,63 @@
+import unittest
+from src.data_structures.lru_cache import LRUCache
+
+class TestLRUCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = LRUCache[str, int]()
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("missing"))
+        self.assertEqual(cache.get("missing", 0), 0)
+        cache.put("a", 10)
+        self.assertEqual(cache.get("a"), 10)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache[str, int](max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" trở thành mục ít dùng gần đây nhất
+        cache.put("c", 3)
+        self.assertTrue(cache.contains_key("a"))
+        self.assertFalse(cache.contains_key("b"))
+        self.assertIn("c", cache)
+        self.assertEqual(list(cache), ["c", "a"])
+        self.assertEqual(cache.evictions, 1)
+
+    def test_byte_budget(self):
+        cache = LRUCache[str, int](max_bytes=25, size_of=lambda key, value: 10)
+        for key in ("a", "b", "c", "d"):
+            cache.put(key, 0)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.total_bytes, 20)
+        stats = cache.stats()
+        self.assertEqual(stats.get("evictions"), 2)
+        self.assertEqual(stats.get("entries"), 2)
+
+        # Một mục lớn hơn cả ngân sách vẫn được giữ lại (chỉ mục đó)
+        cache.put("big", 0)
+        cache.size_of = lambda key, value: 100
+        cache.put("huge", 0)
+        self.assertEqual(list(cache), ["huge"])
+
+    def test_remove_and_clear(self):
+        cache = LRUCache[str, int]()
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.remove("a"), 1)
+        self.assertIsNone(cache.remove("a"))
+        self.assertEqual(list(cache), ["b"])
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.total_bytes, 0)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            LRUCache(max_entries=0)
+        with self.assertRaises(ValueError):
+            LRUCache(max_bytes=-1)
+
+if __name__ == '__main__':
+    unittest.main()
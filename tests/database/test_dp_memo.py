@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from src.core_type import BasicTransaction, AdvancedTransaction
+from src.data_structures import LinkedList, Tuple
+from src.database.dp_memo import PersistentDPMemo, pack_transfers, unpack_transfers
+from src.algorithms.basic_transactions.dynamic_programming import DynamicProgrammingSimplifier
+from src.algorithms.advanced_transactions.dynamic_programming import AdvancedDynamicProgrammingSimplifier
+
+def _rows(transactions):
+    return [(tx.debtor, tx.creditor, tx.amount_cents) for tx in transactions]
+
+class TestPersistentDPMemo(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "dp_memo.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_pack_round_trip(self):
+        transfers = LinkedList[Tuple]()
+        transfers.append(Tuple([0, 2, 12345]))
+        transfers.append(Tuple([1, 2, 10 ** 12]))
+        unpacked = unpack_transfers(pack_transfers(transfers))
+        self.assertEqual([tuple(t) for t in unpacked], [(0, 2, 12345), (1, 2, 10 ** 12)])
+
+    def test_shared_between_connections_and_capped(self):
+        transfers = LinkedList[Tuple]()
+        transfers.append(Tuple([0, 1, 500]))
+        with PersistentDPMemo(self.path, max_entries=2) as writer, PersistentDPMemo(self.path) as reader:
+            writer.put("dp", b"a", 500, 1, transfers)
+            stored = reader.get("dp", b"a")
+            self.assertEqual((stored[0], stored[1]), (500, 1))
+            self.assertIsNone(reader.get("dp_exact", b"a"))
+            self.assertEqual((reader.hits, reader.misses), (1, 1))
+
+            writer.put("dp", b"b", 500, 1, transfers)
+            writer.put("dp", b"c", 500, 1, transfers)
+            self.assertEqual(len(writer), 2)
+            self.assertIsNone(reader.get("dp", b"a"))
+
+    def test_basic_dp_served_from_disk(self):
+        transactions = LinkedList[BasicTransaction]()
+        transactions.append(BasicTransaction("A", "B", 30))
+        transactions.append(BasicTransaction("B", "C", 20))
+        transactions.append(BasicTransaction("D", "C", 15))
+        with PersistentDPMemo(self.path) as memo:
+            first = DynamicProgrammingSimplifier(transactions, persistent_memo=memo).simplify()
+            self.assertEqual(memo.misses, 1)
+
+            second = DynamicProgrammingSimplifier(transactions, persistent_memo=memo).simplify()
+            self.assertEqual(memo.hits, 1)
+            self.assertEqual(_rows(second), _rows(first))
+
+            # Cùng bội số dư nhưng khác người: lời giải được ánh xạ sang người của nhóm mới
+            renamed = LinkedList[BasicTransaction]()
+            renamed.append(BasicTransaction("W", "X", 30))
+            renamed.append(BasicTransaction("X", "Y", 20))
+            renamed.append(BasicTransaction("Z", "Y", 15))
+            mapped = DynamicProgrammingSimplifier(renamed, persistent_memo=memo).simplify()
+            self.assertEqual(memo.hits, 2)
+            rename = {"A": "W", "B": "X", "C": "Y", "D": "Z"}
+            self.assertEqual(_rows(mapped), [(rename[d], rename[c], amount) for d, c, amount in _rows(first)])
+
+    def test_decomposition_keyed_by_parameters(self):
+        # Kết quả tách phụ thuộc max_exact_people (9 giao dịch với 3, tối ưu 8 với 10)
+        transactions = LinkedList[BasicTransaction]()
+        for i, amount in enumerate([-4, -10, -10, 3, -4, 1, 9, 6, 4, 7, -4, 2]):
+            if amount < 0:
+                transactions.append(BasicTransaction.from_cents(f"P{i:02d}", "HUB", -amount))
+            else:
+                transactions.append(BasicTransaction.from_cents("HUB", f"P{i:02d}", amount))
+        with PersistentDPMemo(self.path) as memo:
+            coarse = DynamicProgrammingSimplifier(
+                transactions, exact=True, max_exact_people=3, persistent_memo=memo
+            )
+            self.assertEqual(len(coarse.simplify()), 9)
+            self.assertTrue(coarse.used_decomposition)
+
+            finer = DynamicProgrammingSimplifier(
+                transactions, exact=True, max_exact_people=10, persistent_memo=memo
+            )
+            self.assertEqual(len(finer.simplify()), 8)
+            self.assertEqual(memo.hits, 0)
+
+            again = DynamicProgrammingSimplifier(
+                transactions, exact=True, max_exact_people=3, persistent_memo=memo
+            ).simplify()
+            self.assertEqual((memo.hits, len(again)), (1, 9))
+
+    def test_advanced_dp_served_from_disk(self):
+        transactions = LinkedList[AdvancedTransaction]()
+        for debtor, creditor, amount in (("A", "B", 30), ("B", "C", 20), ("C", "D", 50), ("D", "A", 10)):
+            transactions.append(AdvancedTransaction(
+                debtor, creditor, amount, date(2024, 1, 1), date(2024, 2, 1),
+                interest_rate=0.05, penalty_rate=1.0
+            ))
+        current = date(2024, 3, 1)
+        with PersistentDPMemo(self.path) as memo:
+            expected_txs, expected_stats = AdvancedDynamicProgrammingSimplifier(
+                transactions, current, persistent_memo=memo
+            ).simplify()
+            cached = AdvancedDynamicProgrammingSimplifier(transactions, current, persistent_memo=memo)
+            actual_txs, actual_stats = cached.simplify()
+            self.assertEqual(memo.hits, 1)
+            self.assertEqual(len(cached.advanced_dp_table), 0)
+            self.assertEqual(_rows(actual_txs), _rows(expected_txs))
+            self.assertEqual(list(actual_stats.items()), list(expected_stats.items()))
+
+if __name__ == '__main__':
+    unittest.main()
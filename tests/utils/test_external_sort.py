@@ -0,0 +1,69 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from src.core_type import BasicTransaction
+from src.utils import external_sort
+from src.utils.external_sort import external_merge_sort, net_transactions_by_pair
+
+class TestExternalMergeSort(unittest.TestCase):
+    """Bộ kiểm thử cho External Merge Sort và bù trừ giao dịch theo cặp."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        # Mọi file run tạm phải được dọn dẹp sau khi sắp xếp
+        self.assertEqual(os.listdir(self.temp_dir), [])
+        os.rmdir(self.temp_dir)
+
+    def test_in_memory_when_within_budget(self):
+        data = [5, 3, 9, 1, 7]
+        result = list(external_merge_sort(data, memory_budget=100, temp_dir=self.temp_dir))
+        self.assertEqual(result, [1, 3, 5, 7, 9])
+
+    def test_spills_and_merges_many_runs(self):
+        random.seed(7)
+        data = [random.randint(-500, 500) for _ in range(3000)]
+        # 3000 / 50 = 60 run, max_fan_in=4 buộc phải trộn nhiều lượt
+        result = list(external_merge_sort(data, memory_budget=50, max_fan_in=4, temp_dir=self.temp_dir))
+        self.assertEqual(result, sorted(data))
+
+    def test_cleans_up_runs_when_merge_round_fails(self):
+        data = list(range(400, 0, -1))
+        real_write_run = external_sort._write_run
+        calls = []
+
+        def failing_write_run(pairs, temp_dir):
+            calls.append(1)
+            # 20 run đầu tiên, 2 run của lượt trộn, rồi lỗi giữa lượt trộn
+            if len(calls) == 23:
+                raise OSError("disk full")
+            return real_write_run(pairs, temp_dir)
+
+        with mock.patch.object(external_sort, "_write_run", failing_write_run):
+            with self.assertRaises(OSError):
+                list(external_merge_sort(data, memory_budget=20, max_fan_in=4, temp_dir=self.temp_dir))
+
+    def test_stable_with_key(self):
+        records = [(i % 5, i) for i in range(200)]
+        result = list(external_merge_sort(records, key=lambda r: r[0], memory_budget=17, temp_dir=self.temp_dir))
+        self.assertEqual(result, sorted(records, key=lambda r: r[0]))
+
+    def test_net_transactions_by_pair(self):
+        transactions = [
+            BasicTransaction("Alice", "Bob", 30.0),
+            BasicTransaction("Bob", "Alice", 10.0),
+            BasicTransaction("Charlie", "Alice", 25.5),
+            BasicTransaction("Alice", "Bob", 5.0),
+            BasicTransaction("Bob", "Charlie", 40.0),
+            BasicTransaction("Charlie", "Bob", 40.0),
+        ]
+        netted = list(net_transactions_by_pair(transactions, memory_budget=2, temp_dir=self.temp_dir))
+        summary = {(tx.debtor, tx.creditor): tx.amount for tx in netted}
+        self.assertEqual(summary, {("Alice", "Bob"): 25.0, ("Charlie", "Alice"): 25.5})
+
+if __name__ == "__main__":
+    unittest.main()
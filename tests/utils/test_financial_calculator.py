@@ -0,0 +1,171 @@
+import random
+import unittest
+from datetime import date, timedelta
+
+from src.core_type import AdvancedTransaction
+from src.data_structures import LinkedList
+from src.algorithms.advanced_transactions.greedy import AdvancedGreedySimplifier
+from src.algorithms.advanced_transactions.min_cost_max_flow import AdvancedMinCostMaxFlowSimplifier
+from src.utils import financial_calculator
+from src.utils.financial_calculator import FinancialCalculator, InterestType, PenaltyType, np
+
+def _random_transactions(count: int, seed: int = 7) -> LinkedList[AdvancedTransaction]:
+    rng = random.Random(seed)
+    people = ["A", "B", "C", "D", "E"]
+    transactions = LinkedList[AdvancedTransaction]()
+    for _ in range(count):
+        debtor, creditor = rng.sample(people, 2)
+        borrow = date(2023, 1, 1) + timedelta(days=rng.randint(0, 365))
+        transactions.append(AdvancedTransaction(
+            debtor=debtor, creditor=creditor,
+            amount=round(rng.uniform(1, 5000), 2),
+            borrow_date=borrow, due_date=borrow + timedelta(days=rng.randint(0, 200)),
+            interest_rate=round(rng.uniform(0, 0.3), 3),
+            penalty_rate=round(rng.uniform(0, 50), 2),
+            interest_type=rng.choice(list(InterestType)),
+            penalty_type=rng.choice(list(PenaltyType))
+        ))
+    return transactions
+
+@unittest.skipUnless(np is not None, "Cần NumPy cho API tính toán theo lô")
+class TestFinancialCalculatorBatch(unittest.TestCase):
+    """Bộ kiểm thử cho API vector hóa calculate_batch."""
+
+    def setUp(self):
+        self.current_date = date(2024, 6, 1)
+        self.transactions = _random_transactions(500)
+
+    def test_batch_matches_scalar(self):
+        scalar = FinancialCalculator.evaluate_transactions(self.transactions, self.current_date)
+        batch = FinancialCalculator.evaluate_transactions(self.transactions, self.current_date, use_batch=True)
+        self.assertEqual(len(scalar), len(batch))
+        for expected, actual in zip(scalar, batch):
+            for key in ('principal', 'interest', 'penalty', 'total', 'priority'):
+                self.assertAlmostEqual(expected[key], actual[key], places=6)
+
+    def test_evaluate_columns_keeps_columns(self):
+        scalar = FinancialCalculator.evaluate_transactions(self.transactions, self.current_date)
+        batch = FinancialCalculator.evaluate_columns(
+            FinancialCalculator.build_columns(self.transactions), self.current_date
+        )
+        self.assertEqual(len(batch.column('total')), len(scalar))
+        totals = FinancialCalculator.metric_values(batch, 'total')
+        self.assertEqual(totals, batch.column('total').tolist())
+        self.assertEqual(FinancialCalculator.metric_values(scalar, 'total'), [m['total'] for m in scalar])
+        self.assertEqual(batch[3], {key: batch.column(key)[3] for key in batch.FIELDS})
+
+    def test_empty_columns(self):
+        columns = FinancialCalculator.build_columns([])
+        result = FinancialCalculator.calculate_batch(
+            columns['principal'], columns['interest_rate'], columns['penalty_rate'],
+            columns['borrow_ordinal'], columns['due_ordinal'], self.current_date,
+            columns['interest_code'], columns['penalty_code']
+        )
+        self.assertEqual(len(result['total']), 0)
+
+    def test_simplifiers_agree_with_batch(self):
+        for simplifier_cls in (AdvancedGreedySimplifier, AdvancedMinCostMaxFlowSimplifier):
+            scalar = simplifier_cls(self.transactions, self.current_date).simplify()
+            batch = simplifier_cls(self.transactions, self.current_date, use_batch=True).simplify()
+            self.assertEqual(
+                [(tx.debtor, tx.creditor, tx.amount_cents) for tx in scalar],
+                [(tx.debtor, tx.creditor, tx.amount_cents) for tx in batch]
+            )
+
+class TestDebtMetricsCache(unittest.TestCase):
+    """Bộ kiểm thử cho bộ nhớ đệm chi tiết nợ theo ngày của AdvancedTransaction."""
+
+    def setUp(self):
+        self.current_date = date(2024, 6, 1)
+        self.tx = AdvancedTransaction(
+            debtor="A", creditor="B", amount=1000.0,
+            borrow_date=date(2024, 1, 1), due_date=date(2024, 3, 1),
+            interest_rate=0.1, penalty_rate=5.0,
+            interest_type=InterestType.COMPOUND_DAILY,
+            penalty_type=PenaltyType.DAILY
+        )
+
+    def test_metrics_match_calculator(self):
+        metrics = self.tx.get_debt_metrics(self.current_date)
+        self.assertEqual(metrics, self.tx.get_debt_metrics(self.current_date))
+        self.assertEqual(metrics['priority'], FinancialCalculator.calculate_priority_score(
+            1000.0, 0.1, 5.0, date(2024, 1, 1), date(2024, 3, 1), self.current_date,
+            InterestType.COMPOUND_DAILY, PenaltyType.DAILY
+        ))
+        self.assertEqual(self.tx.get_debt_breakdown(self.current_date)['total'], metrics['total'])
+
+    def test_field_change_invalidates_cache(self):
+        before = self.tx.get_debt_metrics(self.current_date)
+        self.tx.amount = 2000.0
+        after = self.tx.get_debt_metrics(self.current_date)
+        self.assertIsNot(before, after)
+        self.assertGreater(after['total'], before['total'])
+        self.tx.interest_type = InterestType.SIMPLE
+        self.assertNotEqual(self.tx.get_debt_metrics(self.current_date)['interest'], after['interest'])
+
+    def test_cached_metrics_are_read_only(self):
+        metrics = self.tx.get_debt_metrics(self.current_date)
+        with self.assertRaises(TypeError):
+            metrics['total'] = 0.0
+        self.assertEqual(self.tx.get_debt_metrics(self.current_date)['total'], metrics['total'])
+
+    def test_cache_evicts_oldest_date_only(self):
+        dates = [self.current_date + timedelta(days=i)
+                 for i in range(AdvancedTransaction._METRICS_CACHE_SIZE + 1)]
+        for day in dates:
+            self.tx.get_debt_metrics(day)
+
+        cache = self.tx._metrics_cache
+        self.assertEqual(len(cache), AdvancedTransaction._METRICS_CACHE_SIZE)
+        self.assertNotIn(dates[0], cache)
+        self.assertEqual(list(cache), dates[1:])
+
+class TestDebtProjection(unittest.TestCase):
+    """Bộ kiểm thử cho chuỗi chiếu giá trị nợ theo ngày."""
+
+    def test_projection_matches_daily_calculation(self):
+        for interest_type in InterestType:
+            for penalty_type in PenaltyType:
+                tx = AdvancedTransaction(
+                    debtor="A", creditor="B", amount=1234.56,
+                    borrow_date=date(2024, 1, 15), due_date=date(2024, 3, 10),
+                    interest_rate=0.12, penalty_rate=2.5,
+                    interest_type=interest_type, penalty_type=penalty_type
+                )
+                series = tx.project_debt(date(2024, 2, 1), date(2024, 5, 31))
+                self.assertEqual(len(series), 121)
+                for day, interest, penalty, total in series:
+                    expected = tx.get_debt_breakdown(day)
+                    self.assertAlmostEqual(expected['interest'], interest, places=8)
+                    self.assertEqual(expected['penalty'], penalty)
+                    self.assertAlmostEqual(expected['total'], total, places=8)
+
+    def test_empty_range(self):
+        series = FinancialCalculator.project_debt(
+            100.0, 0.1, 1.0, date(2024, 1, 1), date(2024, 2, 1),
+            date(2024, 3, 1), date(2024, 2, 1)
+        )
+        self.assertEqual(len(series), 0)
+
+    def test_factor_tables_stay_bounded(self):
+        limit = financial_calculator._FACTOR_TABLE_MAX_BASES
+        for i in range(limit * 3):
+            rate = 0.01 + i / 1000
+            series = FinancialCalculator.project_debt(
+                500.0, rate, 0.0, date(2024, 1, 1), date(2024, 12, 31),
+                date(2024, 3, 1), date(2024, 3, 10)
+            )
+            self.assertLessEqual(len(financial_calculator._FACTOR_TABLES), limit)
+            # Bảng bị loại bỏ được dựng lại và vẫn cho kết quả khớp với cách tính từng ngày
+            self.assertAlmostEqual(
+                series[len(series) - 1][3],
+                FinancialCalculator.calculate_total_debt(
+                    500.0, rate, 0.0, date(2024, 1, 1), date(2024, 12, 31), date(2024, 3, 10),
+                    InterestType.COMPOUND_DAILY, PenaltyType.FIXED
+                )['total'],
+                places=8
+            )
+        self.assertEqual(len(financial_calculator._FACTOR_TABLES), limit)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from src.core_type import BasicTransaction
+from src.data_structures import LinkedList
+from src.algorithms.basic_transactions.greedy import GreedySimplifier
+from src.utils.money_utils import to_cents, from_cents
+
+class TestMoneyCents(unittest.TestCase):
+    """Bộ kiểm thử cho biểu diễn số tiền nguyên theo xu."""
+
+    def test_round_trip(self):
+        self.assertEqual(to_cents(12.34), 1234)
+        self.assertEqual(to_cents(0.1 + 0.2), 30)
+        self.assertEqual(from_cents(1234), 12.34)
+        self.assertEqual(to_cents(-5.5), -550)
+
+    def test_transaction_stores_cents(self):
+        tx = BasicTransaction("A", "B", 10.005)
+        self.assertIsInstance(tx.amount_cents, int)
+        self.assertEqual(tx.amount, from_cents(tx.amount_cents))
+        with self.assertRaises(ValueError):
+            BasicTransaction("A", "B", 0.001)
+        self.assertEqual(BasicTransaction.from_cents("A", "B", 250).amount, 2.5)
+
+    def test_no_drift_on_many_small_amounts(self):
+        """Cộng dồn nhiều khoản 0.1 không được sinh ra giao dịch lẻ do sai số float."""
+        transactions = LinkedList[BasicTransaction]()
+        for _ in range(1000):
+            transactions.append(BasicTransaction("A", "B", 0.1))
+            transactions.append(BasicTransaction("B", "C", 0.1))
+        result = GreedySimplifier(transactions).simplify()
+        self.assertEqual(len(result), 1)
+        tx = result.head.data
+        self.assertEqual((tx.debtor, tx.creditor, tx.amount_cents), ("A", "C", 10000))
+
+if __name__ == "__main__":
+    unittest.main()
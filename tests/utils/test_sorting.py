@@ -0,0 +1,75 @@
+import random
+import unittest
+from unittest import mock
+
+from src.utils import sorting
+from src.utils.sorting import quick_sort
+
+class TestQuickSort(unittest.TestCase):
+    """Bộ kiểm thử cho quick_sort (Introsort)."""
+
+    def test_empty_and_single(self):
+        empty = []
+        quick_sort(empty)
+        self.assertEqual(empty, [])
+        single = [42]
+        quick_sort(single)
+        self.assertEqual(single, [42])
+
+    def test_random_input(self):
+        random.seed(2024)
+        data = [random.uniform(-1000, 1000) for _ in range(2000)]
+        expected = sorted(data)
+        quick_sort(data)
+        self.assertEqual(data, expected)
+
+    def test_sorted_and_reversed_input_large(self):
+        """Dãy đã sắp xếp/ngược lớn không được gây RecursionError hay O(n²)."""
+        data = list(range(50000))
+        quick_sort(data)
+        self.assertEqual(data, list(range(50000)))
+
+        data = list(range(50000, 0, -1))
+        quick_sort(data)
+        self.assertEqual(data, list(range(1, 50001)))
+
+    def test_many_equal_balances(self):
+        random.seed(7)
+        data = [random.choice([-50.0, 0.0, 25.5, 100.0]) for _ in range(5000)]
+        expected = sorted(data)
+        quick_sort(data)
+        self.assertEqual(data, expected)
+
+    def test_custom_comparator_descending(self):
+        data = [("A", 10), ("B", -5), ("C", 30), ("D", 10), ("E", 0)] * 20
+        quick_sort(data, comparator=lambda a, b: a[1] > b[1])
+        balances = [item[1] for item in data]
+        self.assertEqual(balances, sorted(balances, reverse=True))
+
+    def test_organ_pipe_input(self):
+        """Dãy tăng rồi giảm (organ pipe) - trường hợp bất lợi cho pivot cố định."""
+        data = list(range(5000)) + list(range(5000, 0, -1))
+        expected = sorted(data)
+        quick_sort(data)
+        self.assertEqual(data, expected)
+
+    def test_depth_limit_falls_back_to_heap_sort(self):
+        """Độ sâu cho phép bằng 0 buộc quick_sort dùng nhánh HeapSort dự phòng."""
+        rng = random.Random(26)
+        data = [rng.randint(-500, 500) for _ in range(3000)]
+        expected = sorted(data)
+        with mock.patch.object(sorting, "_DEPTH_LIMIT_FACTOR", 0), \
+                mock.patch.object(sorting, "_heap_sort_range", wraps=sorting._heap_sort_range) as heap_sort, \
+                mock.patch.object(sorting, "_partition_three_way") as partition:
+            quick_sort(data)
+            descending = [("P", rng.randint(-50, 50)) for _ in range(500)]
+            quick_sort(descending, comparator=lambda a, b: a[1] > b[1])
+
+        self.assertEqual(heap_sort.call_count, 2)
+        partition.assert_not_called()
+        self.assertEqual(data, expected)
+        balances = [item[1] for item in descending]
+        self.assertEqual(balances, sorted(balances, reverse=True))
+
+if __name__ == "__main__":
+    unittest.main()